@@ -246,6 +246,32 @@ class ArrayBase(EventsPartial):
             self.log.debug("Setting Formula Array")
             self.set_formula_array(current_formula=formula, add_default_style=True)
 
+    def refresh(self) -> None:
+        """
+        Writes the array of the cell again.
+
+        Used when the rows that are shown change but the data does not, such as when the page of a large DataFrame is changed.
+        The array formula is set again on its range so the cell is recalculated.
+        If the number of rows or columns has changed, ``update()`` is called instead.
+        """
+        with self.log.indent(True):
+            if self._ctl_state.get_state() != StateKind.ARRAY:
+                self.log.debug("refresh() Cell is not an array.")
+                return
+            if self.update_required():
+                self.update()
+                return
+            formula = self.get_formula()
+            if not formula:
+                self.log.error("Cell %s has no formula.", self.cell.cell_obj)
+                return
+            cursor = cast("SheetCellCursor", self.cell.calc_sheet.component.createCursorByRange(self.cell.component))  # type: ignore
+            cursor.collapseToCurrentArray()
+            cm = self._cell_mgr
+            with cm.listener_context(self.cell.component):
+                self.log.debug("refresh() Setting Array Formula")
+                cursor.setArrayFormula(formula)
+
     # region Properties
     @property
     def ctl_state(self) -> CtlState:
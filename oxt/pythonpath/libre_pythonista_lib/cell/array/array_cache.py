@@ -0,0 +1,77 @@
+from __future__ import annotations
+from typing import Any, Dict, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ooodev.proto.office_document_t import OfficeDocumentT
+    from ...utils.pandas_util import LoColumns
+
+
+class ArrayCache:
+    """
+    Per document store of the columns last written by each DataFrame or Series array cell.
+
+    When a cell is calculated again only the columns whose values changed are converted for Calc,
+    see ``PandasUtil.pandas_to_array()``.
+    """
+
+    _instances: Dict[str, ArrayCache] = {}
+
+    def __new__(cls, doc: OfficeDocumentT) -> ArrayCache:
+        key = f"doc_{doc.runtime_uid}"
+        if key not in cls._instances:
+            inst = super().__new__(cls)
+            inst._is_init = False
+            cls._instances[key] = inst
+        return cls._instances[key]
+
+    def __init__(self, doc: OfficeDocumentT) -> None:
+        if getattr(self, "_is_init", False):
+            return
+        self._cells: Dict[Tuple[int, str], LoColumns] = {}
+        self._is_init = True
+
+    def get_columns(self, sheet_idx: int, cell_obj: Any) -> LoColumns:  # noqa: ANN401
+        """
+        Gets the columns of a cell, added when the cell has none.
+
+        Args:
+            sheet_idx (int): Sheet index of the cell.
+            cell_obj (Any): Cell such as a ``CellObj``.
+
+        Returns:
+            LoColumns: Columns that are updated when the array of the cell is converted.
+        """
+        return self._cells.setdefault((sheet_idx, str(cell_obj)), {})
+
+    def remove(self, sheet_idx: int, cell_obj: Any) -> None:  # noqa: ANN401
+        """
+        Removes the columns of a cell, such as when the cell is no longer an array.
+
+        Args:
+            sheet_idx (int): Sheet index of the cell.
+            cell_obj (Any): Cell such as a ``CellObj``.
+        """
+        self._cells.pop((sheet_idx, str(cell_obj)), None)
+
+    def clear(self) -> None:
+        """Removes the columns of all cells."""
+        self._cells.clear()
+
+    def __len__(self) -> int:
+        return len(self._cells)
+
+    @classmethod
+    def reset_instance(cls, runtime_uid: str) -> None:
+        """
+        Clears and removes the instance of a document.
+
+        Args:
+            runtime_uid (str): Runtime uid of the document.
+        """
+        key = f"doc_{runtime_uid}"
+        inst = cls._instances.pop(key, None)
+        if inst is not None:
+            inst.clear()
+
+    def __repr__(self) -> str:
+        return f"<ArrayCache(cells={len(self)})>"
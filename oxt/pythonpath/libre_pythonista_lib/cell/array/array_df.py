@@ -14,6 +14,7 @@ from ooodev.calc import CalcCell
 from ...utils.pandas_util import PandasUtil
 from ...cell.state.ctl_state import CtlState
 from .array_base import ArrayBase
+from .array_window import ArrayWindow
 
 
 if TYPE_CHECKING:
@@ -61,10 +62,9 @@ class ArrayDF(ArrayBase):
             if shape_len == 0:
                 return lst
 
-            if shape_len == 1:
-                lst[0] = shape[0]
-            else:
-                lst[0] = shape[0]
+            start, stop = ArrayWindow(self.cell).get_rows(shape[0])
+            lst[0] = stop - start
+            if shape_len > 1:
                 lst[1] = shape[1]
             if has_headers:
                 lst[0] += 1
@@ -13,6 +13,7 @@ from ooodev.calc import CalcCell
 
 from ...cell.state.ctl_state import CtlState
 from .array_base import ArrayBase
+from .array_window import ArrayWindow
 
 
 if TYPE_CHECKING:
@@ -41,7 +42,8 @@ class ArrayDS(ArrayBase):
             List[int]: Number of rows and columns
         """
         s = cast("pd.Series", self.get_data().value)
-        series_len = len(s)
+        start, stop = ArrayWindow(self.cell).get_rows(len(s))
+        series_len = stop - start
         if not series_len:
             return [0, 0]
         if s.name:
@@ -1,9 +1,10 @@
 from __future__ import annotations
-from typing import List, TYPE_CHECKING
+from typing import Iterable, List, TYPE_CHECKING
 from ooodev.calc import CalcDoc, CalcCell
 from ...code.cell_cache import CellCache
 from ..props.key_maker import KeyMaker
 from .array_factory import get_array_helper
+from .array_shapes import ArrayShapeKey
 
 
 if TYPE_CHECKING:
@@ -54,12 +55,29 @@ class ArrayMgr:
             self._log.exception("_has_array_ability()")
         return False
 
-    def update_array_cells(self) -> None:
+    def _get_cells(self, keys: Iterable[ArrayShapeKey]) -> List[CalcCell]:
+        results: List[CalcCell] = []
+        for sheet_idx, cell_obj in keys:
+            # the cell may have been deleted since its result was returned.
+            if not self._cell_cache.has_cell(cell=cell_obj, sheet_idx=sheet_idx):
+                continue
+            results.append(self._doc.sheets[sheet_idx][cell_obj])
+        return results
+
+    def update_array_cells(self, keys: Iterable[ArrayShapeKey] | None = None) -> None:
         """
-        Updates all sheet array formulas for this extension if the array size has changed.
+        Updates sheet array formulas for this extension if the array size has changed.
+
+        Args:
+            keys (Iterable[ArrayShapeKey], optional): Cells to update in the format of ``(sheet_idx, cell_obj)``.
+                Defaults to all the array cells of the document.
         """
         try:
-            for cell in self.get_array_cells():
+            cells = self.get_array_cells() if keys is None else self._get_cells(keys)
+            if self._log.is_debug:
+                with self._log.indent(True):
+                    self._log.debug("update_array_cells() - %i", len(cells))
+            for cell in cells:
                 helper = get_array_helper(cell)
                 if helper is None:
                     continue
@@ -0,0 +1,109 @@
+from __future__ import annotations
+from typing import Any, Dict, Iterable, Set, Tuple, TYPE_CHECKING
+import threading
+
+if TYPE_CHECKING:
+    from ooodev.proto.office_document_t import OfficeDocumentT
+
+ArrayShapeKey = Tuple[int, Any]
+"""Array cell key in the format of ``(sheet_idx, cell_obj)``."""
+
+
+class ArrayShapes:
+    """
+    Per document record of the shape of the array last returned by each array cell.
+
+    ``PY.C`` reports the shape of each result with ``track()``. Cells whose shape changed are kept as pending
+    until ``pop_pending()`` so only those cells need their array formula resized. Methods are thread safe.
+    """
+
+    _instances: Dict[str, ArrayShapes] = {}
+
+    def __new__(cls, doc: OfficeDocumentT) -> ArrayShapes:
+        key = f"doc_{doc.runtime_uid}"
+        if key not in cls._instances:
+            inst = super().__new__(cls)
+            inst._is_init = False
+            cls._instances[key] = inst
+        return cls._instances[key]
+
+    def __init__(self, doc: OfficeDocumentT) -> None:
+        if getattr(self, "_is_init", False):
+            return
+        self._lock = threading.Lock()
+        self._shapes: Dict[ArrayShapeKey, Tuple[int, int]] = {}
+        self._pending: Set[ArrayShapeKey] = set()
+        self._is_init = True
+
+    def track(self, key: ArrayShapeKey, rows: int, cols: int) -> bool:
+        """
+        Records the shape of the array returned for a cell.
+
+        Args:
+            key (ArrayShapeKey): Cell key.
+            rows (int): Number of rows of the array.
+            cols (int): Number of columns of the array.
+
+        Returns:
+            bool: ``True`` if the shape is not the last recorded shape of the cell and the cell is now pending.
+        """
+        shape = (rows, cols)
+        with self._lock:
+            if self._shapes.get(key, None) == shape:
+                return False
+            self._shapes[key] = shape
+            self._pending.add(key)
+            return True
+
+    def pop_pending(self) -> Set[ArrayShapeKey]:
+        """
+        Gets and clears the cells whose shape changed since the last call.
+
+        Returns:
+            Set[ArrayShapeKey]: Cell keys.
+        """
+        with self._lock:
+            pending = self._pending
+            self._pending = set()
+            return pending
+
+    def forget(self, keys: Iterable[ArrayShapeKey]) -> None:
+        """
+        Removes the shapes of cells so they are pending the next time they are tracked, such as after a failed update.
+
+        Args:
+            keys (Iterable[ArrayShapeKey]): Cell keys.
+        """
+        with self._lock:
+            for key in keys:
+                self._shapes.pop(key, None)
+
+    def clear(self) -> None:
+        """Removes all shapes and pending cells."""
+        with self._lock:
+            self._shapes.clear()
+            self._pending.clear()
+
+    @property
+    def has_pending(self) -> bool:
+        """Gets if any cell shape has changed since the last ``pop_pending()``."""
+        return bool(self._pending)
+
+    def __len__(self) -> int:
+        return len(self._shapes)
+
+    @classmethod
+    def reset_instance(cls, runtime_uid: str) -> None:
+        """
+        Clears and removes the instance of a document.
+
+        Args:
+            runtime_uid (str): Runtime uid of the document.
+        """
+        key = f"doc_{runtime_uid}"
+        inst = cls._instances.pop(key, None)
+        if inst is not None:
+            inst.clear()
+
+    def __repr__(self) -> str:
+        return f"<ArrayShapes(cells={len(self)}, pending={len(self._pending)})>"
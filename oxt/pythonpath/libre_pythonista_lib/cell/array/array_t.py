@@ -103,6 +103,14 @@ class ArrayT(Protocol):
         """
         ...
 
+    def refresh(self) -> None:
+        """
+        Writes the array of the cell again.
+
+        If the number of rows or columns has changed, ``update()`` is called instead.
+        """
+        ...
+
     # region Properties
     @property
     def ctl_state(self) -> CtlState:
@@ -0,0 +1,107 @@
+from __future__ import annotations
+from collections import OrderedDict
+from typing import Callable, TYPE_CHECKING
+import threading
+
+if TYPE_CHECKING:
+    from .....___lo_pip___.oxt_logger.oxt_logger import OxtLogger
+else:
+    from ___lo_pip___.oxt_logger.oxt_logger import OxtLogger
+
+
+class ArrayUpdateWorker:
+    """
+    Single long lived thread that resizes array formulas after a recalculation.
+
+    Updates can not run inside ``PY.C`` while the sheet is being calculated, so they are queued here.
+    Requests are queued per document. A request for a document that is already queued replaces it,
+    so any number of requests made before the update starts run once. Updates run one at a time
+    and never overlap.
+    """
+
+    _instance: ArrayUpdateWorker | None = None
+
+    def __new__(cls) -> ArrayUpdateWorker:
+        if cls._instance is None:
+            inst = super().__new__(cls)
+            inst._is_init = False
+            cls._instance = inst
+        return cls._instance
+
+    def __init__(self) -> None:
+        if getattr(self, "_is_init", False):
+            return
+        self._log = OxtLogger(log_name=self.__class__.__name__)
+        self._cond = threading.Condition()
+        self._pending: OrderedDict[str, Callable[[], None]] = OrderedDict()
+        self._is_running = False
+        self._thread: threading.Thread | None = None
+        self._is_init = True
+
+    def request(self, key: str, run: Callable[[], None]) -> None:
+        """
+        Queues an update.
+
+        Args:
+            key (str): Key of the document such as ``doc_{runtime_uid}``.
+            run (Callable[[], None]): Called on the worker thread to do the update.
+        """
+        with self._cond:
+            self._pending[key] = run
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._worker, name="LpArrayUpdate", daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+
+    def cancel(self, key: str) -> None:
+        """
+        Removes the queued update of a document, such as when the document is closing.
+
+        An update that is running is not stopped.
+
+        Args:
+            key (str): Key of the document.
+        """
+        with self._cond:
+            self._pending.pop(key, None)
+
+    def wait_idle(self, timeout: float | None = None) -> bool:
+        """
+        Waits until no update is queued or running.
+
+        Args:
+            timeout (float, optional): Maximum seconds to wait. Defaults to no limit.
+
+        Returns:
+            bool: ``True`` if idle, ``False`` if the timeout expired.
+        """
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._pending and not self._is_running, timeout)
+
+    def is_worker_thread(self) -> bool:
+        """Gets if the current thread is the worker thread."""
+        return threading.current_thread() is self._thread
+
+    def _worker(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                _, run = self._pending.popitem(last=False)
+                self._is_running = True
+            try:
+                run()
+            except Exception:
+                self._log.exception("Error updating array cells.")
+            finally:
+                with self._cond:
+                    self._is_running = False
+                    self._cond.notify_all()
+
+    @property
+    def is_running(self) -> bool:
+        """Gets if an update is running."""
+        return self._is_running
+
+    def __repr__(self) -> str:
+        return f"<ArrayUpdateWorker(pending={len(self._pending)}, is_running={self._is_running})>"
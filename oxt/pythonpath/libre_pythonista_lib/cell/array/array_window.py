@@ -0,0 +1,126 @@
+from __future__ import annotations
+import contextlib
+from typing import Any, Tuple
+
+from ooodev.calc import CalcCell
+
+from ..props.key_maker import KeyMaker
+
+
+class ArrayWindow:
+    """
+    Rows of a DataFrame or Series that are written to the sheet when the cell is an array.
+
+    When the result has more rows than the ``array_max_rows`` setting, only one page of rows is written.
+    The full result stays in Python. The page is stored in a custom property of the cell.
+    """
+
+    def __init__(self, cell: CalcCell) -> None:
+        """
+        Constructor
+
+        Args:
+            cell (CalcCell): The cell of the array.
+        """
+        self._cell = cell
+        self._key_maker = KeyMaker()
+
+    def __repr__(self) -> str:
+        return f"<{self.__class__.__name__}(cell={self.cell.cell_obj})>"
+
+    def get_max_rows(self) -> int:
+        """
+        Gets the number of rows in a page.
+
+        Returns:
+            int: Rows in a page, ``0`` if all rows are written.
+        """
+        # avoid circular import
+        from ...code.py_source_mgr import PyInstance
+
+        return PyInstance(self.cell.calc_doc).array_max_rows
+
+    def get_page(self) -> int:
+        """
+        Gets the zero based page.
+
+        Returns:
+            int: The page.
+        """
+        key = self._key_maker.ctl_array_page_key
+        if self.cell.has_custom_property(key):
+            with contextlib.suppress(Exception):
+                return max(0, int(self.cell.get_custom_property(key, 0)))
+        return 0
+
+    def set_page(self, page: int) -> None:
+        """
+        Sets the zero based page.
+
+        If the page is ``0``, the custom property is removed.
+
+        Args:
+            page (int): The page.
+        """
+        key = self._key_maker.ctl_array_page_key
+        if page <= 0:
+            if self.cell.has_custom_property(key):
+                self.cell.remove_custom_property(key)
+            return
+        self.cell.set_custom_property(key, int(page))
+
+    def get_page_count(self, total: int) -> int:
+        """
+        Gets the number of pages.
+
+        Args:
+            total (int): Number of rows of the result.
+
+        Returns:
+            int: Number of pages, ``1`` if all rows are written.
+        """
+        max_rows = self.get_max_rows()
+        if max_rows <= 0 or total <= max_rows:
+            return 1
+        return -(-total // max_rows)
+
+    def get_rows(self, total: int) -> Tuple[int, int]:
+        """
+        Gets the rows of the current page.
+
+        A page past the last page gives the last page.
+
+        Args:
+            total (int): Number of rows of the result.
+
+        Returns:
+            Tuple[int, int]: Start and stop of the rows.
+        """
+        max_rows = self.get_max_rows()
+        if max_rows <= 0 or total <= max_rows:
+            return (0, total)
+        page = min(self.get_page(), self.get_page_count(total) - 1)
+        start = page * max_rows
+        return (start, min(total, start + max_rows))
+
+    def apply(self, obj: Any) -> Any:  # noqa: ANN401
+        """
+        Gets the rows of the current page.
+
+        Args:
+            obj (pd.DataFrame | pd.Series): Result of the cell.
+
+        Returns:
+            pd.DataFrame | pd.Series: ``obj`` if all rows are written, otherwise the rows of the page.
+        """
+        start, stop = self.get_rows(len(obj))
+        if start == 0 and stop == len(obj):
+            return obj
+        return obj.iloc[start:stop]
+
+    # region properties
+    @property
+    def cell(self) -> CalcCell:
+        return self._cell
+
+    # endregion properties
@@ -7,7 +7,6 @@ Manages adding and removing listeners to cells.
 from __future__ import annotations
 from typing import Any, cast, TYPE_CHECKING
 from contextlib import contextmanager
-import threading
 from ooodev.calc import CalcDoc, CalcCell, CalcSheet
 from ooodev.utils.data_type.cell_obj import CellObj
 from ooodev.events.args.event_args import EventArgs
@@ -37,6 +36,8 @@ from ..const.event_const import (
 from ..log.log_inst import LogInst
 
 from .array.array_mgr import ArrayMgr
+from .array.array_shapes import ArrayShapes
+from .array.array_update_worker import ArrayUpdateWorker
 
 if TYPE_CHECKING:
     from com.sun.star.sheet import SheetCell  # service
@@ -149,12 +150,23 @@ class CellMgr(SingletonBase):
         with self._log.noindent():
             self._log.debug("_on_sheet_modified() Entering.")
             # self.reset_py_inst()
+            if self.py_inst.background_recalc:
+                self.py_inst.request_recalc()
             self._log.debug("_on_sheet_modified() Done.")
 
     def _on_calc_formulas_calculated(self, src: Any, event: EventArgs) -> None:
         with self._log.noindent():
             self._log.debug("_on_calc_formulas_calculated() Entering.")
-            self.reset_py_inst(update_display=True)
+            py_inst = self.py_inst
+            if py_inst.background_recalc:
+                # changed cells are executed on a background thread, see PySourceManager.request_recalc().
+                py_inst.request_recalc()
+                self._log.debug("_on_calc_formulas_calculated() Requested background recalculation.")
+            elif py_inst.dirty_recalc and py_inst.update_dirty():
+                # module state and PySource objects are kept, only changed cells have been executed.
+                self._log.debug("_on_calc_formulas_calculated() Updated dirty cells.")
+            else:
+                self.reset_py_inst(update_display=True)
             self._log.debug("_on_calc_formulas_calculated() Done.")
 
     def _on_calc_pyc_formula_inserted(self, src: Any, event: EventArgs) -> None:
@@ -179,16 +191,17 @@ class CellMgr(SingletonBase):
                 self._log.debug("Is First Cell: %s", dd.is_first_cell)
                 self._log.debug("Is Last Cell: %s", dd.is_last_cell)
 
-            if dd.is_last_cell:
-                # it is imperative that the update be called in a new thread.
-                # If not called in a new thread then chances are LibreOffice will totally crash.
+            self._track_array_shape(dd)
+            if dd.is_last_cell and ArrayShapes(self._doc).has_pending:
+                # it is imperative that the update be called in another thread.
+                # If not called in another thread then chances are LibreOffice will totally crash.
                 # Most likely the crash is because a re-calculation of the sheet is taking place,
                 # and the update that can change the sheet cell formulas is being called at the same time.
-                # By calling in a thread the crash is avoided and the sheet is updated without any issues.
-                t = threading.Thread(
-                    target=update_array_cells, args=(self._doc,), daemon=True
+                # The update worker runs one update at a time and merges requests that arrive before it starts.
+                doc = self._doc
+                ArrayUpdateWorker().request(
+                    f"doc_{doc.runtime_uid}", lambda: update_array_cells(doc)
                 )
-                t.start()
 
         except Exception:
             self._log.exception("_on_pyc_rule_matched()")
@@ -196,6 +209,26 @@ class CellMgr(SingletonBase):
 
         self._log.debug("_on_pyc_rule_matched() Done")
 
+    def _track_array_shape(self, dd: DotDict) -> None:
+        # records the shape of the array returned by cells that can be arrays.
+        # Only cells whose shape changed are checked by update_array_cells().
+        rules = self._key_maker.rule_names
+        rule = cast("PycRuleT", dd.matched_rule)
+        if rule.data_type_name not in (
+            rules.cell_data_type_pd_df,
+            rules.cell_data_type_pd_series,
+            rules.cell_data_type_tbl_data,
+        ):
+            return
+        result = dd.rule_result
+        try:
+            rows = len(result)
+            cols = len(result[0]) if rows else 0
+        except (TypeError, KeyError, IndexError):
+            return
+        cell_obj = cast(CalcCell, dd.calc_cell).cell_obj
+        ArrayShapes(self._doc).track((cell_obj.sheet_idx, cell_obj), rows, cols)
+
     # endregion PYC Events
 
     # region Control Update Methods
@@ -307,6 +340,7 @@ class CellMgr(SingletonBase):
         # region py instance events
 
         self._fn_on_py_code_updated = self.on_py_code_updated
+        self._fn_on_py_recalc_out_of_sync = self._on_py_recalc_out_of_sync
         # endregion py instance events
         # region shared events
         self._fn_on_shared_dispatch_data_frame_state_before = (
@@ -452,6 +486,8 @@ class CellMgr(SingletonBase):
                     )
                     # address = cell.getCellAddress()
                     self._remove_cell(calc_cell=dd.calc_cell)
+                elif self.py_inst.background_recalc:
+                    self.py_inst.request_recalc()
                 is_first_cell = getattr(dd, "is_first_cell", False)
                 is_last_cell = getattr(dd, "is_last_cell", False)
                 self._log.debug(f"Is First Cell: {is_first_cell}")
@@ -773,7 +809,9 @@ class CellMgr(SingletonBase):
             idp = self._cell_cache.get_index_cell_props(
                 cell=cell_obj, sheet_idx=cell_obj.sheet_idx
             )
-            self.reset_py_inst()
+            if not self.py_inst.dirty_recalc and not self.py_inst.background_recalc:
+                # add_source() has already executed the new cell and the cells that depend on it.
+                self.reset_py_inst()
             sheet = self._doc.sheets[cell_obj.sheet_idx]
             cell = sheet[cell_obj]
             self._add_listener_to_cell(cell, idp.code_name)
@@ -1005,6 +1043,12 @@ class CellMgr(SingletonBase):
 
         self._log.debug("PyInstance after source update Done")
 
+    def _on_py_recalc_out_of_sync(self, src: Any, event: EventArgs) -> None:
+        # a background recalculation found cells that are not in the PyInstance.
+        with self._log.indent(True):
+            self._log.debug("_on_py_recalc_out_of_sync() Resetting PyInstance")
+            self.reset_py_inst(update_display=True)
+
     def reset_cell_cache(self) -> None:
         """
         Reset the cell cache.
@@ -1151,6 +1195,7 @@ class CellMgr(SingletonBase):
         if self._py_inst is None:
             self._py_inst = PyInstance(self._doc)
             self._py_inst.subscribe_after_update_source(self._fn_on_py_code_updated)
+            self._py_inst.subscribe_recalc_out_of_sync(self._fn_on_py_recalc_out_of_sync)
         return self._py_inst
 
     @property
@@ -1185,8 +1230,17 @@ class CellMgr(SingletonBase):
 
 @check_breakpoint("update_array_cells")
 def update_array_cells(doc: Any):
-    # this method is called by CellMgr._on_pyc_rule_matched() in a separate thread.
-    # this method calls ArrayMgr.update_array_cells(),
+    # this method is called by CellMgr._on_pyc_rule_matched() on the ArrayUpdateWorker thread.
+    # this method calls ArrayMgr.update_array_cells() for the cells whose array shape changed,
     # which is responsible for updating the array formula for the cells if the array size has changed.
+    shapes = ArrayShapes(doc)
+    keys = shapes.pop_pending()
+    if not keys:
+        return
     am = ArrayMgr(doc)
-    am.update_array_cells()
+    try:
+        am.update_array_cells(keys)
+    except Exception:
+        # check the cells again the next time they are calculated.
+        shapes.forget(keys)
+        raise
@@ -23,9 +23,11 @@ from ...const import (
     UNO_DISPATCH_DF_CARD,
     UNO_DISPATCH_DATA_TBL_CARD,
     UNO_DISPATCH_CELL_CTl_UPDATE,
+    UNO_DISPATCH_ARRAY_PAGE,
 )
 from ..state.state_kind import StateKind
 from ..state.ctl_state import CtlState
+from ..array.array_window import ArrayWindow
 from ..lpl_cell import LplCell
 from ...log.log_inst import LogInst
 from ...dialog.webview.lp_py_editor.job_listener import JobListener
@@ -177,6 +179,54 @@ class CtlPopup:
                 },
             ]
 
+    def _get_page_menu(self) -> list:
+        # rows of a DataFrame or Series array that has more rows than the array_max_rows setting.
+        if self._ctl_state.get_state() != StateKind.ARRAY:
+            return []
+        rules = self._key_maker.rule_names
+        if self._lpl_cell.pyc_rule_name not in (rules.cell_data_type_pd_df, rules.cell_data_type_pd_series):
+            return []
+        src = self._lpl_cell.pyc_src
+        if src.dd_data is None or "data" not in src.dd_data:
+            return []
+        window = ArrayWindow(self._cell)
+        total = len(src.dd_data.data)
+        page_count = window.get_page_count(total)
+        if page_count <= 1:
+            return []
+        start, stop = window.get_rows(total)
+        page = min(window.get_page(), page_count - 1)
+        page_url = f"{UNO_DISPATCH_ARRAY_PAGE}?sheet={self._sheet_name}&cell={self._cell.cell_obj}&page="
+        rows = self._res.resolve_string("mnuArrayRows")  # Rows
+        return [
+            {
+                "text": f"{rows} {start + 1}-{stop} / {total}",
+                "command": "",
+                "submenu": [
+                    {
+                        "text": self._res.resolve_string("mnuArrayFirst"),
+                        "command": f"{page_url}0",
+                        "enabled": page > 0,
+                    },
+                    {
+                        "text": self._res.resolve_string("mnuArrayPrev"),
+                        "command": f"{page_url}{page - 1}",
+                        "enabled": page > 0,
+                    },
+                    {
+                        "text": self._res.resolve_string("mnuArrayNext"),
+                        "command": f"{page_url}{page + 1}",
+                        "enabled": page < page_count - 1,
+                    },
+                    {
+                        "text": self._res.resolve_string("mnuArrayLast"),
+                        "command": f"{page_url}{page_count - 1}",
+                        "enabled": page < page_count - 1,
+                    },
+                ],
+            },
+        ]
+
     def _get_refresh_menu(self) -> list:
         refresh_ctl = self._res.resolve_string("mnuRefreshCtl")
         refresh_url = f"{UNO_DISPATCH_CELL_CTl_UPDATE}?sheet={self._sheet_name}&cell={self._cell.cell_obj}"
@@ -226,6 +276,7 @@ class CtlPopup:
             state_menu = self._get_state_menu()
             if state_menu:
                 new_menu.extend(state_menu)
+                new_menu.extend(self._get_page_menu())
         if self._lpl_cell.is_dataframe:
             new_menu.extend(self._get_card_df_menu())
         if self._lpl_cell.is_table_data:
@@ -43,6 +43,11 @@ class KeyMaker(SingletonBase):
         """Gets the key for the control shape."""
         return f"{self.cell_cp_prefix}shape"
 
+    @property
+    def ctl_array_page_key(self) -> str:
+        """Gets the key for the page of rows shown when an array result has more rows than the maximum."""
+        return f"{self.cell_cp_prefix}array_page"
+
     @property
     def cell_addr_key(self) -> str:
         """Gets the address property."""
@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import Any, List, TYPE_CHECKING, Type
+from typing import Any, Dict, List, TYPE_CHECKING, Type
 from ooodev.calc import CalcCell
 from ooodev.utils.helper.dot_dict import DotDict
 
@@ -47,6 +47,8 @@ class PycRules(SingletonBase):
         with self._log.indent(True):
             self._log.debug("%s.__init__() Initializing.", self.__class__.__name__)
         self._rules: List[Type[PycRuleT]] = []
+        # rules that can match each type of result, in the order of the rules.
+        self._type_rules: Dict[type, List[Type[PycRuleT]]] = {}
         self._register_known_rules()
         self._default_rule = RuleNone
         with self._log.indent(True):
@@ -101,6 +103,7 @@ class PycRules(SingletonBase):
                 return
             self._log.debug("add_rule_at() Rule %s registered at index %i.", rule, index)
             self._rules.insert(index, rule)
+            self._type_rules.clear()
 
     def remove_rule(self, rule: Type[PycRuleT]) -> None:
         """
@@ -115,6 +118,7 @@ class PycRules(SingletonBase):
         with self._log.indent(True):
             try:
                 self._rules.remove(rule)
+                self._type_rules.clear()
                 self._log.debug("remove_rule_at() Rule %s removed.", rule)
             except ValueError as e:
                 msg = f"{self.__class__.__name__}.unregister_rule() Unable to unregister rule."
@@ -133,6 +137,7 @@ class PycRules(SingletonBase):
         with self._log.indent(True):
             try:
                 del self._rules[index]
+                self._type_rules.clear()
                 self._log.debug("remove_rule_at() Rule at index %i removed.", index)
             except IndexError as e:
                 msg = f"{self.__class__.__name__}.unregister_rule() Unable to unregister rule."
@@ -141,6 +146,18 @@ class PycRules(SingletonBase):
 
     def _reg_rule(self, rule: Type[PycRuleT]) -> None:
         self._rules.append(rule)
+        self._type_rules.clear()
+
+    def _get_type_rules(self, data_type: type) -> List[Type[PycRuleT]]:
+        rules = self._type_rules.get(data_type, None)
+        if rules is None:
+            rules = []
+            for rule in self._rules:
+                match_types = getattr(rule, "match_types", None)
+                if match_types is None or issubclass(data_type, match_types):
+                    rules.append(rule)
+            self._type_rules[data_type] = rules
+        return rules
 
     def _register_known_rules(self) -> None:
         # re.compile(r"^(\w+)\s*=")
@@ -161,6 +178,7 @@ class PycRules(SingletonBase):
         Get matched rules.
 
         The Data comes from the ``PySourceManager`` instance of ``PySource``.
+        Only the rules whose ``match_types`` include the type of ``data.data`` are created and checked.
 
         Args:
             cell (types.ModuleType): Calc Cell
@@ -174,7 +192,7 @@ class PycRules(SingletonBase):
             if is_db:
                 self._log.debug("get_matched_rule() cell: %s. Data Type %s", cell.cell_obj, type(data).__name__)
             result = None
-            for rule in self._rules:
+            for rule in self._get_type_rules(type(data.get("data", None))):
                 inst = rule(cell, data)
                 if inst.get_is_match():
                     if is_db:
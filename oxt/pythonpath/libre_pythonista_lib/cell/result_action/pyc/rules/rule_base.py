@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import Any, TYPE_CHECKING
+from typing import Any, Tuple, TYPE_CHECKING
 from ooodev.calc import CalcCell
 from ooodev.utils.helper.dot_dict import DotDict
 from ....props.key_maker import KeyMaker
@@ -11,6 +11,14 @@ else:
 
 
 class RuleBase:
+    match_types: Tuple[type, ...] | None = None
+    """
+    Types of ``data.data`` the rule can match.
+
+    ``PycRules`` only creates the rule for results of these types. ``None`` if the rule is checked for every
+    result, such as a rule that matches on the source code.
+    """
+
     def __init__(self, cell: CalcCell, data: DotDict) -> None:
         self._cell = cell
         self._dd_data = data
@@ -6,6 +6,8 @@ from ....errors.general_error import GeneralError
 
 
 class RuleError(RuleBase):
+    match_types = (GeneralError,)
+
     def _get_data_type_name(self) -> str:
         return self.key_maker.rule_names.cell_data_type_error
 
@@ -3,13 +3,17 @@ from typing import Any, cast
 from ooodev.calc import CalcCell
 import pandas as pd
 from .rule_base import RuleBase
+from .....cell.array.array_cache import ArrayCache
+from .....cell.array.array_window import ArrayWindow
 from .....cell.state.ctl_state import CtlState
 from .....cell.state.state_kind import StateKind
 from .....const import UNO_DISPATCH_DF_STATE
-from .....utils.pandas_util import PandasUtil
+from .....utils.pandas_util import LoColumns, PandasUtil
 
 
 class RulePdDf(RuleBase):
+    match_types = (pd.DataFrame,)
+
     def __init__(self, cell: CalcCell, data: Any) -> None:  # noqa: ANN401
         super().__init__(cell, data)
         self.state_key = self.key_maker.ctl_state_key
@@ -40,13 +44,19 @@ class RulePdDf(RuleBase):
     def _set_state(self, state: StateKind) -> None:
         CtlState(self.cell).set_state(state)
 
+    def _get_array_cache(self) -> LoColumns:
+        return ArrayCache(self.cell.calc_doc).get_columns(self.cell.calc_sheet.sheet_index, self.cell.cell_obj)
+
+    def _remove_array_cache(self) -> None:
+        ArrayCache(self.cell.calc_doc).remove(self.cell.calc_sheet.sheet_index, self.cell.cell_obj)
+
     def _pandas_to_array(self) -> Any:  # noqa: ANN401
-        df = cast(pd.DataFrame, self.data.data)
+        df = ArrayWindow(self.cell).apply(cast(pd.DataFrame, self.data.data))
         if PandasUtil.is_describe_output(df):
-            arr = PandasUtil.pandas_to_array(df, convert=False)
+            arr = PandasUtil.pandas_to_array(df, convert=False, cache=self._get_array_cache())
             PandasUtil.convert_array_to_lo(arr)
             return arr
-        return PandasUtil.pandas_to_array(df)
+        return PandasUtil.pandas_to_array(df, cache=self._get_array_cache())
         has_headers = PandasUtil.has_headers(df)
         if not has_headers:
             df.values.tolist()
@@ -83,6 +93,7 @@ class RulePdDf(RuleBase):
         )
         if state == StateKind.ARRAY:
             return self._pandas_to_array()
+        self._remove_array_cache()
         return (("",),)
 
     def __repr__(self) -> str:
@@ -4,13 +4,17 @@ from collections import OrderedDict
 from ooodev.calc import CalcCell
 import pandas as pd
 from .rule_base import RuleBase
+from .....cell.array.array_cache import ArrayCache
+from .....cell.array.array_window import ArrayWindow
 from .....cell.state.ctl_state import CtlState
 from .....cell.state.state_kind import StateKind
 from .....const import UNO_DISPATCH_DF_STATE
-from .....utils.pandas_util import PandasUtil
+from .....utils.pandas_util import LoColumns, PandasUtil
 
 
 class RulePdDfHeaders(RuleBase):
+    match_types = (pd.DataFrame,)
+
     def __init__(self, cell: CalcCell, data: Any) -> None:  # noqa: ANN401
         super().__init__(cell, data)
         self.state_key = self.key_maker.ctl_state_key
@@ -41,13 +45,21 @@ class RulePdDfHeaders(RuleBase):
     def _set_state(self, state: StateKind) -> None:
         CtlState(self.cell).set_state(state)
 
+    def _get_array_cache(self) -> LoColumns:
+        return ArrayCache(self.cell.calc_doc).get_columns(self.cell.calc_sheet.sheet_index, self.cell.cell_obj)
+
+    def _remove_array_cache(self) -> None:
+        ArrayCache(self.cell.calc_doc).remove(self.cell.calc_sheet.sheet_index, self.cell.cell_obj)
+
     def _pandas_to_array(self) -> Any:  # noqa: ANN401
-        df = cast(pd.DataFrame, self.data.data)
+        df = ArrayWindow(self.cell).apply(cast(pd.DataFrame, self.data.data))
         if PandasUtil.is_describe_output(df):
-            arr = PandasUtil.pandas_to_array(df, header_opt=1, index_opt=0, convert=False)
+            arr = PandasUtil.pandas_to_array(
+                df, header_opt=1, index_opt=0, convert=False, cache=self._get_array_cache()
+            )
             PandasUtil.convert_array_to_lo(arr)
             return arr
-        return PandasUtil.pandas_to_array(df, header_opt=1, index_opt=0)
+        return PandasUtil.pandas_to_array(df, header_opt=1, index_opt=0, cache=self._get_array_cache())
         # Convert the column names to a list and initialize the 2D list with it
         headers = [df.columns.tolist()]
         # Append the DataFrame values to the list
@@ -77,6 +89,7 @@ class RulePdDfHeaders(RuleBase):
         )
         if state == StateKind.ARRAY:
             return self._pandas_to_array()
+        self._remove_array_cache()
         return (("",),)
 
     def __repr__(self) -> str:
@@ -1,18 +1,21 @@
 from __future__ import annotations
 from typing import Any, cast
-from collections import OrderedDict
 from ooodev.calc import CalcCell
 import pandas as pd
 from .rule_base import RuleBase
+from .....cell.array.array_cache import ArrayCache
+from .....cell.array.array_window import ArrayWindow
 from .....cell.state.ctl_state import CtlState
 from .....cell.state.state_kind import StateKind
 from .....const import UNO_DISPATCH_DS_STATE
-from .....utils.pandas_util import PandasUtil
+from .....utils.pandas_util import LoColumns, PandasUtil
 
 
 class RulePdDs(RuleBase):
     """Rule for handling pandas DataSeries."""
 
+    match_types = (pd.Series,)
+
     def __init__(self, cell: CalcCell, data: Any) -> None:  # noqa: ANN401
         super().__init__(cell, data)
         self.state_key = self.key_maker.ctl_state_key
@@ -39,21 +42,15 @@ class RulePdDs(RuleBase):
     def _set_state(self, state: StateKind) -> None:
         CtlState(self.cell).set_state(state)
 
-    def _pandas_to_array(self) -> Any:  # noqa: ANN401
-        ds = cast(pd.Series, self.data.data)
-        if PandasUtil.is_date_series(ds):
-            ds_copy = ds.copy()
-            PandasUtil.pandas_series_to_lo_calc(ds_copy)
-            d = ds_copy.to_dict(into=OrderedDict)
-        else:
-            d = ds.to_dict(into=OrderedDict)
+    def _get_array_cache(self) -> LoColumns:
+        return ArrayCache(self.cell.calc_doc).get_columns(self.cell.calc_sheet.sheet_index, self.cell.cell_obj)
 
-        d = PandasUtil.convert_dict_keys_to_lo_date(d)
+    def _remove_array_cache(self) -> None:
+        ArrayCache(self.cell.calc_doc).remove(self.cell.calc_sheet.sheet_index, self.cell.cell_obj)
 
-        list_2d = [[k, v] for k, v in d.items()]
-        if ds.name:
-            list_2d.insert(0, ["", ds.name])
-        return list_2d
+    def _pandas_to_array(self) -> Any:  # noqa: ANN401
+        ds = ArrayWindow(self.cell).apply(cast(pd.Series, self.data.data))
+        return PandasUtil.pandas_series_to_array(ds, cache=self._get_array_cache())
 
     def action(self) -> Any:  # noqa: ANN401
         state = self._get_state()
@@ -67,6 +64,7 @@ class RulePdDs(RuleBase):
         )
         if state == StateKind.ARRAY:
             return self._pandas_to_array()
+        self._remove_array_cache()
         return (("",),)
 
     def __repr__(self) -> str:
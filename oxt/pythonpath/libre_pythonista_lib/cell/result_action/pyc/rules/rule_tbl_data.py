@@ -16,6 +16,8 @@ break_mgr = BreakMgr()
 
 
 class RuleTblData(RuleBase):
+    match_types = (list, tuple)
+
     def _get_data_type_name(self) -> str:
         return self.key_maker.rule_names.cell_data_type_tbl_data
 
@@ -0,0 +1,134 @@
+from __future__ import annotations
+from collections import OrderedDict
+from typing import Tuple
+import ast
+import hashlib
+import threading
+import types
+
+from ..utils import str_util
+
+
+class CompiledCode:
+    """
+    Cleaned and compiled source code of a cell.
+
+    The code is compiled in two parts so the value of a trailing expression statement can be captured, see ``PyModule``.
+    """
+
+    def __init__(self, code: str, filename: str) -> None:
+        """
+        Constructor
+
+        Args:
+            code (str): Cleaned source code.
+            filename (str): File name used in tracebacks.
+        """
+        self.code = code
+        self.filename = filename
+        self._is_compiled = False
+        self._body: types.CodeType | None = None
+        self._expr: types.CodeType | None = None
+
+    def compile(self) -> None:
+        """
+        Compiles the code if it is not already compiled.
+
+        Raises:
+            SyntaxError: If the code is not valid python.
+        """
+        if self._is_compiled:
+            return
+        tree = ast.parse(self.code, filename=self.filename, mode="exec")
+        last = tree.body[-1] if tree.body else None
+        if isinstance(last, ast.Expr):
+            tree.body.pop()
+            self._expr = compile(ast.Expression(body=last.value), self.filename, "eval")
+        if tree.body or self._expr is None:
+            self._body = compile(tree, self.filename, "exec")
+        self._is_compiled = True
+
+    @property
+    def body(self) -> types.CodeType | None:
+        """Gets the code object of all the statements except a trailing expression."""
+        self.compile()
+        return self._body
+
+    @property
+    def expr(self) -> types.CodeType | None:
+        """Gets the code object of the trailing expression if any."""
+        self.compile()
+        return self._expr
+
+    def __repr__(self) -> str:
+        return f"<CompiledCode(filename={self.filename!r})>"
+
+
+class CodeCache:
+    """
+    Least recently used cache of compiled cell code.
+
+    Entries are keyed by a hash of the source code and the file name so replaying a cell whose code has not changed
+    skips cleaning and compiling the code.
+
+    The cache is thread safe.
+    """
+
+    def __init__(self, max_size: int = 512) -> None:
+        """
+        Constructor
+
+        Args:
+            max_size (int, optional): Maximum number of entries. Defaults to ``512``.
+        """
+        self._max_size = max(1, max_size)
+        self._cache: OrderedDict[Tuple[str, str], CompiledCode] = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def get(self, code: str, filename: str = "<string>") -> CompiledCode:
+        """
+        Gets the compiled code for source code.
+
+        Args:
+            code (str): Source code as entered in the cell.
+            filename (str, optional): File name used in tracebacks. Defaults to ``<string>``.
+
+        Returns:
+            CompiledCode: Cleaned and compiled code.
+        """
+        key = (hashlib.sha1(code.encode("utf-8")).hexdigest(), filename)
+        with self._lock:
+            compiled = self._cache.get(key, None)
+            if compiled is not None:
+                self.hits += 1
+                self._cache.move_to_end(key)
+                return compiled
+            self.misses += 1
+        clean_code = str_util.remove_comments(code)
+        clean_code = str_util.clean_string(clean_code)
+        compiled = CompiledCode(clean_code, filename)
+        with self._lock:
+            self._cache[key] = compiled
+            if len(self._cache) > self._max_size:
+                self._cache.popitem(last=False)
+        return compiled
+
+    def clear(self) -> None:
+        """Removes all entries and resets the counters."""
+        with self._lock:
+            self._cache.clear()
+        self.hits = 0
+        self.misses = 0
+
+    @property
+    def max_size(self) -> int:
+        """Gets the maximum number of entries."""
+        return self._max_size
+
+    def __repr__(self) -> str:
+        return f"<CodeCache(size={len(self)}, hits={self.hits}, misses={self.misses})>"
@@ -0,0 +1,5 @@
+from .code_analyzer import CodeAnalyzer as CodeAnalyzer
+from .code_refs import CodeRefs as CodeRefs
+from .dep_graph import DepGraph as DepGraph
+
+__all__ = ["CodeAnalyzer", "CodeRefs", "DepGraph"]
@@ -0,0 +1,357 @@
+from __future__ import annotations
+from typing import Dict, List, Set, Tuple
+import ast
+import symtable
+
+from .code_refs import CodeRefs
+
+# names that give code access to the module namespace in ways that can not be tracked statically.
+_DYNAMIC_NAMES = frozenset(("exec", "eval", "globals", "locals", "vars", "__import__"))
+
+# names from the module init code that give access to the document.
+_DOC_NAMES = frozenset(("Lo", "CalcDoc", "CalcSheet", "XSCRIPTCONTEXT"))
+
+# modules that give access to the document.
+_DOC_MODULES = frozenset(("ooodev", "uno", "unohelper", "ooo", "com", "scriptforge"))
+
+# names and modules that use the shared state of matplotlib.pyplot.
+_PLOT_NAMES = frozenset(("plt", "lp_plot", "matplotlib"))
+_PLOT_MODULES = frozenset(("matplotlib", "seaborn"))
+
+# scopes of comprehensions that run to completion where they are created, python 3.11 and before.
+_COMP_SCOPES = frozenset(("listcomp", "setcomp", "dictcomp", "<listcomp>", "<setcomp>", "<dictcomp>"))
+
+# statements that always bind their targets when they complete.
+_BINDING_STMTS = (
+    ast.Assign,
+    ast.AnnAssign,
+    ast.AugAssign,
+    ast.Import,
+    ast.ImportFrom,
+    ast.FunctionDef,
+    ast.AsyncFunctionDef,
+    ast.ClassDef,
+)
+
+
+def _get_base_name(node: ast.AST) -> str:
+    """Gets the name at the root of an attribute or subscript chain such as ``df`` in ``df.loc["a"].x``."""
+    while isinstance(node, (ast.Attribute, ast.Subscript)):
+        node = node.value
+    if isinstance(node, ast.Name):
+        return node.id
+    return ""
+
+
+def _get_root_name(node: ast.AST) -> str:
+    """Gets the name at the root of a chain that may include calls such as ``df`` in ``df.groupby("a").x``."""
+    while isinstance(node, (ast.Attribute, ast.Subscript, ast.Call)):
+        node = node.func if isinstance(node, ast.Call) else node.value
+    if isinstance(node, ast.Name):
+        return node.id
+    return ""
+
+
+def _get_arg_names(node: ast.AST) -> Set[str]:
+    """Gets the names of the objects that a call argument passes, such as ``a`` and ``b`` in ``[a, b.c]``."""
+    if isinstance(node, ast.Starred):
+        return _get_arg_names(node.value)
+    if isinstance(node, (ast.List, ast.Tuple, ast.Set)):
+        return set().union(*(_get_arg_names(elt) for elt in node.elts))
+    if isinstance(node, ast.Dict):
+        return set().union(*(_get_arg_names(value) for value in (*node.keys, *node.values) if value is not None))
+    name = _get_base_name(node)
+    # other expressions such as x + 1 create a new object.
+    return {name} if name else set()
+
+
+def _get_scope_globals(table: symtable.SymbolTable) -> Set[str]:
+    """Gets the module level names read by a scope and the scopes nested in it."""
+    names = {sym.get_name() for sym in table.get_symbols() if sym.is_global()}
+    for child in table.get_children():
+        names.update(_get_scope_globals(child))
+    return names
+
+
+def _get_lp_func_name(func: ast.expr) -> str | None:
+    """Gets ``lp`` or ``lp_many`` if the function is ``lp()``, ``lp_many()`` or called on ``lp_mod``."""
+    if isinstance(func, ast.Name) and func.id in ("lp", "lp_many"):
+        return func.id
+    if (
+        isinstance(func, ast.Attribute)
+        and func.attr in ("lp", "lp_many")
+        and isinstance(func.value, ast.Name)
+        and func.value.id == "lp_mod"
+    ):
+        return func.attr
+    return None
+
+
+class _RefVisitor(ast.NodeVisitor):
+    """Collects the names loaded and stored by a single module level statement."""
+
+    def __init__(self, refs: CodeRefs) -> None:
+        self.refs = refs
+        self.loads: Set[str] = set()
+        self.stores: Set[str] = set()
+        self.mutates: Set[str] = set()
+        self.imports: Set[str] = set()
+        # depth of function, lambda and class scopes.
+        self._scope_depth = 0
+        # depth of comprehension scopes.
+        self._comp_depth = 0
+
+    @property
+    def is_module_scope(self) -> bool:
+        return self._scope_depth == 0 and self._comp_depth == 0
+
+    def _add_store(self, name: str) -> None:
+        if name and self.is_module_scope:
+            self.stores.add(name)
+
+    def _add_mutate(self, name: str) -> None:
+        # calls in comprehensions run with the cell, calls in functions run when the function is called.
+        if name and self._scope_depth == 0:
+            self.mutates.add(name)
+
+    def _add_import(self, name: str) -> None:
+        if self.is_module_scope:
+            self.imports.add(name)
+        self._add_store(name)
+
+    def _visit_scope(self, node: ast.AST) -> None:
+        self.refs.has_functions = True
+        self._scope_depth += 1
+        self.generic_visit(node)
+        self._scope_depth -= 1
+
+    def _visit_comp(self, node: ast.AST) -> None:
+        self._comp_depth += 1
+        self.generic_visit(node)
+        self._comp_depth -= 1
+
+    # region Visitors
+    def visit_Name(self, node: ast.Name) -> None:  # noqa: N802
+        if isinstance(node.ctx, ast.Load):
+            self.loads.add(node.id)
+            if node.id in _DYNAMIC_NAMES:
+                self.refs.is_dynamic = True
+            elif node.id in _DOC_NAMES:
+                self.refs.uses_doc = True
+            elif node.id in _PLOT_NAMES:
+                self.refs.uses_plot = True
+        else:
+            self._add_store(node.id)
+
+    def visit_FunctionDef(self, node: ast.FunctionDef) -> None:  # noqa: N802
+        self._add_store(node.name)
+        self._visit_scope(node)
+
+    def visit_AsyncFunctionDef(self, node: ast.AsyncFunctionDef) -> None:  # noqa: N802
+        self._add_store(node.name)
+        self._visit_scope(node)
+
+    def visit_ClassDef(self, node: ast.ClassDef) -> None:  # noqa: N802
+        self._add_store(node.name)
+        self._visit_scope(node)
+
+    def visit_Lambda(self, node: ast.Lambda) -> None:  # noqa: N802
+        self._visit_scope(node)
+
+    def visit_ListComp(self, node: ast.ListComp) -> None:  # noqa: N802
+        self._visit_comp(node)
+
+    def visit_SetComp(self, node: ast.SetComp) -> None:  # noqa: N802
+        self._visit_comp(node)
+
+    def visit_DictComp(self, node: ast.DictComp) -> None:  # noqa: N802
+        self._visit_comp(node)
+
+    def visit_GeneratorExp(self, node: ast.GeneratorExp) -> None:  # noqa: N802
+        # the generator runs its code after the cell has run.
+        self.refs.has_functions = True
+        self._visit_comp(node)
+
+    def visit_NamedExpr(self, node: ast.NamedExpr) -> None:  # noqa: N802
+        # assignment expressions in a comprehension bind in the enclosing scope.
+        if self._scope_depth == 0 and isinstance(node.target, ast.Name):
+            self.stores.add(node.target.id)
+        self.visit(node.value)
+
+    def visit_Global(self, node: ast.Global) -> None:  # noqa: N802
+        if self._scope_depth > 0:
+            # a function that rebinds module names can be called from any cell.
+            self.refs.is_dynamic = True
+
+    def visit_Import(self, node: ast.Import) -> None:  # noqa: N802
+        for alias in node.names:
+            if alias.name.split(".")[0] in _DOC_MODULES:
+                self.refs.uses_doc = True
+            elif alias.name.split(".")[0] in _PLOT_MODULES:
+                self.refs.uses_plot = True
+            self._add_import(alias.asname or alias.name.split(".")[0])
+
+    def visit_ImportFrom(self, node: ast.ImportFrom) -> None:  # noqa: N802
+        if node.module and node.module.split(".")[0] in _DOC_MODULES:
+            self.refs.uses_doc = True
+        elif node.module and node.module.split(".")[0] in _PLOT_MODULES:
+            self.refs.uses_plot = True
+        for alias in node.names:
+            if alias.name == "*":
+                self.refs.is_dynamic = True
+                continue
+            self._add_import(alias.asname or alias.name)
+
+    def visit_ExceptHandler(self, node: ast.ExceptHandler) -> None:  # noqa: N802
+        if node.name:
+            self._add_store(node.name)
+        self.generic_visit(node)
+
+    def visit_MatchAs(self, node: ast.AST) -> None:  # noqa: N802
+        # python 3.10+
+        self._add_store(getattr(node, "name", None) or "")
+        self.generic_visit(node)
+
+    def visit_MatchStar(self, node: ast.AST) -> None:  # noqa: N802
+        # python 3.10+
+        self._add_store(getattr(node, "name", None) or "")
+        self.generic_visit(node)
+
+    def visit_MatchMapping(self, node: ast.AST) -> None:  # noqa: N802
+        # python 3.10+
+        self._add_store(getattr(node, "rest", None) or "")
+        self.generic_visit(node)
+
+    def visit_Attribute(self, node: ast.Attribute) -> None:  # noqa: N802
+        if node.attr == "plot":
+            # df.plot() and df.plot.bar() draw with pyplot.
+            self.refs.uses_plot = True
+        if not isinstance(node.ctx, ast.Load):
+            # obj.attr = value mutates obj.
+            self._add_store(_get_base_name(node))
+        self.generic_visit(node)
+
+    def visit_Subscript(self, node: ast.Subscript) -> None:  # noqa: N802
+        if not isinstance(node.ctx, ast.Load):
+            # obj[key] = value mutates obj.
+            self._add_store(_get_base_name(node))
+        self.generic_visit(node)
+
+    def visit_AugAssign(self, node: ast.AugAssign) -> None:  # noqa: N802
+        # x += 1 reads x before writing it.
+        if isinstance(node.target, ast.Name):
+            self.loads.add(node.target.id)
+        self.generic_visit(node)
+
+    def _add_lp_address(self, addr: ast.expr | None) -> None:
+        if isinstance(addr, ast.Constant) and isinstance(addr.value, str):
+            self.refs.lp_addresses.add(addr.value)
+        else:
+            # the address is only known at runtime.
+            self.refs.is_dynamic = True
+
+    def visit_Call(self, node: ast.Call) -> None:  # noqa: N802
+        func_name = _get_lp_func_name(node.func)
+        if func_name is not None:
+            arg_name = "addr" if func_name == "lp" else "addrs"
+            arg = node.args[0] if node.args else None
+            if arg is None:
+                for kw in node.keywords:
+                    if kw.arg == arg_name:
+                        arg = kw.value
+                        break
+            if func_name == "lp":
+                self._add_lp_address(arg)
+            elif isinstance(arg, ast.Dict) and None not in arg.keys:
+                for value in arg.values:
+                    self._add_lp_address(value)
+            else:
+                self.refs.is_dynamic = True
+        else:
+            # a method call such as lst.append(1) or x = lst.pop() may mutate the object it is called on
+            # and any call such as mutate(lst) may mutate the objects it is passed.
+            if isinstance(node.func, ast.Attribute):
+                self._add_mutate(_get_root_name(node.func.value))
+            for arg in node.args:
+                for name in _get_arg_names(arg):
+                    self._add_mutate(name)
+            for kw in node.keywords:
+                for name in _get_arg_names(kw.value):
+                    self._add_mutate(name)
+        self.generic_visit(node)
+
+    # endregion Visitors
+
+
+class CodeAnalyzer:
+    """
+    Statically analyzes the source code of a cell.
+
+    The analysis is conservative. When in doubt a name is reported as both read and written,
+    and code that can not be analyzed is flagged as dynamic.
+
+    Functions are followed by name only, ``DepGraph`` adds the names read by the functions that a cell
+    may call from the ``func_reads`` of earlier cells.
+    """
+
+    def analyze(self, code: str) -> CodeRefs:
+        """
+        Analyzes source code.
+
+        Args:
+            code (str): Source code of a cell.
+
+        Returns:
+            CodeRefs: The names read and written by the code and any ``lp()`` addresses it references.
+
+        Note:
+            Code that does not compile returns an empty result because it can neither read nor write any names.
+        """
+        refs = CodeRefs()
+        if not code:
+            return refs
+        try:
+            tree = ast.parse(code)
+        except SyntaxError:
+            return refs
+
+        bound: Set[str] = set()
+        spans: List[Tuple[int, int, Set[str]]] = []
+        for stmt in tree.body:
+            visitor = _RefVisitor(refs)
+            visitor.visit(stmt)
+            refs.reads.update(visitor.loads - bound)
+            refs.writes.update(visitor.stores)
+            refs.mutates.update(visitor.mutates)
+            refs.imports.update(visitor.imports)
+            if isinstance(stmt, _BINDING_STMTS):
+                bound.update(visitor.stores)
+            spans.append((stmt.lineno, stmt.end_lineno or stmt.lineno, visitor.stores | visitor.mutates))
+        if refs.has_functions:
+            refs.func_reads = self._get_func_reads(code, spans)
+        return refs
+
+    def _get_func_reads(self, code: str, spans: List[Tuple[int, int, Set[str]]]) -> Dict[str, Set[str]]:
+        """
+        Gets the module level names read by the scopes that each statement creates,
+        by the names the statement binds or mutates.
+        """
+        try:
+            table = symtable.symtable(code, "<cell>", "exec")
+        except SyntaxError:
+            return {}
+        result: Dict[str, Set[str]] = {}
+        for child in table.get_children():
+            if child.get_name() in _COMP_SCOPES:
+                continue
+            names = _get_scope_globals(child)
+            line = child.get_lineno()
+            for start, end, targets in spans:
+                # a scope without a target, such as in print(lambda: x), can not be called by other cells.
+                if start <= line <= end:
+                    for target in targets:
+                        result.setdefault(target, set()).update(names)
+        return result
+
+    def __repr__(self) -> str:
+        return f"<CodeAnalyzer()>"
@@ -0,0 +1,59 @@
+from __future__ import annotations
+from typing import Dict, Set
+
+
+class CodeRefs:
+    """
+    Names and references gathered from the source code of a single cell.
+
+    Instances are created by ``CodeAnalyzer.analyze()``.
+    """
+
+    def __init__(self) -> None:
+        self.reads: Set[str] = set()
+        """Module level names that are read by the cell and not bound by the cell before they are read."""
+        self.writes: Set[str] = set()
+        """Module level names that may be bound, deleted or mutated by the cell."""
+        self.mutates: Set[str] = set()
+        """
+        Module level names that may be mutated by the calls of the cell, such as ``lst`` in ``x = lst.pop()``
+        or ``mutate(lst)``. Calls may mutate the objects they are called on and the objects they are passed.
+        """
+        self.imports: Set[str] = set()
+        """Module level names that are bound by import statements of the cell."""
+        self.func_reads: Dict[str, Set[str]] = {}
+        """
+        Module level names read by the bodies of the functions, lambdas, classes and generator expressions
+        created by the cell, by the module level name that may refer to them after the cell has run.
+        A cell that calls one of them reads the names when it is called.
+        """
+        self.has_functions = False
+        """
+        ``True`` if the cell creates functions, lambdas, classes or generator expressions.
+        Their code keeps using the module namespace the cell was executed in after the cell has run.
+        """
+        self.lp_addresses: Set[str] = set()
+        """Literal addresses passed to the ``lp()`` function."""
+        self.is_dynamic = False
+        """
+        ``True`` if the cell uses features that can not be analyzed statically
+        such as ``exec()``, ``globals()`` or star imports.
+        """
+        self.uses_doc = False
+        """
+        ``True`` if the cell may read the document directly, without ``lp()``,
+        such as by using ``Lo``, ``CalcDoc`` or importing ``ooodev`` or ``uno``.
+        """
+        self.uses_plot = False
+        """
+        ``True`` if the cell may draw a plot such as by using ``plt`` or ``df.plot()``.
+        The state of ``matplotlib.pyplot`` is shared by all cells.
+        """
+
+    def __repr__(self) -> str:
+        return (
+            f"<CodeRefs(reads={sorted(self.reads)}, writes={sorted(self.writes)}, "
+            f"mutates={sorted(self.mutates)}, lp_addresses={sorted(self.lp_addresses)}, "
+            f"is_dynamic={self.is_dynamic}, uses_doc={self.uses_doc}, uses_plot={self.uses_plot}, "
+            f"has_functions={self.has_functions})>"
+        )
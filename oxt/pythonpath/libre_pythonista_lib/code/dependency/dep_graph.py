@@ -0,0 +1,308 @@
+from __future__ import annotations
+from typing import Callable, Dict, Iterable, Iterator, List, Mapping, Set, Tuple
+
+from .code_analyzer import CodeAnalyzer
+from .code_refs import CodeRefs
+
+CellKey = Tuple[int, int, int]
+"""Cell key in the format of ``(sheet_idx, row, col)``."""
+
+LpResolver = Callable[[str, int], "Set[CellKey] | None"]
+"""
+Callable that takes an ``lp()`` address and the sheet index of the calling cell and returns
+the keys of the code cells the address refers to or ``None`` if the address can not be resolved.
+"""
+
+
+class _CallScope:
+    """
+    Adds to the analysis of cells, in execution order, the names used by the functions that each cell may call.
+
+    A cell that reads the name of a function created by an earlier cell, or of an object that may refer to one,
+    may call it, so it reads every module level name the function reads. The function may mutate any object it
+    can reach so these names, and the names the cell passes to calls, may be mutated by the cell.
+    Names bound by imports are modules, calls on them are not taken as mutating them.
+    """
+
+    def __init__(self) -> None:
+        # module level names read by the functions that each name may refer to.
+        self._carried: Dict[str, Set[str]] = {}
+        self._modules: Set[str] = set()
+
+    def resolve(self, refs: CodeRefs, update: bool = True) -> CodeRefs:
+        """
+        Gets the analysis of a cell with the names of the functions it may call.
+
+        Args:
+            refs (CodeRefs): Analysis of the code of the cell.
+            update (bool, optional): Add the functions of the cell for the following cells. Defaults to ``True``.
+
+        Returns:
+            CodeRefs: New analysis, ``mutates`` is included in ``writes``.
+        """
+        called = self._get_carried(refs.reads | refs.mutates)
+        modules = (self._modules - refs.writes) | refs.imports
+        result = CodeRefs()
+        result.reads = refs.reads | called
+        result.writes = refs.writes | ((refs.mutates | called) - modules)
+        result.mutates = set(refs.mutates)
+        result.imports = set(refs.imports)
+        result.func_reads = refs.func_reads
+        result.lp_addresses = refs.lp_addresses
+        result.is_dynamic = refs.is_dynamic
+        result.uses_doc = refs.uses_doc
+        result.uses_plot = refs.uses_plot
+        result.has_functions = refs.has_functions
+        if update:
+            self._modules = modules
+            for name, names in refs.func_reads.items():
+                self._carried.setdefault(name, set()).update(names)
+            if called:
+                # the names the cell changes may now refer to the functions it used or to objects they created.
+                for name in refs.writes | refs.mutates:
+                    self._carried.setdefault(name, set()).update(called)
+        return result
+
+    def _get_carried(self, names: Set[str]) -> Set[str]:
+        # functions look up the names they read when they are called, follow them to the functions they call.
+        result: Set[str] = set()
+        pending = [name for name in names if name in self._carried]
+        seen = set(pending)
+        while pending:
+            for name in self._carried[pending.pop()]:
+                result.add(name)
+                if name in self._carried and name not in seen:
+                    seen.add(name)
+                    pending.append(name)
+        return result
+
+
+class DepGraph:
+    """
+    Dependency graph of code cells.
+
+    Cells are executed in sheet, row, column order so a cell can only depend on cells that come before it.
+    An edge exists from cell ``a`` to a later cell ``b`` when ``b`` reads or rebinds a name that ``a`` writes,
+    or when ``b`` calls ``lp()`` with an address that refers to ``a``.
+    A cell that may call a function created by an earlier cell also reads and may mutate the names the function reads.
+
+    The analysis of each cell is cached and only recomputed when the source code of the cell changes.
+    """
+
+    def __init__(self) -> None:
+        self._analyzer = CodeAnalyzer()
+        self._cache: Dict[CellKey, Tuple[str, CodeRefs]] = {}
+
+    def __len__(self) -> int:
+        return len(self._cache)
+
+    def __contains__(self, key: CellKey) -> bool:
+        return key in self._cache
+
+    def get_refs(self, key: CellKey, code: str) -> CodeRefs:
+        """
+        Gets the analysis for the code of a cell.
+
+        Args:
+            key (CellKey): Cell key.
+            code (str): Source code of the cell.
+
+        Returns:
+            CodeRefs: Names and references of the code.
+        """
+        cached = self._cache.get(key, None)
+        if cached is not None and cached[0] == code:
+            return cached[1]
+        refs = self._analyzer.analyze(code)
+        self._cache[key] = (code, refs)
+        return refs
+
+    def iter_refs(self, cells: Iterable[Tuple[CellKey, str]]) -> Iterator[Tuple[CellKey, CodeRefs]]:
+        """
+        Gets the analysis of cells including the names used by the functions that each cell may call.
+
+        Args:
+            cells (Iterable[Tuple[CellKey, str]]): Key and source code of the cells, in execution order
+                starting with the first cell.
+
+        Yields:
+            Tuple[CellKey, CodeRefs]: Key and analysis of each cell. ``mutates`` is included in ``writes``.
+        """
+        scope = _CallScope()
+        for key, code in cells:
+            yield key, scope.resolve(self.get_refs(key, code))
+
+    def remove(self, key: CellKey) -> None:
+        """
+        Removes the cached analysis for a cell.
+
+        Args:
+            key (CellKey): Cell key.
+        """
+        self._cache.pop(key, None)
+
+    def clear(self) -> None:
+        """Removes all cached analysis."""
+        self._cache.clear()
+
+    def get_dependents(
+        self,
+        cells: Iterable[Tuple[CellKey, str]],
+        seeds: Iterable[CellKey],
+        lp_resolver: LpResolver,
+        old_code: Mapping[CellKey, str] | None = None,
+    ) -> Set[CellKey] | None:
+        """
+        Gets the cells that must be executed again after cells have changed.
+
+        Args:
+            cells (Iterable[Tuple[CellKey, str]]): Key and source code of every cell, in execution order.
+                Cells before the first changed cell are only used to find the functions they create.
+            seeds (Iterable[CellKey]): Keys of the cells that have changed.
+            lp_resolver (LpResolver): Resolves ``lp()`` addresses to cell keys.
+            old_code (Mapping[CellKey, str], optional): Source code that changed cells had when they last ran,
+                the names it wrote have changed as well. Defaults to ``None``.
+
+        Returns:
+            Set[CellKey] | None: Keys of the changed cells and their transitive dependents,
+            or ``None`` if a changed or following cell can not be analyzed and all following cells must be executed.
+        """
+        dirty_names: Set[str] = set()
+        dirty_keys = set(seeds)
+        scope = _CallScope()
+        started = False
+        for cell_key, code in cells:
+            if cell_key in dirty_keys:
+                started = True
+                if old_code is not None and cell_key in old_code:
+                    old_refs = scope.resolve(self._analyzer.analyze(old_code[cell_key]), update=False)
+                    if old_refs.is_dynamic:
+                        return None
+                    dirty_names.update(old_refs.writes)
+                refs = scope.resolve(self.get_refs(cell_key, code))
+                if refs.is_dynamic:
+                    return None
+                dirty_names.update(refs.writes)
+                continue
+            refs = scope.resolve(self.get_refs(cell_key, code))
+            if not started:
+                continue
+            if refs.is_dynamic:
+                return None
+            if self._is_dependent(cell_key, refs, dirty_names, dirty_keys, lp_resolver):
+                dirty_keys.add(cell_key)
+                dirty_names.update(refs.writes)
+        return dirty_keys
+
+    def get_levels(
+        self,
+        cells: Iterable[Tuple[CellKey, str]],
+        lp_resolver: LpResolver,
+        preceding: Iterable[Tuple[CellKey, str]] = (),
+    ) -> List[List[CellKey]]:
+        """
+        Groups cells into topological levels.
+
+        A cell is placed in the level after the last level of any earlier cell it has an edge with.
+        Cells of the same level do not share any names and do not read each other with ``lp()``
+        so they can be executed in any order, or at the same time, as long as the names they change
+        are applied to the module in execution order.
+
+        Cells that are dynamic, read the document directly or draw a plot are placed in a level of their own
+        and every following cell is placed after them. So are cells that create functions, the functions keep
+        the namespace they were created in and must be created in the module itself.
+
+        Args:
+            cells (Iterable[Tuple[CellKey, str]]): Key and source code of the cells, in execution order.
+            lp_resolver (LpResolver): Resolves ``lp()`` addresses to cell keys.
+            preceding (Iterable[Tuple[CellKey, str]], optional): Key and source code of the cells before ``cells``,
+                in execution order. They are only used to find the functions they create. Defaults to ``()``.
+
+        Returns:
+            List[List[CellKey]]: Cell keys of each level, in execution order.
+        """
+        levels: List[List[CellKey]] = []
+        cell_levels: Dict[CellKey, int] = {}
+        # the last level that writes or reads each name.
+        write_levels: Dict[str, int] = {}
+        read_levels: Dict[str, int] = {}
+        # first level that following cells can be placed in.
+        floor = 0
+        scope = _CallScope()
+        for key, code in preceding:
+            scope.resolve(self.get_refs(key, code))
+        for key, code in cells:
+            refs = scope.resolve(self.get_refs(key, code))
+            if refs.is_dynamic or refs.uses_doc or refs.uses_plot or refs.has_functions:
+                level = len(levels)
+                floor = level + 1
+            else:
+                level = self._get_level(
+                    key, refs, floor, len(levels), cell_levels, write_levels, read_levels, lp_resolver
+                )
+            if level == len(levels):
+                levels.append([])
+            levels[level].append(key)
+            cell_levels[key] = level
+            for name in refs.writes:
+                if write_levels.get(name, -1) < level:
+                    write_levels[name] = level
+            for name in refs.reads:
+                if read_levels.get(name, -1) < level:
+                    read_levels[name] = level
+        return levels
+
+    def _get_level(
+        self,
+        key: CellKey,
+        refs: CodeRefs,
+        floor: int,
+        count: int,
+        cell_levels: Dict[CellKey, int],
+        write_levels: Dict[str, int],
+        read_levels: Dict[str, int],
+        lp_resolver: LpResolver,
+    ) -> int:
+        level = floor
+        for name in refs.reads:
+            level = max(level, write_levels.get(name, -1) + 1)
+        for name in refs.writes:
+            # a name that is mutated or rebound must not change under a cell that uses it.
+            level = max(level, write_levels.get(name, -1) + 1, read_levels.get(name, -1) + 1)
+        for addr in refs.lp_addresses:
+            cells = lp_resolver(addr, key[0])
+            if cells is None:
+                # unknown address, assume it refers to any earlier cell.
+                return count
+            for cell_key in cells:
+                level = max(level, cell_levels.get(cell_key, -1) + 1)
+        return level
+
+    def _is_dependent(
+        self,
+        key: CellKey,
+        refs: CodeRefs,
+        dirty_names: Set[str],
+        dirty_keys: Set[CellKey],
+        lp_resolver: LpResolver,
+    ) -> bool:
+        if not refs.reads.isdisjoint(dirty_names):
+            return True
+        # A cell that may rebind a dirty name must run again, the value it left behind may be stale.
+        if not refs.writes.isdisjoint(dirty_names):
+            return True
+        for addr in refs.lp_addresses:
+            cells = lp_resolver(addr, key[0])
+            if cells is None:
+                # unknown address, assume it refers to a changed cell.
+                return True
+            if not cells.isdisjoint(dirty_keys):
+                return True
+        return False
+
+    @property
+    def analyzer(self) -> CodeAnalyzer:
+        return self._analyzer
+
+    def __repr__(self) -> str:
+        return f"<DepGraph(cells={len(self)})>"
@@ -0,0 +1,400 @@
+"""
+Entry point of the out of process kernel.
+
+The kernel runs the python module of a document in a separate process.
+It is started by ``KernelProcessMgr`` with the same ``sys.path`` as LibreOffice,
+but it does not have access to the office. ``lp()``, ``lp_many()``, ``lp_log`` and ``plt.show()`` calls
+are sent back to LibreOffice to be resolved.
+
+The result of a cell is found with the same ``CodeRules`` as ``PyModule``.
+The kernel has no office connection. Modules that only need ``uno`` to be importable, such as ``DotDict`` of ``ooodev``,
+can be used. Modules that use the office or read its configuration, such as ``LogInst``, can not.
+"""
+
+from __future__ import annotations
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator
+import argparse
+import io
+import json
+import logging
+import os
+import pickle
+import socket
+import struct
+import sys
+import traceback
+import types
+
+from ooodev.utils.helper.dot_dict import DotDict
+
+from libre_pythonista_lib.code.code_cache import CodeCache
+
+OFFICE_ONLY_NAMES = frozenset(
+    (
+        "Lo",
+        "CalcDoc",
+        "CalcSheet",
+        "CellObj",
+        "RangeObj",
+        "OxtLogger",
+        "LogInst",
+        "LibrePythonistaLog",
+        "XSCRIPTCONTEXT",
+    )
+)
+"""Names of ``get_module_init_code()`` that need the office and are not in the kernel module."""
+
+LP_LOG_LEVELS = frozenset(("debug", "info", "warning", "error", "exception", "critical"))
+"""Levels of the ``lp_log`` messages sent by the kernel."""
+
+
+class KernelLog(logging.Logger):
+    """
+    Logger of the kernel. Used in place of ``LogInst``, which reads its settings from the office.
+
+    Messages are written to stdout which is read by LibreOffice.
+    """
+
+    _instance: KernelLog | None = None
+
+    def __new__(cls) -> KernelLog:
+        if cls._instance is None:
+            cls._instance = super().__new__(cls)
+            cls._instance._is_init = False
+        return cls._instance
+
+    def __init__(self) -> None:
+        if getattr(self, "_is_init", False):
+            return
+        super().__init__(name="LpKernel", level=logging.WARNING)
+        handler = logging.StreamHandler(sys.stdout)
+        handler.setFormatter(logging.Formatter("%(asctime)s %(levelname)s: %(message)s"))
+        self.addHandler(handler)
+        self.propagate = False
+        self._is_init = True
+
+    @contextmanager
+    def indent(self, use_indent: bool = True) -> Iterator[None]:
+        yield
+
+    @property
+    def is_debug(self) -> bool:
+        return self.isEnabledFor(logging.DEBUG)
+
+
+def _get_code_rules() -> Any:  # noqa: ANN401
+    """Gets the ``CodeRules`` of ``PyModule``, with ``KernelLog`` as the logger of the rules."""
+    name = "libre_pythonista_lib.log.log_inst"
+    if name not in sys.modules:
+        log_mod = types.ModuleType(name)
+        log_mod.LogInst = KernelLog  # type: ignore
+        sys.modules[name] = log_mod
+    from libre_pythonista_lib.code.rules.code_rules import CodeRules
+
+    return CodeRules()
+
+
+def get_kernel_init_code() -> str:
+    """Gets the code that initializes the kernel module. This is the office free part of ``get_module_init_code()``."""
+    lines = [
+        "from __future__ import annotations",
+        "from typing import Any, cast, TYPE_CHECKING",
+    ]
+    try:
+        import matplotlib  # noqa: F401
+
+        lines.append("import matplotlib")
+        lines.append("matplotlib.use('svg')")
+        lines.append("from matplotlib import pyplot as plt")
+    except ImportError:
+        pass
+    try:
+        import pandas  # noqa: F401
+
+        lines.append("import pandas as pd")
+        lines.append("pd.options.plotting.backend = 'matplotlib'")
+    except ImportError:
+        pass
+    try:
+        import numpy  # noqa: F401
+
+        lines.append("import numpy as np")
+    except ImportError:
+        pass
+    lines.extend(
+        [
+            "PY_ARGS = None",
+            "CURRENT_CELL_OBJ = None",
+            "CURRENT_CELL_ID = ''",
+            "DUMMY_LAST_VALUE = None",
+        ]
+    )
+    return "\n".join(lines)
+
+
+class _KernelLpLog:
+    """``lp_log`` of the kernel. Messages are sent to LibreOffice and written to the log of the document."""
+
+    def __init__(self, kernel: Kernel) -> None:
+        self._kernel = kernel
+
+    def _send(self, level: str, msg: Any, args: Any, kwargs: Dict[str, Any]) -> None:  # noqa: ANN401
+        text = str(msg) % args if args else str(msg)
+        if level == "exception" or kwargs.get("exc_info", False):
+            text = f"{text}\n{traceback.format_exc()}"
+        self._kernel.send({"cmd": "lp_log", "level": level, "msg": text})
+
+    def debug(self, msg: Any, *args: Any, **kwargs: Any) -> None:  # noqa: ANN401
+        self._send("debug", msg, args, kwargs)
+
+    def info(self, msg: Any, *args: Any, **kwargs: Any) -> None:  # noqa: ANN401
+        self._send("info", msg, args, kwargs)
+
+    def warning(self, msg: Any, *args: Any, **kwargs: Any) -> None:  # noqa: ANN401
+        self._send("warning", msg, args, kwargs)
+
+    def error(self, msg: Any, *args: Any, **kwargs: Any) -> None:  # noqa: ANN401
+        self._send("error", msg, args, kwargs)
+
+    def exception(self, msg: Any, *args: Any, **kwargs: Any) -> None:  # noqa: ANN401
+        self._send("exception", msg, args, kwargs)
+
+    def critical(self, msg: Any, *args: Any, **kwargs: Any) -> None:  # noqa: ANN401
+        self._send("critical", msg, args, kwargs)
+
+
+class Kernel:
+    """Executes cell code sent from LibreOffice."""
+
+    def __init__(self, sock: socket.socket) -> None:
+        self._sock = sock
+        self._code_cache = CodeCache()
+        self._code_rules = _get_code_rules()
+        self.mod = types.ModuleType("PyMod")
+        exec(get_kernel_init_code(), self.mod.__dict__)
+        # the code rules read the result of the last call from lp_mod and lp_plot, as in the local module.
+        self._lp_mod = types.ModuleType("lp_mod")
+        self._lp_mod.lp = self.lp  # type: ignore
+        self._lp_mod.lp_many = self.lp_many  # type: ignore
+        self._lp_mod.LAST_LP_RESULT = DotDict(data=None)  # type: ignore
+        self.mod.__dict__["lp_mod"] = self._lp_mod
+        self.mod.__dict__["lp"] = self.lp
+        self.mod.__dict__["lp_many"] = self.lp_many
+        self.mod.__dict__["lp_log"] = _KernelLpLog(self)
+        plt = self.mod.__dict__.get("plt", None)
+        if plt is not None:
+            self._lp_plot = types.ModuleType("lp_plot")
+            self._lp_plot.LAST_LP_RESULT = DotDict(data=None)  # type: ignore
+            self.mod.__dict__["lp_plot"] = self._lp_plot
+            # same as lp_plot, the figure is saved to a file instead of shown.
+            plt.show = self._plt_show
+        self._init_dict = self.mod.__dict__.copy()
+        # data of the last lp() call, a result that is this data is not sent back.
+        self._last_lp_data: Any = None
+
+    # region Messages
+    def _receive_all(self, length: int) -> bytes:
+        data = b""
+        while len(data) < length:
+            more = self._sock.recv(length - len(data))
+            if not more:
+                raise ConnectionResetError("Connection closed prematurely")
+            data += more
+        return data
+
+    def receive(self) -> Dict[str, Any]:
+        msg_len = struct.unpack("!I", self._receive_all(4))[0]
+        data = self._receive_all(msg_len)
+        if data[:1] == b"{":
+            return json.loads(data.decode(encoding="utf-8"))
+        return pickle.loads(data)
+
+    def send(self, message: Dict[str, Any]) -> None:
+        self._send_bytes(pickle.dumps(message, protocol=pickle.HIGHEST_PROTOCOL))
+
+    def _send_bytes(self, message_bytes: bytes) -> None:
+        self._sock.sendall(struct.pack("!I", len(message_bytes)) + message_bytes)
+
+    def _request(self, message: Dict[str, Any]) -> Dict[str, Any]:
+        """Sends a request to LibreOffice and handles messages until the ``lp_result`` reply arrives."""
+        self.send(message)
+        while True:
+            msg = self.receive()
+            if msg.get("cmd") == "lp_result":
+                return msg
+            if not self.handle(msg):
+                raise SystemExit(0)
+
+    # endregion Messages
+
+    def _lp_request(self, message: Dict[str, Any]) -> Any:  # noqa: ANN401
+        msg = self._request(message)
+        if msg.get("error_msg", ""):
+            # LibreOffice could not resolve the call, the error is raised in the cell.
+            raise RuntimeError(msg["error_msg"])
+        data = msg.get("data", None)
+        if msg.get("iter_id", None) is not None:
+            data = self._iter_lp(msg["iter_id"])
+        for key, iter_id in msg.get("iter_ids", {}).items():
+            data[key] = self._iter_lp(iter_id)
+        self._lp_mod.LAST_LP_RESULT = DotDict(data=data, **msg.get("info", {}))  # type: ignore
+        self._last_lp_data = data
+        return data
+
+    def _iter_lp(self, iter_id: int) -> Iterator[Any]:
+        """
+        Gets the DataFrames of ``lp(..., chunksize=N)``.
+
+        LibreOffice keeps the generator of the chunks, each chunk is requested when it is needed.
+        """
+        done = False
+        try:
+            while True:
+                msg = self._request({"cmd": "lp_next", "iter_id": iter_id})
+                if msg.get("error_msg", ""):
+                    done = True
+                    raise RuntimeError(msg["error_msg"])
+                if msg.get("done", False):
+                    done = True
+                    return
+                yield msg.get("data", None)
+        finally:
+            if not done:
+                # the chunks are no longer needed.
+                try:
+                    self.send({"cmd": "lp_close", "iter_id": iter_id})
+                except OSError:
+                    pass
+
+    def lp(self, addr: str, **kwargs: Any) -> Any:  # noqa: ANN401
+        """Reads a cell or range. The call is resolved by LibreOffice."""
+        return self._lp_request({"cmd": "lp", "addr": addr, "kwargs": kwargs})
+
+    def lp_many(self, addrs: Dict[str, str], **kwargs: Any) -> Dict[str, Any]:  # noqa: ANN401
+        """Reads several cells and ranges. The call is resolved by LibreOffice."""
+        return self._lp_request({"cmd": "lp_many", "addrs": dict(addrs), "kwargs": kwargs})
+
+    def _plt_show(self, *args: Any, **kwargs: Any) -> None:  # noqa: ANN401
+        """Replaces ``plt.show()``. The figure is sent to LibreOffice which saves it as ``lp_plot`` does."""
+        plt = self.mod.__dict__["plt"]
+        buf = io.BytesIO()
+        plt.savefig(buf, format="svg")
+        try:
+            plt.close()
+        except Exception:
+            traceback.print_exc()
+        msg = self._request({"cmd": "lp_plot", "svg": buf.getvalue()})
+        self._lp_plot.LAST_LP_RESULT = DotDict(**msg.get("data", {"data": None}))  # type: ignore
+
+    def _get_error_result(self, e: Exception, prefix: str = "") -> Dict[str, Any]:
+        error_msg = f"{type(e).__name__}: {e}"
+        return {
+            "cmd": "result",
+            "data": None,
+            "error": True,
+            "error_msg": f"{prefix}{error_msg}",
+            "traceback": traceback.format_exc(),
+        }
+
+    def execute(self, code: str, filename: str, cell_id: str) -> Dict[str, Any]:
+        """
+        Executes code in the module and gets the result with the same code rules as ``PyModule``.
+
+        Returns:
+            Dict[str, Any]: Result message. When the result is the data of the last ``lp()`` call,
+            ``is_lp_result`` is ``True`` and the data is not included, LibreOffice already has it.
+        """
+        self.mod.__dict__["CURRENT_CELL_ID"] = cell_id
+        try:
+            compiled = self._code_cache.get(code, filename)
+            expr_result = None
+            if compiled.code:
+                if compiled.body is not None:
+                    exec(compiled.body, self.mod.__dict__)
+                if compiled.expr is not None:
+                    expr_result = DotDict(data=eval(compiled.expr, self.mod.__dict__))
+            rule = self._code_rules.get_matched_rule(self.mod, compiled.code, expr_result)
+            result = rule.get_value()
+            rule.reset()
+        except Exception as e:
+            return self._get_error_result(e)
+        data = result.get("data", None)
+        if data is not None and data is self._last_lp_data:
+            return {"cmd": "result", "data": None, "error": False, "is_lp_result": True}
+        return {
+            "cmd": "result",
+            "data": data,
+            "info": {key: value for key, value in result.items() if key != "data"},
+            "error": False,
+            "is_lp_result": False,
+        }
+
+    def handle(self, msg: Dict[str, Any]) -> bool:
+        """
+        Handles a message.
+
+        Returns:
+            bool: ``False`` if the kernel must exit; Otherwise, ``True``.
+        """
+        cmd = msg.get("cmd", "")
+        if cmd == "exec":
+            result = self.execute(msg.get("code", ""), msg.get("filename", "<string>"), msg.get("cell_id", ""))
+            try:
+                payload = pickle.dumps(result, protocol=pickle.HIGHEST_PROTOCOL)
+            except Exception as e:
+                # the result can not be sent to LibreOffice, it is an error of the cell.
+                prefix = f"Unable to send result of type {type(result.get('data', None)).__name__} from kernel. "
+                payload = pickle.dumps(self._get_error_result(e, prefix), protocol=pickle.HIGHEST_PROTOCOL)
+            self._send_bytes(payload)
+        elif cmd == "reset":
+            self.mod.__dict__.clear()
+            self.mod.__dict__.update(self._init_dict)
+        elif cmd == "set_var":
+            self.mod.__dict__[msg["name"]] = msg.get("value", None)
+        elif cmd == "destroy":
+            return False
+        elif cmd == "general_message":
+            print(f"Received From Server: {msg.get('data', '')}")
+        else:
+            print(f"Unknown message: {cmd}", file=sys.stderr)
+        return True
+
+    def run(self) -> None:
+        try:
+            while self.handle(self.receive()):
+                pass
+        except (ConnectionResetError, struct.error):
+            pass
+        finally:
+            self._sock.close()
+
+
+def _connect(args: argparse.Namespace) -> socket.socket:
+    if args.socket_path and os.name != "nt":
+        sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        sock.connect(os.path.expanduser(args.socket_path))
+    else:
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.connect((args.host, int(args.port)))
+    return sock
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="LibrePythonista kernel")
+    parser.add_argument("--process-id", required=True)
+    parser.add_argument("--host", default="localhost")
+    parser.add_argument("--port", default="0")
+    parser.add_argument("--socket-path", default="")
+    parser.add_argument("--debug", default="no_debug")
+    args = parser.parse_args()
+    # stdout is read by LibreOffice until the kernel exits, a full stderr pipe would block the kernel.
+    sys.stderr = sys.stdout
+    if args.debug != "no_debug":
+        KernelLog().setLevel(logging.DEBUG)
+    kernel = Kernel(_connect(args))
+    kernel.run()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,366 @@
+from __future__ import annotations
+from typing import Any, Dict, Iterator, List, Optional, TYPE_CHECKING
+from pathlib import Path
+import threading
+import types
+
+from ooodev.loader import Lo
+from ooodev.utils.gen_util import Util as OooDevGenUtil
+from ooodev.utils.helper.dot_dict import DotDict
+
+from ...multi_process.process_mgr import ProcessMgr
+from ...multi_process.socket_manager import SocketManager
+from ...cell.errors.general_error import GeneralError
+from ...data.lazy_data_frame import LazyDataFrame
+from ..mod_helper.lplog import LpLog as LibrePythonistaLog, StaticLpLog
+from .kernel_main import LP_LOG_LEVELS, OFFICE_ONLY_NAMES
+
+if TYPE_CHECKING:
+    try:
+        # python 3.12+
+        from typing import override  # type: ignore
+    except ImportError:
+        from typing_extensions import override
+
+    from ooodev.calc import CalcDoc
+    from ..dependency.code_refs import CodeRefs
+    from ..py_module import PyModule
+    from ....___lo_pip___.config import Config
+else:
+
+    def override(func):
+        return func
+
+    from ___lo_pip___.config import Config
+
+
+class KernelError(Exception):
+    """Error raised in the kernel process."""
+
+    pass
+
+
+class KernelProcessMgr(ProcessMgr):
+    """
+    Runs the python module of a document in a separate python process.
+
+    Cell code is sent to the kernel and the result is sent back as a pickled payload.
+    ``lp()`` and ``lp_many()`` calls made by the kernel are resolved in LibreOffice, using ``lp_mod`` of the local module,
+    and the data is sent back to the kernel. ``lp_log`` messages are written to the log of the document and
+    figures shown with ``plt.show()`` are saved to a file, the same as ``lp_plot`` does.
+    """
+
+    @override
+    def __init__(self, doc: CalcDoc, py_mod: PyModule) -> None:
+        """
+        Constructor
+
+        Args:
+            doc (CalcDoc): Document the kernel runs the code for.
+            py_mod (PyModule): Local module. Used to resolve ``lp()`` calls.
+        """
+        super().__init__(SocketManager(sock_file_name=f"librepythonista_kernel_{doc.runtime_uid}.sock"))
+        self._doc = doc
+        self._py_mod = py_mod
+        self._process_id = ""
+        # a kernel handles one request at a time.
+        self._kernel_lock = threading.Lock()
+        # generators of lp(..., chunksize=N) calls of the kernel, chunks are sent as the kernel requests them.
+        self._lp_iters: Dict[int, Iterator[Any]] = {}
+        self._lp_iter_id = 0
+        self.read_output_thread = True
+
+    @override
+    def get_script_path(self) -> str:
+        """
+        Retrieves the path to the ``kernel_main.py`` script.
+
+        Returns:
+            str: The path to the python script.
+        """
+        return str(Path(__file__).parent / "kernel_main.py")
+
+    @override
+    def get_process_args(
+        self, process_id: str, host: str, port: int, socket_file: str, is_dbg: str
+    ) -> List[str]:
+        """
+        Gets the command line used to start the kernel.
+
+        The kernel always runs on the python that runs LibreOffice, including flatpak and snap installs.
+        """
+        config = Config()
+        return [
+            str(config.python_path),
+            self.get_script_path(),
+            "--process-id",
+            process_id,
+            "--host",
+            host,
+            "--port",
+            str(port),
+            "--socket-path",
+            socket_file,  # may start with ~
+            "--debug",
+            is_dbg,
+        ]
+
+    @override
+    def get_process_env(self, env: Dict[str, str]) -> Optional[Dict[str, str]]:
+        return env
+
+    @override
+    def handle_client(self, process_id: str) -> None:
+        """
+        The kernel is request and response driven.
+        Messages from the kernel are read by the thread that sent the request, see ``update_with_result()``.
+        """
+        self.log.debug("Kernel %s connected.", process_id)
+
+    def ensure_started(self) -> bool:
+        """
+        Starts the kernel process if it is not running.
+
+        Returns:
+            bool: ``True`` if the kernel is running; Otherwise, ``False``.
+        """
+        if self._process_id and self.get_process(self._process_id) is not None:
+            return True
+        self._process_id = self.start_subprocess()
+        return bool(self._process_id) and self.get_process(self._process_id) is not None
+
+    def reset(self) -> None:
+        """Resets the kernel module to its initial state."""
+        with self._kernel_lock:
+            self._close_lp_iters()
+            if self.ensure_started():
+                self.socket_manager.send_payload({"cmd": "reset"}, self._process_id)
+
+    def set_global_var(self, var_name: str, value: Any) -> None:  # noqa: ANN401
+        """
+        Set a global variable in the kernel module.
+
+        Args:
+            var_name (str): The name of the variable
+            value (Any): The value of the variable, must be picklable.
+        """
+        with self._kernel_lock:
+            if self.ensure_started():
+                self.socket_manager.send_payload({"cmd": "set_var", "name": var_name, "value": value}, self._process_id)
+
+    def check_refs(self, refs: CodeRefs) -> None:
+        """
+        Checks that code can run in the kernel.
+
+        Args:
+            refs (CodeRefs): References of the code.
+
+        Raises:
+            KernelError: If the code uses the document or names of the module that need the office.
+        """
+        names = sorted(refs.reads & OFFICE_ONLY_NAMES)
+        if refs.uses_doc or names:
+            used = f" ({', '.join(names)})" if names else ""
+            raise KernelError(
+                f"Code uses the document{used}, which is not available in kernel mode. "
+                "Use lp() to read the document or turn off kernel mode for this document."
+            )
+
+    def update_with_result(self, code: str, filename: str = "<string>", cell_id: str = "") -> DotDict:
+        """
+        Executes code in the kernel module and returns the result.
+
+        Args:
+            code (str): Any valid python code
+            filename (str, optional): File name used in tracebacks such as the cell address. Defaults to ``<string>``.
+            cell_id (str, optional): Unique id of the cell. Defaults to ``""``.
+
+        Returns:
+            DotDict: The result in the ``data`` key.
+
+        Note:
+            If there is an error the result will be a DotDict with ``data=GeneralError(e)`` and ``error=True``.
+        """
+        try:
+            with self._kernel_lock:
+                if not self.ensure_started():
+                    raise KernelError("Kernel process is not running.")
+                self.socket_manager.send_payload(
+                    {"cmd": "exec", "code": code, "filename": filename, "cell_id": cell_id}, self._process_id
+                )
+                msg = self._wait_for_result()
+        except Exception as e:
+            self.log.exception("update_with_result() Kernel error.")
+            # the kernel is in an unknown state, a new kernel is started on the next request.
+            self.terminate_all_subprocesses()
+            self._process_id = ""
+            return DotDict(data=GeneralError(e), error=True)
+
+        if msg.get("error", False):
+            e = KernelError(msg.get("error_msg", ""))
+            try:
+                lp_log_inst = LibrePythonistaLog()
+                if lp_log_inst.log_extra_info:
+                    lp_log_inst.log.error(f"Error updating module.\n{code}\n{msg.get('traceback', '')}")
+                else:
+                    lp_log_inst.log.error(f"{e}")
+            except Exception:
+                self.log.error("LibrePythonistaLog error", exc_info=True)
+            return DotDict(data=GeneralError(e), error=True)
+        if msg.get("is_lp_result", False):
+            # the value came from lp(). The local result has the range information.
+            return self._py_mod.mod.lp_mod.LAST_LP_RESULT  # type: ignore
+        return DotDict(data=msg.get("data", None), **msg.get("info", {}))
+
+    def _wait_for_result(self) -> Dict[str, Any]:
+        """Reads messages from the kernel, resolving ``lp()`` calls, until the result arrives."""
+        while True:
+            msg = self.socket_manager.receive_message(self._process_id)
+            if not msg:
+                raise KernelError("Kernel process is not connected.")
+            cmd = msg.get("cmd", "")
+            if cmd == "result":
+                return msg
+            if cmd in ("lp", "lp_many"):
+                self._send_lp_result(msg)
+            elif cmd == "lp_next":
+                self._send_lp_chunk(msg.get("iter_id", 0))
+            elif cmd == "lp_close":
+                it = self._lp_iters.pop(msg.get("iter_id", 0), None)
+                if isinstance(it, types.GeneratorType):
+                    it.close()
+            elif cmd == "lp_log":
+                level = msg.get("level", "")
+                if level in LP_LOG_LEVELS:
+                    try:
+                        getattr(StaticLpLog, level)(msg.get("msg", ""))
+                    except Exception:
+                        self.log.error("Unable to log message of kernel.", exc_info=True)
+            elif cmd == "lp_plot":
+                self._send_plot_result(msg.get("svg", b""))
+            else:
+                self.log.error("Unknown message from kernel: %s", cmd)
+
+    def _send_lp_result(self, msg: Dict[str, Any]) -> None:
+        """
+        Resolves a ``lp()`` or ``lp_many()`` call of the kernel and sends the data back.
+
+        Errors are sent back instead of the data, the kernel raises them in the cell that made the call.
+        """
+        try:
+            message = self._get_lp_message(msg)
+        except Exception as e:
+            self.log.error("Unable to resolve %s() call of kernel.", msg.get("cmd"), exc_info=True)
+            self._send_lp_error(e)
+            return
+        try:
+            self.socket_manager.send_payload(message, self._process_id)
+        except Exception as e:
+            self.log.error(
+                "Unable to send lp() result of type %s to kernel.", type(message["data"]).__name__, exc_info=True
+            )
+            for iter_id in [message.get("iter_id", None), *message.get("iter_ids", {}).values()]:
+                self._lp_iters.pop(iter_id, None)  # type: ignore
+            self._send_lp_error(e)
+
+    def _send_lp_error(self, e: Exception) -> None:
+        self.socket_manager.send_payload(
+            {"cmd": "lp_result", "data": None, "error_msg": f"{type(e).__name__}: {e}"}, self._process_id
+        )
+
+    def _get_lp_message(self, msg: Dict[str, Any]) -> Dict[str, Any]:
+        lp_mod = self._py_mod.mod.lp_mod  # type: ignore
+        if msg.get("cmd") == "lp":
+            data = lp_mod.lp(msg.get("addr", ""), **msg.get("kwargs", {}))
+        else:
+            data = lp_mod.lp_many(msg.get("addrs", {}), **msg.get("kwargs", {}))
+        message: Dict[str, Any] = {"cmd": "lp_result", "data": data}
+        if isinstance(data, types.GeneratorType):
+            # chunks are sent one at a time as the kernel iterates, see _send_lp_chunk().
+            message["data"] = None
+            message["iter_id"] = self._add_lp_iter(data)
+        elif isinstance(data, LazyDataFrame):
+            # the range can not be read from the kernel.
+            message["data"] = data.load()
+            lp_mod.LAST_LP_RESULT.data = message["data"]
+        elif isinstance(data, dict):
+            values: Dict[str, Any] = {}
+            iter_ids: Dict[str, int] = {}
+            for key, value in data.items():
+                if isinstance(value, types.GeneratorType):
+                    iter_ids[key] = self._add_lp_iter(value)
+                    value = None
+                elif isinstance(value, LazyDataFrame):
+                    value = value.load()
+                values[key] = value
+            message["data"] = values
+            message["iter_ids"] = iter_ids
+        if "headers" in lp_mod.LAST_LP_RESULT:
+            message["info"] = {"headers": bool(lp_mod.LAST_LP_RESULT.headers)}
+        return message
+
+    def _add_lp_iter(self, it: Iterator[Any]) -> int:
+        self._lp_iter_id += 1
+        self._lp_iters[self._lp_iter_id] = it
+        return self._lp_iter_id
+
+    def _send_lp_chunk(self, iter_id: int) -> None:
+        """Sends the next chunk of a ``lp(..., chunksize=N)`` call of the kernel."""
+        it = self._lp_iters.get(iter_id, None)
+        if it is None:
+            self.socket_manager.send_payload({"cmd": "lp_result", "data": None, "done": True}, self._process_id)
+            return
+        try:
+            chunk = next(it)
+        except StopIteration:
+            self._lp_iters.pop(iter_id, None)
+            self.socket_manager.send_payload({"cmd": "lp_result", "data": None, "done": True}, self._process_id)
+            return
+        except Exception as e:
+            self.log.error("Unable to read chunk for kernel.", exc_info=True)
+            self._lp_iters.pop(iter_id, None)
+            self._send_lp_error(e)
+            return
+        try:
+            self.socket_manager.send_payload({"cmd": "lp_result", "data": chunk}, self._process_id)
+        except Exception as e:
+            self.log.error("Unable to send chunk of type %s to kernel.", type(chunk).__name__, exc_info=True)
+            self._lp_iters.pop(iter_id, None)
+            self._send_lp_error(e)
+
+    def _close_lp_iters(self) -> None:
+        iters = list(self._lp_iters.values())
+        self._lp_iters.clear()
+        for it in iters:
+            if isinstance(it, types.GeneratorType):
+                it.close()
+
+    def _send_plot_result(self, svg: bytes) -> None:
+        """Saves a figure shown by the kernel and sends the result of ``lp_plot`` back."""
+        data = None
+        try:
+            pth = Lo.tmp_dir / f"plt_{OooDevGenUtil.generate_random_hex_string(12)}.svg"
+            pth.write_bytes(svg)
+            data = {
+                "data": str(pth),
+                "data_type": "file",
+                "file_kind": "image",
+                "file_ext": "svg",
+                "details": "figure",
+            }
+        except Exception:
+            self.log.error("Unable to save plot of kernel.", exc_info=True)
+        self.socket_manager.send_payload({"cmd": "lp_result", "data": data}, self._process_id)
+
+    def terminate(self) -> None:
+        """Terminates the kernel process and the server socket."""
+        with self._kernel_lock:
+            self._close_lp_iters()
+            self.terminate_all_subprocesses()
+            self.terminate_server()
+            self._process_id = ""
+
+    @property
+    def process_id(self) -> str:
+        """Gets the process id of the kernel or an empty string if the kernel has not been started."""
+        return self._process_id
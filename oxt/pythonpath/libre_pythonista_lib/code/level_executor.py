@@ -0,0 +1,227 @@
+from __future__ import annotations
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Mapping, TYPE_CHECKING
+import queue
+import types
+
+from ooodev.utils.helper.dot_dict import DotDict
+
+from ..data.lazy_data_frame import LazyDataFrame
+
+if TYPE_CHECKING:
+    from ooodev.utils.data_type.cell_obj import CellObj
+    from .py_module import PyModule
+
+_MISSING = object()
+"""Marks a name that a cell deleted from the module."""
+
+
+@dataclass
+class CellTask:
+    """Code cell to execute on a worker thread."""
+
+    code: str
+    filename: str
+    cell_id: str
+    cell_obj: CellObj
+
+
+@dataclass
+class CellOutcome:
+    """Outcome of a cell executed on a worker thread."""
+
+    result: DotDict | None
+    """Result of the code or ``None`` if the code raised an error."""
+    error: Exception | None = None
+    """Error raised by the code if any."""
+    delta: Dict[str, Any] = field(default_factory=dict)
+    """Names the cell changed in the module, see ``LevelExecutor.apply()``."""
+
+
+class CellLp:
+    """
+    Stands in for ``lp_mod`` in the module of a cell that runs on a worker thread.
+
+    The office must only be accessed from the thread that runs the level so ``lp()`` and ``lp_many()`` calls are sent to it
+    and the worker waits for the data. ``LAST_LP_RESULT`` is kept per cell so the code rules of
+    each cell see the result of their own ``lp()`` calls.
+    """
+
+    def __init__(self, lp_mod: types.ModuleType, cell_obj: CellObj, requests: queue.Queue) -> None:
+        self._lp_mod = lp_mod
+        self._requests = requests
+        self.cell_obj = cell_obj
+        self.LAST_LP_RESULT = DotDict(data=None)  # noqa: N815
+
+    def lp(self, addr: str, **kwargs: Any) -> Any:  # noqa: ANN401
+        future: Future = Future()
+        self._requests.put((self, addr, kwargs, future))
+        self.LAST_LP_RESULT = future.result()
+        return self.LAST_LP_RESULT.data
+
+    def lp_many(self, addrs: Mapping[str, str], **kwargs: Any) -> Dict[str, Any]:  # noqa: ANN401
+        return self.lp(dict(addrs), **kwargs)  # type: ignore
+
+    def __getattr__(self, name: str) -> Any:  # noqa: ANN401
+        return getattr(self._lp_mod, name)
+
+    def __repr__(self) -> str:
+        return f"<CellLp(cell_obj={self.cell_obj})>"
+
+
+class LevelExecutor:
+    """
+    Executes the independent code cells of a topological level on a thread pool.
+
+    Each cell runs in its own copy of the module so cells can not see each other's changes.
+    The names each cell changed are returned so the caller can apply them to the module in execution order.
+    ``lp()`` calls are resolved on the calling thread while it waits for the cells to finish.
+    Lazy and chunked ``lp()`` results are read on the calling thread before they are passed to a cell.
+    """
+
+    def __init__(self, max_workers: int) -> None:
+        """
+        Constructor
+
+        Args:
+            max_workers (int): Maximum number of worker threads.
+        """
+        self._max_workers = max(1, max_workers)
+        self._pool: ThreadPoolExecutor | None = None
+
+    def run(self, py_mod: PyModule, tasks: List[CellTask]) -> List[CellOutcome]:
+        """
+        Executes cells concurrently.
+
+        Args:
+            py_mod (PyModule): Module the cells are executed for. It is not changed.
+            tasks (List[CellTask]): Cells to execute.
+
+        Returns:
+            List[CellOutcome]: Outcome of each cell in the same order as ``tasks``.
+        """
+        if self._pool is None:
+            self._pool = ThreadPoolExecutor(max_workers=self._max_workers, thread_name_prefix="LpCell")
+        base = py_mod.mod.__dict__
+        lp_mod = base["lp_mod"]
+        for value in base.values():
+            if isinstance(value, LazyDataFrame):
+                # the office can not be read from the worker threads.
+                value.load()
+        requests: queue.Queue = queue.Queue()
+        futures = []
+        for task in tasks:
+            cell_lp = CellLp(lp_mod, task.cell_obj, requests)
+            future = self._pool.submit(self._execute, py_mod, base, task, cell_lp)
+            future.add_done_callback(lambda _: requests.put(None))
+            futures.append(future)
+
+        remaining = len(futures)
+        while remaining:
+            item = requests.get()
+            if item is None:
+                remaining -= 1
+                continue
+            cell_lp, addr, kwargs, future = item
+            try:
+                future.set_result(self._lp(lp_mod, cell_lp.cell_obj, addr, kwargs))
+            except Exception as e:
+                future.set_exception(e)
+        return [future.result() for future in futures]
+
+    def _execute(self, py_mod: PyModule, base: Dict[str, Any], task: CellTask, cell_lp: CellLp) -> CellOutcome:
+        lp_fn = cell_lp.lp
+        lp_many_fn = cell_lp.lp_many
+        try:
+            result, mod_dict = py_mod.update_isolated(
+                base,
+                task.code,
+                task.filename,
+                CURRENT_CELL_ID=task.cell_id,
+                CURRENT_CELL_OBJ=task.cell_obj,
+                lp=lp_fn,
+                lp_many=lp_many_fn,
+                lp_mod=cell_lp,
+            )
+        except Exception as e:
+            return CellOutcome(None, e)
+        # the stand ins must not leak into the module.
+        if mod_dict.get("lp", None) is lp_fn:
+            mod_dict["lp"] = base["lp"]
+        if mod_dict.get("lp_many", None) is lp_many_fn:
+            mod_dict["lp_many"] = base["lp_many"]
+        if mod_dict.get("lp_mod", None) is cell_lp:
+            mod_dict["lp_mod"] = base["lp_mod"]
+        return CellOutcome(result, None, self._get_delta(base, mod_dict))
+
+    def _get_delta(self, base: Dict[str, Any], mod_dict: Dict[str, Any]) -> Dict[str, Any]:
+        delta: Dict[str, Any] = {}
+        added = 0
+        for name, value in mod_dict.items():
+            old = base.get(name, _MISSING)
+            if old is not value:
+                delta[name] = value
+                if old is _MISSING:
+                    added += 1
+        if len(base) + added != len(mod_dict):
+            for name in base:
+                if name not in mod_dict:
+                    delta[name] = _MISSING
+        return delta
+
+    def _lp(self, lp_mod: Any, cell_obj: CellObj, addr: str | Mapping[str, str], kwargs: Dict[str, Any]) -> DotDict:  # noqa: ANN401
+        # lp() uses the global cell of lp_mod for relative addresses.
+        current = lp_mod.CURRENT_CELL_OBJ
+        lp_mod.CURRENT_CELL_OBJ = cell_obj
+        try:
+            # lp_many() sends its addresses as a dictionary.
+            data = lp_mod.lp_many(addr, **kwargs) if isinstance(addr, Mapping) else lp_mod.lp(addr, **kwargs)
+            result = lp_mod.LAST_LP_RESULT
+            if result.data is not data:
+                result = DotDict(data=data)
+            if isinstance(data, dict):
+                result.data = {k: self._read_deferred(v) for k, v in data.items()}
+            else:
+                result.data = self._read_deferred(data)
+            return result
+        finally:
+            lp_mod.CURRENT_CELL_OBJ = current
+
+    @staticmethod
+    def _read_deferred(data: Any) -> Any:  # noqa: ANN401
+        # lazy and chunked results would read the office from the worker thread.
+        if isinstance(data, LazyDataFrame):
+            return data.load()
+        if isinstance(data, types.GeneratorType):
+            return iter(list(data))
+        return data
+
+    @staticmethod
+    def apply(delta: Dict[str, Any], mod_dict: Dict[str, Any]) -> None:
+        """
+        Applies the names a cell changed to a module dictionary.
+
+        Args:
+            delta (Dict[str, Any]): Names the cell changed, see ``CellOutcome.delta``.
+            mod_dict (Dict[str, Any]): Module dictionary.
+        """
+        for name, value in delta.items():
+            if value is _MISSING:
+                mod_dict.pop(name, None)
+            else:
+                mod_dict[name] = value
+
+    def shutdown(self) -> None:
+        """Stops the worker threads."""
+        if self._pool is not None:
+            self._pool.shutdown(wait=False)
+            self._pool = None
+
+    @property
+    def max_workers(self) -> int:
+        """Gets the maximum number of worker threads."""
+        return self._max_workers
+
+    def __repr__(self) -> str:
+        return f"<LevelExecutor(max_workers={self._max_workers})>"
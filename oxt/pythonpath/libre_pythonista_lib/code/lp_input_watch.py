@@ -0,0 +1,132 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Any, Dict, Tuple, TYPE_CHECKING
+import hashlib
+import itertools
+import struct
+import threading
+
+from ..data.listen.range_modify_listener import RangeModifyListener
+
+if TYPE_CHECKING:
+    from ooodev.calc import CalcDoc
+
+LpInputRange = Tuple[int, int, int, int, int]
+"""Range in the format of ``(sheet_idx, row_start, col_start, row_end, col_end)`` as zero based indexes."""
+
+
+@dataclass
+class _RangeWatch:
+    comp: Any
+    address: Any
+    listener: Any
+    version: int
+    fingerprint: int | None = None
+    fingerprint_version: int | None = None
+
+
+class LpInputWatch:
+    """
+    Tracks changes to the ``lp()`` input ranges of the cells of a document.
+
+    A modify listener is added to each range the first time it is used. The version of a range changes each time
+    the listener reports a change, so a range is only read again when it has changed.
+    """
+
+    def __init__(self, doc: CalcDoc) -> None:
+        self._doc = doc
+        self._lock = threading.Lock()
+        self._watches: Dict[LpInputRange, _RangeWatch] = {}
+        self._counter = itertools.count(1)
+
+    def get_version(self, rng: LpInputRange) -> int:
+        """
+        Gets the version of a range, adding a listener to the range the first time.
+
+        Args:
+            rng (LpInputRange): Range.
+
+        Returns:
+            int: Version. A different version means the content of the range changed.
+        """
+        return self._get_watch(rng).version
+
+    def get_fingerprint(self, rng: LpInputRange) -> int:
+        """
+        Gets a fingerprint of the data of a range. The range is only read when it changed since the last call.
+
+        The fingerprint is the same in every session, stored results are keyed on it.
+
+        Args:
+            rng (LpInputRange): Range.
+
+        Returns:
+            int: Fingerprint.
+        """
+        watch = self._get_watch(rng)
+        version = watch.version
+        if watch.fingerprint is None or watch.fingerprint_version != version:
+            watch.fingerprint = self._hash_data(watch.comp.getDataArray())
+            watch.fingerprint_version = version
+        return watch.fingerprint
+
+    def _get_watch(self, rng: LpInputRange) -> _RangeWatch:
+        with self._lock:
+            watch = self._watches.get(rng, None)
+        if watch is not None:
+            # inserting or deleting rows and columns moves the range without changing its content.
+            if watch.comp.getRangeAddress() == watch.address:
+                return watch
+            self._release(watch)
+        sheet_idx, row_start, col_start, row_end, col_end = rng
+        comp = self._doc.sheets[sheet_idx].component.getCellRangeByPosition(col_start, row_start, col_end, row_end)
+        watch = _RangeWatch(comp=comp, address=comp.getRangeAddress(), listener=None, version=next(self._counter))
+
+        def on_change() -> None:
+            watch.version = next(self._counter)
+
+        watch.listener = RangeModifyListener(on_change)
+        comp.addModifyListener(watch.listener)
+        with self._lock:
+            old = self._watches.get(rng, None)
+            self._watches[rng] = watch
+        if old is not None and old is not watch:
+            self._release(old)
+        return watch
+
+    def _hash_data(self, data: Tuple[Tuple[Any, ...], ...]) -> int:
+        h = hashlib.blake2b(digest_size=8)
+        pack = struct.Struct("<d").pack
+        for row in data:
+            for value in row:
+                if isinstance(value, str):
+                    encoded = value.encode("utf-8")
+                    h.update(b"s")
+                    h.update(len(encoded).to_bytes(4, "little"))
+                    h.update(encoded)
+                else:
+                    h.update(b"f")
+                    h.update(pack(float(value)))
+            h.update(b"\n")
+        return int.from_bytes(h.digest(), "little")
+
+    def _release(self, watch: _RangeWatch) -> None:
+        try:
+            watch.comp.removeModifyListener(watch.listener)
+        except Exception:
+            # the range may already be disposed.
+            pass
+
+    def clear(self) -> None:
+        """Removes the listeners of all ranges."""
+        with self._lock:
+            watches = list(self._watches.values())
+            self._watches.clear()
+        for watch in watches:
+            self._release(watch)
+
+    def __len__(self) -> int:
+        return len(self._watches)
+
+    def __repr__(self) -> str:
+        return f"<LpInputWatch(ranges={len(self)})>"
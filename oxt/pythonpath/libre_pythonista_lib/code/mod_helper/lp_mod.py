@@ -1,6 +1,6 @@
 # region imports
 from __future__ import annotations
-from typing import Any, cast, TYPE_CHECKING
+from typing import Any, Callable, cast, Dict, Mapping, Sequence, TYPE_CHECKING
 import uno
 
 from ooodev.loader import Lo
@@ -8,6 +8,7 @@ from ooodev.calc import CalcDoc, CalcSheet
 from ooodev.utils.helper.dot_dict import DotDict
 from ooodev.utils.data_type.cell_obj import CellObj
 from ooodev.utils.data_type.range_obj import RangeObj
+from ooodev.utils.data_type.range_values import RangeValues
 from ooodev.exceptions import ex as mEx  # noqa: N812
 
 # region BreakManager
@@ -18,9 +19,13 @@ from ooodev.exceptions import ex as mEx  # noqa: N812
 # endregion BreakManager
 
 from ...cell.cell_mgr import CellMgr
-from ...data.pandas_data_obj import PandasDataObj
+from ...data.pandas_data_obj import PandasDataObj, READ_CHUNK_ROWS
+from ...data.lazy_data_frame import LazyDataFrame
+from ...data.range_cache import RangeCache, RangeCacheEntry
+from ...data.listen.range_modify_listener import RangeModifyListener
 from .lp_rules.lp_rules_engine import LpRulesEngine
 from .lp_enum import LpEnum
+from .lp_name_cache import LpNameCache, LpNameEntry, LpNameKey
 
 LAST_LP_RESULT = DotDict(data=None)
 
@@ -39,6 +44,10 @@ else:
 # endregion imports
 
 _RULES_ENGINE = LpRulesEngine()
+_MAX_BATCH_CELLS = 10_000
+"""Maximum size of the range read by ``lp_many()`` to get the values of the cells of a sheet in one call."""
+_MAX_BATCH_RANGE_CELLS = 1_000_000
+"""Maximum size of the range read by ``lp_many()`` to get the data of the ranges of a sheet in one call."""
 
 
 def _collapse_to_used(sheet: CalcSheet, rng_obj: RangeObj) -> RangeObj:
@@ -50,6 +59,211 @@ def _collapse_to_used(sheet: CalcSheet, rng_obj: RangeObj) -> RangeObj:
         return rng_obj
 
 
+def _get_column_types_key(column_types: Any) -> str | None:  # noqa: ANN401
+    # None when the column types can not be compared, the range is then not cached.
+    if not column_types:
+        return ""
+    try:
+        return repr(sorted(column_types.items(), key=lambda item: repr(item[0])))
+    except Exception:
+        return None
+
+
+def _cache_range(
+    cache: RangeCache, key: Any, sheet: CalcSheet, addr_rng: RangeObj, entry: RangeCacheEntry  # noqa: ANN401
+) -> None:
+    # listen on the range before collapsing, new data in the unused area changes the result.
+    comp = sheet.get_range(range_obj=addr_rng).component
+    address = comp.getRangeAddress()
+    listener = RangeModifyListener(lambda: cache.invalidate(key))
+
+    def release() -> None:
+        comp.removeModifyListener(listener)
+
+    def is_valid() -> bool:
+        # inserting or deleting rows and columns moves the range without changing its content.
+        return comp.getRangeAddress() == address
+
+    comp.addModifyListener(listener)
+    entry.release = release
+    entry.is_valid = is_valid
+    cache.put(key, entry)
+
+
+def _get_chunksize(log: LogInst, **kwargs) -> int:  # noqa: ANN003
+    try:
+        chunksize = int(kwargs.get("chunksize", 0) or 0)
+    except Exception:
+        log.warning("chunksize parameter must be an integer value. Using 0.")
+        return 0
+    return max(0, chunksize)
+
+
+def _get_lazy(log: LogInst, **kwargs) -> bool:  # noqa: ANN003
+    try:
+        return bool(kwargs.get("lazy", False))
+    except Exception:
+        log.warning("lazy parameter must be a boolean value. Using False.")
+        return False
+
+
+def _get_partial_args(log: LogInst, **kwargs) -> Dict[str, Any] | None:  # noqa: ANN003
+    # None when the whole range is read.
+    usecols = kwargs.get("usecols")
+    skiprows = kwargs.get("skiprows")
+    nrows = kwargs.get("nrows")
+    if usecols is None and not skiprows and nrows is None:
+        return None
+    try:
+        skiprows = max(0, int(skiprows or 0))
+    except Exception:
+        log.warning("skiprows parameter must be an integer value. Using 0.")
+        skiprows = 0
+    if nrows is not None:
+        try:
+            nrows = max(0, int(nrows))
+        except Exception:
+            log.warning("nrows parameter must be an integer value. Reading all rows.")
+            nrows = None
+    return {"usecols": usecols, "skiprows": skiprows, "nrows": nrows}
+
+
+def _get_partial_range_data(
+    sheet: CalcSheet,
+    addr_rng: RangeObj,
+    collapse: bool,
+    column_types: Any,  # noqa: ANN401
+    log: LogInst,
+    partial: Dict[str, Any],
+) -> Any:  # noqa: ANN401
+    cache = RangeCache(sheet.calc_doc)
+    key = _get_range_key(cache, addr_rng, collapse, column_types)
+    entry = cache.get(key) if key is not None else None
+    if entry is not None:
+        rng_obj = entry.range_obj.copy()
+        profile = entry.profile
+    else:
+        rng_obj = _collapse_to_used(sheet, addr_rng) if collapse else addr_rng
+        profile = cache.find_profile(rng_obj.sheet_idx, str(rng_obj)) if cache.is_enabled else None
+    pdo = PandasDataObj(cell_rng=sheet.get_range(range_obj=rng_obj), col_types=column_types, profile=profile)
+    usecols = partial["usecols"]
+    cols = None if usecols is None else pdo.get_usecols(usecols)
+    skiprows = partial["skiprows"]
+    nrows = partial["nrows"]
+    if entry is not None:
+        log.debug("lp - Range found in cache, selecting part: %s, %s", addr_rng, cache)
+        stop = None if nrows is None else skiprows + nrows
+        df = entry.data.iloc[skiprows:stop, slice(None) if cols is None else cols].copy()
+        df.reset_index(drop=True, inplace=True)
+    else:
+        # partial reads are not cached, they are already a small part of the range.
+        log.debug("lp - Reading part of %s, columns: %s, skiprows: %i, nrows: %s", rng_obj, cols, skiprows, nrows)
+        df = pdo.get_partial_data_frame(cols, skiprows, nrows)
+    return _set_last_lp_result(df, headers=pdo.has_headers, range_obj=rng_obj)
+
+
+def _get_range_key(cache: RangeCache, addr_rng: RangeObj, collapse: bool, column_types: Any) -> Any:  # noqa: ANN401
+    # None when the range is not cached.
+    types_key = _get_column_types_key(column_types)
+    if not cache.is_enabled or types_key is None:
+        return None
+    return (addr_rng.sheet_idx, str(addr_rng), types_key, collapse)
+
+
+def _get_range_data(
+    sheet: CalcSheet,
+    addr_rng: RangeObj,
+    collapse: bool,
+    column_types: Any,  # noqa: ANN401
+    log: LogInst,
+    chunksize: int = 0,
+    lazy: bool = False,
+    partial: Dict[str, Any] | None = None,
+) -> Any:  # noqa: ANN401
+    if partial is not None:
+        return _get_partial_range_data(sheet, addr_rng, collapse, column_types, log, partial)
+    cache = RangeCache(sheet.calc_doc)
+    if chunksize > 0:
+        # DataFrames are read as they are used and are not cached.
+        rng_obj = _collapse_to_used(sheet, addr_rng) if collapse else addr_rng
+        profile = cache.find_profile(rng_obj.sheet_idx, str(rng_obj)) if cache.is_enabled else None
+        pdo = PandasDataObj(cell_rng=sheet.get_range(range_obj=rng_obj), col_types=column_types, profile=profile)
+        log.debug("lp - Reading %s in chunks of %i rows", rng_obj, chunksize)
+        return _set_last_lp_result(pdo.iter_data_frames(chunksize), headers=pdo.has_headers, range_obj=rng_obj)
+
+    key = _get_range_key(cache, addr_rng, collapse, column_types) if lazy else None
+    if key is not None and key in cache:
+        # the data is already in memory.
+        lazy = False
+
+    if lazy:
+        rng_obj = _collapse_to_used(sheet, addr_rng) if collapse else addr_rng
+        profile = cache.find_profile(rng_obj.sheet_idx, str(rng_obj)) if cache.is_enabled else None
+        pdo = PandasDataObj(cell_rng=sheet.get_range(range_obj=rng_obj), col_types=column_types, profile=profile)
+
+        def load() -> Any:  # noqa: ANN401
+            # the whole range is read the same way as without lazy, adding it to the cache.
+            return _read_range_data(sheet, addr_rng, collapse, column_types, log).data
+
+        log.debug("lp - Lazy DataFrame of %s", rng_obj)
+        return _set_last_lp_result(LazyDataFrame(pdo, load), headers=pdo.has_headers, range_obj=rng_obj)
+
+    dd = _read_range_data(sheet, addr_rng, collapse, column_types, log)
+    return _set_last_lp_result(dd.data, headers=dd.headers, range_obj=dd.range_obj)
+
+
+def _read_range_data(
+    sheet: CalcSheet,
+    addr_rng: RangeObj,
+    collapse: bool,
+    column_types: Any,  # noqa: ANN401
+    log: LogInst,
+    rng_obj: RangeObj | None = None,
+    data: Sequence[Sequence[Any]] | None = None,
+) -> DotDict:
+    """
+    Gets the DataFrame of a range from the cache or reads it, adding it to the cache.
+
+    ``rng_obj`` is the range already collapsed and ``data`` the values of ``rng_obj`` already read from the sheet.
+    """
+    cache = RangeCache(sheet.calc_doc)
+    key = _get_range_key(cache, addr_rng, collapse, column_types)
+    if key is not None:
+        entry = cache.get(key)
+        if entry is not None:
+            log.debug("lp - Range found in cache: %s, %s", addr_rng, cache)
+            # callers may change the DataFrame, the cached one must stay as read.
+            return DotDict(data=entry.data.copy(), headers=entry.headers, range_obj=entry.range_obj.copy())
+
+    if rng_obj is None:
+        rng_obj = addr_rng
+        if collapse:
+            rng_obj = _collapse_to_used(sheet, addr_rng)
+            log.debug("lp - Collapsed addr_rng: %s", rng_obj)
+    cr = sheet.get_range(range_obj=rng_obj)
+    profile = None
+    if key is not None:
+        # the range may have been read with other column types.
+        profile = cache.find_profile(rng_obj.sheet_idx, str(rng_obj))
+    pdo = PandasDataObj(cell_rng=cr, col_types=column_types, profile=profile)
+    df = pdo.get_data_frame(chunksize=READ_CHUNK_ROWS, data=data)
+    if key is not None:
+        try:
+            nbytes = int(df.memory_usage(index=True, deep=True).sum())
+            entry = RangeCacheEntry(
+                data=df.copy(),
+                headers=pdo.has_headers,
+                range_obj=rng_obj.copy(),
+                nbytes=nbytes,
+                profile=pdo.profile,
+            )
+            _cache_range(cache, key, sheet, addr_rng, entry)
+            log.debug("lp - Range added to cache: %s, %s", addr_rng, cache)
+        except Exception:
+            log.warning("lp - Unable to cache range: %s", addr_rng, exc_info=True)
+    return DotDict(data=df, headers=pdo.has_headers, range_obj=rng_obj)
+
+
 def _set_last_lp_result(result: Any, **kwargs) -> Any:  # noqa: ANN003, ANN401
     global LAST_LP_RESULT
     log = LogInst()
@@ -129,13 +343,16 @@ def _handle_range_only(addr: str, log: LogInst, **kwargs) -> Any:  # noqa: ANN00
 
     doc = cast(CalcDoc, Lo.current_doc)
     sheet = doc.sheets[addr_rng.sheet_idx]
-    if collapse:
-        addr_rng = _collapse_to_used(sheet, addr_rng)
-        log.debug("lp - Collapsed addr_rng: %s", addr_rng)
-    cr = sheet.get_range(range_obj=addr_rng)
-    pdo = PandasDataObj(cell_rng=cr, col_types=column_types)
-    df = pdo.get_data_frame()
-    return _set_last_lp_result(df, headers=pdo.has_headers, range_obj=addr_rng)
+    return _get_range_data(
+        sheet,
+        addr_rng,
+        collapse,
+        column_types,
+        log,
+        _get_chunksize(log, **kwargs),
+        _get_lazy(log, **kwargs),
+        _get_partial_args(log, **kwargs),
+    )
 
 
 def _handle_sheet_range_only(addr: str, log: LogInst, **kwargs) -> Any:  # noqa: ANN003, ANN401
@@ -162,25 +379,19 @@ def _handle_sheet_range_only(addr: str, log: LogInst, **kwargs) -> Any:  # noqa:
 
     addr_rng.set_sheet_index(sheet.sheet_index)
     log.debug("lp - addr_rng: %s", addr_rng)
-
-    if collapse:
-        addr_rng = _collapse_to_used(sheet, addr_rng)
-        log.debug("lp - Collapsed addr_rng: %s", addr_rng)
-    cr = sheet.get_range(range_obj=addr_rng)
-    pdo = PandasDataObj(cell_rng=cr, col_types=column_types)
-    df = pdo.get_data_frame()
-    return _set_last_lp_result(df, headers=pdo.has_headers, range_obj=addr_rng)
-
-
-def _handle_named_range_only(addr: str, log: LogInst, **kwargs) -> Any:  # noqa: ANN003, ANN401
-    log.debug("_handle_named_range_only() Entered")
-    global CURRENT_CELL_OBJ
-    log.debug("lp - Cell Name: %s", addr)
-    gbl_cell = cast(CellObj, CURRENT_CELL_OBJ)
-    doc = cast(CalcDoc, Lo.current_doc)
-    data_name = addr
-    sheet = doc.sheets[gbl_cell.sheet_idx]
-
+    return _get_range_data(
+        sheet,
+        addr_rng,
+        collapse,
+        column_types,
+        log,
+        _get_chunksize(log, **kwargs),
+        _get_lazy(log, **kwargs),
+        _get_partial_args(log, **kwargs),
+    )
+
+
+def _get_named_range_entry(doc: CalcDoc, sheet: CalcSheet, data_name: str, log: LogInst) -> LpNameEntry | None:
     if log.is_debug:
         names = sheet.named_ranges.get_element_names()
         log.debug("lp - Sheet Named Ranges: %s", names)
@@ -188,6 +399,7 @@ def _handle_named_range_only(addr: str, log: LogInst, **kwargs) -> Any:  # noqa:
         names = doc.named_ranges.get_element_names()
         log.debug("lp - Doc Named Ranges: %s", names)
 
+    is_db = False
     if sheet.named_ranges.has_by_name(data_name):
         log.debug("lp - Named range found in sheet Name Ranges: %s", data_name)
         nc = sheet.named_ranges.get_by_name(data_name)
@@ -198,18 +410,73 @@ def _handle_named_range_only(addr: str, log: LogInst, **kwargs) -> Any:  # noqa:
     elif doc.database_ranges.has_by_name(data_name):
         log.debug("lp - Named range found in doc Database Ranges: %s", data_name)
         nc = doc.database_ranges.get_by_name(data_name)
+        is_db = True
     else:
         log.error("lp - Named range %s not found in sheet or document.", data_name)
-        return _set_last_lp_result(None)
+        return None
 
     cell_range = cast("SheetCellRange", nc.get_referred_cells())
     rng_addr = cell_range.AbsoluteName.replace("$", "")
-    if doc.range_converter.is_cell_range_name(rng_addr):
+    comp = nc.component
+    if is_db:
+
+        def get_token() -> Any:  # noqa: ANN401
+            area = comp.getDataArea()
+            return (area.Sheet, area.StartColumn, area.StartRow, area.EndColumn, area.EndRow)
+
+    else:
+        # the content changes when the name is changed or the sheet it refers to is renamed.
+        get_token = comp.getContent
+    token = get_token()
+    return LpNameEntry(
+        addr=rng_addr,
+        is_range=doc.range_converter.is_cell_range_name(rng_addr),
+        is_valid=lambda: get_token() == token,
+    )
+
+
+def _get_named_entry(
+    doc: CalcDoc, get_sheet: Callable[[], CalcSheet], data_name: str, key: LpNameKey, log: LogInst
+) -> LpNameEntry | None:
+    cache = LpNameCache(doc)
+    entry = cache.get(key)
+    if entry is None:
+        entry = _get_named_range_entry(doc, get_sheet(), data_name, log)
+        if entry is not None:
+            cache.put(key, entry)
+    else:
+        log.debug("lp - Named range found in cache: %s, %s", data_name, entry.addr)
+    return entry
+
+
+def _handle_named_entry(
+    doc: CalcDoc,
+    get_sheet: Callable[[], CalcSheet],
+    data_name: str,
+    key: LpNameKey,
+    log: LogInst,
+    **kwargs,  # noqa: ANN003
+) -> Any:  # noqa: ANN401
+    entry = _get_named_entry(doc, get_sheet, data_name, key, log)
+    if entry is None:
+        return _set_last_lp_result(None)
+    if entry.is_range:
         # range return a DataFrame
-        return _handle_sheet_range_only(rng_addr, log, **kwargs)
+        return _handle_sheet_range_only(entry.addr, log, **kwargs)
     else:
         # single cell. return the cell value
-        return _handle_sheet_cell(rng_addr, log, **kwargs)
+        return _handle_sheet_cell(entry.addr, log, **kwargs)
+
+
+def _handle_named_range_only(addr: str, log: LogInst, **kwargs) -> Any:  # noqa: ANN003, ANN401
+    log.debug("_handle_named_range_only() Entered")
+    global CURRENT_CELL_OBJ
+    log.debug("lp - Cell Name: %s", addr)
+    gbl_cell = cast(CellObj, CURRENT_CELL_OBJ)
+    doc = cast(CalcDoc, Lo.current_doc)
+    # sheet names are looked up before document names so the current sheet is part of the key.
+    key = (addr, gbl_cell.sheet_idx)
+    return _handle_named_entry(doc, lambda: doc.sheets[gbl_cell.sheet_idx], addr, key, log, **kwargs)
 
 
 def _handle_sheet_named_range_only(addr: str, log: LogInst, **kwargs) -> Any:  # noqa: ANN003, ANN401
@@ -217,40 +484,37 @@ def _handle_sheet_named_range_only(addr: str, log: LogInst, **kwargs) -> Any:  #
     log.debug("lp - Cell Name: %s", addr)
     doc = cast(CalcDoc, Lo.current_doc)
     sheet_name, data_name = addr.split(".")
-    sheet = doc.sheets.get_by_name(sheet_name)
-
-    if log.is_debug:
-        names = sheet.named_ranges.get_element_names()
-        log.debug("lp - Sheet Named Ranges: %s", names)
-
-        names = doc.named_ranges.get_element_names()
-        log.debug("lp - Doc Named Ranges: %s", names)
-
-    if sheet.named_ranges.has_by_name(data_name):
-        log.debug("lp - Named range found in sheet Name Ranges: %s", data_name)
-        nc = sheet.named_ranges.get_by_name(data_name)
-    elif doc.named_ranges.has_by_name(data_name):
-        log.debug("lp - Named range found in doc Named Ranges: %s", data_name)
-        nc = doc.named_ranges.get_by_name(data_name)
-        # try to get the current sheet from the named range
-    elif doc.database_ranges.has_by_name(data_name):
-        log.debug("lp - Named range found in doc Database Ranges: %s", data_name)
-        nc = doc.database_ranges.get_by_name(data_name)
-    else:
-        log.error("lp - Named range %s not found in sheet or document.", data_name)
-        return _set_last_lp_result(None)
-
-    cell_range = cast("SheetCellRange", nc.get_referred_cells())
-    rng_addr = cell_range.AbsoluteName.replace("$", "")
-    if doc.range_converter.is_cell_range_name(rng_addr):
-        # range return a DataFrame
-        return _handle_sheet_range_only(rng_addr, log, **kwargs)
-    else:
-        # single cell. return the cell value
-        return _handle_sheet_cell(rng_addr, log, **kwargs)
+    return _handle_named_entry(doc, lambda: doc.sheets.get_by_name(sheet_name), data_name, (addr, -1), log, **kwargs)
 
 
 def lp(addr: str, **kwargs: Any) -> Any:  # noqa: ANN401
+    """
+    Gets the value of a cell or the data of a range.
+
+    Args:
+        addr (str): Address of a cell, range or named range such as ``A1``, ``Sheet1.A1:F50`` or ``MyData``.
+
+    Keyword Args:
+        collapse (bool, optional): Reduces a range to the area that contains data. Defaults to ``False``.
+        column_types (dict, optional): Types of range columns by name or index such as
+            ``{"Date": "date", "Qty": "int64", "Region": "category"}``. Typed columns are created directly in
+            their type. Supported types are ``date``, ``int64``, ``float64``, ``float32``, ``bool``,
+            ``category``, ``string`` and ``string[pyarrow]``.
+        chunksize (int, optional): For ranges, returns an iterator of DataFrames of ``chunksize`` rows that are
+            read from the sheet as they are used, instead of a single DataFrame. Defaults to ``0``.
+        lazy (bool, optional): For ranges, returns a ``LazyDataFrame`` that knows the shape and columns of the range
+            and reads only the selected columns for ``df["a"]`` or ``df[["a", "b"]]``. Any other use reads the
+            whole range. A range that is already cached is returned as a DataFrame. Defaults to ``False``.
+        usecols (Any, optional): For ranges, the columns to read as in ``pandas.read_csv()``: a column label or
+            zero-based index, a list of them or a callable that gets each column label. Only the cells of these
+            columns are read from the sheet.
+        skiprows (int, optional): For ranges, number of rows below the headers that are not read. Defaults to ``0``.
+        nrows (int, optional): For ranges, number of rows to read. Defaults to all the rows.
+            When ``usecols``, ``skiprows`` or ``nrows`` is given, ``chunksize`` and ``lazy`` are ignored.
+
+    Returns:
+        Any: Cell value, DataFrame, ``LazyDataFrame`` or iterator of DataFrames. ``None`` if the address is not valid.
+    """
     global CURRENT_CELL_OBJ, _RULES_ENGINE
     # break_mgr.check_breakpoint("pythonpath.libre_pythonista_lib.code.mod_helper.lp_mod.lp")
     log = LogInst()
@@ -289,3 +553,208 @@ def lp(addr: str, **kwargs: Any) -> Any:  # noqa: ANN401
     except Exception as e:
         log.error("lp - Exception: %s", e, exc_info=True)
         return _set_last_lp_result(None)
+
+
+def _get_lp_cell_obj(doc: CalcDoc, addr: str, kind: LpEnum) -> CellObj | None:
+    """Gets the cell of a cell address or ``None`` if the address is not a cell address."""
+    if kind == LpEnum.CELL_ONLY:
+        gbl_cell = cast(CellObj, CURRENT_CELL_OBJ)
+        cell_obj = CellObj.from_cell(addr)
+        cell_obj.set_sheet_index(gbl_cell.sheet_idx)
+        return cell_obj
+    if kind == LpEnum.SHEET_CELL:
+        sheet_name, addr_str = addr.split(".")
+        cell_obj = CellObj.from_cell(addr_str)
+        cell_obj.set_sheet_index(doc.sheets.get_by_name(sheet_name).sheet_index)
+        return cell_obj
+    return None
+
+
+def _get_lp_range_obj(doc: CalcDoc, addr: str, kind: LpEnum, log: LogInst) -> RangeObj | None:
+    """Gets the range of a range or named range address or ``None`` if the address is not a range."""
+    if kind == LpEnum.RNG_ONLY:
+        gbl_cell = cast(CellObj, CURRENT_CELL_OBJ)
+        rng_obj = RangeObj.from_range(addr)
+        rng_obj.set_sheet_index(gbl_cell.sheet_idx)
+        return rng_obj
+    if kind == LpEnum.NAMED_RNG:
+        gbl_cell = cast(CellObj, CURRENT_CELL_OBJ)
+        entry = _get_named_entry(doc, lambda: doc.sheets[gbl_cell.sheet_idx], addr, (addr, gbl_cell.sheet_idx), log)
+        if entry is None or not entry.is_range:
+            return None
+        addr = entry.addr
+    elif kind == LpEnum.SHEET_NAMED_RNG:
+        sheet_name, data_name = addr.split(".")
+        entry = _get_named_entry(doc, lambda: doc.sheets.get_by_name(sheet_name), data_name, (addr, -1), log)
+        if entry is None or not entry.is_range:
+            return None
+        addr = entry.addr
+    elif kind != LpEnum.SHEET_RNG:
+        return None
+    sheet_name, addr_str = addr.split(".")
+    if not doc.range_converter.is_cell_range_name(addr_str):
+        return None
+    rng_obj = RangeObj.from_range(addr_str)
+    rng_obj.set_sheet_index(doc.sheets.get_by_name(sheet_name).sheet_index)
+    return rng_obj
+
+
+def _get_sheet_range_values(
+    doc: CalcDoc,
+    sheet_idx: int,
+    ranges: Dict[str, RangeObj],
+    collapse: bool,
+    column_types: Any,  # noqa: ANN401
+    log: LogInst,
+) -> Dict[str, Any]:
+    """
+    Gets the DataFrames of ranges of the same sheet.
+
+    Ranges that are not cached are read in one call when the range that contains them is not much larger.
+    """
+    sheet = doc.sheets[sheet_idx]
+    cache = RangeCache(doc)
+    rng_objs: Dict[str, RangeObj] = {}
+    for key, addr_rng in ranges.items():
+        cache_key = _get_range_key(cache, addr_rng, collapse, column_types)
+        if cache_key is None or cache_key not in cache:
+            rng_objs[key] = _collapse_to_used(sheet, addr_rng) if collapse else addr_rng
+
+    arr = None
+    rv = None
+    if len(rng_objs) > 1:
+        rvs = [ro.get_range_values() for ro in rng_objs.values()]
+        rv = RangeValues(
+            col_start=min(r.col_start for r in rvs),
+            col_end=max(r.col_end for r in rvs),
+            row_start=min(r.row_start for r in rvs),
+            row_end=max(r.row_end for r in rvs),
+            sheet_idx=sheet_idx,
+        )
+        size = (rv.col_end - rv.col_start + 1) * (rv.row_end - rv.row_start + 1)
+        used = sum((r.col_end - r.col_start + 1) * (r.row_end - r.row_start + 1) for r in rvs)
+        # cells between the ranges are read and discarded.
+        if size <= _MAX_BATCH_RANGE_CELLS and size <= used * 2:
+            try:
+                log.debug("lp_many - Reading %i ranges of sheet %i in one call: %s", len(rvs), sheet_idx, rv)
+                arr = sheet.get_array(range_obj=RangeObj.from_range(rv))
+            except Exception:
+                log.debug("lp_many - Unable to read ranges of sheet %i in one call", sheet_idx, exc_info=True)
+
+    values: Dict[str, Any] = {}
+    for key, addr_rng in ranges.items():
+        rng_obj = rng_objs.get(key, None)
+        data = None
+        if arr is not None and rv is not None and rng_obj is not None:
+            r = rng_obj.get_range_values()
+            col_start = r.col_start - rv.col_start
+            col_end = r.col_end - rv.col_start + 1
+            data = [row[col_start:col_end] for row in arr[r.row_start - rv.row_start : r.row_end - rv.row_start + 1]]
+        values[key] = _read_range_data(sheet, addr_rng, collapse, column_types, log, rng_obj, data).data
+    return values
+
+
+def _get_sheet_cell_values(doc: CalcDoc, sheet_idx: int, cells: Dict[str, CellObj], log: LogInst) -> Dict[str, Any]:
+    """Gets the values of cells of the same sheet, reading the cells that are close together in one call."""
+    cm = CellMgr(doc)  # singleton
+    sheet = doc.sheets[sheet_idx]
+    values: Dict[str, Any] = {}
+    remaining: Dict[str, CellObj] = {}
+    for key, cell_obj in cells.items():
+        if cm.has_cell(cell_obj=cell_obj):
+            values[key] = cm.get_py_src(cell_obj=cell_obj).value
+        else:
+            remaining[key] = cell_obj
+    if not remaining:
+        return values
+
+    arr = None
+    cols = [co.col_obj.index for co in remaining.values()]
+    rows = [co.row - 1 for co in remaining.values()]
+    rv = RangeValues(col_start=min(cols), col_end=max(cols), row_start=min(rows), row_end=max(rows), sheet_idx=sheet_idx)
+    if len(remaining) > 1 and (rv.col_end - rv.col_start + 1) * (rv.row_end - rv.row_start + 1) <= _MAX_BATCH_CELLS:
+        try:
+            arr = sheet.get_array(range_obj=RangeObj.from_range(rv))
+        except Exception:
+            log.debug("lp_many - Unable to read cells of sheet %i in one call", sheet_idx, exc_info=True)
+    for key, cell_obj in remaining.items():
+        value = None
+        if arr is not None:
+            value = arr[cell_obj.row - 1 - rv.row_start][cell_obj.col_obj.index - rv.col_start]
+        if value is None or value == "":
+            # empty cells, errors and empty text are read one at a time to get the same value as lp().
+            value = sheet[cell_obj].value
+        values[key] = value
+    return values
+
+
+def lp_many(addrs: Mapping[str, str], **kwargs: Any) -> Dict[str, Any]:  # noqa: ANN401
+    """
+    Gets the values of several cells and ranges.
+
+    All the addresses are resolved before any data is read. The values of the cells of each sheet
+    are read together, as are the ranges and named ranges of each sheet that are not cached.
+    With ``chunksize``, ``lazy``, ``usecols``, ``skiprows`` or ``nrows`` ranges are read as ``lp()`` reads them.
+
+    Args:
+        addrs (Mapping[str, str]): Addresses by name such as ``{"sales": "Sheet1.A1:F5000", "x": "B2"}``.
+
+    Keyword Args:
+        Same as ``lp()``. They apply to all the addresses.
+
+    Returns:
+        Dict[str, Any]: Value of each address by name, in the order of ``addrs``.
+        The value is ``None`` when the address is not valid.
+    """
+    log = LogInst()
+    log.debug("lp_many - Current Cell Obj Global: %s", CURRENT_CELL_OBJ)
+    results: Dict[str, Any] = {}
+    try:
+        doc = cast(CalcDoc, Lo.current_doc)
+        # ranges read in other ways than the whole range at once are left to lp().
+        read_ranges = (
+            _get_chunksize(log, **kwargs) == 0
+            and not _get_lazy(log, **kwargs)
+            and _get_partial_args(log, **kwargs) is None
+        )
+        cells: Dict[int, Dict[str, CellObj]] = {}
+        ranges: Dict[int, Dict[str, RangeObj]] = {}
+        others: Dict[str, str] = {}
+        for key, addr in addrs.items():
+            try:
+                kind = _RULES_ENGINE.get_matched_rule(addr).get_value() if addr else LpEnum.EMPTY
+                cell_obj = _get_lp_cell_obj(doc, addr, kind)
+                rng_obj = _get_lp_range_obj(doc, addr, kind, log) if cell_obj is None and read_ranges else None
+            except Exception:
+                log.error("lp_many - Unable to resolve address: %s", addr, exc_info=True)
+                results[key] = None
+                continue
+            if cell_obj is not None:
+                cells.setdefault(cell_obj.sheet_idx, {})[key] = cell_obj
+            elif rng_obj is not None:
+                ranges.setdefault(rng_obj.sheet_idx, {})[key] = rng_obj
+            else:
+                others[key] = addr
+
+        for sheet_idx, sheet_cells in cells.items():
+            try:
+                results.update(_get_sheet_cell_values(doc, sheet_idx, sheet_cells, log))
+            except Exception:
+                log.error("lp_many - Unable to read cells of sheet %i", sheet_idx, exc_info=True)
+        if ranges:
+            try:
+                collapse = bool(kwargs.get("collapse", False))
+            except Exception:
+                log.warning("collapse parameter must be a boolean value. Using False.")
+                collapse = False
+            column_types = kwargs.get("column_types")
+            for sheet_idx, sheet_ranges in ranges.items():
+                try:
+                    results.update(_get_sheet_range_values(doc, sheet_idx, sheet_ranges, collapse, column_types, log))
+                except Exception:
+                    log.error("lp_many - Unable to read ranges of sheet %i", sheet_idx, exc_info=True)
+        for key, addr in others.items():
+            results[key] = lp(addr, **kwargs)
+    except Exception as e:
+        log.error("lp_many - Exception: %s", e, exc_info=True)
+    return _set_last_lp_result({key: results.get(key, None) for key in addrs})
@@ -0,0 +1,94 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import Callable, Dict, Tuple, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from ooodev.proto.office_document_t import OfficeDocumentT
+
+LpNameKey = Tuple[str, int]
+"""Name cache key in the format of ``(name, sheet_idx)``. ``sheet_idx`` is ``-1`` for names that include the sheet."""
+
+
+@dataclass
+class LpNameEntry:
+    """Address a named range or database range referred to when it was resolved."""
+
+    addr: str
+    """Address of the referred cells such as ``Sheet1.A1:F50`` or ``Sheet1.B2``."""
+    is_range: bool
+    """If the address is a range; Otherwise, a single cell."""
+    is_valid: Callable[[], bool]
+    """Checks the name still refers to the same cells, such as after the name is changed or the sheet is renamed."""
+
+
+class LpNameCache:
+    """
+    Per document cache of the names resolved by ``lp()``.
+
+    Entries are checked with ``LpNameEntry.is_valid`` when they are used and removed when they are no longer valid.
+    A name of a sheet that is added after a document name of the same name was resolved is not seen until
+    ``clear()`` is called.
+    """
+
+    _instances: Dict[str, LpNameCache] = {}
+
+    def __new__(cls, doc: OfficeDocumentT) -> LpNameCache:
+        key = f"doc_{doc.runtime_uid}"
+        if key not in cls._instances:
+            inst = super().__new__(cls)
+            inst._is_init = False
+            cls._instances[key] = inst
+        return cls._instances[key]
+
+    def __init__(self, doc: OfficeDocumentT) -> None:
+        if getattr(self, "_is_init", False):
+            return
+        self._entries: Dict[LpNameKey, LpNameEntry] = {}
+        self._is_init = True
+
+    def get(self, key: LpNameKey) -> LpNameEntry | None:
+        """
+        Gets an entry if it is still valid.
+
+        Args:
+            key (LpNameKey): Entry key.
+
+        Returns:
+            LpNameEntry | None: Entry or ``None`` if not cached or no longer valid.
+        """
+        entry = self._entries.get(key, None)
+        if entry is None:
+            return None
+        try:
+            valid = entry.is_valid()
+        except Exception:
+            # the name has been removed.
+            valid = False
+        if not valid:
+            self._entries.pop(key, None)
+            return None
+        return entry
+
+    def put(self, key: LpNameKey, entry: LpNameEntry) -> None:
+        """Adds an entry, replacing any entry with the same key."""
+        self._entries[key] = entry
+
+    def clear(self) -> None:
+        """Removes all entries."""
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @classmethod
+    def reset_instance(cls, runtime_uid: str) -> None:
+        """
+        Removes the instance of a document.
+
+        Args:
+            runtime_uid (str): Runtime uid of the document.
+        """
+        cls._instances.pop(f"doc_{runtime_uid}", None)
+
+    def __repr__(self) -> str:
+        return f"<LpNameCache(entries={len(self)})>"
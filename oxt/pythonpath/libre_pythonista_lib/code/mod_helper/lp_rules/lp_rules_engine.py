@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import List, Type, TYPE_CHECKING
+from typing import Dict, List, Type, TYPE_CHECKING
 from .rule_cell_only import RuleCellOnly
 from .rule_empty import RuleEmpty
 from .rule_named_range import RuleNamedRange
@@ -11,6 +11,8 @@ from .rule_sheet_range import RuleSheetRange
 if TYPE_CHECKING:
     from .lp_rule_t import LpRuleT
 
+_MAX_MATCHED = 4096
+
 
 class LpRulesEngine:
     """Manages rules for Lp Function"""
@@ -23,6 +25,8 @@ class LpRulesEngine:
             auto_register (bool, optional): Determines if know rules are automatically registered. Defaults to True.
         """
         self._rules: List[Type[LpRuleT]] = []
+        # rules only depend on the value, matches are kept until the rules change.
+        self._matched: Dict[str, LpRuleT] = {}
         if auto_register:
             self._register_known_rules()
 
@@ -68,6 +72,7 @@ class LpRulesEngine:
         if rule in self._rules:
             return
         self._rules.insert(index, rule)
+        self._matched.clear()
 
     def remove_rule(self, rule: Type[LpRuleT]) -> None:
         """
@@ -81,6 +86,7 @@ class LpRulesEngine:
         """
         try:
             self._rules.remove(rule)
+            self._matched.clear()
         except ValueError as e:
             msg = f"{self.__class__.__name__}.unregister_rule() Unable to unregister rule."
             raise ValueError(msg) from e
@@ -97,12 +103,14 @@ class LpRulesEngine:
         """
         try:
             del self._rules[index]
+            self._matched.clear()
         except IndexError as e:
             msg = f"{self.__class__.__name__}.unregister_rule() Unable to unregister rule."
             raise ValueError(msg) from e
 
     def _reg_rule(self, rule: Type[LpRuleT]) -> None:
         self._rules.append(rule)
+        self._matched.clear()
 
     def _register_known_rules(self) -> None:
         # order matters
@@ -125,7 +133,9 @@ class LpRulesEngine:
         Returns:
             List[LpRuleT]: List of matched rules
         """
-        found_rule = None
+        found_rule = self._matched.get(value, None)
+        if found_rule is not None:
+            return found_rule
         for rule in self._rules:
             inst = rule(value)
 
@@ -133,6 +143,9 @@ class LpRulesEngine:
                 found_rule = inst
                 break
         if found_rule:
+            if len(self._matched) >= _MAX_MATCHED:
+                self._matched.clear()
+            self._matched[value] = found_rule
             return found_rule
         # this should never happen LastDict is always a match
         raise ValueError(f"No rule matched for: {value}")
@@ -0,0 +1,192 @@
+from __future__ import annotations
+from typing import Any, Dict, Iterable, Tuple
+
+from sortedcontainers import SortedDict
+
+CellKey = Tuple[int, int, int]
+"""Cell key in the format of ``(sheet_idx, row, col)``."""
+
+_MISSING = object()
+"""Marks a name that a cell deleted from the module."""
+
+
+class ModSnapshots:
+    """
+    Compact history of the module state.
+
+    Instead of a copy of the module dictionary for each cell, only the names a cell changed are stored.
+    The state of the module before any cell is rebuilt from the initial module dictionary
+    by applying the changes of the cells that come before it.
+
+    A single working copy of the module dictionary, the state before the cell that is executing,
+    is kept to find the names a cell changed.
+    Values are compared by identity so this is a shallow snapshot, the same as ``dict.copy()``.
+    """
+
+    def __init__(self, base: Dict[str, Any], max_snapshots: int = 0) -> None:
+        """
+        Constructor
+
+        Args:
+            base (Dict[str, Any]): Module dictionary before any cell is executed.
+            max_snapshots (int, optional): Maximum number of cells to keep changes for.
+                Changes are kept for the first cells in execution order. ``0`` for no limit. Defaults to ``0``.
+        """
+        self._base = base
+        self._max_snapshots = max(0, max_snapshots)
+        self._deltas: SortedDict[CellKey, Dict[str, Any]] = SortedDict()
+        self._shadow: Dict[str, Any] = dict(base)
+        self._full_scan = False
+
+    def __len__(self) -> int:
+        return len(self._deltas)
+
+    def __contains__(self, key: CellKey) -> bool:
+        return key in self._deltas
+
+    def rewind(self, keys: Iterable[CellKey]) -> Tuple[int, Dict[str, Any]]:
+        """
+        Rebuilds the state of the module after the cells of ``keys``.
+
+        The changes of the cells are applied in order until a cell is reached that has no stored changes.
+        The result becomes the starting point for the next :py:meth:`record` or :py:meth:`restore` call.
+
+        Args:
+            keys (Iterable[CellKey]): Keys of the cells to apply, in execution order.
+
+        Returns:
+            Tuple[int, Dict[str, Any]]: The number of cells applied and the module state after them.
+        """
+        count, state = self.get_state(keys)
+        self._shadow = dict(state)
+        return count, state
+
+    def get_state(self, keys: Iterable[CellKey]) -> Tuple[int, Dict[str, Any]]:
+        """
+        Rebuilds the state of the module after the cells of ``keys`` the same as :py:meth:`rewind`
+        without changing the starting point of the next :py:meth:`record` call.
+
+        Args:
+            keys (Iterable[CellKey]): Keys of the cells to apply, in execution order.
+
+        Returns:
+            Tuple[int, Dict[str, Any]]: The number of cells applied and the module state after them.
+        """
+        state = dict(self._base)
+        count = 0
+        for key in keys:
+            delta = self._deltas.get(key, None)
+            if delta is None:
+                break
+            self._apply(delta, state)
+            count += 1
+        return count, state
+
+    def record(self, key: CellKey, mod_dict: Dict[str, Any], names: Iterable[str] | None = None) -> int:
+        """
+        Records the names a cell changed.
+
+        Only the names the cell may have bound or deleted are compared, such as ``CodeRefs.writes``.
+        When ``names`` is ``None`` the whole module dictionary is compared and so are the dictionaries
+        of all later cells until :py:meth:`clear` is called, because the functions created by a dynamic cell
+        can bind names when a later cell calls them.
+
+        Args:
+            key (CellKey): Key of the cell that was executed.
+            mod_dict (Dict[str, Any]): Module dictionary after the cell was executed.
+            names (Iterable[str], None, optional): Names the cell may have bound or deleted.
+                ``None`` if they are not known. Defaults to ``None``.
+
+        Returns:
+            int: The number of changed names.
+        """
+        if names is None:
+            self._full_scan = True
+        if self._full_scan or names is None:
+            delta = self._get_full_delta(mod_dict)
+        else:
+            delta = self._get_names_delta(mod_dict, names)
+        self._apply(delta, self._shadow)
+        self._deltas[key] = delta
+        if self._max_snapshots and len(self._deltas) > self._max_snapshots:
+            self._deltas.popitem(-1)
+        return len(delta)
+
+    def _get_full_delta(self, mod_dict: Dict[str, Any]) -> Dict[str, Any]:
+        shadow = self._shadow
+        delta: Dict[str, Any] = {}
+        added = 0
+        for name, value in mod_dict.items():
+            old = shadow.get(name, _MISSING)
+            if old is not value:
+                delta[name] = value
+                if old is _MISSING:
+                    added += 1
+        if len(shadow) + added != len(mod_dict):
+            for name in shadow:
+                if name not in mod_dict:
+                    delta[name] = _MISSING
+        return delta
+
+    def _get_names_delta(self, mod_dict: Dict[str, Any], names: Iterable[str]) -> Dict[str, Any]:
+        shadow = self._shadow
+        delta: Dict[str, Any] = {}
+        for name in names:
+            value = mod_dict.get(name, _MISSING)
+            if shadow.get(name, _MISSING) is not value:
+                delta[name] = value
+        return delta
+
+    def restore(self, key: CellKey, mod_dict: Dict[str, Any]) -> bool:
+        """
+        Applies the changes that a cell made when it last executed without executing it.
+
+        Args:
+            key (CellKey): Key of the cell.
+            mod_dict (Dict[str, Any]): Module dictionary to apply the changes to.
+
+        Returns:
+            bool: ``False`` if there are no changes stored for the cell and it must be executed; Otherwise, ``True``.
+        """
+        delta = self._deltas.get(key, None)
+        if delta is None:
+            return False
+        self._apply(delta, mod_dict)
+        self._apply(delta, self._shadow)
+        return True
+
+    def remove(self, key: CellKey) -> None:
+        """
+        Removes the changes stored for a cell.
+
+        Args:
+            key (CellKey): Key of the cell.
+        """
+        self._deltas.pop(key, None)
+
+    def clear(self) -> None:
+        """Removes all stored changes."""
+        self._deltas.clear()
+        self._shadow = dict(self._base)
+        self._full_scan = False
+
+    def _apply(self, delta: Dict[str, Any], state: Dict[str, Any]) -> None:
+        for name, value in delta.items():
+            if value is _MISSING:
+                state.pop(name, None)
+            else:
+                state[name] = value
+
+    @property
+    def max_snapshots(self) -> int:
+        """Gets/Sets the maximum number of cells to keep changes for. ``0`` for no limit."""
+        return self._max_snapshots
+
+    @max_snapshots.setter
+    def max_snapshots(self, value: int) -> None:
+        self._max_snapshots = max(0, value)
+        while self._max_snapshots and len(self._deltas) > self._max_snapshots:
+            self._deltas.popitem(-1)
+
+    def __repr__(self) -> str:
+        return f"<ModSnapshots(cells={len(self)})>"
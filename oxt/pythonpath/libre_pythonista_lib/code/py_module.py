@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import Any, TYPE_CHECKING
+from typing import Any, Dict, Tuple, TYPE_CHECKING
 import importlib.util
 
 # import importlib
@@ -7,11 +7,12 @@ import types
 from ooodev.utils.helper.dot_dict import DotDict
 
 # from ooodev.utils.builder.dynamic_importer import DynamicImporter
-from ..utils import str_util
 from .rules.code_rules import CodeRules
+from .code_cache import CodeCache, CompiledCode
 
 from .mod_helper.lplog import LpLog as LibrePythonistaLog
 from ..cell.errors.general_error import GeneralError
+from ..data.lazy_data_frame import LazyDataFrame
 
 
 if TYPE_CHECKING:
@@ -34,6 +35,23 @@ except ImportError:
     lp_plot = None
 
 
+def load_lazy_result(result: Any) -> Any:  # noqa: ANN401
+    """
+    Reads the data of a ``LazyDataFrame`` result of ``lp()``.
+
+    The result of a cell is shown in the cell so it can not stay lazy.
+
+    Args:
+        result (Any): Result of the code, usually a ``DotDict``.
+
+    Returns:
+        Any: The result, with the ``data`` of a ``DotDict`` result read if it is a ``LazyDataFrame``.
+    """
+    if isinstance(result, DotDict) and isinstance(result.get("data", None), LazyDataFrame):
+        result.data = result.data.load()
+    return result
+
+
 def get_module_init_code() -> str:
     # See https://matplotlib.org/stable/users/explain/figure/backends.html
     # for more information on the matplotlib backend.
@@ -61,7 +79,7 @@ def get_module_init_code() -> str:
         "from ___lo_pip___.oxt_logger import OxtLogger",
         "from libre_pythonista_lib.log.log_inst import LogInst",
         "from libre_pythonista_lib.code.mod_helper import lp_mod",
-        "from libre_pythonista_lib.code.mod_helper.lp_mod import lp",
+        "from libre_pythonista_lib.code.mod_helper.lp_mod import lp, lp_many",
         "from libre_pythonista_lib.code.mod_helper.lplog import StaticLpLog as lp_log, LpLog as LibrePythonistaLog",
         "from libre_pythonista_lib.code.mod_helper import lp_plot",
         "PY_ARGS = None",
@@ -79,6 +97,7 @@ class PyModule:
 
         self.mod = types.ModuleType("PyMod")
         self._cr = CodeRules()
+        self._code_cache = CodeCache()
         self._init_mod()
 
     def _init_mod(self) -> None:
@@ -113,12 +132,36 @@ class PyModule:
         with self._log.indent(True):
             self._log.debug("reset_module() done.")
 
-    def update_with_result(self, code: str = "") -> DotDict:
+    def _exec_code(self, compiled: CompiledCode, mod: types.ModuleType | None = None) -> DotDict | None:
+        """
+        Executes code in the module in a single pass.
+
+        If the code ends with an expression statement the expression is evaluated once, after the rest of the code,
+        and its value is captured. This is the same as how an interactive shell gets the value of the last line.
+
+        Args:
+            compiled (CompiledCode): Compiled code.
+            mod (ModuleType, optional): Module to execute the code in. Defaults to this module.
+
+        Returns:
+            DotDict | None: The value of the trailing expression in the ``data`` key if the code ends with an expression; Otherwise, ``None``.
+        """
+        if mod is None:
+            mod = self.mod
+        if compiled.body is not None:
+            exec(compiled.body, mod.__dict__)
+        if compiled.expr is None:
+            return None
+        value = eval(compiled.expr, mod.__dict__)
+        return DotDict(data=value)
+
+    def update_with_result(self, code: str = "", filename: str = "<string>") -> DotDict:
         """
         Appends code to current module and returns the last variable in the module.
 
         Args:
             code (str, optional): Any valid python code
+            filename (str, optional): File name used in tracebacks such as the cell address. Defaults to ``<string>``.
 
         Returns:
             Any: The last variable in the module if any; Otherwise, None.
@@ -129,8 +172,8 @@ class PyModule:
         with self._log.indent(True):
             self._log.debug("update_with_result() Entered.")
         try:
-            code = str_util.remove_comments(code)
-            code = str_util.clean_string(code)
+            compiled = self._code_cache.get(code, filename)
+            code = compiled.code
             # self._log.debug(f"Cleaned code. \n{code}")
         except Exception:
             self._log.exception(f"Error cleaning code: {code}")
@@ -138,45 +181,110 @@ class PyModule:
 
         result = None
         try:
+            expr_result = None
             if code:
                 self._log.debug("Executing code.")
                 # run exec in a new thread and wait for it to finish
                 # t = threading.Thread(target=exec, args=(code, self.mod.__dict__), daemon=True)
                 # t.start()
                 # t.join()
-                exec(code, self.mod.__dict__)
+                expr_result = self._exec_code(compiled)
                 self._log.debug("Executed code.")
-            rule = self._cr.get_matched_rule(self.mod, code)
+            rule = self._cr.get_matched_rule(self.mod, code, expr_result)
             self._log.debug("Got matched rule.")
-            result = rule.get_value()
+            result = load_lazy_result(rule.get_value())
             self._log.debug("Got result.")
             rule.reset()
             self._log.debug("Reset rule.")
             return result
         # other exceptions can be caught and new error classes can be created.
         except Exception as e:
-            with self._log.indent(True):
+            result = self.get_error_result(e, code)
+        return result
+
+    def get_error_result(self, e: Exception, code: str = "") -> DotDict:
+        """
+        Logs an error raised by cell code and gets the result for it.
+
+        Must be called while the error is being handled, or with an error that has a traceback,
+        so the traceback is included in the log.
+
+        Args:
+            e (Exception): Error raised by the code.
+            code (str, optional): Code that raised the error. Defaults to ``""``.
+
+        Returns:
+            DotDict: A DotDict with ``data=GeneralError(e)`` and ``error=True``.
+        """
+        exc_info = (type(e), e, e.__traceback__)
+        with self._log.indent(True):
+            try:
+                # result will be assigned to the py_source.value Other rules for the cell will handle this.
+                result = DotDict(data=GeneralError(e), error=True)
                 try:
-                    # result will be assigned to the py_source.value Other rules for the cell will handle this.
-                    result = DotDict(data=GeneralError(e), error=True)
-                    try:
-                        lp_log_inst = LibrePythonistaLog()
-                        ps_log = lp_log_inst.log
-                        if lp_log_inst.log_extra_info:
-                            ps_log.error(f"Error updating module.\n{code}\n", exc_info=True)
-                        else:
-                            ps_log.error(f"{e}")
-                    except Exception as e:
-                        self._log.error(f"LibrePythonistaLog error", exc_info=True)
-                    if self._log.is_debug:
-                        self._log.warning(f"Error updating module. Result set to {result}.\n{code}\n", exc_info=True)
+                    lp_log_inst = LibrePythonistaLog()
+                    ps_log = lp_log_inst.log
+                    if lp_log_inst.log_extra_info:
+                        ps_log.error(f"Error updating module.\n{code}\n", exc_info=exc_info)
                     else:
-                        self._log.warning(f"Error updating module. Result set to {result}.\n", exc_info=True)
+                        ps_log.error(f"{e}")
                 except Exception:
-                    self._log.exception(f"update_with_result() Error updating module.\n{code}\n")
-                    raise
+                    self._log.error(f"LibrePythonistaLog error", exc_info=True)
+                if self._log.is_debug:
+                    self._log.warning(f"Error updating module. Result set to {result}.\n{code}\n", exc_info=exc_info)
+                else:
+                    self._log.warning(f"Error updating module. Result set to {result}.\n", exc_info=exc_info)
+            except Exception:
+                self._log.exception(f"update_with_result() Error updating module.\n{code}\n")
+                raise
         return result
 
+    def update_isolated(
+        self, mod_dict: Dict[str, Any], code: str = "", filename: str = "<string>", **global_vars: Any
+    ) -> Tuple[DotDict, Dict[str, Any]]:
+        """
+        Executes code in a new module that starts as a copy of a module dictionary.
+
+        This module is not changed. Unlike ``update_with_result()`` errors are not handled,
+        so this method can be called from a worker thread, see ``LevelExecutor``.
+        Functions created by the code keep the new module as their globals, code that creates functions
+        must be executed with ``update_with_result()``, see ``DepGraph.get_levels()``.
+
+        Args:
+            mod_dict (Dict[str, Any]): Module dictionary to start from.
+            code (str, optional): Any valid python code
+            filename (str, optional): File name used in tracebacks such as the cell address. Defaults to ``<string>``.
+            global_vars (Any): Global variables to set in the new module before the code is executed.
+
+        Returns:
+            Tuple[DotDict, Dict[str, Any]]: The result of the code and the dictionary of the new module.
+
+        Raises:
+            Exception: Any error raised by the code.
+        """
+        mod = types.ModuleType("PyMod")
+        mod.__dict__.update(mod_dict)
+        mod.__dict__.update(global_vars)
+        compiled = self._code_cache.get(code, filename)
+        expr_result = None
+        if compiled.code:
+            expr_result = self._exec_code(compiled, mod)
+        # rules hold state while matching, each thread needs its own.
+        rule = CodeRules().get_matched_rule(mod, compiled.code, expr_result)
+        result = load_lazy_result(rule.get_value())
+        rule.reset()
+        return result, mod.__dict__
+
+    @property
+    def init_dict(self) -> Dict[str, Any]:
+        """Gets the module dictionary before any cell code is executed."""
+        return self._init_dict
+
+    @property
+    def code_cache(self) -> CodeCache:
+        """Gets the cache of compiled code."""
+        return self._code_cache
+
     def set_global_var(self, var_name: str, value: Any) -> None:
         """
         Set a global variable in the module.
@@ -192,13 +300,14 @@ class PyModule:
             self.mod.__dict__["lp_mod"].CURRENT_CELL_OBJ = value
         self.mod.__dict__[var_name] = value
 
-    def reset_to_dict(self, mod_dict: dict, code: str = "") -> Any:
+    def reset_to_dict(self, mod_dict: dict, code: str = "", filename: str = "<string>") -> Any:
         """
         Reset the module to the given dictionary and returns the last variable in the module if code is present.
 
         Args:
             mod_dict (dict): A dictionary of variables to reset the module to.
             code (str, optional): Any valid python code
+            filename (str, optional): File name used in tracebacks such as the cell address. Defaults to ``<string>``.
 
         Returns:
             Any: If there is code the last variable in the module if any; Otherwise, None.
@@ -209,14 +318,14 @@ class PyModule:
         self.mod.__dict__.update(mod_dict)
         if not code:
             return None
-        code = str_util.remove_comments(code)
-        code = str_util.clean_string(code)
+        compiled = self._code_cache.get(code, filename)
+        code = compiled.code
         if code:
-            exec(code, self.mod.__dict__)
+            expr_result = self._exec_code(compiled)
         else:
             return None
-        rule = self._cr.get_matched_rule(self.mod, code)
-        result = rule.get_value()
+        rule = self._cr.get_matched_rule(self.mod, code, expr_result)
+        result = load_lazy_result(rule.get_value())
         rule.reset()
         with self._log.indent(True):
             self._log.debug("reset_to_dict() done.")
@@ -1,5 +1,8 @@
 from __future__ import annotations
-from typing import Any, List, Dict, Tuple, TYPE_CHECKING
+from typing import Any, Iterator, List, Dict, Set, Tuple, TYPE_CHECKING
+import hashlib
+import time
+import warnings
 
 from sortedcontainers import SortedDict
 
@@ -11,6 +14,7 @@ from ooodev.events.partial.events_partial import EventsPartial
 from ooodev.io.sfa import Sfa
 from ooodev.utils import gen_util as gUtil
 from ooodev.utils.data_type.cell_obj import CellObj
+from ooodev.utils.data_type.range_obj import RangeObj
 from ooodev.utils.helper.dot_dict import DotDict
 from ooodev.utils.string.str_list import StrList
 
@@ -21,8 +25,26 @@ from ..utils.gen_util import GenUtil
 # from libre_pythonista.oxt_logger.oxt_logger import OxtLogger
 from .py_module import PyModule
 from .cell_cache import CellCache
+from .dependency.code_refs import CodeRefs
+from .dependency.dep_graph import DepGraph
+from .mod_snapshots import ModSnapshots
+from .kernel.kernel_process_mgr import KernelError, KernelProcessMgr
+from .level_executor import CellTask, LevelExecutor
+from .lp_input_watch import LpInputWatch
+from .recalc_scheduler import RecalcRequest, RecalcScheduler
+from .result_store import ResultStore
+from .mod_helper.lp_enum import LpEnum
+from .mod_helper.lp_rules.lp_rules_engine import LpRulesEngine
 from ..cell.props.key_maker import KeyMaker
-from ..const.event_const import GBL_DOC_CLOSING
+from ..cell.array.array_cache import ArrayCache
+from ..cell.array.array_shapes import ArrayShapes
+from ..cell.array.array_update_worker import ArrayUpdateWorker
+from ..const.event_const import DOCUMENT_SAVING, GBL_DOC_CLOSING
+from ..data.range_cache import RangeCache
+from .mod_helper.lp_name_cache import LpNameCache
+from ..doc_props.calc_props import CalcProps
+from ..ex.exceptions import RecalcCanceledError
+from ..utils.main_thread import run_in_main_thread
 
 # from .cell_code_storage import CellCodeStorage
 
@@ -46,13 +68,13 @@ class PySource:
         self._uri = uri
         self._cell_obj = cell
         self._mgr = mgr
-        self._mod_dict = mgr.py_mod.mod.__dict__.copy()
         # pth = Path(uri)
         # self._name = pth.stem
         self._row = cell.row - 1
         self._col = cell.col_obj.index
         self._sheet_idx = cell.sheet_idx
         self._src_code = None
+        self._executed_code = None
         self._dd_data = DotDict(data=None, py_src=self)
         self._unique_id = unique_id
         self._is_init = True
@@ -124,17 +146,37 @@ class PySource:
         self._src_code = code
 
     @property
-    def mod_dict(self) -> Dict[str, Any]:
-        return self._mod_dict
+    def executed_code(self) -> str | None:
+        """Gets/Sets the source code that was last executed or ``None`` if the code has not been executed."""
+        return self._executed_code
 
-    @mod_dict.setter
-    def mod_dict(self, value: Dict[str, Any]) -> None:
-        self._mod_dict = value
+    @executed_code.setter
+    def executed_code(self, code: str | None) -> None:
+        self._executed_code = code
 
     @property
     def unique_id(self) -> str:
         return self._unique_id
 
+    @property
+    def mod_dict(self) -> Dict[str, Any]:
+        """
+        Gets a copy of the module dictionary after the cell was executed.
+
+        The dictionary is rebuilt from the names changed by this cell and the cells before it.
+        If the changes of a cell are not kept, see ``max_mod_snapshots``, the dictionary only has the changes
+        of the cells before that cell.
+
+        .. deprecated:: 0.7.6
+            The module dictionary is no longer stored for each cell.
+        """
+        warnings.warn(
+            "PySource.mod_dict is deprecated. The module dictionary is no longer stored for each cell.",
+            DeprecationWarning,
+            stacklevel=2,
+        )
+        return self._mgr._get_mod_dict((self._sheet_idx, self._row, self._col))
+
     @property
     def value(self) -> Any:
         return self._dd_data.data
@@ -185,7 +227,37 @@ class PySourceManager(EventsPartial):
         #     self._sfa.inst.create_folder(self._root_uri)
         self._mod = PyModule()
         self._data = self._get_sources()
+        self._dep_graph = DepGraph()
+        self._lp_rules = LpRulesEngine()
+        calc_props = CalcProps(self._doc)
+        self._dependency_recalc = calc_props.dependency_recalc
+        self._dirty_recalc = calc_props.dirty_recalc
+        # names changed by each cell, used to rewind the module to the state before a cell.
+        self._snapshots = ModSnapshots(self._mod.init_dict, calc_props.max_mod_snapshots)
+        self._kernel_mode = calc_props.kernel_mode
+        self._kernel: KernelProcessMgr | None = None
+        self._executor: LevelExecutor | None = None
+        self._set_executor(calc_props.max_workers)
+        self._background_recalc = calc_props.background_recalc
+        self._recalc_delay = calc_props.recalc_delay
+        self._recalc: RecalcScheduler | None = None
+        # AfterSourceUpdate events of a background recalculation, triggered on the main thread when it is done.
+        self._deferred_events: Dict[Tuple[int, int, int], EventArgs] = {}
+        # listeners on the lp() input ranges, a range is only read again when it changed.
+        self._lp_watch = LpInputWatch(self._doc)
+        # versions of the lp() input ranges of each cell when it was last executed.
+        self._lp_versions: Dict[Tuple[int, int, int], Dict[str, int | None]] = {}
+        # fingerprints of the lp() input ranges of each cell when it was last executed, only used to store results.
+        self._lp_fingerprints: Dict[Tuple[int, int, int], Dict[str, int | None]] = {}
+        # True while the module only has the names needed by the cells that were executed, see _execute_partial().
+        self._mod_partial = False
+        self._result_store: ResultStore | None = None
+        self._restore_pending = False
+        self._fn_on_document_saving = self._on_document_saving
         self._se = SharedEvent(doc)
+        self._set_result_cache(calc_props.result_cache)
+        RangeCache(self._doc).max_bytes = max(0, calc_props.lp_cache_size) * 1024 * 1024
+        self._array_max_rows = max(0, calc_props.array_max_rows)
         self._se.trigger_event("PySourceManagerCreated", EventArgs(self))
         self._is_init = True
 
@@ -200,8 +272,63 @@ class PySourceManager(EventsPartial):
 
     def dispose(self) -> None:
         if self._se is not None:
+            self._se.unsubscribe_event(DOCUMENT_SAVING, self._fn_on_document_saving)
             self._se.trigger_event("PySourceManagerDisposed", EventArgs(self))
         self._se = None
+        self.terminate_recalc()
+        self.terminate_kernel()
+        self.terminate_executor()
+        RangeCache(self._doc).clear()
+        LpNameCache(self._doc).clear()
+        self._lp_watch.clear()
+
+    def terminate_kernel(self) -> None:
+        """Terminates the kernel process if it has been started."""
+        if self._kernel is not None:
+            self._kernel.terminate()
+            self._kernel = None
+
+    def terminate_executor(self) -> None:
+        """Stops the worker threads used to execute independent cells at the same time."""
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+
+    def terminate_recalc(self) -> None:
+        """Stops the background recalculation thread if it has been started."""
+        if self._recalc is not None:
+            self._recalc.stop()
+            self._recalc = None
+
+    def _get_recalc(self) -> RecalcScheduler:
+        if self._recalc is None:
+            self._recalc = RecalcScheduler(self._run_recalc, self._recalc_delay / 1000)
+        return self._recalc
+
+    def _set_result_cache(self, value: bool) -> None:
+        if value == (self._result_store is not None):
+            return
+        if value:
+            self._result_store = ResultStore(f"{self._root_uri}/results")
+            # results are restored by the first update_all().
+            self._restore_pending = True
+            if self._se is not None:
+                self._se.subscribe_event(DOCUMENT_SAVING, self._fn_on_document_saving)
+        else:
+            self._result_store = None
+            self._restore_pending = False
+            if self._se is not None:
+                self._se.unsubscribe_event(DOCUMENT_SAVING, self._fn_on_document_saving)
+
+    def _set_executor(self, max_workers: int) -> None:
+        self.terminate_executor()
+        if max_workers > 1:
+            self._executor = LevelExecutor(max_workers)
+
+    def _get_kernel(self) -> KernelProcessMgr:
+        if self._kernel is None:
+            self._kernel = KernelProcessMgr(self._doc, self._mod)
+        return self._kernel
 
     def _get_logger(self) -> OxtLogger:
         # can be patched for testing.
@@ -520,6 +647,23 @@ class PySourceManager(EventsPartial):
         # triggered from self.update_source()
         self.unsubscribe_event("AfterUpdateSource", cb)
 
+    def subscribe_recalc_out_of_sync(self, cb: EventCallback) -> None:
+        """
+        Subscribe to recalc out of sync event.
+        This event is triggered on the main thread when a background recalculation finds that the cells
+        no longer match the code cells of the document and the instance must be reset.
+
+        Event Args are ``EventArgs`` with ``source`` set to this instance.
+
+        Args:
+            cb (EventCallback): Callback.
+
+        Return:
+            None:
+        """
+        # triggered from self._run_recalc()
+        self.subscribe_event("RecalcOutOfSync", cb)
+
     def subscribe_before_remove_source(self, cb: EventCallback) -> None:
         """
         Subscribe to before remove source event.
@@ -607,7 +751,7 @@ class PySourceManager(EventsPartial):
             code_cell = self.convert_cell_obj_to_tuple(key)
         else:
             code_cell = (key[0], key[2], key[1])
-        self._data[code_cell] = value
+        self._set_data_item(code_cell, value)
 
     def __delitem__(self, key: CellObj | Tuple[int, int, int]) -> None:
         """
@@ -711,6 +855,8 @@ class PySourceManager(EventsPartial):
             self.trigger_event("BeforeAddSource", cargs)
             if cargs.cancel:
                 return
+            if self._recalc is not None:
+                self._recalc.cancel()
             cc = CellCache(self._doc)
             code = cargs.event_data.get("code", code)
             sheet = self._doc.sheets[sheet_idx]
@@ -741,16 +887,21 @@ class PySourceManager(EventsPartial):
                 f"add_source() - inserted for cell {cell}: sheet index: {sheet_idx}"
             )
             # CellCache.reset_instance()
-            self._data[code_cell] = py_src
+            self._set_data_item(code_cell, py_src)
             index = self.get_index(cell)
             if index < 0:
                 self._log.error(f"add_source() - Cell {cell} not found.")
                 raise Exception(f"Cell {cell} not found.")
-            if self._is_last_index(index):
+            if self._background_recalc:
+                self._log.debug(f"add_source() - Requesting background recalculation from index {index}")
+                self._request_source_recalc(index)
+            elif self._is_last_index(index):
                 self._log.debug(
                     f"add_source() - Last Index, updating from index {index}"
                 )
                 self.update_from_index(index)
+            elif self._dependency_recalc and self._update_dependents(index, None):
+                self._log.debug(f"add_source() not last index, updated dependents of index {index}")
             else:
                 self._log.debug(f"add_source() not last index, Updating all")
                 self.update_all()
@@ -801,14 +952,22 @@ class PySourceManager(EventsPartial):
             if index < 0:
                 self._log.error(f"update_source() - Cell {cell} not found.")
                 raise Exception(f"Cell {cell} not found.")
+            if self._recalc is not None:
+                self._recalc.cancel()
+            old_code = src.source_code
             src.source_code = code  # writes code to file
             # CellCache.reset_instance()
 
-            if self._is_last_index(index):
+            if self._background_recalc:
+                self._log.debug(f"update_source() Requesting background recalculation from index {index}")
+                self._request_source_recalc(index)
+            elif self._is_last_index(index):
                 self._log.debug(
                     f"update_source() is last index updating from index {index}"
                 )
                 self.update_from_index(index)
+            elif self._dependency_recalc and self._update_dependents(index, old_code):
+                self._log.debug(f"update_source() not last index, updated dependents of index {index}")
             else:
                 self._log.debug(f"update_source() not last index, Updating all")
                 self.update_all()
@@ -854,8 +1013,15 @@ class PySourceManager(EventsPartial):
             self.trigger_event(f"BeforeRemoveSource_{col}_{row}", cargs)
             if cargs.cancel:
                 return
+            if self._recalc is not None:
+                # the running recalculation must not see the cells change.
+                self._recalc.cancel()
             self._data[code_cell].del_source()
-            del self._data[code_cell]
+            self._set_data_item(code_cell, None)
+            self._dep_graph.remove(code_cell)
+            self._lp_versions.pop(code_cell, None)
+            self._lp_fingerprints.pop(code_cell, None)
+            self._snapshots.remove(code_cell)
             sheet = self._doc.sheets[sheet_idx]
             calc_cell = sheet[cell]
             cc = CellCache(self._doc)
@@ -868,8 +1034,12 @@ class PySourceManager(EventsPartial):
                 self._log.debug("remove_source() custom property removed.")
             # remove the cell from the cache is faster then resetting
             # CellCache.reset_instance()
-            self._log.debug("remove_source() Calling update_all()")
-            self.update_all()
+            if self._background_recalc:
+                self._log.debug("remove_source() Requesting background recalculation of all cells")
+                self._get_recalc().request(RecalcRequest(full=True, display=True))
+            else:
+                self._log.debug("remove_source() Calling update_all()")
+                self.update_all()
 
             eargs = EventArgs.from_args(cargs)
             self.trigger_event("AfterRemoveSource", eargs)
@@ -930,11 +1100,80 @@ class PySourceManager(EventsPartial):
         with self._log.indent(True):
             try:
                 code_cell = self.convert_cell_obj_to_tuple(cell)
-                return list(self._data.keys()).index(code_cell)
+                return self._data.index(code_cell)
             except Exception:
                 self._log.warning(f"get_index() - Cell {cell} not found.")
                 return -1
 
+    def get_next_cell(self, cell: CellObj) -> CellObj | None:
+        """
+        Gets the code cell that is executed after a cell.
+
+        Args:
+            cell (CellObj): Cell object. The cell does not need to contain code.
+
+        Returns:
+            CellObj | None: The next code cell or ``None`` if there is no code cell after the cell.
+        """
+        index = self._data.bisect_right(self.convert_cell_obj_to_tuple(cell))
+        if index >= len(self._data):
+            return None
+        key = self._data.peekitem(index)[0]
+        return CellObj.from_idx(col_idx=key[2], row_idx=key[1], sheet_idx=key[0])
+
+    def get_prev_cell(self, cell: CellObj) -> CellObj | None:
+        """
+        Gets the code cell that is executed before a cell.
+
+        Args:
+            cell (CellObj): Cell object. The cell does not need to contain code.
+
+        Returns:
+            CellObj | None: The previous code cell or ``None`` if there is no code cell before the cell.
+        """
+        index = self._data.bisect_left(self.convert_cell_obj_to_tuple(cell))
+        if index == 0:
+            return None
+        key = self._data.peekitem(index - 1)[0]
+        return CellObj.from_idx(col_idx=key[2], row_idx=key[1], sheet_idx=key[0])
+
+    def _set_data_item(self, key: Tuple[int, int, int], py_src: PySource | None) -> None:
+        """
+        Sets or removes (``None``) the source of a cell.
+
+        The data is replaced by a changed copy instead of being changed in place. A background recalculation
+        iterates the data on its own thread, it keeps iterating the data it started with and stops at the next cell
+        because it is canceled here.
+        """
+        if self._recalc is not None:
+            self._recalc.cancel()
+        data = self._data.copy()
+        if py_src is None:
+            del data[key]
+        else:
+            data[key] = py_src
+        self._data = data
+
+    def _iter_code_from_index(self, index: int) -> Iterator[Tuple[Tuple[int, int, int], str]]:
+        """Iterates the key and source code of the cells from the specified index to the end of the data."""
+        data = self._data
+        for key in data.islice(start=index):
+            yield key, data[key].source_code
+
+    def iter_from_index(self, index: int) -> Iterator[PySource]:
+        """
+        Iterates the sources from the specified index to the end of the data in execution order.
+
+        Args:
+            index (int): Index of the first cell in the data.
+
+        Returns:
+            Iterator[PySource]: Source objects.
+        """
+        data = self._data
+        for key in data.islice(start=index):
+            yield data[key]
+
     # endregion Source Management
 
     def has_code(self) -> bool:
@@ -948,52 +1187,118 @@ class PySourceManager(EventsPartial):
 
     def _update_item(self, py_src: PySource) -> bool:
         with self._log.indent(True):
-            cargs = CancelEventArgs(self)
+            self._log.debug("_update_item() Entered.")
+            cargs = self._before_update_item(py_src)
+            if cargs is None:
+                return False
             sheet_idx = py_src.sheet_idx
             row = py_src.row
             col = py_src.col
-            self._log.debug("_update_item() Entered.")
-            self._log.debug(
-                f"_update_item() sheet index: {sheet_idx} col: {col}, row: {row}"
-            )
-            cargs.event_data = DotDict(
-                source=self,
-                sheet_idx=sheet_idx,
-                row=row,
-                col=col,
-                code=py_src.source_code,
-                doc=self._doc,
-                py_src=py_src,
-            )
-            # triggers are in col row format
-            self.trigger_event(f"BeforeSourceUpdate_{col}_{row}", cargs)
-            if cargs.cancel:
-                return False
-            self.trigger_event("BeforeSourceUpdate", cargs)
-            if cargs.cancel:
-                return False
-            code = cargs.event_data.get("code", py_src.source_code)
-            if code != py_src.source_code:
-                py_src.source_code = code
-            # update the dictionary to the current state of the module
-            py_src.mod_dict = self.py_mod.mod.__dict__.copy()
-            cell_obj = CellObj.from_idx(
-                col_idx=py_src.col, row_idx=py_src.row, sheet_idx=py_src.sheet_idx
-            )
+            cell_obj = CellObj.from_idx(col_idx=col, row_idx=row, sheet_idx=sheet_idx)
             self.py_mod.set_global_var("CURRENT_CELL_ID", py_src.unique_id)
             self.py_mod.set_global_var("CURRENT_CELL_OBJ", cell_obj)
-            result = self.py_mod.update_with_result(py_src.source_code)
-            result.py_src = py_src
-            py_src.dd_data = result
-
-            eargs = EventArgs.from_args(cargs)
-            eargs.event_data["result"] = result
-            # triggers are in col row format
-            self.trigger_event(f"AfterSourceUpdate_{col}_{row}", eargs)
-            self.trigger_event("AfterSourceUpdate", eargs)
+            if self._kernel_mode:
+                kernel = self._get_kernel()
+                try:
+                    kernel.check_refs(self._dep_graph.get_refs((sheet_idx, row, col), py_src.source_code))
+                    result = kernel.update_with_result(
+                        py_src.source_code, self._get_code_filename(cell_obj), py_src.unique_id
+                    )
+                except KernelError as e:
+                    result = self.py_mod.get_error_result(e, py_src.source_code)
+            else:
+                result = self.py_mod.update_with_result(py_src.source_code, self._get_code_filename(cell_obj))
+                key = (sheet_idx, row, col)
+                self._snapshots.record(key, self.py_mod.mod.__dict__, self._get_snapshot_names(key, py_src))
+            self._after_update_item(py_src, cargs, result)
             self._log.debug("_update_item() Leaving.")
         return True
 
+    def _get_mod_dict(self, key: Tuple[int, int, int]) -> Dict[str, Any]:
+        """Rebuilds the module dictionary after the cell of the key from the snapshots, see ``PySource.mod_dict``."""
+        _, state = self._snapshots.get_state(self._data.irange(maximum=key))
+        return state
+
+    def _get_snapshot_names(self, key: Tuple[int, int, int], py_src: PySource) -> Set[str] | None:
+        """Gets the names an executed cell may have changed in the module or ``None`` if they are not known."""
+        refs = self._dep_graph.get_refs(key, py_src.source_code)
+        if refs.is_dynamic:
+            return None
+        # set by _update_item() before the code is executed.
+        return refs.writes | {"CURRENT_CELL_ID", "CURRENT_CELL_OBJ"}
+
+    def _before_update_item(self, py_src: PySource) -> CancelEventArgs | None:
+        """
+        Triggers the ``BeforeSourceUpdate`` events for a cell that is about to be executed.
+
+        Returns:
+            CancelEventArgs | None: The event args or ``None`` if the update was canceled.
+        """
+        cargs = CancelEventArgs(self)
+        sheet_idx = py_src.sheet_idx
+        row = py_src.row
+        col = py_src.col
+        self._log.debug(
+            f"_update_item() sheet index: {sheet_idx} col: {col}, row: {row}"
+        )
+        cargs.event_data = DotDict(
+            source=self,
+            sheet_idx=sheet_idx,
+            row=row,
+            col=col,
+            code=py_src.source_code,
+            doc=self._doc,
+            py_src=py_src,
+        )
+        # triggers are in col row format
+        self.trigger_event(f"BeforeSourceUpdate_{col}_{row}", cargs)
+        if cargs.cancel:
+            return None
+        self.trigger_event("BeforeSourceUpdate", cargs)
+        if cargs.cancel:
+            return None
+        code = cargs.event_data.get("code", py_src.source_code)
+        if code != py_src.source_code:
+            py_src.source_code = code
+        if self._dirty_recalc or self._result_store is not None:
+            key = (sheet_idx, row, col)
+            refs = self._dep_graph.get_refs(key, py_src.source_code)
+            if refs.lp_addresses:
+                self._lp_versions[key] = self._get_lp_versions(key, refs.lp_addresses)
+                if self._result_store is not None:
+                    self._lp_fingerprints[key] = self._get_lp_fingerprints(key, refs.lp_addresses)
+            else:
+                self._lp_versions.pop(key, None)
+                self._lp_fingerprints.pop(key, None)
+        return cargs
+
+    def _after_update_item(self, py_src: PySource, cargs: CancelEventArgs, result: DotDict) -> None:
+        """Sets the result of a cell that has been executed and triggers the ``AfterSourceUpdate`` events."""
+        result.py_src = py_src
+        py_src.executed_code = py_src.source_code
+        py_src.dd_data = result
+
+        eargs = EventArgs.from_args(cargs)
+        eargs.event_data["result"] = result
+        if RecalcScheduler.current() is not None:
+            # listeners write to the document, the events are triggered on the main thread when the recalculation is done.
+            self._deferred_events[(py_src.sheet_idx, py_src.row, py_src.col)] = eargs
+            return
+        self._trigger_after_source_update(eargs)
+
+    def _trigger_after_source_update(self, eargs: EventArgs) -> None:
+        # triggers are in col row format
+        self.trigger_event(f"AfterSourceUpdate_{eargs.event_data.col}_{eargs.event_data.row}", eargs)
+        self.trigger_event("AfterSourceUpdate", eargs)
+
+    def _get_code_filename(self, cell_obj: CellObj) -> str:
+        """Gets the file name that is shown in tracebacks for the code of a cell such as ``<Sheet1.A1>``."""
+        try:
+            sheet_name = self._doc.sheets[cell_obj.sheet_idx].name
+        except Exception:
+            sheet_name = f"Sheet index {cell_obj.sheet_idx}"
+        return f"<{sheet_name}.{cell_obj}>"
+
     def update_all(self) -> None:
         """
         Rebuilds the module for all the cells.
@@ -1002,11 +1307,24 @@ class PySourceManager(EventsPartial):
         """
         with self._log.indent(True):
             self._log.debug("update_all() Entered.")
+            if self._restore_pending:
+                self._restore_pending = False
+                if self._restore_results():
+                    self._log.debug("update_all() Restored stored results. Leaving.")
+                    return
             self.py_mod.reset_module()
-            for key in self._data.keys():
-                co = CellObj.from_idx(col_idx=key[2], row_idx=key[1], sheet_idx=key[0])
-                py_src = self[co]
-                self._update_item(py_src)
+            self._mod_partial = False
+            self._snapshots.clear()
+            if self._kernel_mode:
+                self._get_kernel().reset()
+            if self._is_parallel():
+                self._execute_levels(0)
+            else:
+                for py_src in self._data.values():
+                    if self._is_recalc_canceled():
+                        raise RecalcCanceledError(0)
+                    self._update_item(py_src)
+            self._log.debug("update_all() %s", self.py_mod.code_cache)
             self._log.debug("update_all() Leaving.")
 
     def get_calc_cells(self) -> List[CalcCell]:
@@ -1056,33 +1374,853 @@ class PySourceManager(EventsPartial):
 
             if index < 0:
                 index = 0
-            if index == 0:
+            if index == 0 or self._kernel_mode:
+                # the module state of the kernel can not be rewound.
                 self.update_all()
                 return
+            if self._mod_partial:
+                self._execute_partial(set(self._data.islice(start=index)))
+                return
 
             # reset the module dictionary to before index item changes
-            keys = list(self._data.keys())
-            key = keys[index]  # row, col format
-            co = CellObj.from_idx(col_idx=key[2], row_idx=key[1], sheet_idx=key[0])
-            py_src = self[co]
-            if self._is_last_index(index):
-                self._log.debug(f"update_from_index({index}). Is last index.")
+            count, state = self._snapshots.rewind(self._data.islice(stop=index))
+            if count < index:
+                self._log.debug(
+                    f"update_from_index({index}). No snapshot for index {count}. Updating from index {count}."
+                )
+            self.py_mod.reset_to_dict(state)
+            if self._is_parallel():
+                self._execute_levels(count)
             else:
+                for i, py_src in enumerate(self.iter_from_index(count), count):
+                    if self._is_recalc_canceled():
+                        raise RecalcCanceledError(i)
+                    self._update_item(py_src)
+            self._log.debug(f"update_from_index({index}) {self.py_mod.code_cache}")
+            self._log.debug(f"update_from_index({index}) Leaving.")
+
+    def _update_dependents(self, index: int, old_code: str | None) -> bool:
+        """
+        Executes the cell at the specified index and only the following cells that depend on it.
+
+        Following cells that are not executed have the names they write restored from the state
+        the module was in after they last ran.
+
+        Args:
+            index (int): Index of the cell in the data.
+            old_code (str, None): Source code of the cell before it changed or ``None`` if the cell is new.
+
+        Returns:
+            bool: ``False`` if dependencies could not be determined and no cells were executed; Otherwise, ``True``.
+        """
+        with self._log.indent(True):
+            self._log.debug(f"_update_dependents({index}) Entered.")
+            if self._kernel_mode:
+                self._log.debug(f"_update_dependents({index}) Kernel mode. Leaving.")
+                return False
+            key = self._data.peekitem(index)[0]
+            dirty_keys = self._dep_graph.get_dependents(
+                self._iter_code_from_index(0),
+                [key],
+                self._get_lp_cell_keys,
+                None if old_code is None else {key: old_code},
+            )
+            if dirty_keys is None:
+                self._log.debug(f"_update_dependents({index}) The cell or a following cell is dynamic. Leaving.")
+                return False
+            if self._log.is_debug:
                 self._log.debug(
-                    f"update_from_index({index}). Is not last index. Resetting module to py_src dict."
+                    f"_update_dependents({index}) Executing {len(dirty_keys)} of {len(self) - index} cells."
                 )
-                self.py_mod.reset_to_dict(py_src.mod_dict)
-            for i in range(index, length):
-                key = keys[i]  # tuple in row, col format
-                cell_obj = CellObj.from_idx(
-                    col_idx=key[2], row_idx=key[1], sheet_idx=key[0]
+            self._execute_dirty(index, dirty_keys)
+            self._log.debug(f"_update_dependents({index}) Leaving.")
+            return True
+
+    def _execute_dirty(self, index: int, dirty_keys: Set[Tuple[int, int, int]]) -> None:
+        """
+        Executes the dirty cells from the specified index to the end of the data.
+
+        Cells that are not dirty are not executed, the names they changed are restored from the
+        snapshot of when they last ran.
+
+        Args:
+            index (int): Index of the first cell in the data.
+            dirty_keys (Set[Tuple[int, int, int]]): Keys of the cells to execute.
+        """
+        if self._mod_partial:
+            self._execute_partial(dirty_keys)
+            return
+        count, state = self._snapshots.rewind(self._data.islice(stop=index))
+        if count < index:
+            self._log.debug(f"_execute_dirty() No snapshot for index {count}. Executing from index {count}.")
+        self.py_mod.reset_to_dict(state)
+        if self._is_parallel():
+            self._execute_levels(count, dirty_keys)
+            self._log.debug("_execute_dirty() %s", self.py_mod.code_cache)
+            return
+        mod_dict = self.py_mod.mod.__dict__
+        last_key = None
+        data = self._data
+        for i, cell_key in enumerate(data.islice(start=count), count):
+            if self._is_recalc_canceled():
+                raise RecalcCanceledError(i)
+            src = data[cell_key]
+            last_key = cell_key
+            if cell_key in dirty_keys or not self._snapshots.restore(cell_key, mod_dict):
+                self._update_item(src)
+                last_key = None
+
+        if last_key is not None:
+            # restoring the module dictionary does not update lp_mod.
+            self.py_mod.set_global_var("CURRENT_CELL_ID", mod_dict.get("CURRENT_CELL_ID", ""))
+            self.py_mod.set_global_var("CURRENT_CELL_OBJ", mod_dict.get("CURRENT_CELL_OBJ", None))
+        self._log.debug("_execute_dirty() %s", self.py_mod.code_cache)
+
+    def _is_parallel(self) -> bool:
+        """Gets if independent cells are executed at the same time."""
+        return self._executor is not None and not self._kernel_mode
+
+    def _execute_levels(self, index: int, dirty_keys: Set[Tuple[int, int, int]] | None = None) -> None:
+        """
+        Executes the cells from the specified index to the end of the data one topological level at a time.
+
+        The cells of a level are independent of each other, when a level has more than one cell to execute
+        they are executed at the same time on the worker threads. The names each cell changed are applied to
+        the module, and events are triggered, in execution order so the result is the same as executing
+        the cells one at a time.
+
+        The module must already be in the state before the cell at the specified index.
+
+        Args:
+            index (int): Index of the first cell in the data.
+            dirty_keys (Set[Tuple[int, int, int]], None, optional): Keys of the cells to execute.
+                Other cells have the names they changed restored from their snapshot.
+                If ``None`` all cells are executed. Defaults to ``None``.
+        """
+        with self._log.indent(True):
+            data = self._data
+            levels = self._dep_graph.get_levels(
+                self._iter_code_from_index(index),
+                self._get_lp_cell_keys,
+                ((key, data[key].source_code) for key in data.islice(stop=index)),
+            )
+            self._log.debug(f"_execute_levels({index}) {len(levels)} levels.")
+            mod_dict = self.py_mod.mod.__dict__
+            for level_num, level in enumerate(levels):
+                if self._is_recalc_canceled():
+                    # later levels can contain cells that come before the cells of earlier levels.
+                    raise RecalcCanceledError(
+                        min(data.index(key) for remaining in levels[level_num:] for key in remaining)
+                    )
+                start = time.perf_counter()
+                run_keys = [
+                    key for key in level if dirty_keys is None or key in dirty_keys or key not in self._snapshots
+                ]
+                if len(run_keys) > 1:
+                    self._execute_level(level, set(run_keys))
+                else:
+                    for key in level:
+                        if key in run_keys or not self._snapshots.restore(key, mod_dict):
+                            self._update_item(data[key])
+                self._log.debug(
+                    "_execute_levels() Level %i executed %i of %i cells in %.4f seconds.",
+                    level_num,
+                    len(run_keys),
+                    len(level),
+                    time.perf_counter() - start,
                 )
-                py_src = self[cell_obj]
-                self._update_item(py_src)
-            self._log.debug(f"update_from_index({index}) Leaving.")
+            if levels:
+                # levels do not end on the last cell, leave the module as if the last cell ran last.
+                key, py_src = data.peekitem(-1)
+                self.py_mod.set_global_var("CURRENT_CELL_ID", py_src.unique_id)
+                self.py_mod.set_global_var(
+                    "CURRENT_CELL_OBJ", CellObj.from_idx(col_idx=key[2], row_idx=key[1], sheet_idx=key[0])
+                )
+
+    def _execute_level(self, level: List[Tuple[int, int, int]], run_keys: Set[Tuple[int, int, int]]) -> None:
+        """
+        Executes the cells of a single level on the worker threads.
+
+        Args:
+            level (List[Tuple[int, int, int]]): Keys of the cells of the level, in execution order.
+            run_keys (Set[Tuple[int, int, int]]): Keys of the cells to execute, other cells are restored from their snapshot.
+        """
+        executor = self._executor
+        if executor is None:
+            raise RuntimeError("Executor is not set.")
+        mod_dict = self.py_mod.mod.__dict__
+        tasks: List[CellTask] = []
+        prepared: Dict[Tuple[int, int, int], Tuple[PySource, CancelEventArgs]] = {}
+        for key in level:
+            if key not in run_keys:
+                continue
+            py_src = self._data[key]
+            cargs = self._before_update_item(py_src)
+            if cargs is None:
+                continue
+            cell_obj = CellObj.from_idx(col_idx=key[2], row_idx=key[1], sheet_idx=key[0])
+            prepared[key] = (py_src, cargs)
+            tasks.append(
+                CellTask(py_src.source_code, self._get_code_filename(cell_obj), py_src.unique_id, cell_obj)
+            )
+        outcomes = dict(zip(prepared.keys(), executor.run(self.py_mod, tasks)))
+        for key in level:
+            if key in prepared:
+                py_src, cargs = prepared[key]
+                outcome = outcomes[key]
+                if outcome.error is None:
+                    LevelExecutor.apply(outcome.delta, mod_dict)
+                    result = outcome.result
+                else:
+                    result = self.py_mod.get_error_result(outcome.error, py_src.source_code)
+                self._snapshots.record(key, mod_dict, outcome.delta.keys())
+                self._after_update_item(py_src, cargs, result)
+            elif key not in run_keys:
+                self._snapshots.restore(key, mod_dict)
+
+    def update_dirty(self) -> bool:
+        """
+        Executes only the cells that have changed since they were last executed and the cells that depend on them.
+
+        A cell has changed when its code has changed, when the data of an ``lp()`` input range has changed,
+        or when it may read the document directly.
+
+        Returns:
+            bool: ``False`` if the cells no longer match the cells of the document and the module must be rebuilt;
+            Otherwise, ``True``.
+
+        Note:
+            Triggers ``BeforeSourceUpdate`` and ``AfterSourceUpdate`` events only for cells that are executed.
+        """
+        with self._log.indent(True):
+            self._log.debug("update_dirty() Entered.")
+            if not self._is_cache_in_sync():
+                self._log.debug("update_dirty() Cells are not in sync with the cell cache. Leaving.")
+                return False
+            if self._kernel_mode:
+                # starting a new kernel is slow, rebuild the module in the running kernel.
+                self._log.debug("update_dirty() Kernel mode. Updating all.")
+                self.update_all()
+                return True
+            seeds: List[Tuple[int, int, int]] = []
+            old_code: Dict[Tuple[int, int, int], str] = {}
+            for key, py_src in self._data.items():
+                refs = self._dep_graph.get_refs(key, py_src.source_code)
+                if not self._is_dirty(key, py_src, refs):
+                    continue
+                seeds.append(key)
+                if py_src.executed_code is not None and py_src.executed_code != py_src.source_code:
+                    old_code[key] = py_src.executed_code
+            if not seeds:
+                self._log.debug("update_dirty() No dirty cells. Leaving.")
+                return True
+
+            index = self._data.index(seeds[0])
+            dirty_keys = self._dep_graph.get_dependents(
+                self._iter_code_from_index(0), seeds, self._get_lp_cell_keys, old_code
+            )
+            if dirty_keys is None:
+                self._log.debug(f"update_dirty() A cell is dynamic, updating from index {index}.")
+                self.update_from_index(index)
+                return True
+            if self._log.is_debug:
+                self._log.debug(f"update_dirty() Executing {len(dirty_keys)} of {len(self)} cells.")
+            self._execute_dirty(index, dirty_keys)
+            self._log.debug("update_dirty() Leaving.")
+            return True
+
+    def _execute_partial(self, run_keys: Set[Tuple[int, int, int]], results: Dict[Tuple[int, int, int], DotDict] | None = None) -> None:
+        """
+        Rebuilds the module executing only the specified cells and the earlier cells they need.
+
+        Earlier cells are needed when they write a name that a needed cell reads or writes, or when they are dynamic.
+        Cells that are not executed keep their result, or are set to the result in ``results``,
+        and the module does not have the names they write until the module is rebuilt by ``update_all()``.
+
+        Args:
+            run_keys (Set[Tuple[int, int, int]]): Keys of the cells to execute.
+            results (Dict[Tuple[int, int, int], DotDict], None, optional): Results of cells that are not executed.
+                Defaults to ``None``.
+        """
+        with self._log.indent(True):
+            needed = self._get_required_keys(run_keys)
+            self._log.debug(f"_execute_partial() Executing {len(needed)} of {len(self)} cells.")
+            self.py_mod.reset_module()
+            self._snapshots.clear()
+            for i, (key, py_src) in enumerate(self._data.items()):
+                if key in needed:
+                    if self._is_recalc_canceled():
+                        raise RecalcCanceledError(i)
+                    self._update_item(py_src)
+                elif results is not None and key in results:
+                    cargs = self._before_update_item(py_src)
+                    if cargs is not None:
+                        self._after_update_item(py_src, cargs, results[key])
+            # snapshots of a partial module can not be used to rewind it.
+            self._snapshots.clear()
+            self._mod_partial = len(needed) < len(self)
+
+    def _get_required_keys(self, run_keys: Set[Tuple[int, int, int]]) -> Set[Tuple[int, int, int]]:
+        """Gets the keys of the specified cells and of the earlier cells they need, see ``_execute_partial()``."""
+        needed = set(run_keys)
+        names: Set[str] = set()
+        for key, refs in reversed(list(self._dep_graph.iter_refs(self._iter_code_from_index(0)))):
+            if key not in needed:
+                if not names:
+                    continue
+                if not refs.is_dynamic and refs.writes.isdisjoint(names):
+                    continue
+                needed.add(key)
+            if refs.is_dynamic:
+                # any earlier cell may write a name that a dynamic cell uses.
+                needed.update(self._data.irange(maximum=key))
+                break
+            names.update(refs.reads)
+            names.update(refs.writes)
+        return needed
+
+    def _get_result_keys(self, executed: bool) -> Dict[Tuple[int, int, int], str | None]:
+        """
+        Gets the keys that the results of the cells are stored with.
+
+        The key of a cell is a hash of its code, of the data of its ``lp()`` input ranges and of the keys of
+        the earlier cells it depends on, so a key changes when anything the result is computed from changes.
+        A cell that calls a function of an earlier cell depends on the cells that write the names the function reads.
+        Cells that read the document directly, and cells that depend on them, have no key.
+
+        Args:
+            executed (bool): Get the keys for the code and input data the cells were last executed with.
+                Otherwise, get the keys for the current code and input data.
+
+        Returns:
+            Dict[Tuple[int, int, int], str | None]: Key of each cell or ``None`` if the cell has no key.
+        """
+        result: Dict[Tuple[int, int, int], str | None] = {}
+        # key of the last cell that wrote each name, None if the name was written by a cell without a key.
+        writers: Dict[str, str | None] = {}
+        chain = hashlib.sha256()
+        # False once a dynamic cell has no key, it may have written any name.
+        chain_valid = True
+        # False once any cell has no key, a dynamic cell may use the names of any earlier cell.
+        all_valid = True
+        for key, refs in self._dep_graph.iter_refs(self._iter_code_from_index(0)):
+            py_src = self._data[key]
+            code = py_src.executed_code if executed else py_src.source_code
+            cell_key = None
+            if chain_valid and code is not None and code == py_src.source_code:
+                cell_key = self._get_result_key(key, code, refs, executed, writers, result)
+                if cell_key is not None and refs.is_dynamic:
+                    cell_key = self._hash_key(cell_key, chain.hexdigest()) if all_valid else None
+            result[key] = cell_key
+            if cell_key is None:
+                all_valid = False
+                if refs.is_dynamic:
+                    chain_valid = False
+                if py_src.executed_code is not None and py_src.executed_code != py_src.source_code:
+                    old_refs = self._dep_graph.analyzer.analyze(py_src.executed_code)
+                    for name in old_refs.writes | old_refs.mutates:
+                        writers[name] = None
+            else:
+                chain.update(cell_key.encode("utf-8"))
+            for name in refs.writes:
+                writers[name] = cell_key
+        return result
+
+    def _get_result_key(
+        self,
+        key: Tuple[int, int, int],
+        code: str,
+        refs: CodeRefs,
+        executed: bool,
+        writers: Dict[str, str | None],
+        keys: Dict[Tuple[int, int, int], str | None],
+    ) -> str | None:
+        if refs.uses_doc:
+            return None
+        parts = [self._config.extension_version, code]
+        for name in sorted(refs.reads | refs.writes):
+            if name in writers:
+                writer = writers[name]
+                if writer is None:
+                    return None
+                parts.append(f"{name}={writer}")
+        if refs.lp_addresses:
+            if executed:
+                prints = self._lp_fingerprints.get(key, None)
+            else:
+                prints = self._get_lp_fingerprints(key, refs.lp_addresses)
+            if prints is None or None in prints.values():
+                return None
+            for addr in sorted(refs.lp_addresses):
+                parts.append(f"{addr}={prints.get(addr, None)}")
+                cells = self._get_lp_cell_keys(addr, key[0])
+                if cells is None:
+                    return None
+                for cell_key in sorted(cells):
+                    if cell_key == key:
+                        continue
+                    ref_key = keys.get(cell_key, None)
+                    if ref_key is None:
+                        return None
+                    parts.append(ref_key)
+        return self._hash_key(*parts)
+
+    def _hash_key(self, *parts: str) -> str:
+        h = hashlib.sha256()
+        for part in parts:
+            h.update(part.encode("utf-8"))
+            h.update(b"\0")
+        return h.hexdigest()
+
+    def _restore_results(self) -> bool:
+        """
+        Sets the stored result of each cell whose key has not changed and executes the other cells.
+
+        Returns:
+            bool: ``True`` if any stored result was used; Otherwise, ``False`` and no cells were executed.
+        """
+        store = self._result_store
+        if store is None or self._kernel_mode or len(self) == 0:
+            return False
+        with self._log.indent(True):
+            start = time.perf_counter()
+            keys = self._get_result_keys(False)
+            results: Dict[Tuple[int, int, int], DotDict] = {}
+            for key, py_src in self._data.items():
+                result_key = keys[key]
+                if result_key is None:
+                    continue
+                result = store.load(py_src.unique_id, result_key)
+                if result is not None:
+                    results[key] = result
+            self._log.debug(
+                "_restore_results() %i of %i stored results are valid. Loaded in %.4f seconds.",
+                len(results),
+                len(self),
+                time.perf_counter() - start,
+            )
+            if not results:
+                return False
+            self._execute_partial({key for key in self._data.keys() if key not in results}, results)
+            return True
+
+    def save_results(self) -> int:
+        """
+        Stores the results of the cells in the document. Only results that have changed are written.
+
+        Results are stored when the document is saved if the ``result_cache`` document property is ``True``.
+
+        Returns:
+            int: Number of results written.
+        """
+        store = self._result_store
+        if store is None:
+            return 0
+        with self._log.indent(True):
+            count = 0
+            keys = self._get_result_keys(True)
+            unique_ids: Set[str] = set()
+            for key, py_src in self._data.items():
+                unique_ids.add(py_src.unique_id)
+                result_key = keys[key]
+                if result_key is None or py_src.is_error:
+                    store.remove(py_src.unique_id)
+                    continue
+                if store.get_key(py_src.unique_id) == result_key:
+                    continue
+                if store.save(py_src.unique_id, result_key, py_src.dd_data):
+                    count += 1
+            store.prune(unique_ids)
+            store.flush()
+            self._log.debug(f"save_results() Wrote {count} results.")
+            return count
+
+    def _on_document_saving(self, src: Any, event: EventArgs) -> None:
+        try:
+            self.save_results()
+        except Exception:
+            # saving the document must not fail.
+            self._log.exception("_on_document_saving() Error saving results")
+
+    def request_recalc(self, full: bool = False) -> None:
+        """
+        Requests a recalculation on the background thread.
+
+        Requests that arrive close together are combined into a single recalculation, see ``recalc_delay``.
+        A recalculation that is running when a request arrives is canceled and started again.
+        The ``AfterSourceUpdate`` events of the executed cells are triggered on the main thread when
+        the recalculation is done and the document is then recalculated to display the results.
+
+        Args:
+            full (bool, optional): Rebuild the module for all the cells. Defaults to ``False``,
+                only the cells that have changed and the cells that depend on them are executed.
+        """
+        recalc = self._get_recalc()
+        if full or not self._dirty_recalc:
+            recalc.request(RecalcRequest(full=True))
+        else:
+            recalc.request(RecalcRequest(dirty=True))
+
+    def _request_source_recalc(self, index: int) -> None:
+        """Requests a background recalculation after the code of the cell at the specified index has changed."""
+        recalc = self._get_recalc()
+        recalc.cancel()
+        if self._dependency_recalc:
+            recalc.request(RecalcRequest(dirty=True, display=True))
+        else:
+            recalc.request(RecalcRequest(index=index, display=True))
+
+    def _is_recalc_canceled(self) -> bool:
+        """Gets if the code is executed by a background recalculation that has been superseded."""
+        recalc = RecalcScheduler.current()
+        return recalc is not None and recalc.is_canceled()
+
+    def _run_recalc(self, request: RecalcRequest) -> None:
+        """Does a recalculation on the background thread."""
+        with self._log.indent(True):
+            self._log.debug(f"_run_recalc() Entered. {request}")
+            start = time.perf_counter()
+            try:
+                if request.full:
+                    self.update_all()
+                else:
+                    if request.index is not None:
+                        self.update_from_index(request.index)
+                    if request.dirty and not self.update_dirty():
+                        self._log.debug("_run_recalc() Cells are not in sync with the document. Leaving.")
+                        self._deferred_events = {}
+                        run_in_main_thread(self._on_recalc_out_of_sync)
+                        return
+            except RecalcCanceledError as e:
+                self._log.debug(f"_run_recalc() Canceled at index {e.index}.")
+                raise
+            except Exception as e:
+                if self._is_recalc_canceled():
+                    # the cells were changed while they were executed.
+                    self._log.debug("_run_recalc() Canceled.")
+                    raise RecalcCanceledError(0) from e
+                self._log.exception("_run_recalc() Error")
+                return
+            events, self._deferred_events = self._deferred_events, {}
+            self._log.debug(
+                "_run_recalc() Executed %i cells in %.4f seconds.", len(events), time.perf_counter() - start
+            )
+            if events or request.display:
+                run_in_main_thread(lambda: self._flush_recalc(events))
+            self._log.debug("_run_recalc() Leaving.")
+
+    def _flush_recalc(self, events: Dict[Tuple[int, int, int], EventArgs]) -> None:
+        """Triggers the deferred events of a background recalculation and displays the results. Runs on the main thread."""
+        with self._log.indent(True):
+            self._log.debug(f"_flush_recalc() Entered. {len(events)} events.")
+            recalc = self._recalc
+            if recalc is None:
+                # disposed or no longer in background mode.
+                return
+            # recalculating the document must not request another recalculation.
+            with recalc.suppress():
+                for key in sorted(events.keys()):
+                    self._trigger_after_source_update(events[key])
+                self._doc.component.calculateAll()
+            self._log.debug("_flush_recalc() Leaving.")
+
+    def _on_recalc_out_of_sync(self) -> None:
+        if self._recalc is None:
+            return
+        self.trigger_event("RecalcOutOfSync", EventArgs(self))
+
+    def _is_dirty(self, key: Tuple[int, int, int], py_src: PySource, refs: CodeRefs) -> bool:
+        """Gets if a cell must be executed by ``update_dirty()``."""
+        if py_src.executed_code is None or py_src.executed_code != py_src.source_code:
+            return True
+        if refs.is_dynamic or refs.uses_doc:
+            return True
+        if not refs.lp_addresses:
+            return False
+        versions = self._lp_versions.get(key, None)
+        if versions is None or None in versions.values():
+            return True
+        return versions != self._get_lp_versions(key, refs.lp_addresses)
+
+    def _is_cache_in_sync(self) -> bool:
+        """Gets if the cells of the data match the code cells of the ``CellCache``."""
+        cc = CellCache(self._doc)
+        count = 0
+        for sheet_idx, cells in cc.code_cells.items():
+            for cell in cells.keys():
+                if (sheet_idx, cell.row - 1, cell.col_obj.index) not in self._data:
+                    return False
+                count += 1
+        return count == len(self._data)
+
+    def _get_lp_versions(self, key: Tuple[int, int, int], addresses: Set[str]) -> Dict[str, int | None]:
+        """
+        Gets the version of each ``lp()`` input range of a cell. A version changes when the range is modified.
+
+        Args:
+            key (Tuple[int, int, int]): Cell key.
+            addresses (Set[str]): Addresses passed to ``lp()`` by the cell.
+
+        Returns:
+            Dict[str, int | None]: Version for each address. The version is ``None`` when the address can not be resolved.
+        """
+        result: Dict[str, int | None] = {}
+        for addr in addresses:
+            result[addr] = None
+            rng = self._resolve_lp_addr(addr, key[0])
+            if rng is None:
+                continue
+            try:
+                result[addr] = self._lp_watch.get_version(rng)
+            except Exception:
+                self._log.debug(f"_get_lp_versions() Unable to watch address: {addr}", exc_info=True)
+        return result
+
+    def _get_lp_fingerprints(self, key: Tuple[int, int, int], addresses: Set[str]) -> Dict[str, int | None]:
+        """
+        Gets a fingerprint of the data in each ``lp()`` input range of a cell.
+
+        Only ranges that have been modified since their last fingerprint are read.
+
+        Args:
+            key (Tuple[int, int, int]): Cell key.
+            addresses (Set[str]): Addresses passed to ``lp()`` by the cell.
+
+        Returns:
+            Dict[str, int | None]: Fingerprint for each address. The fingerprint is ``None`` when the address can not be resolved.
+        """
+        result: Dict[str, int | None] = {}
+        for addr in addresses:
+            result[addr] = None
+            rng = self._resolve_lp_addr(addr, key[0])
+            if rng is None:
+                continue
+            try:
+                result[addr] = self._lp_watch.get_fingerprint(rng)
+            except Exception:
+                self._log.debug(f"_get_lp_fingerprints() Unable to read address: {addr}", exc_info=True)
+        return result
+
+    def _resolve_lp_addr(self, addr: str, sheet_idx: int) -> Tuple[int, int, int, int, int] | None:
+        """
+        Resolves an ``lp()`` address.
+
+        Args:
+            addr (str): Address passed to ``lp()`` such as ``A1``, ``A1:B4``, ``Sheet1.A1:B4`` or a named range.
+            sheet_idx (int): Sheet index of the cell calling ``lp()``.
+
+        Returns:
+            Tuple[int, int, int, int, int] | None: Tuple of sheet index, start row, start column, end row and end column
+            as zero based indexes or ``None`` if the address can not be resolved.
+        """
+        try:
+            kind = self._lp_rules.get_matched_rule(addr).get_value()
+            if kind == LpEnum.EMPTY:
+                return None
+            if kind in (LpEnum.NAMED_RNG, LpEnum.SHEET_NAMED_RNG):
+                addr = self._get_named_range_addr(addr, sheet_idx)
+                if not addr:
+                    return None
+                kind = LpEnum.SHEET_RNG
+            if kind in (LpEnum.SHEET_CELL, LpEnum.SHEET_RNG):
+                sheet_name, addr = addr.rsplit(".", 1)
+                sheet_idx = self._doc.sheets.get_by_name(sheet_name.strip("'")).sheet_index
+
+            if ":" in addr:
+                rv = RangeObj.from_range(addr).get_range_values()
+                return (sheet_idx, rv.row_start, rv.col_start, rv.row_end, rv.col_end)
+            co = CellObj.from_cell(addr)
+            return (sheet_idx, co.row - 1, co.col_obj.index, co.row - 1, co.col_obj.index)
+        except Exception:
+            self._log.debug(f"_resolve_lp_addr() Unable to resolve address: {addr}", exc_info=True)
+            return None
+
+    def _get_lp_cell_keys(self, addr: str, sheet_idx: int) -> Set[Tuple[int, int, int]] | None:
+        """
+        Gets the keys of the code cells that an ``lp()`` address refers to.
+
+        Args:
+            addr (str): Address passed to ``lp()`` such as ``A1``, ``A1:B4``, ``Sheet1.A1:B4`` or a named range.
+            sheet_idx (int): Sheet index of the cell calling ``lp()``.
+
+        Returns:
+            Set[Tuple[int, int, int]] | None: Keys of code cells in the range or ``None`` if the address can not be resolved.
+        """
+        if not addr:
+            return set()
+        rng = self._resolve_lp_addr(addr, sheet_idx)
+        if rng is None:
+            return None
+        sheet_idx, row_start, col_start, row_end, col_end = rng
+        keys = self._data.irange((sheet_idx, row_start, col_start), (sheet_idx, row_end, col_end))
+        return {k for k in keys if col_start <= k[2] <= col_end}
+
+    def _get_named_range_addr(self, addr: str, sheet_idx: int) -> str:
+        """Gets the absolute address such as ``Sheet1.A1:B4`` of a named range or an empty string if not found."""
+        if "." in addr:
+            sheet_name, name = addr.split(".")
+            sheet = self._doc.sheets.get_by_name(sheet_name)
+        else:
+            sheet = self._doc.sheets[sheet_idx]
+            name = addr
+        if sheet.named_ranges.has_by_name(name):
+            nc = sheet.named_ranges.get_by_name(name)
+        elif self._doc.named_ranges.has_by_name(name):
+            nc = self._doc.named_ranges.get_by_name(name)
+        elif self._doc.database_ranges.has_by_name(name):
+            nc = self._doc.database_ranges.get_by_name(name)
+        else:
+            return ""
+        return nc.get_referred_cells().AbsoluteName.replace("$", "")
 
     # region Properties
 
+    @property
+    def dependency_recalc(self) -> bool:
+        """
+        Gets/Sets if editing a cell only executes the cells that depend on it.
+
+        When ``False`` or when a cell uses dynamic features such as ``exec()``, ``globals()`` or star imports
+        all the cells that come after the edited cell are executed.
+
+        The default value is read from the ``dependency_recalc`` document property.
+        """
+        return self._dependency_recalc
+
+    @dependency_recalc.setter
+    def dependency_recalc(self, value: bool) -> None:
+        self._dependency_recalc = value
+
+    @property
+    def dirty_recalc(self) -> bool:
+        """
+        Gets/Sets if a Calc recalculation only executes the cells that have changed.
+
+        See ``update_dirty()``.
+
+        The default value is read from the ``dirty_recalc`` document property.
+        """
+        return self._dirty_recalc
+
+    @dirty_recalc.setter
+    def dirty_recalc(self, value: bool) -> None:
+        self._dirty_recalc = value
+
+    @property
+    def kernel_mode(self) -> bool:
+        """
+        Gets/Sets if cell code is executed in a separate python process.
+
+        The default value is read from the ``kernel_mode`` document property.
+        """
+        return self._kernel_mode
+
+    @kernel_mode.setter
+    def kernel_mode(self, value: bool) -> None:
+        if not value:
+            self.terminate_kernel()
+        self._kernel_mode = value
+
+    @property
+    def max_mod_snapshots(self) -> int:
+        """
+        Gets/Sets the maximum number of cells that keep a snapshot of the module changes they made. ``0`` for no limit.
+
+        The default value is read from the ``max_mod_snapshots`` document property.
+        """
+        return self._snapshots.max_snapshots
+
+    @max_mod_snapshots.setter
+    def max_mod_snapshots(self, value: int) -> None:
+        self._snapshots.max_snapshots = value
+
+    @property
+    def max_workers(self) -> int:
+        """
+        Gets/Sets the maximum number of threads used to execute independent cells at the same time.
+
+        ``0`` or ``1`` executes one cell at a time. Not used in kernel mode.
+
+        The default value is read from the ``max_workers`` document property.
+        """
+        return 0 if self._executor is None else self._executor.max_workers
+
+    @max_workers.setter
+    def max_workers(self, value: int) -> None:
+        self._set_executor(value)
+
+    @property
+    def result_cache(self) -> bool:
+        """
+        Gets/Sets if the results of the cells are stored in the document when it is saved, see ``save_results()``.
+
+        The default value is read from the ``result_cache`` document property.
+        """
+        return self._result_store is not None
+
+    @result_cache.setter
+    def result_cache(self, value: bool) -> None:
+        self._set_result_cache(value)
+
+    @property
+    def background_recalc(self) -> bool:
+        """
+        Gets/Sets if cells are executed on a background thread after a change, see ``request_recalc()``.
+
+        When ``True`` adding, updating and removing source code does not execute any cells,
+        a background recalculation is requested instead.
+
+        The default value is read from the ``background_recalc`` document property.
+        """
+        return self._background_recalc
+
+    @background_recalc.setter
+    def background_recalc(self, value: bool) -> None:
+        self._background_recalc = value
+        if not value:
+            self.terminate_recalc()
+
+    @property
+    def recalc_delay(self) -> int:
+        """
+        Gets/Sets the time in milliseconds to wait for more changes before a background recalculation starts.
+
+        The default value is read from the ``recalc_delay`` document property.
+        """
+        return self._recalc_delay
+
+    @recalc_delay.setter
+    def recalc_delay(self, value: int) -> None:
+        self._recalc_delay = value
+        if self._recalc is not None:
+            self._recalc.delay = value / 1000
+
+    @property
+    def lp_cache_size(self) -> int:
+        """
+        Gets/Sets the maximum memory in MB of the ranges read by ``lp()`` that are kept until the range changes.
+
+        ``0`` disables the cache. The default value is read from the ``lp_cache_size`` document property.
+        """
+        return RangeCache(self._doc).max_bytes // (1024 * 1024)
+
+    @lp_cache_size.setter
+    def lp_cache_size(self, value: int) -> None:
+        RangeCache(self._doc).max_bytes = max(0, value) * 1024 * 1024
+
+    @property
+    def array_max_rows(self) -> int:
+        """
+        Gets/Sets the maximum number of rows of a DataFrame or Series that are written to the sheet as an array.
+
+        ``0`` writes all rows. The default value is read from the ``array_max_rows`` document property.
+        """
+        return self._array_max_rows
+
+    @array_max_rows.setter
+    def array_max_rows(self, value: int) -> None:
+        self._array_max_rows = max(0, value)
+
     @property
     def sfa(self) -> Sfa:
         return self._sfa
@@ -1137,7 +2275,15 @@ def _on_doc_closing(src: Any, event: EventArgs) -> None:
     uid = str(event.event_data.uid)
     key = f"doc_{uid}"
     if key in PyInstance._instances:
+        PyInstance._instances[key].terminate_recalc()
+        PyInstance._instances[key].terminate_kernel()
+        PyInstance._instances[key].terminate_executor()
         del PyInstance._instances[key]
+    RangeCache.reset_instance(uid)
+    LpNameCache.reset_instance(uid)
+    ArrayCache.reset_instance(uid)
+    ArrayShapes.reset_instance(uid)
+    ArrayUpdateWorker().cancel(key)
 
 
 LoEvents().on(GBL_DOC_CLOSING, _on_doc_closing)
@@ -0,0 +1,206 @@
+from __future__ import annotations
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Iterator
+import threading
+import time
+
+from ..ex.exceptions import RecalcCanceledError
+
+_local = threading.local()
+
+
+@dataclass
+class RecalcRequest:
+    """Work for a recalculation. Requests that arrive before a recalculation starts are merged into one."""
+
+    full: bool = False
+    """Rebuild the module for all the cells."""
+    index: int | None = None
+    """Execute all the cells from this index."""
+    dirty: bool = False
+    """Execute the cells that have changed since they were last executed and the cells that depend on them."""
+    display: bool = False
+    """Recalculate the document when done so the new results are displayed."""
+
+    def merge(self, other: RecalcRequest) -> RecalcRequest:
+        """
+        Merges two requests into a request that does the work of both.
+
+        Args:
+            other (RecalcRequest): Other request.
+
+        Returns:
+            RecalcRequest: Merged request.
+        """
+        if self.index is None:
+            index = other.index
+        elif other.index is None:
+            index = self.index
+        else:
+            index = min(self.index, other.index)
+        return RecalcRequest(
+            full=self.full or other.full,
+            index=index,
+            dirty=self.dirty or other.dirty,
+            display=self.display or other.display,
+        )
+
+
+class RecalcScheduler:
+    """
+    Runs recalculations on a background thread.
+
+    Requests are debounced, a recalculation starts once no new request has arrived for the debounce delay,
+    and all the requests that arrived in the meantime are merged into a single recalculation.
+
+    A request that arrives while a recalculation is running supersedes it. The running recalculation
+    is expected to call :py:meth:`is_canceled` between cells and raise ``RecalcCanceledError`` when it returns ``True``.
+    The work of the canceled recalculation is merged into the pending request.
+    """
+
+    def __init__(self, run: Callable[[RecalcRequest], None], delay: float = 0.3) -> None:
+        """
+        Constructor
+
+        Args:
+            run (Callable[[RecalcRequest], None]): Called on the background thread to do a recalculation.
+                Errors other than ``RecalcCanceledError`` must be handled by the callable.
+            delay (float, optional): Debounce delay in seconds. Defaults to ``0.3``.
+        """
+        self._run = run
+        self._delay = max(0.0, delay)
+        self._cond = threading.Condition()
+        self._pending: RecalcRequest | None = None
+        self._deadline = 0.0
+        self._generation = 0
+        self._run_generation = -1
+        self._suppress = 0
+        self._is_running = False
+        self._stopped = False
+        self._thread: threading.Thread | None = None
+
+    def request(self, request: RecalcRequest) -> None:
+        """
+        Requests a recalculation.
+
+        Requests made by the recalculation itself, such as from listeners of changes the code of a cell made,
+        and requests made while suppressed are ignored.
+
+        Args:
+            request (RecalcRequest): Work to do.
+        """
+        if self.is_worker_thread():
+            return
+        with self._cond:
+            if self._stopped or self._suppress:
+                return
+            self._pending = request if self._pending is None else self._pending.merge(request)
+            self._deadline = time.monotonic() + self._delay
+            self._generation += 1
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._worker, name="LpRecalc", daemon=True)
+                self._thread.start()
+            self._cond.notify_all()
+
+    def cancel(self) -> None:
+        """Cancels the running recalculation if any. Its work is done again after the next request."""
+        with self._cond:
+            self._generation += 1
+
+    def is_canceled(self) -> bool:
+        """Gets if the recalculation running on the current thread has been superseded."""
+        return self.is_worker_thread() and (self._stopped or self._generation != self._run_generation)
+
+    @staticmethod
+    def current() -> RecalcScheduler | None:
+        """Gets the scheduler whose recalculation is running on the current thread or ``None``."""
+        return getattr(_local, "scheduler", None)
+
+    def is_worker_thread(self) -> bool:
+        """Gets if the current thread is the thread that runs recalculations."""
+        return self._thread is not None and threading.current_thread() is self._thread
+
+    @contextmanager
+    def suppress(self) -> Iterator[None]:
+        """Context manager that ignores requests while it is active."""
+        with self._cond:
+            self._suppress += 1
+        try:
+            yield
+        finally:
+            with self._cond:
+                self._suppress -= 1
+
+    def wait_idle(self, timeout: float | None = None) -> bool:
+        """
+        Waits until there is no pending or running recalculation.
+
+        Must not be called from the thread that LibreOffice uses to call into the extension,
+        recalculations may need that thread to read the document.
+
+        Args:
+            timeout (float, None, optional): Maximum time to wait in seconds. Defaults to ``None``.
+
+        Returns:
+            bool: ``True`` if idle; Otherwise, ``False`` if the timeout expired.
+        """
+        with self._cond:
+            return self._cond.wait_for(
+                lambda: self._stopped or (self._pending is None and not self._is_running), timeout
+            )
+
+    def stop(self) -> None:
+        """Stops the background thread. The running recalculation, if any, is canceled and pending work is dropped."""
+        with self._cond:
+            self._stopped = True
+            self._pending = None
+            self._cond.notify_all()
+
+    def _worker(self) -> None:
+        _local.scheduler = self
+        while True:
+            with self._cond:
+                while not self._stopped and self._pending is None:
+                    self._cond.wait()
+                if self._stopped:
+                    return
+                delay = self._deadline - time.monotonic()
+                if delay > 0:
+                    # debounce, more requests may arrive.
+                    self._cond.wait(delay)
+                    continue
+                request = self._pending
+                self._pending = None
+                self._run_generation = self._generation
+                self._is_running = True
+            try:
+                self._run(request)
+            except RecalcCanceledError as e:
+                with self._cond:
+                    canceled = RecalcRequest(index=e.index, dirty=request.dirty, display=request.display)
+                    if request.full:
+                        canceled = request
+                    elif request.index is not None:
+                        canceled.index = min(request.index, e.index)
+                    if not self._stopped:
+                        self._pending = canceled if self._pending is None else canceled.merge(self._pending)
+            except Exception:
+                # the run callable logs its own errors, the scheduler must keep running.
+                pass
+            finally:
+                with self._cond:
+                    self._is_running = False
+                    self._cond.notify_all()
+
+    @property
+    def delay(self) -> float:
+        """Gets/Sets the debounce delay in seconds."""
+        return self._delay
+
+    @delay.setter
+    def delay(self, value: float) -> None:
+        self._delay = max(0.0, value)
+
+    def __repr__(self) -> str:
+        return f"<RecalcScheduler(delay={self._delay}, pending={self._pending is not None}, running={self._is_running})>"
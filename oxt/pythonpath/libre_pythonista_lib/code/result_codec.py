@@ -0,0 +1,129 @@
+from __future__ import annotations
+from pathlib import Path
+from typing import Any, Dict, Mapping, Tuple
+import importlib.util
+import io
+import uuid
+
+RESULT_VALUE = "value"
+RESULT_DATA_FRAME = "data_frame"
+RESULT_SERIES = "series"
+RESULT_FILE = "file"
+
+_SCALAR_TYPES = (type(None), bool, int, float, str)
+_SERIES_COL = "__lp_series__"
+
+
+def _is_scalar(value: Any) -> bool:  # noqa: ANN401
+    # exact types, subclasses such as numpy scalars would not be restored as the same type.
+    return type(value) in _SCALAR_TYPES
+
+
+def _is_parquet_available() -> bool:
+    return importlib.util.find_spec("pyarrow") is not None
+
+
+def _get_extra(result: Mapping[str, Any]) -> Dict[str, Any]:
+    # keys such as headers or file_kind, values that can not be stored in json are dropped.
+    return {k: v for k, v in result.items() if k not in ("data", "py_src") and _is_scalar(v)}
+
+
+def encode_result(result: Mapping[str, Any]) -> Tuple[Dict[str, Any], bytes | None] | None:
+    """
+    Encodes the result of a code cell so it can be stored.
+
+    Scalar values are stored in the entry. DataFrames and Series are stored in the payload in parquet format,
+    which requires ``pyarrow``. Figures and other files are stored in the payload as the content of the file.
+
+    Args:
+        result (Mapping[str, Any]): Result of a code cell such as ``PySource.dd_data``.
+
+    Returns:
+        Tuple[Dict[str, Any], bytes | None] | None: Json serializable entry and payload,
+        or ``None`` if the result can not be stored.
+    """
+    if result.get("error", False):
+        return None
+    data = result.get("data", None)
+    entry: Dict[str, Any] = {"extra": _get_extra(result)}
+    if result.get("data_type", "") == "file":
+        if not isinstance(data, str):
+            return None
+        pth = Path(data)
+        if not pth.is_file():
+            return None
+        entry["kind"] = RESULT_FILE
+        entry["suffix"] = pth.suffix
+        return entry, pth.read_bytes()
+    if _is_scalar(data):
+        entry["kind"] = RESULT_VALUE
+        entry["value"] = data
+        return entry, None
+
+    cls_name = type(data).__name__
+    if cls_name not in ("DataFrame", "Series") or not _is_parquet_available():
+        return None
+    try:
+        import pandas as pd
+    except ImportError:
+        return None
+    if isinstance(data, pd.Series):
+        if not _is_scalar(data.name):
+            return None
+        entry["kind"] = RESULT_SERIES
+        entry["name"] = data.name
+        data = data.to_frame(name=_SERIES_COL)
+    elif isinstance(data, pd.DataFrame):
+        entry["kind"] = RESULT_DATA_FRAME
+    else:
+        return None
+    buf = io.BytesIO()
+    try:
+        data.to_parquet(buf)
+    except Exception:
+        # column names that are not strings, mixed type object columns, etc.
+        return None
+    return entry, buf.getvalue()
+
+
+def decode_result(entry: Mapping[str, Any], payload: bytes | None, tmp_dir: Path) -> Dict[str, Any] | None:
+    """
+    Decodes a result that was encoded with ``encode_result()``.
+
+    Args:
+        entry (Mapping[str, Any]): Entry returned by ``encode_result()``.
+        payload (bytes, None): Payload returned by ``encode_result()``.
+        tmp_dir (Path): Folder that files such as figures are restored to.
+
+    Returns:
+        Dict[str, Any] | None: Result with the ``data`` key and any other stored keys,
+        or ``None`` if the result can not be decoded.
+    """
+    kind = entry.get("kind", "")
+    result = dict(entry.get("extra", {}))
+    if kind == RESULT_VALUE:
+        result["data"] = entry.get("value", None)
+        return result
+    if payload is None:
+        return None
+    if kind == RESULT_FILE:
+        # figures are displayed from a file, each restored figure gets a new file.
+        pth = tmp_dir / f"lp_{uuid.uuid4().hex[:12]}{entry.get('suffix', '')}"
+        pth.write_bytes(payload)
+        result["data"] = str(pth)
+        return result
+    if kind not in (RESULT_DATA_FRAME, RESULT_SERIES) or not _is_parquet_available():
+        return None
+    try:
+        import pandas as pd
+
+        df = pd.read_parquet(io.BytesIO(payload))
+    except Exception:
+        return None
+    if kind == RESULT_SERIES:
+        series = df[_SERIES_COL]
+        series.name = entry.get("name", None)
+        result["data"] = series
+    else:
+        result["data"] = df
+    return result
@@ -0,0 +1,190 @@
+from __future__ import annotations
+from typing import Any, Dict, Set, TYPE_CHECKING
+import json
+
+import uno
+from ooodev.adapter.io.pipe_comp import PipeComp
+from ooodev.io.sfa import Sfa
+from ooodev.loader import Lo
+from ooodev.utils.helper.dot_dict import DotDict
+
+from .result_codec import encode_result, decode_result
+
+if TYPE_CHECKING:
+    from ....___lo_pip___.oxt_logger.oxt_logger import OxtLogger
+else:
+    from ___lo_pip___.oxt_logger.oxt_logger import OxtLogger
+
+_INDEX_NAME = "index.json"
+_INDEX_VERSION = 1
+
+
+class ResultStore:
+    """
+    Stores the results of code cells inside the document.
+
+    Each result is stored with the key it was computed for, a result is only loaded when the key matches.
+    Entries are kept in an index file and payloads such as DataFrames and figures in a file per cell.
+    The index is written by ``flush()``.
+    """
+
+    def __init__(self, root_uri: str) -> None:
+        """
+        Constructor
+
+        Args:
+            root_uri (str): Folder of the results such as ``vnd.sun.star.tdoc:/1/librepythonista/results``.
+        """
+        self._root_uri = root_uri
+        self._sfa = Sfa()
+        self._log = OxtLogger(log_name=self.__class__.__name__)
+        self._index: Dict[str, Dict[str, Any]] | None = None
+        self._changed = False
+
+    def _get_index(self) -> Dict[str, Dict[str, Any]]:
+        if self._index is not None:
+            return self._index
+        self._index = {}
+        uri = f"{self._root_uri}/{_INDEX_NAME}"
+        try:
+            if self._sfa.exists(uri):
+                data = json.loads(self._sfa.read_text_file(uri))
+                if data.get("version", 0) == _INDEX_VERSION:
+                    self._index = data.get("entries", {})
+        except Exception:
+            self._log.warning("Unable to read result index. Stored results are ignored.", exc_info=True)
+        return self._index
+
+    def _get_payload_uri(self, unique_id: str) -> str:
+        return f"{self._root_uri}/{unique_id}.bin"
+
+    def _read_bytes(self, uri: str) -> bytes:
+        sfa = self._sfa.inst
+        size = sfa.get_size(uri)
+        stream = sfa.open_file_read(uri)
+        try:
+            chunks = []
+            while size > 0:
+                count, data = stream.readBytes(None, size)
+                if count <= 0:
+                    break
+                chunks.append(data.value)
+                size -= count
+            return b"".join(chunks)
+        finally:
+            stream.closeInput()
+
+    def _write_bytes(self, uri: str, data: bytes) -> None:
+        sfa = self._sfa.inst
+        if not sfa.exists(self._root_uri):
+            sfa.create_folder(self._root_uri)
+        if sfa.exists(uri):
+            sfa.kill(uri)
+        # files in a document can only be written from a stream, see Sfa.write_text_file().
+        pipe = PipeComp.from_lo().component
+        try:
+            pipe.writeBytes(uno.ByteSequence(data))
+            pipe.closeOutput()
+            sfa.write_file(uri, pipe)
+        finally:
+            pipe.closeInput()
+
+    def get_key(self, unique_id: str) -> str | None:
+        """Gets the key of the stored result of a cell or ``None`` if the cell has no stored result."""
+        entry = self._get_index().get(unique_id, None)
+        return None if entry is None else entry.get("key", None)
+
+    def load(self, unique_id: str, key: str) -> DotDict | None:
+        """
+        Loads the stored result of a cell.
+
+        Args:
+            unique_id (str): Unique id of the cell code.
+            key (str): Key the result must have been computed for.
+
+        Returns:
+            DotDict | None: Result or ``None`` if there is no stored result for the key.
+        """
+        entry = self._get_index().get(unique_id, None)
+        if entry is None or entry.get("key", None) != key:
+            return None
+        try:
+            payload = None
+            if entry.get("payload", False):
+                payload = self._read_bytes(self._get_payload_uri(unique_id))
+            result = decode_result(entry, payload, Lo.tmp_dir)
+        except Exception:
+            self._log.warning(f"load() Unable to load result for {unique_id}.", exc_info=True)
+            return None
+        return None if result is None else DotDict(**result)
+
+    def save(self, unique_id: str, key: str, result: DotDict) -> bool:
+        """
+        Stores the result of a cell.
+
+        Args:
+            unique_id (str): Unique id of the cell code.
+            key (str): Key the result was computed for.
+            result (DotDict): Result of the cell.
+
+        Returns:
+            bool: ``True`` if stored; Otherwise, ``False`` if the result can not be stored.
+        """
+        try:
+            encoded = encode_result(result)
+            if encoded is None:
+                self.remove(unique_id)
+                return False
+            entry, payload = encoded
+            if payload is not None:
+                self._write_bytes(self._get_payload_uri(unique_id), payload)
+            elif self.get_key(unique_id) is not None:
+                self._remove_payload(unique_id)
+        except Exception:
+            self._log.warning(f"save() Unable to save result for {unique_id}.", exc_info=True)
+            self.remove(unique_id)
+            return False
+        entry["key"] = key
+        entry["payload"] = payload is not None
+        self._get_index()[unique_id] = entry
+        self._changed = True
+        return True
+
+    def _remove_payload(self, unique_id: str) -> None:
+        uri = self._get_payload_uri(unique_id)
+        if self._sfa.exists(uri):
+            self._sfa.delete_file(uri)
+
+    def remove(self, unique_id: str) -> None:
+        """Removes the stored result of a cell."""
+        index = self._get_index()
+        if unique_id not in index:
+            return
+        entry = index.pop(unique_id)
+        self._changed = True
+        if entry.get("payload", False):
+            try:
+                self._remove_payload(unique_id)
+            except Exception:
+                self._log.warning(f"remove() Unable to remove result for {unique_id}.", exc_info=True)
+
+    def prune(self, unique_ids: Set[str]) -> None:
+        """Removes the stored results of all the cells that are not in ``unique_ids``."""
+        for unique_id in [k for k in self._get_index().keys() if k not in unique_ids]:
+            self.remove(unique_id)
+
+    def flush(self) -> None:
+        """Writes the index if it has changed."""
+        if not self._changed or self._index is None:
+            return
+        if not self._sfa.exists(self._root_uri):
+            self._sfa.inst.create_folder(self._root_uri)
+        content = json.dumps({"version": _INDEX_VERSION, "entries": self._index})
+        self._sfa.write_text_file(f"{self._root_uri}/{_INDEX_NAME}", content)
+        self._changed = False
+
+    def __len__(self) -> int:
+        return len(self._get_index())
+
+    def __repr__(self) -> str:
+        return f"<ResultStore(root_uri={self._root_uri})>"
@@ -10,12 +10,14 @@ from .lp_fn_obj import LpFnObj
 from .any_fn import AnyFn
 from .lp_fn_value import LpFnValue
 from .lp_fn_plot import LpFnPlot
+from .last_expr import LastExpr
 
 # from .list_fn import ListFn
 from .code_empty import CodeEmpty
 from ...log.log_inst import LogInst
 
 if TYPE_CHECKING:
+    from ooodev.utils.helper.dot_dict import DotDict
     from .code_rule_t import CodeRuleT
 
 
@@ -31,6 +33,7 @@ class CodeRules:
         """
         self._log = LogInst()
         self._rules: List[CodeRuleT] = []
+        self._last_expr = LastExpr()
         if auto_register:
             self._register_known_rules()
 
@@ -130,6 +133,7 @@ class CodeRules:
         self._reg_rule(rule=RegexLastLine())
         self._reg_rule(rule=RegexLastLine(re.compile(r"^(\w+)$")))
         self._reg_rule(rule=LpFnPlot())
+        self._reg_rule(rule=self._last_expr)
         # self._reg_rule(rule=ListFn())
         self._reg_rule(rule=AnyFn())
         self._reg_rule(rule=EvalCode())
@@ -137,19 +141,21 @@ class CodeRules:
         self._reg_rule(rule=LpFnObj())
         self._reg_rule(rule=LastDict())
 
-    def get_matched_rule(self, mod: types.ModuleType, code: str) -> CodeRuleT:
+    def get_matched_rule(self, mod: types.ModuleType, code: str, expr_result: DotDict | None = None) -> CodeRuleT:
         """
         Get matched rules
 
         Args:
             mod (types.ModuleType): Module
             code (str): Code string.
+            expr_result (DotDict, optional): Value of the trailing expression of the code, if it was captured when the code was executed.
 
         Returns:
             List[CodeRuleT]: List of matched rules
         """
         with self._log.indent(True):
             found_rule = None
+            self._last_expr.data = expr_result
             for rule in self._rules:
                 rule.set_values(mod, code)
                 if rule.get_is_match():
@@ -157,6 +163,9 @@ class CodeRules:
                     found_rule = rule
                     break
                 rule.reset()
+            if found_rule is not self._last_expr:
+                # do not hold on to the captured value.
+                self._last_expr.data = None
             if found_rule:
                 # rules LpFn and LpFnObj already contain the correct DotDict
                 if not isinstance(found_rule, (LpFn, LpFnObj, LpFnPlot, CodeEmpty)):
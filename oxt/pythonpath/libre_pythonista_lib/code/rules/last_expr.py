@@ -0,0 +1,55 @@
+from __future__ import annotations
+import types
+from ooodev.utils.helper.dot_dict import DotDict
+
+
+class LastExpr:
+    """
+    A class to get the value of the trailing expression of the code.
+
+    The value is captured when the code is executed, see ``PyModule``, and assigned to ``data`` before the rules are matched.
+    This avoids evaluating the last line of the code a second time.
+    Expected to match ``df.groupby("a").agg("sum")``.
+    """
+
+    def __init__(self) -> None:
+        self._result = None
+        self.data = None
+
+    def set_values(self, mod: types.ModuleType, code: str) -> None:
+        """
+        Set the values for the class.
+
+        Args:
+            mod (types.ModuleType): Module
+            code (str): Code string.
+        """
+        self._result = None
+        self.mod = mod
+        self.code = code
+
+    def get_is_match(self) -> bool:
+        """Check if rules is a match. Matches when the value of a trailing expression has been captured."""
+        self._result = None
+        if not self.code:
+            return False
+        if self.data is None:
+            return False
+        self._result = self.data
+        return True
+
+    def get_value(self) -> DotDict:
+        """Get the value of the trailing expression in the ``data`` key."""
+        if self._result is None:
+            return DotDict(data=None)
+        return self._result
+
+    def reset(self) -> None:
+        """Reset the rule releasing any resource it is holding on to."""
+        self._result = None
+        self.mod = None
+        self.code = None
+        self.data = None
+
+    def __repr__(self) -> str:
+        return f"<LastExpr()>"
@@ -13,6 +13,7 @@ UNO_DISPATCH_CELL_SELECT_RECALC = ".uno:libre_pythonista.calc.cell.select_recalc
 UNO_DISPATCH_CELL_CTl_UPDATE = ".uno:libre_pythonista.calc.cell.select_ctl_update"
 UNO_DISPATCH_DF_CARD = ".uno:libre_pythonista.calc.cell.df_card"
 UNO_DISPATCH_DATA_TBL_CARD = ".uno:libre_pythonista.calc.cell.data_tbl_card"
+UNO_DISPATCH_ARRAY_PAGE = ".uno:libre_pythonista.calc.cell.array_page"
 UNO_DISPATCH_ABOUT = ".uno:libre_pythonista.ext.about"
 UNO_DISPATCH_LOG_WIN = ".uno:libre_pythonista.calc.log_window"
 UNO_DISPATCH_PIP_PKG_INSTALL = ".uno:libre_pythonista.ext.pip_pkg_install"
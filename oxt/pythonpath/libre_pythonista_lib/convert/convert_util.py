@@ -1,5 +1,6 @@
 from __future__ import annotations
 from datetime import datetime, timedelta
+import numpy as np
 import pandas as pd
 from ooodev.loader import Lo
 
@@ -93,3 +94,49 @@ class ConvertUtil:
         libreoffice_number = delta.days + delta.seconds / 86400  # 86400 seconds in a day
 
         return round(libreoffice_number)
+
+    @classmethod
+    def lo_dates_to_pandas(cls, values: pd.Series, epoch: datetime | None = None) -> pd.Series:
+        """
+        Convert a Series of LibreOffice Calc numeric dates to a Series of Pandas Timestamps.
+
+        The whole Series is converted at once. Times are kept to the microsecond,
+        values that are empty or not numbers become ``NaT``.
+
+        Args:
+            values (pd.Series): The numeric dates to convert.
+            epoch (datetime, optional): The epoch of the numeric dates. Defaults to the epoch of LibreOffice Calc.
+
+        Returns:
+            pd.Series: Series of ``datetime64[ns]`` values.
+        """
+        if epoch is None:
+            epoch = cls.get_lo_epoch()
+        numbers = pd.to_numeric(values, errors="coerce").to_numpy(dtype=np.float64)
+        # round to the microsecond as datetime does, float days are not exact.
+        micro = np.round(numbers * 86_400_000_000)
+        dates = pd.Timestamp(epoch) + pd.to_timedelta(micro, unit="us")
+        return pd.Series(dates, index=values.index, name=values.name)
+
+    @classmethod
+    def pandas_dates_to_lo(cls, values: pd.Series, epoch: datetime | None = None) -> pd.Series:
+        """
+        Convert a Series of Pandas Timestamps to a Series of LibreOffice Calc numeric dates.
+
+        The whole Series is converted at once. Times are kept as the fractional part of the day,
+        ``NaT`` values become ``NaN``. Timezone aware values are converted using their local time.
+
+        Args:
+            values (pd.Series): The dates to convert.
+            epoch (datetime, optional): The epoch of the numeric dates. Defaults to the epoch of LibreOffice Calc.
+
+        Returns:
+            pd.Series: Series of ``float64`` values.
+        """
+        if epoch is None:
+            epoch = cls.get_lo_epoch()
+        if not pd.api.types.is_datetime64_any_dtype(values):
+            values = pd.to_datetime(values, errors="coerce")
+        if values.dt.tz is not None:
+            values = values.dt.tz_localize(None)
+        return (values - pd.Timestamp(epoch)) / pd.Timedelta(days=1)
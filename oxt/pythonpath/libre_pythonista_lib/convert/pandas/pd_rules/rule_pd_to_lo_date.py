@@ -24,5 +24,5 @@ class RulePdToLoDate(RuleBase):
                 # df.iloc[:, col] = df.iloc[:, col].apply(cls.libreoffice_date_to_pandas)
             else:
                 col_name = col
-            df[col_name] = df[col_name].apply(ConvertUtil.pandas_to_lo_date)
+            df[col_name] = ConvertUtil.pandas_dates_to_lo(df[col_name])
         return df
@@ -0,0 +1,150 @@
+from __future__ import annotations
+from typing import Any, Dict, Sequence
+import numpy as np
+import pandas as pd
+
+DATE = "date"
+"""Column type of dates. Date columns are converted from LibreOffice numeric dates after the DataFrame is created."""
+
+_ALIASES: Dict[str, str] = {
+    "date": DATE,
+    "datetime": DATE,
+    "datetime64": DATE,
+    "datetime64[ns]": DATE,
+    "int": "int64",
+    "int64": "int64",
+    "float": "float64",
+    "float64": "float64",
+    "float32": "float32",
+    "bool": "bool",
+    "boolean": "bool",
+    "category": "category",
+    "str": "string",
+    "string": "string",
+    "string[python]": "string",
+    "string[pyarrow]": "string[pyarrow]",
+}
+
+
+def get_column_type(value: Any) -> str | None:  # noqa: ANN401
+    """
+    Gets the column type of a ``column_types`` value.
+
+    Args:
+        value (Any): Type name such as ``int64``, ``category`` or ``date``, or a numpy or pandas dtype.
+
+    Returns:
+        str | None: Column type or ``None`` if the type is not supported.
+    """
+    if isinstance(value, str):
+        return _ALIASES.get(value, _ALIASES.get(value.lower(), None))
+    try:
+        return _ALIASES.get(str(pd.api.types.pandas_dtype(value)).lower(), None)
+    except TypeError:
+        return None
+
+
+def _is_missing(value: Any) -> bool:  # noqa: ANN401
+    # empty cells are read as empty strings.
+    return value is None or value == "" or (isinstance(value, float) and value != value)
+
+
+def _to_float(value: Any) -> float:  # noqa: ANN401
+    if isinstance(value, float):
+        return value
+    if isinstance(value, (bool, int)):
+        return float(value)
+    if isinstance(value, str):
+        text = value.strip().lower()
+        if text in ("true", "false"):
+            return 1.0 if text == "true" else 0.0
+        try:
+            return float(text)
+        except ValueError:
+            return np.nan
+    return np.nan
+
+
+def _to_str(value: Any) -> str:  # noqa: ANN401
+    # Calc numbers are floats, show whole numbers as Calc does.
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    return str(value)
+
+
+def _get_floats(values: Sequence[Any] | np.ndarray, dtype: Any, name: Any, col_type: str) -> np.ndarray:  # noqa: ANN401
+    if isinstance(values, np.ndarray) and values.dtype.kind == "f":
+        return values.astype(dtype, copy=False)
+    floats = np.fromiter((_to_float(v) for v in values), dtype=dtype, count=len(values))
+    # values that are not numbers are NaN as are empty cells.
+    for i in np.flatnonzero(np.isnan(floats)):
+        if not _is_missing(values[i]):
+            raise ValueError(f"Column {name!r} of type {col_type}: value {values[i]!r} is not a number")
+    return floats
+
+
+def _get_categorical(values: Sequence[Any] | np.ndarray) -> pd.Categorical:
+    codes = np.empty(len(values), dtype=np.int32)
+    categories: Dict[Any, int] = {}
+    for i, value in enumerate(values):
+        codes[i] = -1 if _is_missing(value) else categories.setdefault(value, len(categories))
+    return pd.Categorical.from_codes(codes, categories=list(categories))
+
+
+def _get_strings(values: Sequence[Any] | np.ndarray, storage: str) -> Any:  # noqa: ANN401
+    strings = [None if _is_missing(v) else _to_str(v) for v in values]
+    if storage == "pyarrow":
+        try:
+            import pyarrow as pa
+
+            return pd.arrays.ArrowStringArray(pa.array(strings, type=pa.string()))
+        except ImportError:
+            pass
+    return pd.array(strings, dtype="string")
+
+
+def convert_column(values: Sequence[Any] | np.ndarray, col_type: str, name: Any = None) -> Any:  # noqa: ANN401
+    """
+    Creates the array of a column in its column type.
+
+    Empty cells become missing values. ``int64`` and ``bool`` columns with missing values use the
+    pandas nullable ``Int64`` and ``boolean`` types.
+
+    Args:
+        values (Sequence[Any] | np.ndarray): Values of the column as read from the range.
+        col_type (str): Column type from ``get_column_type()``. Must not be ``date``.
+        name (Any, optional): Name of the column, used in error messages.
+
+    Raises:
+        ValueError: If the column type is not supported.
+        ValueError: If a value of an ``int64``, ``float64``, ``float32`` or ``bool`` column is not a number
+            or a value of an ``int64`` column is not a whole number.
+
+    Returns:
+        Any: numpy or pandas array.
+    """
+    if col_type in ("float64", "float32"):
+        return _get_floats(values, np.dtype(col_type), name, col_type)
+    if col_type in ("int64", "bool"):
+        floats = _get_floats(values, np.float64, name, col_type)
+        mask = np.isnan(floats)
+        has_missing = bool(mask.any())
+        if has_missing:
+            floats = np.where(mask, 0.0, floats)
+        if col_type == "int64":
+            fractions = np.flatnonzero(floats != np.trunc(floats))
+            if len(fractions):
+                raise ValueError(
+                    f"Column {name!r} of type int64: value {values[fractions[0]]!r} is not a whole number"
+                )
+            ints = floats.astype(np.int64)
+            return pd.arrays.IntegerArray(ints, mask) if has_missing else ints
+        bools = floats != 0.0
+        return pd.arrays.BooleanArray(bools, mask) if has_missing else bools
+    if col_type == "category":
+        return _get_categorical(values)
+    if col_type == "string":
+        return _get_strings(values, "python")
+    if col_type == "string[pyarrow]":
+        return _get_strings(values, "pyarrow")
+    raise ValueError(f"Column type is not supported: {col_type}")
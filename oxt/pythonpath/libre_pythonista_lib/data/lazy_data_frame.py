@@ -0,0 +1,155 @@
+from __future__ import annotations
+from typing import Any, Callable, Dict, Hashable, Iterator, List, Tuple, TYPE_CHECKING
+import numpy as np
+import pandas as pd
+
+if TYPE_CHECKING:
+    from .pandas_data_obj import PandasDataObj
+
+
+class LazyDataFrame:
+    """
+    DataFrame of a range that is read from the sheet when its data is first used.
+
+    ``shape``, ``columns`` and ``len()`` are known from the range and its header row without reading the data.
+    Selecting columns with ``[]`` reads only those columns and ``head()`` only the first rows. Any other use reads the whole range once and is
+    passed on to the DataFrame.
+
+    Pickling or copying an instance gives the DataFrame.
+    """
+
+    def __init__(self, pdo: PandasDataObj, load: Callable[[], pd.DataFrame]) -> None:
+        """
+        Constructor
+
+        Args:
+            pdo (PandasDataObj): Data object of the range, used to read columns.
+            load (Callable[[], pd.DataFrame]): Reads the DataFrame of the whole range.
+        """
+        self._pdo = pdo
+        self._load = load
+        self._df: pd.DataFrame | None = None
+        self._shape = (pdo.row_count, pdo.col_count)
+        labels = pdo.columns
+        self._columns = pd.Index(labels) if pdo.has_headers else pd.RangeIndex(len(labels))
+        self._cols: Dict[int, pd.Series] = {}
+
+    def load(self) -> pd.DataFrame:
+        """
+        Gets the DataFrame, reading the range the first time.
+
+        Returns:
+            pd.DataFrame: DataFrame of the range.
+        """
+        if self._df is None:
+            self._df = self._load()
+            self._cols.clear()
+        return self._df
+
+    def _get_col_index(self, key: Any) -> int | None:  # noqa: ANN401
+        # None when the key is not a single column such as a duplicate header or a boolean mask.
+        if not isinstance(key, Hashable) or isinstance(key, (slice, tuple)):
+            return None
+        try:
+            loc = self._columns.get_loc(key)
+        except (KeyError, TypeError):
+            return None
+        return loc if isinstance(loc, int) else None
+
+    def _get_cols(self, indexes: List[int]) -> List[pd.Series]:
+        missing = [i for i in dict.fromkeys(indexes) if i not in self._cols]
+        if missing:
+            df = self._pdo.get_partial_data_frame(missing)
+            for pos, i in enumerate(missing):
+                self._cols[i] = df.iloc[:, pos]
+        return [self._cols[i] for i in indexes]
+
+    def __getitem__(self, key: Any) -> Any:  # noqa: ANN401
+        if self._df is None:
+            idx = self._get_col_index(key)
+            if idx is not None:
+                # callers may change the Series, the read column must stay as read.
+                return self._get_cols([idx])[0].copy()
+            if isinstance(key, list) and key:
+                indexes = [self._get_col_index(k) for k in key]
+                if all(i is not None for i in indexes):
+                    return pd.concat(self._get_cols(indexes), axis=1)  # type: ignore
+        return self.load()[key]
+
+    def head(self, n: int = 5) -> pd.DataFrame:
+        """
+        Gets the first ``n`` rows.
+
+        When the range has not been read, only those rows are read.
+
+        Args:
+            n (int, optional): Number of rows. Defaults to ``5``.
+
+        Returns:
+            pd.DataFrame: DataFrame of the rows.
+        """
+        if self._df is None and n >= 0:
+            return self._pdo.get_partial_data_frame(nrows=n)
+        return self.load().head(n)
+
+    def __getattr__(self, name: str) -> Any:  # noqa: ANN401
+        if name.startswith("_"):
+            raise AttributeError(name)
+        return getattr(self.load(), name)
+
+    def __reduce__(self) -> Tuple[Any, ...]:
+        return (pd.DataFrame, (self.load(),))
+
+    def __array__(self, dtype: Any = None) -> np.ndarray:  # noqa: ANN401
+        return np.asarray(self.load(), dtype=dtype)
+
+    def __len__(self) -> int:
+        return self.shape[0]
+
+    def __iter__(self) -> Iterator[Any]:
+        return iter(self.columns)
+
+    def __contains__(self, key: Any) -> bool:  # noqa: ANN401
+        return key in self.columns
+
+    def __str__(self) -> str:
+        return str(self.load())
+
+    def __repr__(self) -> str:
+        if self._df is None:
+            return f"<LazyDataFrame(shape={self._shape}, loaded=False)>"
+        return repr(self._df)
+
+    # region Properties
+    @property
+    def shape(self) -> Tuple[int, int]:
+        """Gets the number of rows and columns."""
+        return self._shape if self._df is None else self._df.shape
+
+    @property
+    def columns(self) -> pd.Index:
+        """Gets the column labels."""
+        return self._columns if self._df is None else self._df.columns
+
+    @property
+    def ndim(self) -> int:
+        """Gets the number of dimensions, always ``2``."""
+        return 2
+
+    @property
+    def size(self) -> int:
+        """Gets the number of cells."""
+        rows, cols = self.shape
+        return rows * cols
+
+    @property
+    def empty(self) -> bool:
+        """Gets if there are no rows or no columns."""
+        return self.size == 0
+
+    @property
+    def is_loaded(self) -> bool:
+        """Gets if the whole range has been read."""
+        return self._df is not None
+
+    # endregion Properties
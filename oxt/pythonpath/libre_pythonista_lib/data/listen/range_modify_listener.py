@@ -0,0 +1,46 @@
+from __future__ import annotations
+from typing import Callable, TYPE_CHECKING
+
+try:
+    # python 3.12+
+    from typing import override  # type: ignore
+except ImportError:
+    from typing_extensions import override
+
+import uno
+import unohelper
+from com.sun.star.util import XModifyListener
+
+if TYPE_CHECKING:
+    from com.sun.star.lang import EventObject
+
+
+class RangeModifyListener(XModifyListener, unohelper.Base):
+    """Modify listener of a cell range that calls a function when the range changes or is disposed."""
+
+    def __init__(self, on_change: Callable[[], None]) -> None:
+        """
+        Constructor
+
+        Args:
+            on_change (Callable[[], None]): Called when the content of the range changes.
+        """
+        XModifyListener.__init__(self)
+        unohelper.Base.__init__(self)
+        self._on_change = on_change
+
+    @override
+    def modified(self, aEvent: EventObject) -> None:
+        """
+        Is called when something changes in the object.
+
+        The source of the event is the cell range the listener is registered with.
+        """
+        self._on_change()
+
+    @override
+    def disposing(self, Source: EventObject) -> None:
+        """
+        gets called when the broadcaster is about to be disposed.
+        """
+        self._on_change()
@@ -1,11 +1,16 @@
 from __future__ import annotations
-from typing import Dict, TYPE_CHECKING
+from typing import Any, Dict, Iterator, Sequence, TYPE_CHECKING
+import numpy as np
 import pandas as pd
 from typing import List
 import uno
 from ooodev.calc import CalcCellRange
+from ooodev.utils.data_type.range_obj import RangeObj
+from ooodev.utils.data_type.range_values import RangeValues
 from ooodev.utils.gen_util import Util as OdUtil
 from .tbl_data_obj import TblDataObj
+from .range_profile import RangeProfile
+from .column_types import DATE, convert_column, get_column_type
 from ..utils.pandas_util import PandasUtil
 
 if TYPE_CHECKING:
@@ -13,28 +18,40 @@ if TYPE_CHECKING:
 else:
     from ___lo_pip___.oxt_logger import OxtLogger
 
+READ_CHUNK_ROWS = 50_000
+"""Number of rows read at a time by ``lp()`` for large ranges."""
+
 
 class PandasDataObj:
-    def __init__(self, cell_rng: CalcCellRange, col_types: Dict[str | int, str] | None = None):
+    def __init__(
+        self,
+        cell_rng: CalcCellRange,
+        col_types: Dict[str | int, str] | None = None,
+        profile: RangeProfile | None = None,
+    ):
         """
         Constructor
 
         Args:
             cell_rng (CalcCellRange): The cell range to get the table information from.
             col_types (Dict[str | int, str] | None): A dictionary of column names or indexes and their types.
-                Currently only "date" column type is supported.
+                Supported types are ``date``, ``int64``, ``float64``, ``float32``, ``bool``, ``category``,
+                ``string`` and ``string[pyarrow]``. Other columns have the type inferred by pandas.
+            profile (RangeProfile, optional): Content of the range from an earlier read of the same unchanged range.
         """
         self._sheet = cell_rng.calc_sheet
         self._doc = cell_rng.calc_doc
         self._cell_rng = cell_rng
         self._date_column_names: List[str] = []
         self._date_column_indexes: List[int] = []
+        self._typed_column_names: Dict[str, str] = {}
+        self._typed_column_indexes: Dict[int, str] = {}
         self._log = OxtLogger(log_name=self.__class__.__name__)
         with self._log.indent(True):
             if self._log.is_debug:
                 self._log.debug(f"init: {cell_rng.range_obj}")
                 self._log.debug(f"current sheet {self._sheet.name}")
-            self._data_info = TblDataObj(cell_rng)
+            self._data_info = TblDataObj(cell_rng, profile)
             if col_types:
                 self._process_column_types(col_types)
             self._log.debug("init complete.")
@@ -44,24 +61,210 @@ class PandasDataObj:
             names: Dict[str, str] = {}
             indexes: Dict[int, str] = {}
             for key, value in col_types.items():
+                col_type = get_column_type(value)
+                if col_type is None:
+                    self._log.warning(f"_process_column_types() - Column type not supported: {key}: {value}")
+                    continue
                 if isinstance(key, str):
-                    names[key] = value
+                    names[key] = col_type
                 elif isinstance(key, int):
-                    indexes[key] = value
+                    indexes[key] = col_type
 
             for key, value in names.items():
-                if value == "date":
+                if value == DATE:
                     self._log.debug(f"_process_column_types() - Added Date Column Name: {key}")
                     self._date_column_names.append(key)
+                else:
+                    self._log.debug(f"_process_column_types() - Added {value} Column Name: {key}")
+                    self._typed_column_names[key] = value
 
             for key, value in indexes.items():
-                if value == "date":
+                if value == DATE:
                     self._log.debug(f"_process_column_types() - Added Date Column index: {key}")
                     self._date_column_indexes.append(key)
+                else:
+                    self._log.debug(f"_process_column_types() - Added {value} Column index: {key}")
+                    self._typed_column_indexes[key] = value
+
+    def _get_typed_columns(self) -> Dict[int, str]:
+        """Gets the types of the columns that have a type other than date by zero-based column index."""
+        result: Dict[int, str] = {}
+        if not self._typed_column_names and not self._typed_column_indexes:
+            return result
+        count = self._data_info.col_count
+        for idx, col_type in self._typed_column_indexes.items():
+            try:
+                result[OdUtil.get_index(idx, count)] = col_type
+            except IndexError:
+                self._log.warning(f"_get_typed_columns() Index out of range: {idx}. Will not be included")
+        if self._typed_column_names and self._data_info.has_headers:
+            for i, name in enumerate(self._data_info.headers):
+                if name in self._typed_column_names:
+                    result[i] = self._typed_column_names[name]
+        return result
 
     def _get_data(self):
         return self._sheet.get_array(range_obj=self._cell_rng.range_obj)
 
+    def _get_body_range(self) -> RangeObj:
+        """Gets the range below the headers."""
+        ro = self._cell_rng.range_obj
+        if self._data_info.has_headers:
+            ro = 1 - ro
+        return ro
+
+    def _iter_body_ranges(self, chunksize: int) -> Iterator[RangeObj]:
+        """Gets the range below the headers in blocks of ``chunksize`` rows."""
+        rv = self._get_body_range().get_range_values()
+        for row_start in range(rv.row_start, rv.row_end + 1, chunksize):
+            yield RangeObj.from_range(
+                RangeValues(
+                    col_start=rv.col_start,
+                    col_end=rv.col_end,
+                    row_start=row_start,
+                    row_end=min(row_start + chunksize - 1, rv.row_end),
+                    sheet_idx=rv.sheet_idx,
+                )
+            )
+
+    def _get_numeric_data(self, ro: RangeObj | None = None) -> np.ndarray:
+        """
+        Gets the data of a range as a float64 array.
+
+        Only valid when every cell below the headers is a number, see ``TblDataObj.is_numeric``.
+
+        Args:
+            ro (RangeObj, optional): Range to read. Defaults to the range below the headers.
+        """
+        if ro is None:
+            ro = self._get_body_range()
+        rng = self._sheet.get_range(range_obj=ro)
+        # getData() returns the cells as doubles which numpy converts in a single step.
+        return np.array(rng.component.getData(), dtype=np.float64)
+
+    def _create_column_data_frame(
+        self, col_values: List[Any], typed: Dict[int, str], columns: Sequence[Any]
+    ) -> pd.DataFrame:
+        """
+        Creates a DataFrame from the values of each column with each typed column created directly in its type.
+
+        Items of ``col_values`` are set to ``None`` as they are used, so each column is released once converted.
+        """
+        arrays: Dict[int, Any] = {}
+        for i, values in enumerate(col_values):
+            col_values[i] = None
+            col_type = typed.get(i, None)
+            if col_type is not None:
+                arrays[i] = convert_column(values, col_type, columns[i])
+            elif isinstance(values, np.ndarray):
+                # same type as pandas infers for the column of a DataFrame created from rows.
+                arrays[i] = pd.Series(values, copy=False).infer_objects() if values.dtype == object else values
+            else:
+                arrays[i] = pd.Series(values, dtype=None if values else object)
+            del values
+        df = pd.DataFrame(arrays, copy=False)
+        # names may not be unique.
+        df.columns = list(columns)
+        return df
+
+    def _create_data_frame(  # noqa: ANN401
+        self, data: Any, cols: Sequence[int] | None = None, by_column: bool = False
+    ) -> pd.DataFrame:
+        """
+        Creates a DataFrame from the data below the headers and converts the date columns.
+
+        Args:
+            data (Any): Rows or float64 array of the data or, when ``by_column`` is ``True``, a list of the array of each column.
+            cols (Sequence[int], optional): Sorted zero-based range column indexes of the columns of the data.
+                Defaults to all the columns of the range.
+            by_column (bool, optional): If ``data`` is the array of each column. The list is emptied. Defaults to ``False``.
+        """
+        has_headers = self._data_info.has_headers
+        columns = self._data_info.headers if has_headers else list(range(self._data_info.col_count))
+        typed = self._get_typed_columns()
+        if cols is not None:
+            columns = [columns[i] for i in cols]
+            typed = {pos: typed[i] for pos, i in enumerate(cols) if i in typed}
+        if by_column:
+            df = self._create_column_data_frame(data, typed, columns)
+        elif typed:
+            if isinstance(data, np.ndarray):
+                col_values: List[Any] = [data[:, i] for i in range(data.shape[1])]
+            else:
+                col_values = list(zip(*data)) if len(data) else [() for _ in columns]
+            df = self._create_column_data_frame(col_values, typed, columns)
+        elif has_headers or cols is not None:
+            # without headers the labels are the range column indexes.
+            df = pd.DataFrame(data, columns=columns, copy=False)
+        else:
+            df = pd.DataFrame(data, copy=False)
+        if has_headers:
+            self._process_df_with_headers(df)
+        else:
+            self._process_df_no_headers(df)
+        return df
+
+    def _get_chunked_data_frame(self, chunksize: int) -> pd.DataFrame:
+        """
+        Gets the DataFrame by reading the range in blocks of ``chunksize`` rows.
+
+        Blocks are copied into arrays created for all the rows, only one block is held in memory besides the result.
+        """
+        rv = self._get_body_range().get_range_values()
+        row_count = rv.row_end - rv.row_start + 1
+        if self._data_info.is_numeric:
+            arr = np.empty((row_count, rv.col_end - rv.col_start + 1), dtype=np.float64)
+            pos = 0
+            for ro in self._iter_body_ranges(chunksize):
+                block = self._get_numeric_data(ro)
+                arr[pos : pos + len(block)] = block
+                pos += len(block)
+            return self._create_data_frame(arr)
+
+        # columns of numbers are float64, other columns hold the cell values until the DataFrame is created.
+        numeric = set(self._data_info.numeric_columns)
+        arrays: List[Any] = [
+            np.empty(row_count, dtype=np.float64 if col in numeric else object)
+            for col in range(rv.col_start, rv.col_end + 1)
+        ]
+        pos = 0
+        for ro in self._iter_body_ranges(chunksize):
+            block = self._sheet.get_array(range_obj=ro)
+            for arr, values in zip(arrays, zip(*block)):
+                arr[pos : pos + len(block)] = values
+            pos += len(block)
+            del block
+        return self._create_data_frame(arrays, by_column=True)
+
+    def iter_data_frames(self, chunksize: int) -> Iterator[pd.DataFrame]:
+        """
+        Gets the data of the range as DataFrames of ``chunksize`` rows.
+
+        Each block is read from the sheet when it is needed.
+        The index of each DataFrame continues from the previous DataFrame.
+
+        Args:
+            chunksize (int): Number of rows of each DataFrame, not counting the headers.
+
+        Raises:
+            ValueError: If ``chunksize`` is less than ``1``.
+
+        Yields:
+            pd.DataFrame: DataFrame with Date columns converted to Pandas Date columns.
+        """
+        if chunksize < 1:
+            raise ValueError(f"chunksize must be greater than 0: {chunksize}")
+        start = 0
+        for ro in self._iter_body_ranges(chunksize):
+            if self._data_info.is_numeric:
+                data = self._get_numeric_data(ro)
+            else:
+                data = self._sheet.get_array(range_obj=ro)
+            df = self._create_data_frame(data)
+            df.index = pd.RangeIndex(start, start + len(df))
+            start += len(df)
+            yield df
+
     def _process_df_with_headers(self, df: pd.DataFrame):
 
         with self._log.indent(True):
@@ -75,7 +278,7 @@ class PandasDataObj:
                 for index in self._date_column_indexes:
                     name = self.get_column_name(index)
                     date_col_names.add(name)
-                actual_columns = set(self._data_info.headers)
+                actual_columns = set(df.columns)
                 if self._log.is_debug:
                     self._log.debug(f"_process_df_with_headers() - Actual Columns: {actual_columns}")
                 # if any name in date_col_names is not in the actual columns then remove it
@@ -94,7 +297,9 @@ class PandasDataObj:
     def _process_df_no_headers(self, df: pd.DataFrame):
         with self._log.indent(True):
             self._log.debug("_process_df_no_headers() Entered.")
-            dc = self._data_info.date_columns
+            # date columns of the profile are sheet indexes, the DataFrame columns start at 0.
+            col_start = self._cell_rng.range_obj.start_col_index
+            dc = [i - col_start for i in self._data_info.date_columns]
             count = self._data_info.col_count
 
             for i in self._date_column_indexes:
@@ -113,18 +318,38 @@ class PandasDataObj:
             self._log.debug("_process_df_no_headers() Exiting.")
             return df
 
-    def get_data_frame(self) -> pd.DataFrame:
+    def get_data_frame(self, chunksize: int = 0, data: Sequence[Sequence[Any]] | None = None) -> pd.DataFrame:
         """
         Gets the dataframe for the instance.
         The DataFrame Frame will have Date columns converted to Pandas Date columns.
 
+        Args:
+            chunksize (int, optional): When the range has more rows, the range is read in blocks of
+                ``chunksize`` rows which keeps less data in memory at the same time. ``0`` reads the range at once.
+                Defaults to ``0``.
+            data (Sequence[Sequence[Any]], optional): Values of the range when they are already read,
+                such as by ``lp_many()`` with other ranges. Defaults to reading them from the range.
+
         Returns:
             pd.DataFrame: The DataFrame.
         """
         with self._log.indent(True):
             self._log.debug("get_data_frame() Entered.")
             try:
-                data = self._get_data()
+                if data is None:
+                    if chunksize > 0 and self._get_body_range().row_count > chunksize:
+                        self._log.debug(f"get_data_frame() Reading in blocks of {chunksize} rows.")
+                        df = self._get_chunked_data_frame(chunksize)
+                        self._log.debug("get_data_frame() Exiting.")
+                        return df
+
+                    if self._data_info.is_numeric:
+                        self._log.debug("get_data_frame() Numeric data.")
+                        df = self._create_data_frame(self._get_numeric_data())
+                        self._log.debug("get_data_frame() Exiting.")
+                        return df
+
+                    data = self._get_data()
                 data_len = len(data)
                 self._log.debug(f"get_data_frame() Data Length: {data_len}")
                 if data_len == 0:
@@ -132,21 +357,121 @@ class PandasDataObj:
 
                 if self._data_info.has_headers:
                     self._log.debug("get_data_frame() Has Headers.")
+                    if self._data_info.profile.headers is None:
+                        self._data_info.set_headers(data[0])
                     if data_len == 1:
                         self._log.debug("get_data_frame() Exiting. No data. Only Headers")
                         return pd.DataFrame([], columns=data[0])
-                    df = pd.DataFrame(data[1:], columns=data[0])
-                    self._process_df_with_headers(df)
+                    df = self._create_data_frame(data[1:])
                 else:
                     self._log.debug("get_data_frame() No Headers.")
-                    df = pd.DataFrame(data)
-                    self._process_df_no_headers(df)
+                    df = self._create_data_frame(data)
                 self._log.debug("get_data_frame() Exiting.")
                 return df
             except Exception:
                 self._log.exception("get_data_frame()")
                 raise
 
+    def _get_sub_range(self, col_first: int, col_last: int, row_first: int, row_last: int) -> RangeObj:
+        """Gets the range of the zero-based columns and the zero-based rows below the headers."""
+        rv = self._get_body_range().get_range_values()
+        return RangeObj.from_range(
+            RangeValues(
+                col_start=rv.col_start + col_first,
+                col_end=rv.col_start + col_last,
+                row_start=rv.row_start + row_first,
+                row_end=rv.row_start + row_last,
+                sheet_idx=rv.sheet_idx,
+            )
+        )
+
+    def get_usecols(self, usecols: Any) -> List[int]:  # noqa: ANN401
+        """
+        Gets the column indexes of ``usecols`` in the same way as ``pandas.read_csv()``.
+
+        Args:
+            usecols (Any): Column label or zero-based index, a list of them or a callable that is passed each
+                column label and returns ``True`` for the columns to include.
+
+        Raises:
+            ValueError: If a column label is not found.
+            IndexError: If a column index is out of range.
+
+        Returns:
+            List[int]: Sorted zero-based column indexes.
+        """
+        labels = self.columns
+        if callable(usecols):
+            return [i for i, label in enumerate(labels) if usecols(label)]
+        if isinstance(usecols, (str, int)):
+            usecols = [usecols]
+        count = self._data_info.col_count
+        indexes = set()
+        for col in usecols:
+            if isinstance(col, str):
+                if col not in labels:
+                    raise ValueError(f"Usecols do not match columns, column not found: {col}")
+                indexes.add(labels.index(col))
+            else:
+                indexes.add(OdUtil.get_index(idx=int(col), count=count))
+        return sorted(indexes)
+
+    def get_partial_data_frame(
+        self, cols: Sequence[int] | None = None, skiprows: int = 0, nrows: int | None = None
+    ) -> pd.DataFrame:
+        """
+        Gets the DataFrame of some of the columns and rows of the range.
+
+        Only the cells of the columns and rows are read from the sheet, adjacent columns are read together.
+
+        Args:
+            cols (Sequence[int], optional): Zero-based column indexes in the order of the DataFrame columns.
+                Can be negative indexes to get from the end. Defaults to all the columns.
+            skiprows (int, optional): Number of rows below the headers to skip. Defaults to ``0``.
+            nrows (int, optional): Number of rows to read. Defaults to the rest of the rows.
+
+        Raises:
+            IndexError: If an index is out of range.
+
+        Returns:
+            pd.DataFrame: DataFrame with Date columns converted to Pandas Date columns.
+                The index starts at ``0``.
+        """
+        with self._log.indent(True):
+            count = self._data_info.col_count
+            if cols is None:
+                cols = range(count)
+            indexes = [OdUtil.get_index(idx=i, count=count) for i in cols]
+            ordered = sorted(set(indexes))
+            row_first = max(0, skiprows)
+            row_last = self.row_count - 1
+            if nrows is not None:
+                row_last = min(row_last, row_first + max(0, nrows) - 1)
+            if self._log.is_debug:
+                self._log.debug(f"get_partial_data_frame() Columns: {ordered}, Rows: {row_first} to {row_last}")
+            if row_first > row_last or not ordered:
+                data: Any = []
+            else:
+                # runs of adjacent columns.
+                runs: List[List[int]] = []
+                for i in ordered:
+                    if runs and runs[-1][1] == i - 1:
+                        runs[-1][1] = i
+                    else:
+                        runs.append([i, i])
+                ranges = [self._get_sub_range(a, b, row_first, row_last) for a, b in runs]
+                if self._data_info.is_numeric:
+                    data = np.hstack([self._get_numeric_data(ro) for ro in ranges])
+                else:
+                    col_values: List[Any] = []
+                    for ro in ranges:
+                        col_values.extend(zip(*self._sheet.get_array(range_obj=ro)))
+                    data = list(zip(*col_values))
+            df = self._create_data_frame(data, ordered)
+            if indexes != ordered:
+                df = df.iloc[:, [ordered.index(i) for i in indexes]]
+            return df
+
     def get_column_name(self, idx: int) -> str:
         """
         Gets the column name at the given index.
@@ -166,6 +491,11 @@ class PandasDataObj:
 
     # region Properties
 
+    @property
+    def profile(self) -> RangeProfile:
+        """Gets the content of the range, can be passed to a new instance for the same unchanged range."""
+        return self._data_info.profile
+
     @property
     def has_headers(self) -> bool:
         """Check if the range has header columns."""
@@ -176,4 +506,22 @@ class PandasDataObj:
         """Check if the range has date columns."""
         return self._data_info.has_date_columns
 
+    @property
+    def row_count(self) -> int:
+        """Gets the number of rows of the DataFrame, not counting the headers."""
+        count = self._cell_rng.range_obj.row_count
+        return count - 1 if self._data_info.has_headers else count
+
+    @property
+    def col_count(self) -> int:
+        """Gets the number of columns of the range."""
+        return self._data_info.col_count
+
+    @property
+    def columns(self) -> List[Any]:
+        """Gets the column labels of the DataFrame, the headers or the zero-based column indexes."""
+        if self._data_info.has_headers:
+            return list(self._data_info.headers)
+        return list(range(self._data_info.col_count))
+
     # endregion Properties
@@ -0,0 +1,256 @@
+from __future__ import annotations
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, List, Tuple, TYPE_CHECKING
+import threading
+
+if TYPE_CHECKING:
+    from ooodev.proto.office_document_t import OfficeDocumentT
+
+RangeCacheKey = Tuple[int, str, str, bool]
+"""Range cache key in the format of ``(sheet_idx, range_name, column_types, collapse)``."""
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+
+@dataclass
+class RangeCacheEntry:
+    """Data read from a cell range."""
+
+    data: Any
+    """Data such as a DataFrame. Must not be changed, callers get a copy."""
+    headers: bool
+    """If the first row of the range was used as column names."""
+    range_obj: Any
+    """Range the data was read from. Differs from the key when the range was collapsed to the used area."""
+    nbytes: int
+    """Memory used by the data."""
+    release: Callable[[], None] | None = None
+    """Called when the entry is removed, such as to remove the listener of the range."""
+    is_valid: Callable[[], bool] | None = None
+    """Called by ``get()`` to check the entry still matches its key, such as after rows are inserted above the range."""
+    profile: Any = None
+    """Content of the range gathered before the data was read, see ``find_profile()``."""
+
+
+class RangeCache:
+    """
+    Per document cache of the data read by ``lp()`` from cell ranges.
+
+    Entries are removed by ``invalidate()`` when the range changes and the least recently used entries are
+    removed when the memory of all the entries exceeds ``max_bytes``. Methods are thread safe.
+
+    ``RangeCacheEntry.release`` is never called while the lock is held, it may need to wait for the office
+    which may in turn be waiting for the lock to report a change.
+    """
+
+    _instances: Dict[str, RangeCache] = {}
+
+    def __new__(cls, doc: OfficeDocumentT) -> RangeCache:
+        key = f"doc_{doc.runtime_uid}"
+        if key not in cls._instances:
+            inst = super().__new__(cls)
+            inst._is_init = False
+            cls._instances[key] = inst
+        return cls._instances[key]
+
+    def __init__(self, doc: OfficeDocumentT) -> None:
+        if getattr(self, "_is_init", False):
+            return
+        self._lock = threading.RLock()
+        self._entries: OrderedDict[RangeCacheKey, RangeCacheEntry] = OrderedDict()
+        self._max_bytes = DEFAULT_MAX_BYTES
+        self._bytes = 0
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+        self._is_init = True
+
+    def get(self, key: RangeCacheKey) -> RangeCacheEntry | None:
+        """
+        Gets an entry and marks it as the most recently used.
+
+        Args:
+            key (RangeCacheKey): Entry key.
+
+        Returns:
+            RangeCacheEntry | None: Entry or ``None`` if not cached.
+        """
+        with self._lock:
+            entry = self._entries.get(key, None)
+            if entry is None:
+                self._misses += 1
+                return None
+        if entry.is_valid is not None and not self._is_valid(entry):
+            with self._lock:
+                removed = self._remove(key) if self._entries.get(key, None) is entry else []
+                self._misses += 1
+            self._release(removed)
+            return None
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+            self._hits += 1
+        return entry
+
+    def find_profile(self, sheet_idx: int, range_name: str) -> Any:  # noqa: ANN401
+        """
+        Gets the profile of the range the data of an entry was read from.
+
+        The same range may be read with other options such as different column types,
+        the profile does not depend on the options.
+
+        Args:
+            sheet_idx (int): Sheet index of the range.
+            range_name (str): Range that was read, such as ``A1:F50``.
+
+        Returns:
+            Any: Profile or ``None`` if no entry was read from the range.
+        """
+        with self._lock:
+            entries = [
+                entry
+                for key, entry in self._entries.items()
+                if key[0] == sheet_idx and entry.profile is not None and str(entry.range_obj) == range_name
+            ]
+        for entry in entries:
+            if self._is_valid(entry):
+                return entry.profile
+        return None
+
+    def _is_valid(self, entry: RangeCacheEntry) -> bool:
+        try:
+            return entry.is_valid() if entry.is_valid is not None else True
+        except Exception:
+            return False
+
+    def put(self, key: RangeCacheKey, entry: RangeCacheEntry) -> bool:
+        """
+        Adds an entry, replacing any entry with the same key.
+
+        Args:
+            key (RangeCacheKey): Entry key.
+            entry (RangeCacheEntry): Entry.
+
+        Returns:
+            bool: ``True`` if added; Otherwise, ``False`` if the entry is larger than ``max_bytes``.
+            ``entry.release`` is called when the entry is not added.
+        """
+        with self._lock:
+            removed = self._remove(key)
+            added = entry.nbytes <= self._max_bytes
+            if added:
+                self._entries[key] = entry
+                self._bytes += entry.nbytes
+                removed.extend(self._evict())
+            else:
+                removed.append(entry)
+        self._release(removed)
+        return added
+
+    def invalidate(self, key: RangeCacheKey) -> None:
+        """Removes an entry if it is cached."""
+        with self._lock:
+            removed = self._remove(key)
+        self._release(removed)
+
+    def clear(self) -> None:
+        """Removes all entries. Counters are not reset."""
+        with self._lock:
+            removed = list(self._entries.values())
+            self._entries.clear()
+            self._bytes = 0
+        self._release(removed)
+
+    def _remove(self, key: RangeCacheKey) -> List[RangeCacheEntry]:
+        entry = self._entries.pop(key, None)
+        if entry is None:
+            return []
+        self._bytes -= entry.nbytes
+        return [entry]
+
+    def _release(self, entries: List[RangeCacheEntry]) -> None:
+        for entry in entries:
+            release = entry.release
+            if release is None:
+                continue
+            entry.release = None
+            try:
+                release()
+            except Exception:
+                # the range may already be disposed.
+                pass
+
+    def _evict(self) -> List[RangeCacheEntry]:
+        removed: List[RangeCacheEntry] = []
+        while self._bytes > self._max_bytes and self._entries:
+            key = next(iter(self._entries))
+            removed.extend(self._remove(key))
+            self._evictions += 1
+        return removed
+
+    def __contains__(self, key: RangeCacheKey) -> bool:
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    # region Properties
+    @property
+    def max_bytes(self) -> int:
+        """Gets/Sets the maximum memory of all the entries. ``0`` disables the cache."""
+        return self._max_bytes
+
+    @max_bytes.setter
+    def max_bytes(self, value: int) -> None:
+        with self._lock:
+            self._max_bytes = max(0, value)
+            removed = self._evict()
+        self._release(removed)
+
+    @property
+    def is_enabled(self) -> bool:
+        """Gets if entries can be cached."""
+        return self._max_bytes > 0
+
+    @property
+    def bytes(self) -> int:
+        """Gets the memory used by all the entries."""
+        return self._bytes
+
+    @property
+    def hits(self) -> int:
+        """Gets the number of times ``get()`` found an entry."""
+        return self._hits
+
+    @property
+    def misses(self) -> int:
+        """Gets the number of times ``get()`` did not find an entry."""
+        return self._misses
+
+    @property
+    def evictions(self) -> int:
+        """Gets the number of entries removed to stay under ``max_bytes``."""
+        return self._evictions
+
+    # endregion Properties
+
+    @classmethod
+    def reset_instance(cls, runtime_uid: str) -> None:
+        """
+        Clears and removes the instance of a document.
+
+        Args:
+            runtime_uid (str): Runtime uid of the document.
+        """
+        key = f"doc_{runtime_uid}"
+        inst = cls._instances.pop(key, None)
+        if inst is not None:
+            inst.clear()
+
+    def __repr__(self) -> str:
+        return (
+            f"<RangeCache(entries={len(self)}, bytes={self._bytes}, max_bytes={self._max_bytes}, "
+            f"hits={self._hits}, misses={self._misses}, evictions={self._evictions})>"
+        )
@@ -0,0 +1,45 @@
+from __future__ import annotations
+from dataclasses import dataclass, field
+from typing import List, Sequence, TYPE_CHECKING
+
+if TYPE_CHECKING:
+    from com.sun.star.table import CellRangeAddress
+
+
+@dataclass
+class RangeProfile:
+    """Content of a cell range, gathered by ``TblDataObj`` before the data is read."""
+
+    has_headers: bool
+    """If the first row is all text values."""
+    date_columns: List[int]
+    """Zero-based sheet column indexes of the columns whose cells below the headers all have a date or time format."""
+    is_numeric: bool
+    """If every cell below the headers is a number that does not have a date or time format."""
+    headers: List[str] | None = None
+    """Values of the first row. ``None`` until read."""
+    numeric_columns: List[int] = field(default_factory=list)
+    """Zero-based sheet column indexes of the columns whose cells below the headers are all numbers that do not have a date or time format."""
+
+
+def is_cell_covered(ranges: Sequence[CellRangeAddress], row: int, col: int) -> bool:
+    """Gets if a cell is inside any of the ranges."""
+    return any(r.StartRow <= row <= r.EndRow and r.StartColumn <= col <= r.EndColumn for r in ranges)
+
+
+def is_col_covered(ranges: Sequence[CellRangeAddress], col: int, row_start: int, row_end: int) -> bool:
+    """Gets if the rows ``row_start`` to ``row_end`` of a column are all inside the ranges."""
+    spans = sorted((r.StartRow, r.EndRow) for r in ranges if r.StartColumn <= col <= r.EndColumn)
+    row = row_start
+    for start, end in spans:
+        if start > row:
+            break
+        row = max(row, end + 1)
+        if row > row_end:
+            return True
+    return row > row_end
+
+
+def has_rows(ranges: Sequence[CellRangeAddress], row_start: int, row_end: int) -> bool:
+    """Gets if any of the ranges has cells in the rows ``row_start`` to ``row_end``."""
+    return any(r.StartRow <= row_end and r.EndRow >= row_start for r in ranges)
@@ -1,8 +1,10 @@
 from __future__ import annotations
-from typing import cast, List, Tuple, TYPE_CHECKING
+from typing import cast, List, Sequence, Tuple, TYPE_CHECKING
 from com.sun.star.table import CellRangeAddress
 from com.sun.star.sheet import CellFlags  # const
-from ooodev.calc import CalcCellRange, RangeObj
+from ooodev.calc import CalcCellRange
+
+from .range_profile import RangeProfile, is_cell_covered, is_col_covered
 
 if TYPE_CHECKING:
     from ....___lo_pip___.oxt_logger import OxtLogger
@@ -13,12 +15,14 @@ else:
 class TblDataObj:
     """Class that gets table information on a cell range."""
 
-    def __init__(self, cell_rng: CalcCellRange):
+    def __init__(self, cell_rng: CalcCellRange, profile: RangeProfile | None = None):
         """
         Constructor
 
         Args:
             cell_rng (CalcCellRange): The cell range to get the table information from.
+            profile (RangeProfile, optional): Content of the range from an earlier read of the same unchanged range.
+                Defaults to reading it from the range when it is first needed.
         """
         self._log = OxtLogger(log_name=self.__class__.__name__)
         if self._log.is_debug:
@@ -27,87 +31,70 @@ class TblDataObj:
         self._sheet = cell_rng.calc_sheet
         self._doc = cell_rng.calc_doc
         self._cell_rng = cell_rng
-        self._date_columns = None
-        self._headers = None
+        self._profile = profile
         with self._log.indent(True):
             self._log.debug("init complete.")
 
-    def _rng_has_header(self) -> List[str]:
+    def _query(self, flags: int) -> Tuple[CellRangeAddress, ...]:
+        ranges = self._cell_rng.component.queryContentCells(flags)
+        return cast(Tuple[CellRangeAddress, ...], ranges.RangeAddresses)  # type: ignore
+
+    def _get_profile(self) -> RangeProfile:
         """
-        Check if the range has headers. Considered to be a header if the first row is all string values.
+        Gets the content of the range with a query per kind of content on the whole range.
+
+        The range is considered to have headers if the first row is all string values.
+        A column is a date column if all its cells below the headers are numbers with a date or time format
+        and a numeric column if they are all numbers without a date or time format.
 
         Returns:
-            bool: True if the range has headers.
+            RangeProfile: Content of the range.
         """
-        # Check of the first row is all string values.
-        # If there are merged cell in the header then the number of ranges will be more than 1
-        # which will return False.
         with self._log.indent(True):
-            self._log.debug("_rng_has_header() Entered")
-            ro = self._cell_rng.range_obj
-            if ro.is_single_row():
-                self._log.debug("_rng_has_header() Single row detected, returning Headers: []")
-                return []
-            start_ro = ro.get_start_row()
-            calc_rng = self._cell_rng.calc_sheet.get_range(range_obj=start_ro)
-            cursor = calc_rng.create_cursor()
-            ranges = cursor.component.queryContentCells(CellFlags.STRING)
-            if len(ranges.RangeAddresses) != 1:  # type: ignore
-                self._log.debug("_rng_has_header() Multiple ranges detected, returning Headers: []")
-                return []
-            cra = cast(CellRangeAddress, ranges.RangeAddresses[0])  # type: ignore
-            found_rng = RangeObj.from_range(cra)
-            if self._log.is_debug:
-                self._log.debug(f"_rng_has_header() Found Range: {found_rng}")
-            if found_rng != start_ro:
-                self._log.debug("_rng_has_header() Found Range does not match start row, returning Headers: []")
-                return []
-            arr = self._sheet.get_array(range_obj=found_rng)
+            self._log.debug("_get_profile() Entered")
+            rv = self._cell_rng.range_obj.get_range_values()
+            cols = range(rv.col_start, rv.col_end + 1)
+            text = self._query(CellFlags.STRING)
+            has_headers = rv.row_start < rv.row_end and all(is_cell_covered(text, rv.row_start, col) for col in cols)
+            body_start = rv.row_start + 1 if has_headers else rv.row_start
+
+            date_columns: List[int] = []
+            dates = self._query(CellFlags.DATETIME)
+            if dates:
+                date_columns = [col for col in cols if is_col_covered(dates, col, body_start, rv.row_end)]
+
+            values = self._query(CellFlags.VALUE)
+            numeric_columns = [col for col in cols if is_col_covered(values, col, body_start, rv.row_end)]
+            # numbers that cover every column leave no room for text or dates below the headers.
+            is_numeric = len(numeric_columns) == len(cols)
+
+            profile = RangeProfile(
+                has_headers=has_headers,
+                date_columns=date_columns,
+                is_numeric=is_numeric,
+                numeric_columns=numeric_columns,
+            )
             if self._log.is_debug:
-                self._log.debug(f"_rng_has_header() returning Headers: {list(arr[0])}")
-            return list(arr[0])
+                self._log.debug(f"_get_profile() returning {profile}")
+            return profile
 
-    def _get_date_columns(self) -> List[int]:
+    def _read_headers(self) -> List[str]:
+        if not self.profile.has_headers:
+            return []
+        arr = self._sheet.get_array(range_obj=self._cell_rng.range_obj.get_start_row())
+        if self._log.is_debug:
+            with self._log.indent(True):
+                self._log.debug(f"_read_headers() returning Headers: {list(arr[0])}")
+        return list(arr[0])
+
+    def set_headers(self, headers: Sequence[str]) -> None:
         """
-        Queries all constant numeric values that have a date or time number format.
-        Checks the queries to see if they match entire columns.
-        Match columns are returned as a list of zero-based column indexes.
+        Sets the headers when the first row has already been read with the data, saving a read.
 
-        Returns:
-            List[int]: A list of zero-based column indexes that contain date values.
+        Args:
+            headers (Sequence[str]): Values of the first row.
         """
-        with self._log.indent(True):
-            try:
-                self._log.debug("_get_date_columns() Entered")
-                ro = self._cell_rng.range_obj
-                if self.has_headers:
-                    # skip the header row
-                    # https://tinyurl.com/2zswb49z#subtracting-rows-using-integer
-                    ro = 1 - ro
-
-                calc_rng = self._sheet.get_range(range_obj=ro)
-                rv = ro.get_range_values()
-                cursor = calc_rng.create_cursor()
-                ranges = cursor.component.queryContentCells(CellFlags.DATETIME)
-                cra_vals = cast(Tuple[CellRangeAddress, ...], ranges.RangeAddresses)  # type: ignore
-                if self._log.is_debug:
-                    self._log.debug(f"_get_date_columns() Range Value Count: {len(cra_vals)}")
-                if len(cra_vals) == 0:  # type: ignore
-                    return []
-                date_columns = []
-                for cra in cra_vals:  # type: ignore
-                    if cra.StartColumn != cra.EndColumn:
-                        # must be a single column
-                        continue
-                    # check to see if the column spans the entire range
-                    if cra.StartRow == rv.row_start and cra.EndRow == rv.row_end:
-                        date_columns.append(cra.StartColumn)
-                if self._log.is_debug:
-                    self._log.debug(f"_get_date_columns() returning Date Columns: {date_columns}")
-                return date_columns
-            except Exception as e:
-                self._log.exception(f"_get_date_columns() Error: {e}")
-            return []
+        self.profile.headers = list(headers)
 
     def get_date_column_names(self) -> List[str]:
         """Gets the names of the columns that contain date values."""
@@ -135,12 +122,20 @@ class TblDataObj:
         end_idx = self._cell_rng.range_obj.end_col_index
         return end_idx - start_idx + 1
 
+    @property
+    def profile(self) -> RangeProfile:
+        """Gets the content of the range."""
+        if self._profile is None:
+            self._profile = self._get_profile()
+        return self._profile
+
     @property
     def headers(self) -> List[str]:
         """Gets the headers of the range."""
-        if self._headers is None:
-            self._headers = self._rng_has_header()
-        return self._headers
+        profile = self.profile
+        if profile.headers is None:
+            profile.headers = self._read_headers()
+        return profile.headers
 
     @property
     def has_headers(self) -> bool:
@@ -149,14 +144,26 @@ class TblDataObj:
 
         Headers are considered to be True if the first row is all string values.
         """
-        return len(self.headers) > 0
+        return self.profile.has_headers
 
     @property
     def date_columns(self) -> List[int]:
         """Gets the zero-based column indexes that contain date values."""
-        if self._date_columns is None:
-            self._date_columns = self._get_date_columns()
-        return self._date_columns
+        return self.profile.date_columns
+
+    @property
+    def is_numeric(self) -> bool:
+        """
+        Check if every cell below the headers is a number.
+
+        Formulas, text, empty cells and numbers formatted as dates or times are not considered to be numbers.
+        """
+        return self.profile.is_numeric
+
+    @property
+    def numeric_columns(self) -> List[int]:
+        """Gets the zero-based sheet column indexes of the columns whose cells below the headers are all numbers."""
+        return self.profile.numeric_columns
 
     @property
     def has_date_columns(self) -> bool:
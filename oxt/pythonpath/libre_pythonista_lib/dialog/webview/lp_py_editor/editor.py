@@ -67,7 +67,6 @@ class PyCellCodeEdit(CellCodeEdit):
             self.log.debug(f"Editing code for cell: {self.cell}")
             py_inst = PyInstance(self.cell.calc_doc)  # singleton
             py_inst.update_source(code=self.src_code, cell=self.cell.cell_obj)
-            py_inst.update_all()
             return True
         except Exception:
             self.log.exception(f"Error editing code for cell: {self.cell.cell_obj}")
@@ -33,6 +33,7 @@ from ..const import (
     UNO_DISPATCH_CELL_SELECT_RECALC,
     UNO_DISPATCH_DF_CARD,
     UNO_DISPATCH_DATA_TBL_CARD,
+    UNO_DISPATCH_ARRAY_PAGE,
     UNO_DISPATCH_SEL_RNG,
     UNO_DISPATCH_ABOUT,
     UNO_DISPATCH_LOG_WIN,
@@ -589,6 +590,39 @@ class DispatchProviderInterceptor(unohelper.Base, XDispatchProviderInterceptor):
                 log.exception(f"Dispatch Error: {URL.Main}")
                 return None
 
+        elif URL.Main == UNO_DISPATCH_ARRAY_PAGE:
+            try:
+                from .dispatch_array_page import DispatchArrayPage
+            except ImportError:
+                log.exception("DispatchArrayPage import error")
+                raise
+            try:
+                args = self._convert_query_to_dict(URL.Arguments)
+
+                cargs = CancelEventArgs(self)
+                cargs.event_data = DotDict(
+                    cmd=UNO_DISPATCH_ARRAY_PAGE, doc=self._doc, **args
+                )
+                se.trigger_event(LP_DISPATCHING_CMD, cargs)
+                if cargs.cancel is True and cargs.handled is False:
+                    return None
+
+                with log.indent(True):
+                    log.debug(
+                        "DispatchProviderInterceptor.queryDispatch: returning DispatchArrayPage"
+                    )
+                result = DispatchArrayPage(
+                    sheet=args["sheet"], cell=args["cell"], page=args["page"]
+                )
+
+                eargs = EventArgs.from_args(cargs)
+                eargs.event_data.dispatch = result
+                se.trigger_event(LP_DISPATCHED_CMD, eargs)
+                return result
+            except Exception:
+                log.exception(f"Dispatch Error: {URL.Main}")
+                return None
+
         elif URL.Main == UNO_DISPATCH_DATA_TBL_CARD:
             try:
                 from .dispatch_card_tbl_data import DispatchCardTblData
@@ -240,6 +240,139 @@ class CalcProps(CustomPropsBase):
     def include_extra_err_info(self, value: bool) -> None:
         self.set_custom_property("include_extra_err_info", value)
 
+    @property
+    def dependency_recalc(self) -> bool:
+        """
+        Gets/Sets if editing a cell only executes the cells that depend on it.
+
+        When ``False`` all the cells that come after the edited cell are executed. Defaults to ``False``.
+        """
+        return self.get_custom_property("dependency_recalc", False)
+
+    @dependency_recalc.setter
+    def dependency_recalc(self, value: bool) -> None:
+        self.set_custom_property("dependency_recalc", value)
+
+    @property
+    def dirty_recalc(self) -> bool:
+        """
+        Gets/Sets if a Calc recalculation only executes the cells whose code or ``lp()`` input data has changed.
+
+        When ``False`` the python module is rebuilt and all the cells are executed on every recalculation.
+        Defaults to ``False``.
+        """
+        return self.get_custom_property("dirty_recalc", False)
+
+    @dirty_recalc.setter
+    def dirty_recalc(self, value: bool) -> None:
+        self.set_custom_property("dirty_recalc", value)
+
+    @property
+    def kernel_mode(self) -> bool:
+        """
+        Gets/Sets if cell code is executed in a separate python process instead of inside LibreOffice.
+
+        ``lp()`` calls are resolved by LibreOffice and the data is sent to the kernel process.
+        """
+        return self.get_custom_property("kernel_mode", False)
+
+    @kernel_mode.setter
+    def kernel_mode(self, value: bool) -> None:
+        self.set_custom_property("kernel_mode", value)
+
+    @property
+    def max_mod_snapshots(self) -> int:
+        """
+        Gets/Sets the maximum number of code cells that keep a snapshot of the python module changes they made.
+
+        Snapshots are used to rewind the module when a cell is edited. Editing a cell after the limit executes
+        the cells from the limit onward. ``0`` for no limit.
+        """
+        return self.get_custom_property("max_mod_snapshots", 1000)
+
+    @max_mod_snapshots.setter
+    def max_mod_snapshots(self, value: int) -> None:
+        self.set_custom_property("max_mod_snapshots", value)
+
+    @property
+    def max_workers(self) -> int:
+        """
+        Gets/Sets the maximum number of threads used to execute independent code cells at the same time.
+
+        Cells that do not share any names and do not read each other with ``lp()`` are executed concurrently.
+        ``0`` or ``1`` executes one cell at a time.
+        """
+        return self.get_custom_property("max_workers", 0)
+
+    @max_workers.setter
+    def max_workers(self, value: int) -> None:
+        self.set_custom_property("max_workers", value)
+
+    @property
+    def background_recalc(self) -> bool:
+        """
+        Gets/Sets if code cells are executed on a background thread after a change.
+
+        Changes that arrive close together are combined into a single recalculation and a recalculation
+        that is still running when a newer change arrives is canceled and started again.
+        """
+        return self.get_custom_property("background_recalc", False)
+
+    @background_recalc.setter
+    def background_recalc(self, value: bool) -> None:
+        self.set_custom_property("background_recalc", value)
+
+    @property
+    def recalc_delay(self) -> int:
+        """
+        Gets/Sets the time in milliseconds to wait for more changes before a background recalculation starts.
+        """
+        return self.get_custom_property("recalc_delay", 300)
+
+    @recalc_delay.setter
+    def recalc_delay(self, value: int) -> None:
+        self.set_custom_property("recalc_delay", value)
+
+    @property
+    def result_cache(self) -> bool:
+        """
+        Gets/Sets if the results of code cells are stored in the document when it is saved.
+
+        When the document is opened again, cells whose code and ``lp()`` input data have not changed
+        show the stored result and are not executed.
+        """
+        return self.get_custom_property("result_cache", False)
+
+    @result_cache.setter
+    def result_cache(self, value: bool) -> None:
+        self.set_custom_property("result_cache", value)
+
+    @property
+    def lp_cache_size(self) -> int:
+        """
+        Gets/Sets the maximum memory in MB of the ranges read by ``lp()`` that are kept until the range changes.
+
+        When the limit is reached the least recently read ranges are removed. ``0`` disables the cache.
+        """
+        return self.get_custom_property("lp_cache_size", 256)
+
+    @lp_cache_size.setter
+    def lp_cache_size(self, value: int) -> None:
+        self.set_custom_property("lp_cache_size", value)
+
+    @property
+    def array_max_rows(self) -> int:
+        """
+        Gets/Sets the maximum number of rows of a DataFrame or Series that are written to the sheet as an array.
+
+        Larger results are shown a page of rows at a time, the page is chosen from the cell menu. ``0`` writes all rows.
+        """
+        return self.get_custom_property("array_max_rows", 0)
+
+    @array_max_rows.setter
+    def array_max_rows(self, value: int) -> None:
+        self.set_custom_property("array_max_rows", value)
+
     @property
     @override
     def doc(self) -> CalcDoc:
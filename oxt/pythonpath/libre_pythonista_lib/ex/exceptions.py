@@ -58,3 +58,17 @@ class SingletonKeyError(Exception):
     """Singleton Key Error."""
 
     pass
+
+
+class RecalcCanceledError(Exception):
+    """Recalculation Canceled Error."""
+
+    def __init__(self, index: int = 0) -> None:
+        """
+        Constructor
+
+        Args:
+            index (int, optional): Index of the first cell the canceled recalculation did not finish executing. Defaults to ``0``.
+        """
+        super().__init__(f"Recalculation canceled at index {index}.")
+        self.index = index
@@ -1,5 +1,5 @@
 from __future__ import annotations
-from typing import Any, Dict, Tuple, Optional, TYPE_CHECKING
+from typing import Any, Dict, List, Tuple, Optional, TYPE_CHECKING
 import socket
 import threading
 import subprocess
@@ -158,59 +158,13 @@ class ProcessMgr(ABC):
 
             is_dbg = "debug" if self.log.is_debug else "no_debug"
 
-            if config.is_flatpak:
-                p_args = [
-                    "/usr/bin/flatpak-spawn",
-                    "--host",
-                    "flatpak",
-                    "run",
-                    f"--command={config.flatpak_libre_pythonista_py_editor_cell_cmd}",
-                    config.flatpak_libre_pythonista_py_editor,
-                    "--process-id",
-                    process_id,
-                    "--socket-path",
-                    socket_file,  # may start with ~
-                    "--debug",
-                    is_dbg,
-                ]
-            elif config.is_snap:
-                p_args = [
-                    # "/usr/bin/snap",
-                    "snapctl",
-                    "run",
-                    "librepythonista-pyeditor",
-                    "--process-id",
-                    process_id,
-                    # "--socket-path",
-                    # socket_file,  # may start with ~
-                    "--host",
-                    host,
-                    "--port",
-                    str(port),
-                    "--debug",
-                    is_dbg,
-                ]
-            else:
-                p_args = [
-                    str(config.python_path),
-                    entry_point,
-                    "--process-id",
-                    process_id,
-                    "--host",
-                    host,
-                    "--port",
-                    str(port),
-                    "--socket-path",
-                    socket_file,  # may start with ~
-                    "--debug",
-                    is_dbg,
-                ]
-            if config.is_flatpak:
-                p_args.append("--kind")
-                p_args.append("flatpak")
-            elif config.is_snap:
-                p_args.append("--kind")
-                p_args.append("snap")
+            p_args = self.get_process_args(
+                process_id=process_id,
+                host=host,
+                port=port,
+                socket_file=socket_file,
+                is_dbg=is_dbg,
+            )
 
             if self.log.is_debug:
                 self.log.debug("args: %s", p_args)
@@ -218,7 +172,7 @@ class ProcessMgr(ABC):
 
             process = subprocess.Popen(
                 p_args,
-                env=None if config.is_flatpak else env,
+                env=self.get_process_env(env),
                 stdout=subprocess.PIPE,
                 stderr=subprocess.PIPE,
                 text=True,
@@ -259,6 +213,92 @@ class ProcessMgr(ABC):
             self.log.exception(f"Error starting subprocess: {e}")
             return ""
 
+    def get_process_args(
+        self, process_id: str, host: str, port: int, socket_file: str, is_dbg: str
+    ) -> List[str]:
+        """
+        Gets the command line used to start the subprocess.
+
+        Args:
+            process_id (str): The unique process ID of the subprocess.
+            host (str): Host the server socket is bound to.
+            port (int): Port the server socket is bound to or ``0`` for a Unix domain socket.
+            socket_file (str): Unix domain socket file the server socket is bound to, may start with ``~``.
+            is_dbg (str): ``debug`` or ``no_debug``.
+
+        Returns:
+            List[str]: The command line arguments.
+        """
+        config = Config()
+        entry_point = self.get_script_path()
+        if config.is_flatpak:
+            p_args = [
+                "/usr/bin/flatpak-spawn",
+                "--host",
+                "flatpak",
+                "run",
+                f"--command={config.flatpak_libre_pythonista_py_editor_cell_cmd}",
+                config.flatpak_libre_pythonista_py_editor,
+                "--process-id",
+                process_id,
+                "--socket-path",
+                socket_file,  # may start with ~
+                "--debug",
+                is_dbg,
+            ]
+        elif config.is_snap:
+            p_args = [
+                # "/usr/bin/snap",
+                "snapctl",
+                "run",
+                "librepythonista-pyeditor",
+                "--process-id",
+                process_id,
+                # "--socket-path",
+                # socket_file,  # may start with ~
+                "--host",
+                host,
+                "--port",
+                str(port),
+                "--debug",
+                is_dbg,
+            ]
+        else:
+            p_args = [
+                str(config.python_path),
+                entry_point,
+                "--process-id",
+                process_id,
+                "--host",
+                host,
+                "--port",
+                str(port),
+                "--socket-path",
+                socket_file,  # may start with ~
+                "--debug",
+                is_dbg,
+            ]
+        if config.is_flatpak:
+            p_args.append("--kind")
+            p_args.append("flatpak")
+        elif config.is_snap:
+            p_args.append("--kind")
+            p_args.append("snap")
+        return p_args
+
+    def get_process_env(self, env: Dict[str, str]) -> Optional[Dict[str, str]]:
+        """
+        Gets the environment variables of the subprocess.
+
+        Args:
+            env (Dict[str, str]): A copy of the current environment with ``PYTHONPATH`` set to the current ``sys.path``.
+
+        Returns:
+            Optional[Dict[str, str]]: The environment variables or ``None`` to inherit the environment of LibreOffice.
+        """
+        config = Config()
+        return None if config.is_flatpak else env
+
     @abstractmethod
     def handle_client(self, process_id: str) -> None:
         """
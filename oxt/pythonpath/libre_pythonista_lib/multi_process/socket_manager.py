@@ -4,6 +4,7 @@ import socket
 import struct
 import threading
 import json
+import pickle
 import tempfile
 from pathlib import Path
 import os
@@ -28,14 +29,18 @@ class SocketManager:
         create_server_socket() -> Tuple[socket.socket, str, int, str]:
         accept_client(server_socket: socket.socket, process_id: str) -> socket.socket:
         send_message(message: Dict[str, Any], process_id: str) -> None:
+        send_payload(message: Dict[str, Any], process_id: str) -> None:
         receive_all(length: int, process_id: str) -> bytes:
+        receive_message(process_id: str) -> Dict[str, Any]:
         close_socket(process_id: str) -> None:
     """
 
-    def __init__(self):
+    def __init__(self, sock_file_name: str = "librepythonista_edit.sock"):
         """
         Initializes the editor with a logger, a socket pool, and a lock.
 
+        Args:
+            sock_file_name (str, optional): Name of the Unix domain socket file. Defaults to ``librepythonista_edit.sock``.
 
         Attributes:
             _socket_pool (Dict[str, socket.socket]): A dictionary to store socket connections.
@@ -47,6 +52,7 @@ class SocketManager:
         self.socket_timeout_sec = config.lp_py_cell_edit_sock_timeout
         self._socket_pool: Dict[str, socket.socket] = {}
         self._socket_file = ""
+        self._sock_file_name = sock_file_name
         self.log = OxtLogger(log_name=self.__class__.__name__)
         self.lock = threading.Lock()
 
@@ -63,7 +69,7 @@ class SocketManager:
 
         host = "localhost"
         sock_file = ""
-        sock_file_name = "librepythonista_edit.sock"
+        sock_file_name = self._sock_file_name
         if config.is_win or config.is_snap or force_tcp:
             server_socket = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
             server_socket.bind((host, 0))  # Bind to an available port
@@ -167,6 +173,64 @@ class SocketManager:
             except Exception:
                 self.log.exception("Error sending message")
 
+    def send_payload(self, message: Dict[str, Any], process_id: str) -> None:
+        """
+        Sends a pickled message to a client process via a socket.
+
+        Use this method instead of ``send_message()`` for messages that contain binary data such as a DataFrame.
+        The framing is the same as ``send_message()``.
+
+        Args:
+            message (Dict[str, Any]): The message to be sent, represented as a dictionary.
+            process_id (str): The identifier of the client process to which the message will be sent.
+
+        Raises:
+            Exception: If the message can not be pickled or sent.
+        """
+
+        message_bytes = pickle.dumps(message, protocol=pickle.HIGHEST_PROTOCOL)
+        message_length = struct.pack("!I", len(message_bytes))
+        with self.lock:
+            if process_id not in self._socket_pool:
+                self.log.error(
+                    "send_payload() Process %s not found in socket pool",
+                    process_id,
+                )
+                raise ConnectionResetError(f"Process {process_id} not found in socket pool")
+            sock = self._socket_pool[process_id]
+            if self.log.is_debug:
+                self.log.debug(
+                    "Sending payload of %i bytes to process %s",
+                    len(message_bytes),
+                    process_id,
+                )
+            sock.sendall(message_length + message_bytes)
+
+    def receive_message(self, process_id: str) -> Dict[str, Any]:
+        """
+        Receives a single message from a client process.
+
+        Messages sent as JSON or as a pickled payload are both supported.
+
+        Args:
+            process_id (str): The ID of the process whose socket will be used to receive data.
+
+        Returns:
+            Dict[str, Any]: The message or an empty dictionary if the process is not in the socket pool.
+
+        Raises:
+            ConnectionResetError: If the connection is closed prematurely.
+        """
+
+        raw_msg_len = self.receive_all(length=4, process_id=process_id)
+        if not raw_msg_len:
+            return {}
+        msg_len = struct.unpack("!I", raw_msg_len)[0]
+        byte_data = self.receive_all(length=msg_len, process_id=process_id)
+        if byte_data[:1] == b"{":
+            return json.loads(byte_data.decode(encoding="utf-8"))
+        return pickle.loads(byte_data)
+
     def receive_all(self, length: int, process_id: str) -> bytes:
         """
         Receives a specified number of bytes from a socket associated with a given process ID.
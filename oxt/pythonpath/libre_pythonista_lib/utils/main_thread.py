@@ -0,0 +1,47 @@
+from __future__ import annotations
+from typing import Any, Callable, TYPE_CHECKING
+
+try:
+    # python 3.12+
+    from typing import override  # type: ignore
+except ImportError:
+    from typing_extensions import override
+
+import uno
+import unohelper
+from com.sun.star.awt import XCallback
+from com.sun.star.awt import XRequestCallback
+from ooodev.loader import Lo
+
+if TYPE_CHECKING:
+    from ....___lo_pip___.oxt_logger.oxt_logger import OxtLogger
+else:
+    from ___lo_pip___.oxt_logger.oxt_logger import OxtLogger
+
+
+class _MainThreadCallback(unohelper.Base, XCallback):
+    def __init__(self, fn: Callable[[], Any]) -> None:
+        super().__init__()
+        self._fn = fn
+
+    @override
+    def notify(self, aData: Any) -> None:  # noqa: N803, ANN401
+        try:
+            self._fn()
+        except Exception:
+            # an error raised here may crash LibreOffice.
+            OxtLogger(log_name="MainThreadCallback").exception("Error running callback on main thread.")
+
+
+def run_in_main_thread(fn: Callable[[], Any]) -> None:
+    """
+    Runs a function on the main thread of LibreOffice.
+
+    The call returns at once. The function runs the next time the main thread processes events,
+    so it can be used from a background thread to write results back to the document.
+
+    Args:
+        fn (Callable[[], Any]): Function to run.
+    """
+    async_cb = Lo.create_instance_mcf(XRequestCallback, "com.sun.star.awt.AsyncCallback", raise_err=True)
+    async_cb.addCallback(_MainThreadCallback(fn), None)
@@ -1,12 +1,21 @@
 from __future__ import annotations
 import contextlib
-from typing import Any, Tuple, List
+import hashlib
+from typing import Any, Dict, Tuple, List
 from datetime import datetime, timedelta
+import numpy as np
 import pandas as pd
 from ..convert import array as convert_array
+from ..convert.convert_util import ConvertUtil
 from ..convert.array import rules as array_rules
-from ..convert import pandas as convert_pandas
-from ..convert.pandas import pd_rules as pandas_rules
+
+# LibreOffice Calc's epoch
+_LO_EPOCH = datetime(1899, 12, 30)
+# types that are written to Calc as they are.
+_LO_TYPES = (str, float, int, bool)
+
+LoColumns = Dict[int, Tuple[bytes, List[Any]]]
+"""Converted columns by position, ``-1`` for the index, with the hash of the values they were converted from."""
 
 
 class PandasUtil:
@@ -60,14 +69,108 @@ class PandasUtil:
         """Returns the index names of a DataFrame."""
         return df.index.tolist()
 
+    @classmethod
+    def _values_to_lo(cls, values: pd.Series | pd.Index, convert: bool = True) -> List[Any]:
+        """
+        Converts the values of a column or an index to a list of values that can be written to Calc.
+
+        Numeric columns are converted by numpy at once. Missing values become empty strings and
+        numpy scalars become Python values.
+
+        Args:
+            values (pd.Series | pd.Index): Values to convert.
+            convert (bool, optional): If True, converts dates and durations to LibreOffice Calc numbers
+                and other values Calc does not support to strings; Otherwise, they are left as they are.
+        """
+        dtype = values.dtype
+        if convert and pd.api.types.is_datetime64_any_dtype(dtype):
+            values = ConvertUtil.pandas_dates_to_lo(pd.Series(values, copy=False), _LO_EPOCH)
+            dtype = values.dtype
+        elif convert and pd.api.types.is_timedelta64_dtype(dtype):
+            values = pd.Series(values, copy=False) / pd.Timedelta(days=1)
+            dtype = values.dtype
+
+        if isinstance(dtype, np.dtype) and dtype.kind in "fiub":
+            arr = values.to_numpy()
+            result = arr.tolist()
+            if dtype.kind == "f":
+                for i in np.flatnonzero(np.isnan(arr)).tolist():
+                    result[i] = ""
+            return result
+
+        arr = values.to_numpy(dtype=object)
+        missing = pd.isna(arr)
+        result = arr.tolist()
+        for i, value in enumerate(result):
+            if missing[i]:
+                result[i] = ""
+            elif isinstance(value, _LO_TYPES):
+                continue
+            elif isinstance(value, np.generic):
+                result[i] = value.item()
+            elif not convert:
+                continue
+            elif isinstance(value, datetime):
+                ts = pd.Timestamp(value)
+                if ts.tz is not None:
+                    ts = ts.tz_localize(None)
+                result[i] = (ts - pd.Timestamp(_LO_EPOCH)) / pd.Timedelta(days=1)
+            else:
+                result[i] = str(value)
+        return result
+
+    @staticmethod
+    def _get_values_hash(values: pd.Series | pd.Index, convert: bool) -> bytes | None:
+        # None when the values can not be hashed, such as lists in a column.
+        try:
+            hashes = pd.util.hash_pandas_object(values, index=False)
+        except TypeError:
+            return None
+        h = hashlib.blake2b(hashes.to_numpy().tobytes(), digest_size=16)
+        h.update(f"{values.dtype}|{convert}".encode())
+        return h.digest()
+
+    @classmethod
+    def _cached_values_to_lo(
+        cls, key: int, values: pd.Series | pd.Index, convert: bool, prev: LoColumns, cache: LoColumns
+    ) -> List[Any]:
+        digest = cls._get_values_hash(values, convert)
+        if digest is not None:
+            entry = prev.get(key, None)
+            if entry is not None and entry[0] == digest:
+                cache[key] = entry
+                return entry[1]
+        result = cls._values_to_lo(values, convert)
+        if digest is not None:
+            cache[key] = (digest, result)
+        return result
+
+    @classmethod
+    def _columns_to_lo(
+        cls, items: List[Tuple[int, pd.Series | pd.Index]], convert: bool, cache: LoColumns | None
+    ) -> List[List[Any]]:
+        if cache is None:
+            return [cls._values_to_lo(values, convert) for _, values in items]
+        prev = dict(cache)
+        cache.clear()
+        return [cls._cached_values_to_lo(key, values, convert, prev, cache) for key, values in items]
+
     @classmethod
     def pandas_to_array(
-        cls, df: pd.DataFrame, *, header_opt: int = 0, index_opt: int = 0, convert: bool = True
+        cls,
+        df: pd.DataFrame,
+        *,
+        header_opt: int = 0,
+        index_opt: int = 0,
+        convert: bool = True,
+        cache: LoColumns | None = None,
     ) -> Any:
         """
         Converts a pandas DataFrame into a 2D list.
 
         This method automatically detects if the DataFrame has headers and index names.
+        The DataFrame is converted a column at a time without being copied.
+        Missing values such as ``NaN``, ``NaT`` and ``None`` become empty strings.
 
         Args:
             df (pd.DataFrame): The DataFrame to convert.
@@ -79,7 +182,10 @@ class PandasUtil:
                 If ``1``, then index names are included.
                 If ``2``, then index names are not included.
                 Default is ``0``.
-            convert (bool, optional): If True, converts dates to LibreOffice Calc numeric dates; Otherwise, converts dates to strings. Default is True.
+            convert (bool, optional): If True, converts dates to LibreOffice Calc numeric dates; Otherwise,
+                dates are left as Pandas Timestamps. Default is True.
+            cache (LoColumns, optional): Columns converted by the previous call for the same cell.
+                Columns whose values have the same hash are not converted again. Updated with the columns of ``df``.
 
         Returns:
             Any: The 2D list.
@@ -92,17 +198,9 @@ class PandasUtil:
         else:
             has_headers = cls.has_headers(df)
         if has_headers:
-            headers = [df.columns.tolist()]
-        # Append the DataFrame values to the list
-        if convert:
-            converter = convert_pandas.PandasDfConverter()
-            converter.add_rule(pandas_rules.RulePdToLoDate)
-            # converter.add_rule(pandas_rules.RulePdToIsoDate)
-            list_values = converter.apply_rules(df).values.tolist()
-        else:
-            list_values = df.values.tolist()
+            headers = [cls._values_to_lo(df.columns, convert)]
 
-        if not list_values:
+        if len(df.index) == 0:
             return headers
 
         if index_opt == 1:
@@ -112,18 +210,44 @@ class PandasUtil:
         else:
             has_index_names = cls.has_index_names(df)
 
+        items: List[Tuple[int, pd.Series | pd.Index]] = [(i, df.iloc[:, i]) for i in range(df.shape[1])]
         if has_index_names:
-            index_names = cls.get_index_names(df)
-            # insert an index name into each row
-            for i, index_name in enumerate(index_names):
-                list_values[i].insert(0, index_name)
+            items.insert(0, (-1, df.index))
             # insert an empty value into the start of the headers
             if has_headers:
                 headers[0].insert(0, "")
+        columns = cls._columns_to_lo(items, convert, cache)
 
+        # rows are lists, callers may change the values.
+        list_values = list(map(list, zip(*columns)))
         result = headers + list_values if has_headers else list_values
         return result
 
+    @classmethod
+    def pandas_series_to_array(
+        cls, ds: pd.Series, convert: bool = True, cache: LoColumns | None = None
+    ) -> List[List[Any]]:
+        """
+        Converts a pandas Series into a 2D list of index and value rows.
+
+        A header row of ``["", name]`` is included if the Series has a name.
+
+        Args:
+            ds (pd.Series): The Series to convert.
+            convert (bool, optional): If True, converts dates to LibreOffice Calc numeric dates; Otherwise,
+                dates are left as Pandas Timestamps. Default is True.
+            cache (LoColumns, optional): Index and values converted by the previous call for the same cell,
+                see ``pandas_to_array()``.
+
+        Returns:
+            List[List[Any]]: The 2D list.
+        """
+        columns = cls._columns_to_lo([(-1, ds.index), (0, ds)], convert, cache)
+        result = list(map(list, zip(*columns)))
+        if ds.name:
+            result.insert(0, ["", ds.name])
+        return result
+
     @staticmethod
     def is_pandas_date_column(df: pd.DataFrame, column_name: str) -> bool:
         """
@@ -271,22 +395,14 @@ class PandasUtil:
         Returns:
             pd.Series: Series containing LibreOffice Calc date values.
         """
-        # Define the base date for LibreOffice Calc
-        base_date = datetime(1899, 12, 30)
-
-        # Convert each Timestamp to the number of days since the base date
-        libreoffice_values = series.apply(
-            lambda x: (x - pd.Timestamp(base_date)).days + (x - pd.Timestamp(base_date)).seconds / 86400
-        )
-
-        return libreoffice_values
+        return ConvertUtil.pandas_dates_to_lo(series, _LO_EPOCH)
 
     @classmethod
     def convert_float64_to_dates(cls, df: pd.DataFrame) -> pd.DataFrame:
         """Converts date columns to Pandas Timestamp."""
         for col in df.columns:
             if df[col].dtype == "float64":
-                df[col] = df[col].apply(cls.lo_date_to_pandas)
+                df[col] = ConvertUtil.lo_dates_to_pandas(df[col], _LO_EPOCH)
         return df
 
     @classmethod
@@ -311,7 +427,7 @@ class PandasUtil:
                     raise ValueError("Column name must be a string if DataFrame has no headers.")
                 col_name = col
             if col_name in df.columns and not cls.pandas_is_date_col(df, col_name):
-                df[col_name] = df[col_name].apply(cls.lo_date_to_pandas)
+                df[col_name] = ConvertUtil.lo_dates_to_pandas(df[col_name], _LO_EPOCH)
         return df
 
     @classmethod
@@ -336,7 +452,7 @@ class PandasUtil:
                     raise ValueError("Column name must be a string if DataFrame has no headers.")
                 col_name = col
             if cls.pandas_is_date_col(df, col_name):
-                df[col_name] = df[col_name].apply(cls.pandas_to_lo_date)
+                df[col_name] = ConvertUtil.pandas_dates_to_lo(df[col_name], _LO_EPOCH)
             # df[col] = df[col].apply(cls.pandas_to_lo_date)
         return df
 
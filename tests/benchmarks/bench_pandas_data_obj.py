@@ -0,0 +1,54 @@
+"""
+Micro-benchmark of the DataFrame construction of ``PandasDataObj.get_data_frame()`` for numeric ranges.
+
+The baseline builds the frame from the tuple of tuples returned by ``get_array()``.
+The numeric path builds a float64 array from the tuple of tuples returned by ``getData()``,
+which only contains floats, and wraps it without copying.
+The data is created in python, the time spent by the office to return it is not included.
+
+Run from the project root:
+
+    python -m tests.benchmarks.bench_pandas_data_obj
+"""
+
+from __future__ import annotations
+from typing import Any, Tuple
+import timeit
+
+import numpy as np
+import pandas as pd
+
+SIZES = (10_000, 100_000, 1_000_000)
+COLUMNS = 10
+NUMBER = 5
+
+
+def _create_data(size: int) -> Tuple[Tuple[Any, ...], ...]:
+    rows = size // COLUMNS
+    headers = tuple(f"col{i}" for i in range(COLUMNS))
+    body = tuple(tuple(float(row * COLUMNS + col) for col in range(COLUMNS)) for row in range(rows))
+    return (headers,) + body
+
+
+def _baseline(data: Tuple[Tuple[Any, ...], ...]) -> pd.DataFrame:
+    return pd.DataFrame(data[1:], columns=data[0])
+
+
+def _numeric(headers: Tuple[Any, ...], body: Tuple[Tuple[float, ...], ...]) -> pd.DataFrame:
+    arr = np.array(body, dtype=np.float64)
+    return pd.DataFrame(arr, columns=list(headers), copy=False)
+
+
+def main() -> None:
+    print(f"{'cells':>10} {'baseline (ms)':>15} {'numeric (ms)':>15} {'speedup':>9}")
+    for size in SIZES:
+        data = _create_data(size)
+        headers, body = data[0], data[1:]
+        pd.testing.assert_frame_equal(_baseline(data), _numeric(headers, body))
+        baseline = timeit.timeit(lambda: _baseline(data), number=NUMBER) / NUMBER
+        numeric = timeit.timeit(lambda: _numeric(headers, body), number=NUMBER) / NUMBER
+        print(f"{size:>10} {baseline * 1e3:>15.2f} {numeric * 1e3:>15.2f} {baseline / numeric:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
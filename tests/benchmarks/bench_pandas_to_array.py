@@ -0,0 +1,61 @@
+"""
+Micro-benchmark of ``PandasUtil.pandas_to_array()`` that converts a DataFrame result into the array of a cell.
+
+The baseline copies the frame to convert its date columns, boxes every cell with ``.values.tolist()``
+and inserts the index into each row. The columnar version converts each column with numpy and builds
+the rows with ``zip()``.
+
+Run from the project root:
+
+    python -m tests.benchmarks.bench_pandas_to_array
+"""
+
+from __future__ import annotations
+from typing import Any, List, TYPE_CHECKING
+import timeit
+
+import numpy as np
+import pandas as pd
+
+if TYPE_CHECKING:
+    from build.pythonpath.libre_pythonista_lib.utils.pandas_util import PandasUtil
+    from build.pythonpath.libre_pythonista_lib.convert.convert_util import ConvertUtil
+else:
+    from libre_pythonista_lib.utils.pandas_util import PandasUtil
+    from libre_pythonista_lib.convert.convert_util import ConvertUtil
+
+SIZES = (10_000, 100_000, 1_000_000)
+COLUMNS = 10
+NUMBER = 3
+
+
+def _create_df(size: int) -> pd.DataFrame:
+    rows = size // COLUMNS
+    data = {f"col{i}": np.arange(rows, dtype=np.float64) * (i + 1) for i in range(COLUMNS - 2)}
+    data["date"] = pd.date_range("2024-01-01", periods=rows, freq="h")
+    data["name"] = [f"n{i % 100}" for i in range(rows)]
+    return pd.DataFrame(data, index=pd.Index(np.arange(rows) + 1, name="id"))
+
+
+def _baseline(df: pd.DataFrame) -> List[List[Any]]:
+    df = df.copy()
+    for col in df.columns:
+        if pd.api.types.is_datetime64_any_dtype(df[col]):
+            df[col] = ConvertUtil.pandas_dates_to_lo(df[col])
+    list_values = df.values.tolist()
+    for i, index_name in enumerate(df.index.tolist()):
+        list_values[i].insert(0, index_name)
+    return [[""] + df.columns.tolist()] + list_values
+
+
+def main() -> None:
+    print(f"{'cells':>10} {'baseline (ms)':>15} {'columnar (ms)':>15} {'speedup':>9}")
+    for size in SIZES:
+        df = _create_df(size)
+        baseline = timeit.timeit(lambda: _baseline(df), number=NUMBER) / NUMBER
+        columnar = timeit.timeit(lambda: PandasUtil.pandas_to_array(df), number=NUMBER) / NUMBER
+        print(f"{size:>10} {baseline * 1e3:>15.2f} {columnar * 1e3:>15.2f} {baseline / columnar:>8.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Micro-benchmark of the cell ordering operations of ``PySourceManager`` that run on every edit of a code cell.
+
+Each edit looks up the position of the edited cell and walks the cells that come after it.
+The baseline is the list based lookup that was used before ``SortedDict`` positions were used directly.
+
+Run from the project root:
+
+    python -m tests.benchmarks.bench_py_source_mgr
+"""
+
+from __future__ import annotations
+from typing import Any, TYPE_CHECKING
+import contextlib
+import timeit
+
+from sortedcontainers import SortedDict
+from ooodev.utils.data_type.cell_obj import CellObj
+
+if TYPE_CHECKING:
+    from build.pythonpath.libre_pythonista_lib.code.py_source_mgr import PySourceManager
+else:
+    from libre_pythonista_lib.code.py_source_mgr import PySourceManager
+
+SIZES = (10, 100, 1_000, 5_000)
+NUMBER = 200
+
+
+class _NullLog:
+    is_debug = False
+
+    def indent(self, use_as_ctx: bool = False) -> Any:  # noqa: ANN401
+        return contextlib.nullcontext()
+
+    def debug(self, *args: Any, **kwargs: Any) -> None:  # noqa: ANN401
+        pass
+
+    def warning(self, *args: Any, **kwargs: Any) -> None:  # noqa: ANN401
+        pass
+
+
+def _create_mgr(size: int) -> PySourceManager:
+    mgr = object.__new__(PySourceManager)
+    mgr._log = _NullLog()  # type: ignore
+    # one code cell per row in column A of the first sheet.
+    mgr._data = SortedDict({(0, row, 0): object() for row in range(size)})  # type: ignore
+    return mgr
+
+
+def _edit(mgr: PySourceManager, cell: CellObj) -> None:
+    index = mgr.get_index(cell)
+    for _ in mgr.iter_from_index(index + 1):
+        pass
+    mgr.get_next_cell(cell)
+
+
+def _edit_baseline(mgr: PySourceManager, cell: CellObj) -> None:
+    data = mgr._data
+    code_cell = mgr.convert_cell_obj_to_tuple(cell)
+    index = list(data.keys()).index(code_cell)
+    keys = list(data.keys())
+    for i in range(index + 1, len(keys)):
+        key = keys[i]
+        co = CellObj.from_idx(col_idx=key[2], row_idx=key[1], sheet_idx=key[0])
+        _ = data[mgr.convert_cell_obj_to_tuple(co)]
+
+
+def main() -> None:
+    print(f"{'cells':>8} {'baseline (us)':>15} {'indexed (us)':>15}")
+    for size in SIZES:
+        mgr = _create_mgr(size)
+        # edit the cell in the middle of the sheet.
+        cell = CellObj.from_idx(col_idx=0, row_idx=size // 2, sheet_idx=0)
+        baseline = timeit.timeit(lambda: _edit_baseline(mgr, cell), number=NUMBER) / NUMBER
+        indexed = timeit.timeit(lambda: _edit(mgr, cell), number=NUMBER) / NUMBER
+        print(f"{size:>8} {baseline * 1e6:>15.1f} {indexed * 1e6:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
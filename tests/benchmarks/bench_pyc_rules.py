@@ -0,0 +1,87 @@
+"""
+Micro-benchmark of the rule matching done by ``PY.C`` for each formula of a sheet with scalar results.
+
+A sheet with 5,000 ``PY.C`` formulas matches a rule for each formula on every recalculation.
+The baseline creates every registered rule in order until one matches. ``PycRules.get_matched_rule()``
+only creates the rules whose ``match_types`` include the type of the result.
+
+Rules read the custom properties of the document so LibreOffice is started headless.
+
+Run from the project root:
+
+    python -m tests.benchmarks.bench_pyc_rules
+"""
+
+from __future__ import annotations
+from typing import Any, List, TYPE_CHECKING
+import tempfile
+import timeit
+
+from ooodev.calc import CalcDoc
+from ooodev.conn import cache as conn_cache
+from ooodev.conn import connectors
+from ooodev.loader import Lo
+from ooodev.utils.helper.dot_dict import DotDict
+
+if TYPE_CHECKING:
+    from build.pythonpath.libre_pythonista_lib.cell.result_action.pyc.rules.pyc_rules import PycRules
+else:
+    from libre_pythonista_lib.cell.result_action.pyc.rules.pyc_rules import PycRules
+
+FORMULAS = 5_000
+NUMBER = 3
+
+
+def _create_data() -> List[DotDict]:
+    values: List[Any] = []
+    for i in range(FORMULAS):
+        kind = i % 3
+        if kind == 0:
+            values.append(i * 1.5)
+        elif kind == 1:
+            values.append(i)
+        else:
+            values.append(f"item {i}")
+    py_src = DotDict(source_code="result = 1")
+    return [DotDict(data=value, py_src=py_src) for value in values]
+
+
+def _match_baseline(rules: PycRules, cell: Any, data: DotDict) -> Any:  # noqa: ANN401
+    for rule in rules._rules:
+        inst = rule(cell, data)
+        if inst.get_is_match():
+            return inst
+    return None
+
+
+def _run(match: Any, rules: PycRules, cell: Any, items: List[DotDict]) -> None:  # noqa: ANN401
+    for data in items:
+        match(rules, cell, data)
+
+
+def main() -> None:
+    Lo.load_office(
+        connector=connectors.ConnectPipe(headless=True),
+        cache_obj=conn_cache.Cache(working_dir=tempfile.mkdtemp()),
+    )
+    try:
+        doc = CalcDoc.create_doc()
+        cell = doc.sheets[0]["A1"]
+        rules = PycRules()
+        items = _create_data()
+        for data in items[:3]:
+            assert type(_match_baseline(rules, cell, data)) is type(rules.get_matched_rule(cell, data))
+
+        baseline = timeit.timeit(lambda: _run(_match_baseline, rules, cell, items), number=NUMBER) / NUMBER
+        indexed = timeit.timeit(
+            lambda: _run(lambda r, c, d: r.get_matched_rule(c, d), rules, cell, items), number=NUMBER
+        ) / NUMBER
+        print(f"{'formulas':>10} {'baseline (ms)':>15} {'indexed (ms)':>15} {'speedup':>9}")
+        print(f"{FORMULAS:>10} {baseline * 1e3:>15.2f} {indexed * 1e3:>15.2f} {baseline / indexed:>8.1f}x")
+        doc.close_doc()
+    finally:
+        Lo.close_office()
+
+
+if __name__ == "__main__":
+    main()
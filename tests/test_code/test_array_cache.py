@@ -0,0 +1,65 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+import pytest
+
+if __name__ == "__main__":
+    pytest.main([__file__])
+
+pd = pytest.importorskip("pandas")
+
+if TYPE_CHECKING:
+    from build.pythonpath.libre_pythonista_lib.cell.array.array_cache import ArrayCache
+    from build.pythonpath.libre_pythonista_lib.utils.pandas_util import PandasUtil
+else:
+    from libre_pythonista_lib.cell.array.array_cache import ArrayCache
+    from libre_pythonista_lib.utils.pandas_util import PandasUtil
+
+
+class _Doc:
+    def __init__(self, runtime_uid: str) -> None:
+        self.runtime_uid = runtime_uid
+
+
+def test_pandas_to_array_cache() -> None:
+    df = pd.DataFrame({"a": [1.0, 2.0, 3.0], "b": ["x", "y", None]})
+    cache = {}
+    arr = PandasUtil.pandas_to_array(df, cache=cache)
+    assert arr == PandasUtil.pandas_to_array(df)
+    assert sorted(cache) == [0, 1]
+    col_a = cache[0][1]
+    col_b = cache[1][1]
+
+    df.loc[1, "b"] = "z"
+    arr = PandasUtil.pandas_to_array(df, cache=cache)
+    assert arr == [["a", "b"], [1.0, "x"], [2.0, "z"], [3.0, ""]]
+    # only the changed column is converted again.
+    assert cache[0][1] is col_a
+    assert cache[1][1] is not col_b
+
+    # columns that are gone are removed.
+    PandasUtil.pandas_to_array(df[["a"]], cache=cache)
+    assert sorted(cache) == [0]
+
+
+def test_pandas_series_to_array_cache() -> None:
+    ds = pd.Series([1.0, 2.0], index=pd.Index(["r1", "r2"]), name="val")
+    cache = {}
+    assert PandasUtil.pandas_series_to_array(ds, cache=cache) == [["", "val"], ["r1", 1.0], ["r2", 2.0]]
+    assert sorted(cache) == [-1, 0]
+    ds = ds[::-1]
+    assert PandasUtil.pandas_series_to_array(ds, cache=cache) == [["", "val"], ["r2", 2.0], ["r1", 1.0]]
+
+
+def test_array_cache() -> None:
+    doc = _Doc("array_cache_test")
+    try:
+        cache = ArrayCache(doc)  # type: ignore
+        assert ArrayCache(doc) is cache  # type: ignore
+        columns = cache.get_columns(0, "A1")
+        assert cache.get_columns(0, "A1") is columns
+        assert cache.get_columns(1, "A1") is not columns
+        assert len(cache) == 2
+        cache.remove(0, "A1")
+        assert len(cache) == 1
+    finally:
+        ArrayCache.reset_instance(doc.runtime_uid)
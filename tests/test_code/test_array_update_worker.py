@@ -0,0 +1,76 @@
+from __future__ import annotations
+from typing import List, TYPE_CHECKING
+import threading
+import pytest
+
+if __name__ == "__main__":
+    pytest.main([__file__])
+
+if TYPE_CHECKING:
+    from build.pythonpath.libre_pythonista_lib.cell.array.array_shapes import ArrayShapes
+    from build.pythonpath.libre_pythonista_lib.cell.array.array_update_worker import ArrayUpdateWorker
+else:
+    from libre_pythonista_lib.cell.array.array_shapes import ArrayShapes
+    from libre_pythonista_lib.cell.array.array_update_worker import ArrayUpdateWorker
+
+
+class _Doc:
+    def __init__(self, runtime_uid: str) -> None:
+        self.runtime_uid = runtime_uid
+
+
+def test_array_shapes() -> None:
+    doc = _Doc("array_shapes_test")
+    try:
+        shapes = ArrayShapes(doc)  # type: ignore
+        assert shapes.track((0, "A1"), 10, 2)
+        assert not shapes.track((0, "A1"), 10, 2)
+        assert shapes.pop_pending() == {(0, "A1")}
+        assert not shapes.has_pending
+
+        # same shape, nothing to update.
+        assert not shapes.track((0, "A1"), 10, 2)
+        assert shapes.track((0, "A1"), 11, 2)
+        assert shapes.pop_pending() == {(0, "A1")}
+
+        shapes.forget([(0, "A1")])
+        assert shapes.track((0, "A1"), 11, 2)
+    finally:
+        ArrayShapes.reset_instance(doc.runtime_uid)
+
+
+def test_array_update_worker_coalesces() -> None:
+    worker = ArrayUpdateWorker()
+    assert ArrayUpdateWorker() is worker
+    started = threading.Event()
+    release = threading.Event()
+    calls: List[str] = []
+
+    def blocking() -> None:
+        started.set()
+        release.wait(5)
+        calls.append("first")
+
+    worker.request("doc_a", blocking)
+    assert started.wait(5)
+    # requests made while an update runs are merged into one.
+    for i in range(5):
+        worker.request("doc_a", lambda i=i: calls.append(f"next{i}"))
+    worker.request("doc_b", lambda: calls.append("b"))
+    release.set()
+    assert worker.wait_idle(5)
+    assert calls == ["first", "next4", "b"]
+
+
+def test_array_update_worker_error() -> None:
+    worker = ArrayUpdateWorker()
+    calls: List[str] = []
+
+    def fail() -> None:
+        raise RuntimeError("update failed")
+
+    worker.request("doc_a", fail)
+    assert worker.wait_idle(5)
+    worker.request("doc_a", lambda: calls.append("ok"))
+    assert worker.wait_idle(5)
+    assert calls == ["ok"]
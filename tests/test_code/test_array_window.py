@@ -0,0 +1,69 @@
+from __future__ import annotations
+from typing import Any, Dict, TYPE_CHECKING
+import pytest
+
+if __name__ == "__main__":
+    pytest.main([__file__])
+
+pytest.importorskip("ooodev")
+pd = pytest.importorskip("pandas")
+
+if TYPE_CHECKING:
+    from build.pythonpath.libre_pythonista_lib.cell.array.array_window import ArrayWindow
+else:
+    from libre_pythonista_lib.cell.array.array_window import ArrayWindow
+
+
+class _Cell:
+    def __init__(self) -> None:
+        self.props: Dict[str, Any] = {}
+        self.cell_obj = "A1"
+
+    def has_custom_property(self, name: str) -> bool:
+        return name in self.props
+
+    def get_custom_property(self, name: str, default: Any = None) -> Any:  # noqa: ANN401
+        return self.props.get(name, default)
+
+    def set_custom_property(self, name: str, value: Any) -> None:  # noqa: ANN401
+        self.props[name] = value
+
+    def remove_custom_property(self, name: str) -> None:
+        del self.props[name]
+
+
+class _Window(ArrayWindow):
+    def __init__(self, cell: _Cell, max_rows: int) -> None:
+        super().__init__(cell)  # type: ignore
+        self.max_rows = max_rows
+
+    def get_max_rows(self) -> int:
+        return self.max_rows
+
+
+def test_array_window_all_rows() -> None:
+    window = _Window(_Cell(), 0)
+    df = pd.DataFrame({"a": range(25)})
+    assert window.get_page_count(len(df)) == 1
+    assert window.get_rows(len(df)) == (0, 25)
+    assert window.apply(df) is df
+
+
+def test_array_window_pages() -> None:
+    cell = _Cell()
+    window = _Window(cell, 10)
+    ds = pd.Series(range(25))
+    assert window.get_page_count(len(ds)) == 3
+    assert window.get_rows(len(ds)) == (0, 10)
+
+    window.set_page(2)
+    assert window.get_page() == 2
+    assert window.apply(ds).tolist() == list(range(20, 25))
+
+    # a page past the last page shows the last page.
+    window.set_page(5)
+    assert window.get_rows(len(ds)) == (20, 25)
+
+    window.set_page(0)
+    assert not cell.props
+    assert window.get_rows(len(ds)) == (0, 10)
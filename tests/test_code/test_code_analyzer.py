@@ -0,0 +1,289 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+import pytest
+
+if __name__ == "__main__":
+    pytest.main([__file__])
+
+if TYPE_CHECKING:
+    from build.pythonpath.libre_pythonista_lib.code.dependency import CodeAnalyzer, DepGraph
+else:
+    from libre_pythonista_lib.code.dependency import CodeAnalyzer, DepGraph
+
+
+def test_analyze_reads_writes() -> None:
+    analyzer = CodeAnalyzer()
+    refs = analyzer.analyze("x = 1\ny = x + z\nimport numpy as np")
+    assert refs.writes == {"x", "y", "np"}
+    # x is bound before it is read.
+    assert refs.reads == {"z"}
+    assert refs.is_dynamic is False
+
+
+def test_analyze_mutation() -> None:
+    analyzer = CodeAnalyzer()
+    refs = analyzer.analyze("df['a'] = 1\nlst.append(3)")
+    assert refs.writes == {"df"}
+    assert refs.mutates == {"lst"}
+    assert refs.reads == {"df", "lst"}
+
+
+def test_analyze_call_mutation() -> None:
+    analyzer = CodeAnalyzer()
+    # receivers of method calls and arguments of calls may be mutated, wherever the call is.
+    refs = analyzer.analyze("x = lst.pop()\nmutate(other, key=[a, b.c])\ny = df.groupby('a').sum()\nz = f(n + 1)")
+    assert refs.writes == {"x", "y", "z"}
+    assert refs.mutates == {"lst", "other", "a", "b", "df"}
+
+    refs = analyzer.analyze("import numpy as np\nv = np.sum(arr)")
+    assert refs.imports == {"np"}
+    assert refs.mutates == {"np", "arr"}
+
+
+def test_analyze_func_reads() -> None:
+    analyzer = CodeAnalyzer()
+    code = (
+        "def f(a):\n    return a + x\ng = lambda: y\nclass C:\n    def m(self):\n        return z\nt = [i for i in w]"
+    )
+    refs = analyzer.analyze(code)
+    assert refs.has_functions
+    assert refs.func_reads == {"f": {"x"}, "g": {"y"}, "C": {"z"}}
+
+    refs = analyzer.analyze("y = f()")
+    assert not refs.has_functions
+    assert refs.func_reads == {}
+
+
+def test_analyze_function_locals() -> None:
+    analyzer = CodeAnalyzer()
+    refs = analyzer.analyze("def fn(a):\n    b = a + g\n    return b")
+    assert refs.writes == {"fn"}
+    assert "g" in refs.reads
+
+
+def test_analyze_lp() -> None:
+    analyzer = CodeAnalyzer()
+    refs = analyzer.analyze("df = lp('A1:B4')\nval = lp_mod.lp(addr='Sheet1.C3')")
+    assert refs.lp_addresses == {"A1:B4", "Sheet1.C3"}
+    assert refs.is_dynamic is False
+
+    refs = analyzer.analyze("df = lp(addr_name)")
+    assert refs.is_dynamic
+
+
+def test_analyze_lp_many() -> None:
+    analyzer = CodeAnalyzer()
+    refs = analyzer.analyze("d = lp_many({'sales': 'Sheet1.A1:F50', 'x': 'B2'})")
+    assert refs.lp_addresses == {"Sheet1.A1:F50", "B2"}
+    assert refs.is_dynamic is False
+
+    refs = analyzer.analyze("d = lp_many(addrs)")
+    assert refs.is_dynamic
+
+    refs = analyzer.analyze("d = lp_many({'x': 'B2', **others})")
+    assert refs.is_dynamic
+
+
+@pytest.mark.parametrize(
+    "code",
+    [
+        "exec('a = 1')",
+        "g = globals()",
+        "from math import *",
+        "def fn():\n    global x\n    x = 1",
+    ],
+)
+def test_analyze_dynamic(code: str) -> None:
+    analyzer = CodeAnalyzer()
+    refs = analyzer.analyze(code)
+    assert refs.is_dynamic
+
+
+def test_analyze_syntax_error() -> None:
+    analyzer = CodeAnalyzer()
+    refs = analyzer.analyze("x = ")
+    assert not refs.reads
+    assert not refs.writes
+    assert refs.is_dynamic is False
+
+
+def test_dep_graph_dependents() -> None:
+    graph = DepGraph()
+    following = [
+        ((0, 1, 0), "y = x"),
+        ((0, 2, 0), "z = 3"),
+        ((0, 3, 0), "w = y + z"),
+        ((0, 4, 0), "q = lp('A1')"),
+        ((0, 5, 0), "r = lp('B1')"),
+    ]
+
+    def lp_resolver(addr: str, sheet_idx: int):
+        if addr == "A1":
+            return {(0, 0, 0)}
+        return set()
+
+    result = graph.get_dependents([((0, 0, 0), "x = 1"), *following], [(0, 0, 0)], lp_resolver)
+    assert result == {(0, 0, 0), (0, 1, 0), (0, 3, 0), (0, 4, 0)}
+
+
+def test_dep_graph_dependents_old_code() -> None:
+    graph = DepGraph()
+    cells = [((0, 0, 0), "x = 1"), ((0, 1, 0), "y = x"), ((0, 2, 0), "z = w")]
+    # the cell used to write w.
+    result = graph.get_dependents(cells, [(0, 0, 0)], lambda addr, idx: set(), {(0, 0, 0): "x = 1\nw = 2"})
+    assert result == {(0, 0, 0), (0, 1, 0), (0, 2, 0)}
+
+
+def test_dep_graph_dependents_functions() -> None:
+    graph = DepGraph()
+    cells = [
+        ((0, 0, 0), "def f():\n    return x"),
+        ((0, 1, 0), "x = 5"),
+        ((0, 2, 0), "y = f()"),
+        ((0, 3, 0), "obj = C()"),
+        ((0, 4, 0), "q = 1"),
+    ]
+    # the function reads x when C1 calls it.
+    result = graph.get_dependents(cells, [(0, 1, 0)], lambda addr, idx: set())
+    assert result == {(0, 1, 0), (0, 2, 0)}
+
+    cells = [
+        ((0, 0, 0), "class C:\n    def m(self):\n        return x"),
+        ((0, 1, 0), "obj = C()"),
+        ((0, 2, 0), "x = 5"),
+        ((0, 3, 0), "r = obj.m()"),
+    ]
+    # the instance refers to the methods of the class.
+    result = graph.get_dependents(cells, [(0, 2, 0)], lambda addr, idx: set())
+    assert result == {(0, 2, 0), (0, 3, 0)}
+
+
+def test_dep_graph_dependents_mutation() -> None:
+    graph = DepGraph()
+    cells = [
+        ((0, 0, 0), "import numpy as np\nlst = [1, 2]"),
+        ((0, 1, 0), "x = lst.pop()"),
+        ((0, 2, 0), "n = len(lst)"),
+        ((0, 3, 0), "s = np.sum(q)"),
+        ((0, 4, 0), "t = np.mean(r)"),
+        ((0, 5, 0), "u = q"),
+    ]
+    result = graph.get_dependents(cells, [(0, 1, 0)], lambda addr, idx: set())
+    assert result == {(0, 1, 0), (0, 2, 0)}
+    # calls on a module do not change the module, the arguments may be changed.
+    result = graph.get_dependents(cells, [(0, 3, 0)], lambda addr, idx: set())
+    assert result == {(0, 3, 0), (0, 5, 0)}
+
+
+def test_dep_graph_dynamic() -> None:
+    graph = DepGraph()
+    following = [
+        ((0, 1, 0), "y = 1"),
+        ((0, 2, 0), "exec('z = 3')"),
+    ]
+    result = graph.get_dependents([((0, 0, 0), "x = 1"), *following], [(0, 0, 0)], lambda addr, idx: set())
+    assert result is None
+
+
+def test_dep_graph_cache() -> None:
+    graph = DepGraph()
+    refs = graph.get_refs((0, 0, 0), "x = 1")
+    assert graph.get_refs((0, 0, 0), "x = 1") is refs
+    assert graph.get_refs((0, 0, 0), "x = 2") is not refs
+    graph.remove((0, 0, 0))
+    assert (0, 0, 0) not in graph
+
+
+@pytest.mark.parametrize(
+    "code, expected",
+    [
+        ("doc = CalcDoc.from_current_doc()", True),
+        ("from ooodev.calc import CalcDoc as Cd", True),
+        ("import uno", True),
+        ("df = lp('A1:B4')", False),
+    ],
+)
+def test_analyze_uses_doc(code: str, expected: bool) -> None:
+    analyzer = CodeAnalyzer()
+    refs = analyzer.analyze(code)
+    assert refs.uses_doc is expected
+
+
+def test_dep_graph_seeds() -> None:
+    graph = DepGraph()
+    following = [
+        ((0, 1, 0), "y = x"),
+        ((0, 2, 0), "z = 3"),
+        ((0, 3, 0), "w = z"),
+    ]
+    cells = [((0, 0, 0), "x = 1"), *following]
+    result = graph.get_dependents(cells, [(0, 0, 0), (0, 2, 0)], lambda addr, idx: set())
+    assert result == {(0, 0, 0), (0, 1, 0), (0, 2, 0), (0, 3, 0)}
+
+
+@pytest.mark.parametrize(
+    "code, expected",
+    [
+        ("plt.plot([1, 2])", True),
+        ("df.plot()", True),
+        ("import seaborn as sns", True),
+        ("df = lp('A1:B4')", False),
+    ],
+)
+def test_analyze_uses_plot(code: str, expected: bool) -> None:
+    analyzer = CodeAnalyzer()
+    refs = analyzer.analyze(code)
+    assert refs.uses_plot is expected
+
+
+def test_dep_graph_levels() -> None:
+    graph = DepGraph()
+    cells = [
+        ((0, 0, 0), "a = lp('B1:B10')"),
+        ((0, 1, 0), "b = lp('C1:C10')"),
+        ((0, 2, 0), "c = a.sum() + b.sum()"),
+        ((0, 3, 0), "d = lp('A1')"),
+        ((0, 4, 0), "e = 1"),
+        ((0, 5, 0), "print(f)"),
+        ((0, 6, 0), "f = 2"),
+    ]
+
+    def lp_resolver(addr: str, sheet_idx: int):
+        if addr == "A1":
+            return {(0, 0, 0)}
+        return set()
+
+    levels = graph.get_levels(cells, lp_resolver)
+    assert levels == [
+        [(0, 0, 0), (0, 1, 0), (0, 4, 0), (0, 5, 0)],
+        [(0, 2, 0), (0, 3, 0), (0, 6, 0)],
+    ]
+
+
+def test_dep_graph_levels_barrier() -> None:
+    graph = DepGraph()
+    cells = [
+        ((0, 0, 0), "a = 1"),
+        ((0, 1, 0), "exec('b = 2')"),
+        ((0, 2, 0), "c = 3"),
+        ((0, 3, 0), "d = lp('Z1')"),
+    ]
+    levels = graph.get_levels(cells, lambda addr, idx: None)
+    assert levels == [[(0, 0, 0)], [(0, 1, 0)], [(0, 2, 0)], [(0, 3, 0)]]
+
+
+def test_dep_graph_levels_functions() -> None:
+    graph = DepGraph()
+    cells = [
+        ((0, 0, 0), "def f():\n    return x"),
+        ((0, 1, 0), "x = 5"),
+        ((0, 2, 0), "y = f()"),
+        ((0, 3, 0), "z = 1"),
+    ]
+    # the function is created in the module itself and the call runs after x is set.
+    levels = graph.get_levels(cells, lambda addr, idx: set())
+    assert levels == [[(0, 0, 0)], [(0, 1, 0), (0, 3, 0)], [(0, 2, 0)]]
+
+    # functions of the cells before the first level are known.
+    levels = graph.get_levels(cells[1:], lambda addr, idx: set(), preceding=cells[:1])
+    assert levels == [[(0, 1, 0), (0, 3, 0)], [(0, 2, 0)]]
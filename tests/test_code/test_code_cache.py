@@ -0,0 +1,61 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+import pytest
+
+if __name__ == "__main__":
+    pytest.main([__file__])
+
+if TYPE_CHECKING:
+    from build.pythonpath.libre_pythonista_lib.code.code_cache import CodeCache
+else:
+    from libre_pythonista_lib.code.code_cache import CodeCache
+
+
+def test_code_cache_hit_miss() -> None:
+    cache = CodeCache()
+    compiled = cache.get("x = 1 # comment\nx + 1", "<Sheet1.A1>")
+    assert cache.misses == 1
+    assert cache.get("x = 1 # comment\nx + 1", "<Sheet1.A1>") is compiled
+    assert cache.hits == 1
+    # same code in another cell gets its own entry.
+    assert cache.get("x = 1 # comment\nx + 1", "<Sheet1.A2>") is not compiled
+    assert cache.misses == 2
+    assert "comment" not in compiled.code
+
+
+def test_code_cache_lru() -> None:
+    cache = CodeCache(max_size=2)
+    first = cache.get("a = 1")
+    cache.get("b = 2")
+    cache.get("a = 1")
+    cache.get("c = 3")
+    assert len(cache) == 2
+    assert cache.get("a = 1") is first
+    cache.get("b = 2")
+    assert cache.misses == 4
+
+
+def test_compiled_code_trailing_expr() -> None:
+    cache = CodeCache()
+    compiled = cache.get("x = 2\nx * 3", "<Sheet1.B2>")
+    glbs = {}
+    assert compiled.body is not None
+    assert compiled.expr is not None
+    exec(compiled.body, glbs)
+    assert eval(compiled.expr, glbs) == 6
+    assert compiled.expr.co_filename == "<Sheet1.B2>"
+
+    compiled = cache.get("x = 2")
+    assert compiled.body is not None
+    assert compiled.expr is None
+
+    compiled = cache.get("x * 3")
+    assert compiled.body is None
+    assert compiled.expr is not None
+
+
+def test_compiled_code_syntax_error() -> None:
+    cache = CodeCache()
+    compiled = cache.get("x = ")
+    with pytest.raises(SyntaxError):
+        compiled.compile()
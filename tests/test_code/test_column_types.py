@@ -0,0 +1,56 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+import pytest
+
+if __name__ == "__main__":
+    pytest.main([__file__])
+
+pd = pytest.importorskip("pandas")
+
+if TYPE_CHECKING:
+    from build.pythonpath.libre_pythonista_lib.data.column_types import convert_column, get_column_type
+else:
+    from libre_pythonista_lib.data.column_types import convert_column, get_column_type
+
+
+def test_get_column_type() -> None:
+    assert get_column_type("date") == "date"
+    assert get_column_type("Int") == "int64"
+    assert get_column_type("float32") == "float32"
+    assert get_column_type("string[pyarrow]") == "string[pyarrow]"
+    assert get_column_type(float) == "float64"
+    assert get_column_type("complex") is None
+
+
+def test_convert_column() -> None:
+    ints = pd.Series(convert_column((1.0, "", 3.0), "int64"))
+    assert str(ints.dtype) == "Int64"
+    assert ints.isna().tolist() == [False, True, False]
+
+    bools = pd.Series(convert_column((1.0, 0.0, "TRUE"), "bool"))
+    assert bools.tolist() == [True, False, True]
+
+    cats = pd.Series(convert_column(("a", "b", "", "a"), "category"))
+    assert list(cats.cat.categories) == ["a", "b"]
+    assert cats.isna().sum() == 1
+
+    strings = pd.Series(convert_column((1.0, 2.5, "x"), "string"))
+    assert strings.tolist() == ["1", "2.5", "x"]
+
+    with pytest.raises(ValueError):
+        convert_column((1.0,), "date")
+
+
+def test_convert_column_invalid() -> None:
+    # values that can not be converted are not silently changed or made missing.
+    with pytest.raises(ValueError, match=r"'Qty' of type int64: value 1\.5 is not a whole number"):
+        convert_column((1.0, "", 1.5), "int64", "Qty")
+    with pytest.raises(ValueError, match="'Qty' of type int64: value 'n/a' is not a number"):
+        convert_column((1.0, "n/a", "x"), "int64", "Qty")
+    with pytest.raises(ValueError, match="'Price' of type float32: value 'abc' is not a number"):
+        convert_column((1.5, "abc"), "float32", "Price")
+    with pytest.raises(ValueError, match="'Paid' of type bool: value 'yes' is not a number"):
+        convert_column((1.0, "yes"), "bool", "Paid")
+
+    floats = convert_column((1.5, "", " 2 "), "float64", "Price")
+    assert floats[0] == 1.5 and floats[2] == 2.0
@@ -0,0 +1,142 @@
+from __future__ import annotations
+from typing import Any, Dict, Iterator, List, Tuple, TYPE_CHECKING
+import pickle
+import socket
+import struct
+import threading
+import pytest
+
+if __name__ == "__main__":
+    pytest.main([__file__])
+
+if TYPE_CHECKING:
+    from build.pythonpath.libre_pythonista_lib.code.kernel.kernel_main import Kernel
+else:
+    from libre_pythonista_lib.code.kernel.kernel_main import Kernel
+
+
+def _send(sock: socket.socket, message: Dict[str, Any]) -> None:
+    data = pickle.dumps(message)
+    sock.sendall(struct.pack("!I", len(data)) + data)
+
+
+def _receive(sock: socket.socket) -> Dict[str, Any]:
+    def receive_all(length: int) -> bytes:
+        data = b""
+        while len(data) < length:
+            data += sock.recv(length - len(data))
+        return data
+
+    return pickle.loads(receive_all(struct.unpack("!I", receive_all(4))[0]))
+
+
+@pytest.fixture
+def kernel_pair() -> Iterator[Tuple[Kernel, socket.socket]]:
+    office, kernel_sock = socket.socketpair()
+    try:
+        yield Kernel(kernel_sock), office
+    finally:
+        office.close()
+        kernel_sock.close()
+
+
+def test_kernel_code_rules(kernel_pair: Tuple[Kernel, socket.socket]) -> None:
+    kernel, _ = kernel_pair
+    # same rules as the local module, the value of the last assigned name.
+    result = kernel.execute("x = 1\ny = x + 1", "<cell>", "id1")
+    assert result["error"] is False
+    assert result["data"] == 2
+    result = kernel.execute("y * 10", "<cell>", "id2")
+    assert result["data"] == 20
+    result = kernel.execute("z = y\nz", "<cell>", "id3")
+    assert result["data"] == 2
+    result = kernel.execute("1 / 0", "<cell>", "id4")
+    assert result["error"] is True
+    assert "ZeroDivisionError" in result["error_msg"]
+
+
+def test_kernel_unpicklable_result(kernel_pair: Tuple[Kernel, socket.socket]) -> None:
+    kernel, office = kernel_pair
+    kernel.handle({"cmd": "exec", "code": "import threading\nlock = threading.Lock()", "filename": "<cell>"})
+    result = _receive(office)
+    assert result["error"] is True
+    assert "Unable to send result of type lock" in result["error_msg"]
+
+
+def test_kernel_lp(kernel_pair: Tuple[Kernel, socket.socket]) -> None:
+    kernel, office = kernel_pair
+    messages: List[Dict[str, Any]] = []
+
+    def resolve() -> None:
+        while True:
+            msg = _receive(office)
+            messages.append(msg)
+            if msg["cmd"] == "lp":
+                _send(office, {"cmd": "lp_result", "data": [[1.0, 2.0]], "info": {"headers": False}})
+                return
+
+    thread = threading.Thread(target=resolve)
+    thread.start()
+    result = kernel.execute("lp_log.info('reading %s', 'A1:B1')\ndata = lp('A1:B1')", "<cell>", "id1")
+    thread.join(5)
+    assert [msg["cmd"] for msg in messages] == ["lp_log", "lp"]
+    assert messages[0]["msg"] == "reading A1:B1"
+    # LibreOffice has the data of the lp() call, it is not sent back.
+    assert result["is_lp_result"] is True
+    assert result["data"] is None
+    result = kernel.execute("total = sum(data[0])", "<cell>", "id2")
+    assert result["is_lp_result"] is False
+    assert result["data"] == 3.0
+
+
+def test_kernel_lp_chunks(kernel_pair: Tuple[Kernel, socket.socket]) -> None:
+    kernel, office = kernel_pair
+    chunks = iter([[[1.0]], [[2.0]], [[3.0]]])
+    messages: List[Dict[str, Any]] = []
+
+    def resolve() -> None:
+        while True:
+            msg = _receive(office)
+            messages.append(msg)
+            if msg["cmd"] == "lp":
+                _send(office, {"cmd": "lp_result", "data": None, "iter_id": 1, "info": {"headers": False}})
+            elif msg["cmd"] == "lp_next":
+                chunk = next(chunks, None)
+                _send(office, {"cmd": "lp_result", "data": chunk, "done": chunk is None})
+            elif msg["cmd"] == "lp_close":
+                return
+
+    thread = threading.Thread(target=resolve)
+    thread.start()
+    result = kernel.execute("it = lp('A1:A3', chunksize=1)\nfirst = next(it)", "<cell>", "id1")
+    # only the chunk that is used is sent.
+    assert result["data"] == [[1.0]]
+    assert [msg["cmd"] for msg in messages] == ["lp", "lp_next"]
+    result = kernel.execute("rest = [chunk[0][0] for chunk in it]", "<cell>", "id2")
+    assert result["data"] == [2.0, 3.0]
+    assert [msg["cmd"] for msg in messages].count("lp_next") == 4
+
+    chunks = iter([[[1.0]], [[2.0]]])
+    kernel.execute("it = lp('A1:A2', chunksize=1)\nfirst = next(it)\nit.close()", "<cell>", "id3")
+    thread.join(5)
+    # a generator closed early releases the chunks kept by LibreOffice.
+    assert messages[-1] == {"cmd": "lp_close", "iter_id": 1}
+
+
+def test_kernel_lp_error(kernel_pair: Tuple[Kernel, socket.socket]) -> None:
+    kernel, office = kernel_pair
+
+    def resolve() -> None:
+        msg = _receive(office)
+        assert msg["cmd"] == "lp"
+        _send(office, {"cmd": "lp_result", "data": None, "error_msg": "CellRangeError: bad range"})
+
+    thread = threading.Thread(target=resolve)
+    thread.start()
+    kernel.execute("x = 1", "<cell>", "id1")
+    result = kernel.execute("data = lp('A1:B1')", "<cell>", "id2")
+    thread.join(5)
+    # the error is raised in the cell, the kernel keeps its state.
+    assert result["error"] is True
+    assert "CellRangeError: bad range" in result["error_msg"]
+    assert kernel.execute("x + 1", "<cell>", "id3")["data"] == 2
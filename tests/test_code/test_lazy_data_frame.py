@@ -0,0 +1,59 @@
+from __future__ import annotations
+from typing import Any, List, Sequence, TYPE_CHECKING
+import pickle
+import pytest
+
+if __name__ == "__main__":
+    pytest.main([__file__])
+
+pd = pytest.importorskip("pandas")
+
+if TYPE_CHECKING:
+    from build.pythonpath.libre_pythonista_lib.data.lazy_data_frame import LazyDataFrame
+else:
+    from libre_pythonista_lib.data.lazy_data_frame import LazyDataFrame
+
+
+class _Pdo:
+    def __init__(self, df: Any) -> None:  # noqa: ANN401
+        self._df = df
+        self.reads: List[List[int]] = []
+        self.has_headers = True
+        self.row_count, self.col_count = df.shape
+        self.columns = list(df.columns)
+
+    def get_partial_data_frame(
+        self, cols: Sequence[int] | None = None, skiprows: int = 0, nrows: int | None = None
+    ) -> Any:  # noqa: ANN401
+        cols = range(self.col_count) if cols is None else cols
+        self.reads.append(list(cols))
+        stop = None if nrows is None else skiprows + nrows
+        return self._df.iloc[skiprows:stop, list(cols)].copy()
+
+
+def test_lazy_data_frame() -> None:
+    df = pd.DataFrame({"date": [1.0, 2.0], "amount": [3.0, 4.0], "qty": [5.0, 6.0]})
+    pdo = _Pdo(df)
+    loads: List[int] = []
+
+    def load() -> Any:  # noqa: ANN401
+        loads.append(1)
+        return df.copy()
+
+    lazy = LazyDataFrame(pdo, load)  # type: ignore
+    assert lazy.shape == (2, 3)
+    assert list(lazy.columns) == ["date", "amount", "qty"]
+    assert len(lazy) == 2 and "qty" in lazy
+
+    assert lazy["amount"].tolist() == [3.0, 4.0]
+    sub = lazy[["qty", "amount"]]
+    assert list(sub.columns) == ["qty", "amount"]
+    # amount is read once.
+    assert pdo.reads == [[1], [2]]
+    assert lazy.head(1).shape == (1, 3)
+    assert not loads and not lazy.is_loaded
+
+    assert lazy.sum().tolist() == [3.0, 7.0, 11.0]
+    assert loads == [1] and lazy.is_loaded
+    assert isinstance(pickle.loads(pickle.dumps(lazy)), pd.DataFrame)
+    assert loads == [1]
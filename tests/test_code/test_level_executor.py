@@ -0,0 +1,131 @@
+from __future__ import annotations
+from typing import Any, Dict, Iterator, List, Tuple, TYPE_CHECKING
+import threading
+import types
+import pytest
+
+if __name__ == "__main__":
+    pytest.main([__file__])
+
+from ooodev.utils.helper.dot_dict import DotDict
+
+if TYPE_CHECKING:
+    from build.pythonpath.libre_pythonista_lib.code.level_executor import CellTask, LevelExecutor
+else:
+    from libre_pythonista_lib.code.level_executor import CellTask, LevelExecutor
+
+
+class _LpMod:
+    """Records the ``lp()`` calls made for the cells."""
+
+    def __init__(self) -> None:
+        self.CURRENT_CELL_OBJ: Any = None  # noqa: N815
+        self.LAST_LP_RESULT = DotDict(data=None)  # noqa: N815
+        self.calls: List[Tuple[Any, Any, str]] = []
+
+    def lp(self, addr: str, **kwargs: Any) -> Any:  # noqa: ANN401
+        self.calls.append((addr, self.CURRENT_CELL_OBJ, threading.current_thread().name))
+        self.LAST_LP_RESULT = DotDict(data=f"data of {addr}", headers=False)
+        return self.LAST_LP_RESULT.data
+
+    def lp_many(self, addrs: Dict[str, str], **kwargs: Any) -> Dict[str, Any]:  # noqa: ANN401
+        self.LAST_LP_RESULT = DotDict(data={key: self.lp(addr) for key, addr in addrs.items()})
+        return self.LAST_LP_RESULT.data
+
+
+class _PyModule:
+    """Executes code the same way as ``PyModule.update_isolated()`` with the last expression as the result."""
+
+    def __init__(self, mod_dict: Dict[str, Any]) -> None:
+        self.mod = types.ModuleType("PyMod")
+        self.mod.__dict__.update(mod_dict)
+
+    def update_isolated(
+        self,
+        mod_dict: Dict[str, Any],
+        code: str = "",
+        filename: str = "<string>",
+        **global_vars: Any,  # noqa: ANN401
+    ) -> Tuple[DotDict, Dict[str, Any]]:
+        mod = types.ModuleType("PyMod")
+        mod.__dict__.update(mod_dict)
+        mod.__dict__.update(global_vars)
+        exec(compile(code, filename, "exec"), mod.__dict__)
+        return DotDict(data=mod.__dict__.get("result", None)), mod.__dict__
+
+
+@pytest.fixture
+def executor() -> Iterator[LevelExecutor]:
+    executor = LevelExecutor(4)
+    yield executor
+    executor.shutdown()
+
+
+def _create_module(lp_mod: _LpMod, **names: Any) -> _PyModule:  # noqa: ANN401
+    return _PyModule({"lp_mod": lp_mod, "lp": lp_mod.lp, "lp_many": lp_mod.lp_many, **names})
+
+
+def test_level_executor_delta(executor: LevelExecutor) -> None:
+    lp_mod = _LpMod()
+    py_mod = _create_module(lp_mod, a=1, b=2, gone=3)
+    tasks = [
+        CellTask("x = a + 1\nresult = x", "<A1>", "id1", "A1"),  # type: ignore
+        CellTask("y = b * 10\ndel gone\nresult = y", "<A2>", "id2", "A2"),  # type: ignore
+    ]
+    outcomes = executor.run(py_mod, tasks)  # type: ignore
+    assert [outcome.result.data for outcome in outcomes] == [2, 20]  # type: ignore
+    # each cell only sees the module, the module is not changed.
+    assert "x" not in py_mod.mod.__dict__
+    names = {name for name in outcomes[0].delta if not name.startswith("__")}
+    assert names == {"x", "result", "CURRENT_CELL_ID", "CURRENT_CELL_OBJ"}
+    assert "y" not in outcomes[0].delta
+    mod_dict = py_mod.mod.__dict__
+    for outcome in outcomes:
+        LevelExecutor.apply(outcome.delta, mod_dict)
+    assert mod_dict["x"] == 2
+    assert mod_dict["y"] == 20
+    assert mod_dict["result"] == 20
+    assert "gone" not in mod_dict
+    # the stand ins for lp() do not leak into the module.
+    assert mod_dict["lp"] == lp_mod.lp
+    assert mod_dict["lp_mod"] is lp_mod
+
+
+def test_level_executor_lp(executor: LevelExecutor) -> None:
+    lp_mod = _LpMod()
+    py_mod = _create_module(lp_mod)
+    tasks = [
+        CellTask("result = lp('A1:B4')", "<C1>", "id1", "C1"),  # type: ignore
+        CellTask("result = lp_many({'a': 'D1', 'b': 'D2'})", "<C2>", "id2", "C2"),  # type: ignore
+        CellTask("result = lp_mod.LAST_LP_RESULT.data if lp('E1') else None", "<C3>", "id3", "C3"),  # type: ignore
+    ]
+    outcomes = executor.run(py_mod, tasks)  # type: ignore
+    assert outcomes[0].result.data == "data of A1:B4"  # type: ignore
+    assert outcomes[1].result.data == {"a": "data of D1", "b": "data of D2"}  # type: ignore
+    # each cell sees the result of its own lp() call.
+    assert outcomes[2].result.data == "data of E1"  # type: ignore
+    # the office is read on the calling thread, with the cell of the call for relative addresses.
+    caller = threading.current_thread().name
+    assert {thread for _, _, thread in lp_mod.calls} == {caller}
+    assert {(addr, cell) for addr, cell, _ in lp_mod.calls} == {
+        ("A1:B4", "C1"),
+        ("D1", "C2"),
+        ("D2", "C2"),
+        ("E1", "C3"),
+    }
+    assert lp_mod.CURRENT_CELL_OBJ is None
+
+
+def test_level_executor_error(executor: LevelExecutor) -> None:
+    lp_mod = _LpMod()
+    py_mod = _create_module(lp_mod, a=1)
+    tasks = [
+        CellTask("result = missing + 1", "<A1>", "id1", "A1"),  # type: ignore
+        CellTask("result = a", "<A2>", "id2", "A2"),  # type: ignore
+    ]
+    outcomes = executor.run(py_mod, tasks)  # type: ignore
+    assert outcomes[0].result is None
+    assert isinstance(outcomes[0].error, NameError)
+    assert outcomes[0].delta == {}
+    assert outcomes[1].error is None
+    assert outcomes[1].result.data == 1  # type: ignore
@@ -0,0 +1,191 @@
+from __future__ import annotations
+from typing import Any, Dict, List, Sequence, Set, Tuple, TYPE_CHECKING
+from types import SimpleNamespace
+import pytest
+
+if __name__ == "__main__":
+    pytest.main([__file__])
+
+# lp_mod and the ooodev data types need the office python.
+pytest.importorskip("ooodev.loader", exc_type=ImportError)
+
+from ooodev.utils.data_type.cell_obj import CellObj
+from ooodev.utils.data_type.range_obj import RangeObj
+from ooodev.utils.helper.dot_dict import DotDict
+
+if TYPE_CHECKING:
+    from build.pythonpath.libre_pythonista_lib.code.mod_helper import lp_mod
+else:
+    from libre_pythonista_lib.code.mod_helper import lp_mod
+
+_COLS = "ABCDEFGH"
+
+
+class _Log:
+    is_debug = False
+
+    def debug(self, *args: Any, **kwargs: Any) -> None:  # noqa: ANN401
+        pass
+
+    def warning(self, *args: Any, **kwargs: Any) -> None:  # noqa: ANN401
+        pass
+
+    def error(self, *args: Any, **kwargs: Any) -> None:  # noqa: ANN401
+        pass
+
+
+class _Sheet:
+    """Sheet whose cells hold their own address, ``None`` for empty cells."""
+
+    def __init__(self, rows: int, empty: Set[str] | None = None) -> None:
+        empty = empty or set()
+        self.grid = [
+            [None if f"{col}{row}" in empty else f"{col}{row}" for col in _COLS] for row in range(1, rows + 1)
+        ]
+        self.arrays: List[str] = []
+
+    def get_array(self, range_obj: RangeObj) -> Tuple[Tuple[Any, ...], ...]:
+        # like the office, empty cells are read as empty text.
+        self.arrays.append(str(range_obj))
+        rv = range_obj.get_range_values()
+        return tuple(
+            tuple("" if value is None else value for value in row[rv.col_start : rv.col_end + 1])
+            for row in self.grid[rv.row_start : rv.row_end + 1]
+        )
+
+    def __getitem__(self, cell_obj: CellObj) -> SimpleNamespace:
+        # single cells are read as lp() reads them.
+        return SimpleNamespace(value=self.grid[cell_obj.row - 1][cell_obj.col_obj.index])
+
+
+class _CellMgr:
+    code_cells: Dict[str, Any] = {}
+
+    def __init__(self, doc: Any) -> None:  # noqa: ANN401
+        pass
+
+    def has_cell(self, cell_obj: CellObj) -> bool:
+        return str(cell_obj) in self.code_cells
+
+    def get_py_src(self, cell_obj: CellObj) -> SimpleNamespace:
+        return SimpleNamespace(value=self.code_cells[str(cell_obj)])
+
+
+class _RangeCache:
+    is_enabled = False
+
+    def __init__(self, doc: Any) -> None:  # noqa: ANN401
+        pass
+
+    def __contains__(self, key: Any) -> bool:  # noqa: ANN401
+        return False
+
+
+def _cell(addr: str) -> CellObj:
+    cell_obj = CellObj.from_cell(addr)
+    cell_obj.set_sheet_index(0)
+    return cell_obj
+
+
+def _rng(addr: str) -> RangeObj:
+    rng_obj = RangeObj.from_range(addr)
+    rng_obj.set_sheet_index(0)
+    return rng_obj
+
+
+def _cells(sheet: _Sheet, addr: str) -> List[List[Any]]:
+    # the values of a range as read from the sheet.
+    rv = _rng(addr).get_range_values()
+    return [
+        ["" if value is None else value for value in row[rv.col_start : rv.col_end + 1]]
+        for row in sheet.grid[rv.row_start : rv.row_end + 1]
+    ]
+
+
+@pytest.fixture
+def sheet(monkeypatch: pytest.MonkeyPatch) -> _Sheet:
+    sheet = _Sheet(rows=120, empty={"B2", "E5"})
+    doc = SimpleNamespace(sheets=[sheet])
+    reads: List[Tuple[str, Any]] = []
+
+    def read_range_data(
+        sheet: Any,  # noqa: ANN401
+        addr_rng: RangeObj,
+        collapse: bool,
+        column_types: Any,  # noqa: ANN401
+        log: Any,  # noqa: ANN401
+        rng_obj: RangeObj | None = None,
+        data: Sequence[Sequence[Any]] | None = None,
+    ) -> DotDict:
+        # the data that would be turned into a DataFrame.
+        reads.append((str(addr_rng), data))
+        return DotDict(data=None if data is None else [list(row) for row in data])
+
+    _CellMgr.code_cells = {"D4": 42}
+    monkeypatch.setattr(lp_mod, "CellMgr", _CellMgr)
+    monkeypatch.setattr(lp_mod, "RangeCache", _RangeCache)
+    monkeypatch.setattr(lp_mod, "LogInst", _Log)
+    monkeypatch.setattr(lp_mod, "_read_range_data", read_range_data)
+    monkeypatch.setattr(lp_mod, "Lo", SimpleNamespace(current_doc=doc))
+    monkeypatch.setattr(lp_mod, "CURRENT_CELL_OBJ", _cell("H1"), raising=False)
+    sheet.doc = doc  # type: ignore
+    sheet.reads = reads  # type: ignore
+    return sheet
+
+
+def test_sheet_cell_values_offsets(sheet: _Sheet) -> None:
+    cells = {"a": _cell("A1"), "c": _cell("C3"), "f": _cell("F6"), "code": _cell("D4")}
+    values = lp_mod._get_sheet_cell_values(sheet.doc, 0, cells, _Log())  # type: ignore
+    # the code cell is not read from the sheet.
+    assert sheet.arrays == ["A1:F6"]
+    assert values == {"code": 42, "a": "A1", "c": "C3", "f": "F6"}
+
+
+def test_sheet_cell_values_empty(sheet: _Sheet) -> None:
+    cells = {"empty": _cell("B2"), "c": _cell("C2"), "other_empty": _cell("E5")}
+    values = lp_mod._get_sheet_cell_values(sheet.doc, 0, cells, _Log())  # type: ignore
+    assert sheet.arrays == ["B2:E5"]
+    # empty cells are read one at a time, the same value as lp().
+    assert values["empty"] == sheet[_cell("B2")].value
+    assert values["empty"] is None
+    assert values["other_empty"] is None
+    assert values["c"] == "C2"
+
+
+def test_sheet_cell_values_single(sheet: _Sheet) -> None:
+    values = lp_mod._get_sheet_cell_values(sheet.doc, 0, {"g": _cell("G7")}, _Log())  # type: ignore
+    assert sheet.arrays == []
+    assert values == {"g": "G7"}
+
+
+def test_sheet_range_values_slices(sheet: _Sheet) -> None:
+    ranges = {"first": _rng("A1:B2"), "second": _rng("C3:D5"), "inner": _rng("B3:C4")}
+    values = lp_mod._get_sheet_range_values(sheet.doc, 0, ranges, False, None, _Log())  # type: ignore
+    assert sheet.arrays == ["A1:D5"]
+    assert list(values.keys()) == ["first", "second", "inner"]
+    for key, rng_obj in ranges.items():
+        assert values[key] == _cells(sheet, str(rng_obj))
+    assert values["first"] == [["A1", "B1"], ["A2", ""]]
+
+
+def test_sheet_range_values_far_apart(sheet: _Sheet) -> None:
+    # the range that contains them is more than twice their size, each range is read by itself.
+    ranges = {"top": _rng("A1:B2"), "bottom": _rng("A100:B101")}
+    values = lp_mod._get_sheet_range_values(sheet.doc, 0, ranges, False, None, _Log())  # type: ignore
+    assert sheet.arrays == []
+    assert sheet.reads == [("A1:B2", None), ("A100:B101", None)]  # type: ignore
+    assert values == {"top": None, "bottom": None}
+
+
+def test_lp_many(sheet: _Sheet) -> None:
+    addrs = {"rng": "C3:D4", "a": "A1", "empty": "B2", "code": "D4", "rng2": "A1:B2"}
+    values = lp_mod.lp_many(addrs)
+    assert list(values.keys()) == list(addrs.keys())
+    assert values["a"] == "A1"
+    assert values["empty"] is None
+    assert values["code"] == 42
+    assert values["rng"] == _cells(sheet, "C3:D4")
+    assert values["rng2"] == _cells(sheet, "A1:B2")
+    # one call for the cells and one for the ranges.
+    assert sheet.arrays == ["A1:B2", "A1:D4"]
+    assert lp_mod.LAST_LP_RESULT.data is values
@@ -0,0 +1,47 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+import pytest
+
+if __name__ == "__main__":
+    pytest.main([__file__])
+
+if TYPE_CHECKING:
+    from build.pythonpath.libre_pythonista_lib.code.mod_helper.lp_name_cache import LpNameCache, LpNameEntry
+    from build.pythonpath.libre_pythonista_lib.code.mod_helper.lp_rules.lp_rules_engine import LpRulesEngine
+    from build.pythonpath.libre_pythonista_lib.code.mod_helper.lp_enum import LpEnum
+else:
+    from libre_pythonista_lib.code.mod_helper.lp_name_cache import LpNameCache, LpNameEntry
+    from libre_pythonista_lib.code.mod_helper.lp_rules.lp_rules_engine import LpRulesEngine
+    from libre_pythonista_lib.code.mod_helper.lp_enum import LpEnum
+
+
+class _Doc:
+    def __init__(self, runtime_uid: str) -> None:
+        self.runtime_uid = runtime_uid
+
+
+def test_lp_name_cache() -> None:
+    doc = _Doc("lp_name_cache_test")
+    cache = LpNameCache(doc)  # type: ignore
+    try:
+        content = ["$Sheet1.$A$1:$B$5"]
+        token = content[0]
+        cache.put(("Rates", 0), LpNameEntry("Sheet1.A1:B5", True, lambda: content[0] == token))
+        entry = cache.get(("Rates", 0))
+        assert entry is not None and entry.addr == "Sheet1.A1:B5"
+        assert cache.get(("Rates", 1)) is None
+
+        # renaming the sheet changes the content of the name.
+        content[0] = "$Data.$A$1:$B$5"
+        assert cache.get(("Rates", 0)) is None
+        assert len(cache) == 0
+    finally:
+        LpNameCache.reset_instance(doc.runtime_uid)
+
+
+def test_lp_rules_engine_matched() -> None:
+    engine = LpRulesEngine()
+    rule = engine.get_matched_rule("Sheet1.A1:B5")
+    assert rule.get_value() == LpEnum.SHEET_RNG
+    assert engine.get_matched_rule("Sheet1.A1:B5") is rule
+    assert engine.get_matched_rule("Rates").get_value() == LpEnum.NAMED_RNG
@@ -0,0 +1,115 @@
+from __future__ import annotations
+from typing import TYPE_CHECKING
+import pytest
+
+if __name__ == "__main__":
+    pytest.main([__file__])
+
+if TYPE_CHECKING:
+    from build.pythonpath.libre_pythonista_lib.code.mod_snapshots import ModSnapshots
+else:
+    from libre_pythonista_lib.code.mod_snapshots import ModSnapshots
+
+
+def _run(snapshots: ModSnapshots, mod_dict: dict, key: tuple, code: str) -> None:
+    exec(code, mod_dict)
+    snapshots.record(key, mod_dict)
+
+
+def test_rewind() -> None:
+    base = {"init": 1}
+    snapshots = ModSnapshots(base)
+    mod_dict = dict(base)
+    _run(snapshots, mod_dict, (0, 0, 0), "x = 1")
+    _run(snapshots, mod_dict, (0, 1, 0), "y = x + 1\ndel init")
+    _run(snapshots, mod_dict, (0, 2, 0), "x = 10")
+
+    count, state = snapshots.rewind([(0, 0, 0), (0, 1, 0)])
+    assert count == 2
+    assert state["x"] == 1
+    assert state["y"] == 2
+    assert "init" not in state
+
+    count, state = snapshots.rewind([])
+    assert count == 0
+    assert state == base
+
+
+def test_record_changed_names_only() -> None:
+    snapshots = ModSnapshots({})
+    mod_dict = {}
+    _run(snapshots, mod_dict, (0, 0, 0), "a = 1\nb = 2")
+    exec("c = 3", mod_dict)
+    assert snapshots.record((0, 1, 0), mod_dict) == 1
+
+
+def test_restore() -> None:
+    snapshots = ModSnapshots({})
+    mod_dict = {}
+    _run(snapshots, mod_dict, (0, 0, 0), "x = 1")
+    _run(snapshots, mod_dict, (0, 1, 0), "y = [x]")
+    y = mod_dict["y"]
+
+    count, state = snapshots.rewind([(0, 0, 0)])
+    assert count == 1
+    mod_dict = dict(state)
+    assert snapshots.restore((0, 1, 0), mod_dict)
+    assert mod_dict["y"] is y
+    assert not snapshots.restore((0, 2, 0), mod_dict)
+
+
+def test_max_snapshots() -> None:
+    snapshots = ModSnapshots({}, max_snapshots=2)
+    mod_dict = {}
+    _run(snapshots, mod_dict, (0, 0, 0), "a = 1")
+    _run(snapshots, mod_dict, (0, 1, 0), "b = 2")
+    _run(snapshots, mod_dict, (0, 2, 0), "c = 3")
+    assert len(snapshots) == 2
+    assert (0, 2, 0) not in snapshots
+
+    count, state = snapshots.rewind([(0, 0, 0), (0, 1, 0), (0, 2, 0)])
+    assert count == 2
+    assert "c" not in state
+
+
+def test_record_names() -> None:
+    snapshots = ModSnapshots({"init": 1})
+    mod_dict = {"init": 1}
+    exec("x = 1\ny = 2", mod_dict)
+    # only the names the cell writes are compared.
+    assert snapshots.record((0, 0, 0), mod_dict, ["x"]) == 1
+    exec("del x\nz = 3", mod_dict)
+    assert snapshots.record((0, 1, 0), mod_dict, ["x", "z"]) == 2
+
+    count, state = snapshots.get_state([(0, 0, 0)])
+    assert count == 1
+    assert state == {"init": 1, "x": 1}
+    count, state = snapshots.get_state([(0, 0, 0), (0, 1, 0)])
+    assert count == 2
+    assert state == {"init": 1, "z": 3}
+
+
+def test_record_full_scan() -> None:
+    snapshots = ModSnapshots({})
+    mod_dict = {}
+    exec("def f():\n    global a\n    a = 1", mod_dict)
+    # a dynamic cell is compared in full, so are the cells after it.
+    snapshots.record((0, 0, 0), mod_dict)
+    exec("f()", mod_dict)
+    assert snapshots.record((0, 1, 0), mod_dict, []) == 1
+    _, state = snapshots.get_state([(0, 0, 0), (0, 1, 0)])
+    assert state["a"] == 1
+
+    snapshots.clear()
+    exec("b = 2", mod_dict)
+    assert snapshots.record((0, 0, 0), mod_dict, ["b"]) == 1
+
+
+def test_get_state_keeps_record_start() -> None:
+    snapshots = ModSnapshots({})
+    mod_dict = {}
+    _run(snapshots, mod_dict, (0, 0, 0), "x = 1")
+    _run(snapshots, mod_dict, (0, 1, 0), "y = 2")
+    snapshots.get_state([])
+    exec("z = 3", mod_dict)
+    assert snapshots.record((0, 2, 0), mod_dict) == 1
@@ -0,0 +1,218 @@
+from __future__ import annotations
+from typing import Any, List, Tuple, TYPE_CHECKING
+from types import SimpleNamespace
+import pytest
+
+if __name__ == "__main__":
+    pytest.main([__file__])
+
+pd = pytest.importorskip("pandas")
+# the ooodev data types need the office python.
+pytest.importorskip("ooodev.loader", exc_type=ImportError)
+
+from ooodev.utils.data_type.range_obj import RangeObj
+
+if TYPE_CHECKING:
+    from build.pythonpath.libre_pythonista_lib.code.mod_helper import lp_mod
+    from build.pythonpath.libre_pythonista_lib.data.pandas_data_obj import PandasDataObj
+    from build.pythonpath.libre_pythonista_lib.data.range_profile import RangeProfile
+else:
+    from libre_pythonista_lib.code.mod_helper import lp_mod
+    from libre_pythonista_lib.data.pandas_data_obj import PandasDataObj
+    from libre_pythonista_lib.data.range_profile import RangeProfile
+
+# table at B2:D7, headers and 5 rows.
+_HEADERS = ["a", "b", "c"]
+_MIXED = [[float(i), f"x{i}", i * 10.0] for i in range(1, 6)]
+_NUMERIC = [[float(i), i + 0.5, i * 10.0] for i in range(1, 6)]
+
+
+class _Sheet:
+    """Sheet that records the ranges that are read."""
+
+    def __init__(self, rows: List[List[Any]], row_start: int = 1, col_start: int = 1) -> None:
+        self.grid: List[List[Any]] = [[None] * (col_start + len(rows[0])) for _ in range(row_start)]
+        self.grid.extend([None] * col_start + list(row) for row in rows)
+        self.reads: List[str] = []
+        self.calc_doc = None
+
+    def _read(self, range_obj: RangeObj) -> Tuple[Tuple[Any, ...], ...]:
+        self.reads.append(str(range_obj))
+        rv = range_obj.get_range_values()
+        return tuple(tuple(row[rv.col_start : rv.col_end + 1]) for row in self.grid[rv.row_start : rv.row_end + 1])
+
+    def get_array(self, range_obj: RangeObj) -> Tuple[Tuple[Any, ...], ...]:
+        return self._read(range_obj)
+
+    def get_range(self, range_obj: RangeObj) -> SimpleNamespace:
+        # getData() of a range of numbers.
+        component = SimpleNamespace(getData=lambda: self._read(range_obj))
+        return SimpleNamespace(calc_sheet=self, calc_doc=None, range_obj=range_obj, component=component)
+
+
+def _get_pdo(body: List[List[Any]], headers: bool = True) -> Tuple[PandasDataObj, _Sheet]:
+    rows = [_HEADERS, *body] if headers else body
+    sheet = _Sheet(rows)
+    range_obj = RangeObj.from_range(f"B2:D{len(rows) + 1}")
+    range_obj.set_sheet_index(0)
+    is_numeric = all(isinstance(value, float) for row in body for value in row)
+    profile = RangeProfile(
+        has_headers=headers,
+        date_columns=[],
+        is_numeric=is_numeric,
+        headers=list(_HEADERS) if headers else [],
+        numeric_columns=[1 + i for i in range(3) if all(isinstance(row[i], float) for row in body)],
+    )
+    return PandasDataObj(cell_rng=sheet.get_range(range_obj), profile=profile), sheet  # type: ignore
+
+
+def _expected(body: List[List[Any]], cols: List[int], start: int = 0, stop: int | None = None) -> Any:  # noqa: ANN401
+    df = pd.DataFrame(body, columns=_HEADERS).iloc[start:stop, cols]
+    return df.reset_index(drop=True)
+
+
+def test_get_usecols() -> None:
+    pdo, _ = _get_pdo(_MIXED)
+    assert pdo.get_usecols("b") == [1]
+    assert pdo.get_usecols(["c", "a"]) == [0, 2]
+    assert pdo.get_usecols([2, 0, 2]) == [0, 2]
+    assert pdo.get_usecols(-1) == [2]
+    assert pdo.get_usecols(["a", -1]) == [0, 2]
+    assert pdo.get_usecols(lambda name: name != "b") == [0, 2]
+    with pytest.raises(ValueError):
+        pdo.get_usecols(["z"])
+    with pytest.raises(IndexError):
+        pdo.get_usecols([3])
+
+
+def test_get_usecols_no_headers() -> None:
+    pdo, _ = _get_pdo(_MIXED, headers=False)
+    assert pdo.columns == [0, 1, 2]
+    assert pdo.get_usecols([2, 1]) == [1, 2]
+    with pytest.raises(ValueError):
+        pdo.get_usecols("a")
+
+
+def test_partial_data_frame_columns() -> None:
+    pdo, sheet = _get_pdo(_MIXED)
+    df = pdo.get_partial_data_frame([2, 0], skiprows=1, nrows=2)
+    assert list(df.columns) == ["c", "a"]
+    assert list(df.index) == [0, 1]
+    pd.testing.assert_frame_equal(df, _expected(_MIXED, [2, 0], 1, 3))
+    # the columns are not adjacent, the column between them is not read.
+    assert sheet.reads == ["B4:B5", "D4:D5"]
+
+
+def test_partial_data_frame_numeric() -> None:
+    pdo, sheet = _get_pdo(_NUMERIC)
+    df = pdo.get_partial_data_frame([0, 1], skiprows=3)
+    pd.testing.assert_frame_equal(df, _expected(_NUMERIC, [0, 1], 3))
+    assert sheet.reads == ["B6:C7"]
+
+
+@pytest.mark.parametrize("skiprows, nrows", [(5, None), (9, 2), (0, 0), (2, 0)])
+def test_partial_data_frame_empty(skiprows: int, nrows: int | None) -> None:
+    pdo, sheet = _get_pdo(_MIXED)
+    df = pdo.get_partial_data_frame([0, 2], skiprows=skiprows, nrows=nrows)
+    assert list(df.columns) == ["a", "c"]
+    assert len(df) == 0
+    assert sheet.reads == []
+
+
+def test_partial_data_frame_past_end() -> None:
+    pdo, sheet = _get_pdo(_MIXED)
+    df = pdo.get_partial_data_frame(None, skiprows=3, nrows=10)
+    pd.testing.assert_frame_equal(df, _expected(_MIXED, [0, 1, 2], 3))
+    assert sheet.reads == ["B6:D7"]
+
+
+@pytest.mark.parametrize(
+    "usecols, skiprows, nrows",
+    [(["c", "a"], 1, 2), ([1], 0, None), (None, 4, 5), (["a", "b"], 7, None), ([-1], 2, 0)],
+)
+def test_partial_range_data_cached(
+    monkeypatch: pytest.MonkeyPatch,
+    usecols: Any,  # noqa: ANN401
+    skiprows: int,
+    nrows: int | None,
+) -> None:
+    log = SimpleNamespace(is_debug=False, debug=lambda *args: None)
+    pdo, sheet = _get_pdo(_MIXED)
+    full = pdo.get_data_frame()
+    entry: List[Any] = [None]
+
+    class _RangeCache:
+        is_enabled = True
+
+        def __init__(self, doc: Any) -> None:  # noqa: ANN401
+            pass
+
+        def get(self, key: Any) -> Any:  # noqa: ANN401
+            return entry[0]
+
+        def find_profile(self, sheet_idx: int, addr: str) -> RangeProfile:
+            return pdo.profile
+
+    monkeypatch.setattr(lp_mod, "RangeCache", _RangeCache)
+    monkeypatch.setattr(lp_mod, "LogInst", lambda: log)
+    addr_rng = RangeObj.from_range("B2:D7")
+    addr_rng.set_sheet_index(0)
+    partial = {"usecols": usecols, "skiprows": skiprows, "nrows": nrows}
+
+    # read from the sheet.
+    read = lp_mod._get_partial_range_data(sheet, addr_rng, False, None, log, partial)  # type: ignore
+    # selected from the cached DataFrame of the whole range.
+    entry[0] = SimpleNamespace(data=full, range_obj=addr_rng, profile=pdo.profile)
+    cached = lp_mod._get_partial_range_data(sheet, addr_rng, False, None, log, partial)  # type: ignore
+    # an empty read does not know the types of the columns.
+    pd.testing.assert_frame_equal(cached, read, check_dtype=len(read) > 0)
+    # the cached DataFrame is not changed.
+    pd.testing.assert_frame_equal(full, _expected(_MIXED, [0, 1, 2]))
+
+
+def test_numeric_data_frame_headers() -> None:
+    pdo, sheet = _get_pdo(_NUMERIC)
+    df = pdo.get_data_frame()
+    pd.testing.assert_frame_equal(df, _expected(_NUMERIC, [0, 1, 2]))
+    assert all(dtype == "float64" for dtype in df.dtypes)
+    # the headers are known from the profile, only the numbers below them are read.
+    assert sheet.reads == ["B3:D7"]
+
+
+def test_numeric_data_frame_no_headers() -> None:
+    pdo, sheet = _get_pdo(_NUMERIC, headers=False)
+    df = pdo.get_data_frame()
+    pd.testing.assert_frame_equal(df, pd.DataFrame(_NUMERIC))
+    assert sheet.reads == ["B2:D6"]
+
+
+@pytest.mark.parametrize("body", [_NUMERIC, _MIXED], ids=["numeric", "mixed"])
+def test_chunked_data_frame(body: List[List[Any]]) -> None:
+    pdo, sheet = _get_pdo(body)
+    expected = pdo.get_data_frame()
+    sheet.reads.clear()
+    # the last block ends in the middle of a chunk.
+    df = pdo.get_data_frame(chunksize=2)
+    pd.testing.assert_frame_equal(df, expected)
+    pd.testing.assert_frame_equal(df, _expected(body, [0, 1, 2]))
+    assert sheet.reads == ["B3:D4", "B5:D6", "B7:D7"]
+
+
+def test_chunked_data_frame_one_chunk() -> None:
+    pdo, sheet = _get_pdo(_MIXED)
+    df = pdo.get_data_frame(chunksize=5)
+    pd.testing.assert_frame_equal(df, _expected(_MIXED, [0, 1, 2]))
+    assert sheet.reads == ["B2:D7"]
+
+
+@pytest.mark.parametrize("body", [_NUMERIC, _MIXED], ids=["numeric", "mixed"])
+def test_iter_data_frames(body: List[List[Any]]) -> None:
+    pdo, sheet = _get_pdo(body)
+    frames = list(pdo.iter_data_frames(2))
+    assert [len(df) for df in frames] == [2, 2, 1]
+    assert [list(df.index) for df in frames] == [[0, 1], [2, 3], [4]]
+    assert all(list(df.columns) == _HEADERS for df in frames)
+    pd.testing.assert_frame_equal(pd.concat(frames), _expected(body, [0, 1, 2]))
+    assert sheet.reads == ["B3:D4", "B5:D6", "B7:D7"]
+    with pytest.raises(ValueError):
+        next(pdo.iter_data_frames(0))
@@ -0,0 +1,82 @@
+from __future__ import annotations
+from typing import List, TYPE_CHECKING
+import pytest
+
+if __name__ == "__main__":
+    pytest.main([__file__])
+
+if TYPE_CHECKING:
+    from build.pythonpath.libre_pythonista_lib.data.range_cache import RangeCache, RangeCacheEntry
+else:
+    from libre_pythonista_lib.data.range_cache import RangeCache, RangeCacheEntry
+
+
+class _Doc:
+    def __init__(self, runtime_uid: str) -> None:
+        self.runtime_uid = runtime_uid
+
+
+@pytest.fixture
+def cache():
+    doc = _Doc("range_cache_test")
+    inst = RangeCache(doc)  # type: ignore
+    yield inst
+    RangeCache.reset_instance(doc.runtime_uid)
+
+
+def _entry(nbytes: int, released: List[str], name: str) -> RangeCacheEntry:
+    return RangeCacheEntry(
+        data=name, headers=True, range_obj=None, nbytes=nbytes, release=lambda: released.append(name)
+    )
+
+
+def test_range_cache_get_put(cache: RangeCache) -> None:
+    released: List[str] = []
+    key = (0, "A1:B10", "", False)
+    assert cache.get(key) is None
+    assert cache.put(key, _entry(10, released, "a"))
+    entry = cache.get(key)
+    assert entry is not None and entry.data == "a"
+    assert (cache.hits, cache.misses, cache.bytes) == (1, 1, 10)
+
+    cache.invalidate(key)
+    assert key not in cache
+    assert cache.bytes == 0
+    assert released == ["a"]
+    # released only once.
+    cache.invalidate(key)
+    assert released == ["a"]
+
+
+def test_range_cache_lru(cache: RangeCache) -> None:
+    released: List[str] = []
+    cache.max_bytes = 25
+    k1, k2, k3 = ((0, f"A1:A{i}", "", False) for i in range(1, 4))
+    cache.put(k1, _entry(10, released, "1"))
+    cache.put(k2, _entry(10, released, "2"))
+    cache.get(k1)
+    cache.put(k3, _entry(10, released, "3"))
+    assert k2 not in cache
+    assert k1 in cache and k3 in cache
+    assert released == ["2"]
+    assert cache.evictions == 1
+
+    assert not cache.put(k2, _entry(30, released, "big"))
+    assert released == ["2", "big"]
+
+    cache.max_bytes = 0
+    assert not cache.is_enabled
+    assert len(cache) == 0
+    assert sorted(released) == ["1", "2", "3", "big"]
+
+
+def test_range_cache_is_valid(cache: RangeCache) -> None:
+    released: List[str] = []
+    key = (0, "A1:B10", "", True)
+    entry = _entry(10, released, "a")
+    entry.is_valid = lambda: False
+    cache.put(key, entry)
+    assert cache.get(key) is None
+    assert key not in cache
+    assert released == ["a"]
+    assert (cache.hits, cache.misses) == (0, 1)
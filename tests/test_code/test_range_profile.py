@@ -0,0 +1,39 @@
+from __future__ import annotations
+from dataclasses import dataclass
+from typing import TYPE_CHECKING
+import pytest
+
+if __name__ == "__main__":
+    pytest.main([__file__])
+
+if TYPE_CHECKING:
+    from build.pythonpath.libre_pythonista_lib.data.range_profile import has_rows, is_cell_covered, is_col_covered
+else:
+    from libre_pythonista_lib.data.range_profile import has_rows, is_cell_covered, is_col_covered
+
+
+@dataclass
+class _Addr:
+    StartColumn: int  # noqa: N815
+    StartRow: int  # noqa: N815
+    EndColumn: int  # noqa: N815
+    EndRow: int  # noqa: N815
+
+
+def test_is_col_covered() -> None:
+    # column 1 rows 1 to 9 split over two ranges, column 2 has a gap at row 5.
+    ranges = [_Addr(0, 1, 1, 4), _Addr(1, 5, 2, 9), _Addr(2, 1, 2, 3)]
+    assert is_col_covered(ranges, 1, 1, 9)
+    assert not is_col_covered(ranges, 0, 1, 9)
+    assert is_col_covered(ranges, 0, 1, 4)
+    assert not is_col_covered(ranges, 2, 1, 9)
+    assert not is_col_covered(ranges, 3, 1, 1)
+    assert not is_col_covered([], 0, 0, 0)
+
+
+def test_is_cell_covered_has_rows() -> None:
+    ranges = [_Addr(0, 0, 3, 0), _Addr(2, 4, 2, 6)]
+    assert all(is_cell_covered(ranges, 0, col) for col in range(4))
+    assert not is_cell_covered(ranges, 1, 0)
+    assert not has_rows(ranges, 1, 3)
+    assert has_rows(ranges, 1, 4)
@@ -0,0 +1,76 @@
+from __future__ import annotations
+from typing import List, TYPE_CHECKING
+import threading
+import pytest
+
+if __name__ == "__main__":
+    pytest.main([__file__])
+
+if TYPE_CHECKING:
+    from build.pythonpath.libre_pythonista_lib.code.recalc_scheduler import RecalcRequest, RecalcScheduler
+    from build.pythonpath.libre_pythonista_lib.ex.exceptions import RecalcCanceledError
+else:
+    from libre_pythonista_lib.code.recalc_scheduler import RecalcRequest, RecalcScheduler
+    from libre_pythonista_lib.ex.exceptions import RecalcCanceledError
+
+
+def test_recalc_request_merge() -> None:
+    req = RecalcRequest(dirty=True).merge(RecalcRequest(index=5, display=True))
+    assert req == RecalcRequest(full=False, index=5, dirty=True, display=True)
+    req = req.merge(RecalcRequest(index=2))
+    assert req.index == 2
+    assert req.merge(RecalcRequest(full=True)).full is True
+
+
+def test_recalc_scheduler_coalesces() -> None:
+    runs: List[RecalcRequest] = []
+    scheduler = RecalcScheduler(runs.append, delay=0.05)
+    scheduler.request(RecalcRequest(dirty=True))
+    scheduler.request(RecalcRequest(index=3))
+    scheduler.request(RecalcRequest(index=1, display=True))
+    assert scheduler.wait_idle(timeout=5)
+    scheduler.stop()
+    assert runs == [RecalcRequest(index=1, dirty=True, display=True)]
+
+
+def test_recalc_scheduler_cancel() -> None:
+    runs: List[RecalcRequest] = []
+    started = threading.Event()
+    release = threading.Event()
+
+    def run(request: RecalcRequest) -> None:
+        runs.append(request)
+        if len(runs) == 1:
+            started.set()
+            release.wait(5)
+            assert scheduler.is_canceled()
+            raise RecalcCanceledError(4)
+
+    scheduler = RecalcScheduler(run, delay=0.0)
+    scheduler.request(RecalcRequest(dirty=True))
+    assert started.wait(5)
+    # a newer request supersedes the running recalculation.
+    scheduler.request(RecalcRequest(index=7))
+    release.set()
+    assert scheduler.wait_idle(timeout=5)
+    scheduler.stop()
+    assert runs == [RecalcRequest(dirty=True), RecalcRequest(index=4, dirty=True)]
+
+
+def test_recalc_scheduler_ignores_own_requests() -> None:
+    runs: List[RecalcRequest] = []
+
+    def run(request: RecalcRequest) -> None:
+        runs.append(request)
+        assert RecalcScheduler.current() is scheduler
+        scheduler.request(RecalcRequest(full=True))
+
+    scheduler = RecalcScheduler(run, delay=0.0)
+    scheduler.request(RecalcRequest(dirty=True))
+    assert scheduler.wait_idle(timeout=5)
+    assert RecalcScheduler.current() is None
+    with scheduler.suppress():
+        scheduler.request(RecalcRequest(full=True))
+    assert scheduler.wait_idle(timeout=5)
+    scheduler.stop()
+    assert runs == [RecalcRequest(dirty=True)]
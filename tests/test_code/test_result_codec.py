@@ -0,0 +1,68 @@
+from __future__ import annotations
+from pathlib import Path
+from typing import TYPE_CHECKING
+import pytest
+
+if __name__ == "__main__":
+    pytest.main([__file__])
+
+if TYPE_CHECKING:
+    from build.pythonpath.libre_pythonista_lib.code.result_codec import encode_result, decode_result
+else:
+    from libre_pythonista_lib.code.result_codec import encode_result, decode_result
+
+
+@pytest.mark.parametrize("value", [None, True, 12, 1.5, "hello"])
+def test_result_codec_value(value, tmp_path: Path) -> None:
+    encoded = encode_result({"data": value, "headers": False})
+    assert encoded is not None
+    entry, payload = encoded
+    assert payload is None
+    result = decode_result(entry, payload, tmp_path)
+    assert result == {"data": value, "headers": False}
+    assert type(result["data"]) is type(value)
+
+
+def test_result_codec_not_stored(tmp_path: Path) -> None:
+    assert encode_result({"data": 1, "error": True}) is None
+    assert encode_result({"data": (1, 2)}) is None
+    assert encode_result({"data": object()}) is None
+    assert decode_result({"kind": "data_frame"}, None, tmp_path) is None
+
+
+def test_result_codec_file(tmp_path: Path) -> None:
+    src = tmp_path / "plot.svg"
+    src.write_text("<svg></svg>")
+    encoded = encode_result({"data": str(src), "data_type": "file", "file_ext": "svg", "range_obj": object()})
+    assert encoded is not None
+    entry, payload = encoded
+    assert payload == b"<svg></svg>"
+    out_dir = tmp_path / "out"
+    out_dir.mkdir()
+    result = decode_result(entry, payload, out_dir)
+    assert result is not None
+    assert result["data_type"] == "file"
+    assert "range_obj" not in result
+    restored = Path(result["data"])
+    assert restored.parent == out_dir
+    assert restored.suffix == ".svg"
+    assert restored.read_bytes() == payload
+
+
+def test_result_codec_data_frame(tmp_path: Path) -> None:
+    pd = pytest.importorskip("pandas")
+    pytest.importorskip("pyarrow")
+    df = pd.DataFrame({"a": [1, 2, 3], "b": ["x", "y", "z"]})
+    encoded = encode_result({"data": df, "headers": True})
+    assert encoded is not None
+    entry, payload = encoded
+    result = decode_result(entry, payload, tmp_path)
+    assert result is not None
+    assert result["headers"] is True
+    pd.testing.assert_frame_equal(result["data"], df)
+
+    encoded = encode_result({"data": df["a"]})
+    assert encoded is not None
+    result = decode_result(encoded[0], encoded[1], tmp_path)
+    assert result is not None
+    pd.testing.assert_series_equal(result["data"], df["a"])